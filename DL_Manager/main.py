@@ -1,31 +1,175 @@
 import sys
 import os
+import heapq
+import itertools
 import json
+import tempfile
 import time
 import uuid
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                                QHBoxLayout, QLineEdit, QPushButton, 
-                               QProgressBar, QLabel, QScrollArea, QMessageBox, QFrame)
-from PySide6.QtCore import Qt, QThread, Signal, Slot, QObject, QMutex, QMutexLocker
+                               QProgressBar, QLabel, QScrollArea, QMessageBox, QFrame, QSpinBox)
+from PySide6.QtCore import (Qt, QThread, QTimer, Signal, Slot, QObject, QMutex, QMutexLocker,
+                            QWaitCondition)
 
 from TPOPyside.dialogs.reusable_file_dialog import FileDialog
 
 # File to store download state
 STATE_FILE = "downloads.json"
+# How long download state may go unsaved while transfers are running
+CHECKPOINT_INTERVAL_MS = 2000
+# Downloads transferring at once; the rest wait in the queue
+MAX_ACTIVE_DOWNLOADS = 3
+# How long closing the window waits for each worker to write its final journal
+SHUTDOWN_TIMEOUT_MS = 5000
+# Fields of a download kept in STATE_FILE; transfer details live in its journal
+QUEUE_FIELDS = ("id", "url", "filepath", "status", "downloaded_bytes", "total_bytes", "priority", "rate_limit")
+# Per-download journal, written next to the partial file
+JOURNAL_SUFFIX = ".part.json"
+JOURNAL_FIELDS = ("url", "total_bytes", "downloaded_bytes", "etag", "last_modified", "segments")
+
+
+def write_json_atomic(path, payload):
+    """Write JSON to a temp file beside `path`, fsync it, then rename it over `path`."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(payload, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def journal_path(filepath):
+    return filepath + JOURNAL_SUFFIX
+
 
 class DownloadSignals(QObject):
     """Signals for the worker thread."""
-    progress = Signal(str, int, int, float)  # id, downloaded, total, speed
+    progress = Signal(str, 'qint64', 'qint64', float, float)  # id, downloaded, total, speed, eta (-1 unknown)
     status = Signal(str, str)                # id, status_text
     finished = Signal(str)                   # id
     error = Signal(str, str)                 # id, error_message
 
+class ProgressMeter:
+    """
+    Rate-limits progress reports from a worker and smooths its speed.
+
+    update() is called for every chunk, from any connection thread, but only returns
+    a report every `interval` seconds (or when forced), so the GUI thread receives
+    about ten progress signals per second per download. Speed is an exponential
+    moving average of the rate between reports.
+    """
+    def __init__(self, interval=0.1, smoothing=0.3):
+        self.interval = interval
+        self.smoothing = smoothing
+        self._mutex = QMutex()
+        self.reset(0)
+
+    def reset(self, downloaded):
+        with QMutexLocker(self._mutex):
+            self.speed = 0.0
+            self._last_time = time.monotonic()
+            self._last_bytes = downloaded
+
+    def update(self, downloaded, total, force=False):
+        """Return (speed, eta_seconds) when a report is due, otherwise None."""
+        with QMutexLocker(self._mutex):
+            now = time.monotonic()
+            elapsed = now - self._last_time
+            if not force and elapsed < self.interval:
+                return None
+            if elapsed > 0:
+                sample = (downloaded - self._last_bytes) / elapsed
+                if self.speed <= 0:
+                    self.speed = sample
+                else:
+                    self.speed += self.smoothing * (sample - self.speed)
+            self._last_time = now
+            self._last_bytes = downloaded
+            eta = (total - downloaded) / self.speed if total > 0 and self.speed > 0 else -1.0
+            return self.speed, eta
+
+
+class TokenBucket:
+    """
+    Byte-rate limiter that any number of threads can draw from.
+
+    `rate` is in bytes per second, 0 meaning unlimited; up to `burst` seconds of unused
+    allowance carries over. consume() takes the bytes immediately and makes the caller
+    wait off any debt, so concurrent users share the rate without a polling loop.
+    """
+    def __init__(self, rate=0, burst=0.25):
+        self._mutex = QMutex()
+        self.rate = max(0, rate)
+        self.burst = burst
+        self._tokens = 0.0
+        self._stamp = time.monotonic()
+
+    def set_rate(self, rate):
+        with QMutexLocker(self._mutex):
+            self.rate = max(0, rate)
+            self._tokens = min(self._tokens, self.rate * self.burst)
+            self._stamp = time.monotonic()
+
+    def consume(self, amount, wait=time.sleep):
+        """Take `amount` bytes of allowance; `wait(seconds)` is called while in debt."""
+        with QMutexLocker(self._mutex):
+            if self.rate <= 0:
+                return
+            now = time.monotonic()
+            self._tokens = min(self.rate * self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= amount
+            debt = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if debt > 0:
+            wait(debt)
+
+
+class RangesNotSupported(Exception):
+    """Raised when a server ignores a Range request part-way through a segmented download."""
+
+
+class RemoteFileChanged(Exception):
+    """Raised when an If-Range request shows the remote file is no longer the journalled one."""
+
+
 class DownloadWorker(QThread):
     """
     Worker thread that handles the actual downloading.
     It supports resuming (Range headers) and infinite retries.
+
+    When the server advertises byte ranges and a length, the file is preallocated and
+    fetched as several segments over parallel connections, each written in place with
+    os.pwrite. Segment progress lives in download_data['segments'] so a restart
+    resumes every segment where it stopped. A connection that runs out of work takes
+    half of the largest remaining segment, so slow connections do not hold up the
+    finish. Servers without range support use a single stream. While it runs, the worker
+    is the only writer of download_data['downloaded_bytes'] and ['total_bytes'].
+
+    Transfer state (segments, validators) is checkpointed to a journal beside the file
+    at most every `checkpoint_interval` seconds, after the written bytes are synced, so
+    a crash loses at most that much work. A resume whose ETag/Last-Modified no longer
+    matches the journal starts over instead of mixing two versions of the file.
+
+    Every chunk is charged to the download's own TokenBucket (download_data['rate_limit'])
+    and to `global_bucket`, which DownloadScheduler shares between all workers. A paused
+    worker blocks on a wait condition until resume() or cancel() wakes it.
     """
+    connections = 4                 # parallel connections per download
+    min_segment_size = 1024 * 1024  # never split below this many bytes
+    chunk_size = 256 * 1024         # bytes per read/pwrite
+    checkpoint_interval = 1.0       # seconds between journal writes
+
     def __init__(self, download_data):
         super().__init__()
         self.data = download_data
@@ -34,42 +178,79 @@ class DownloadWorker(QThread):
         self.is_paused = download_data.get('status') == 'paused'
         self.is_cancelled = False
         self._mutex = QMutex()
+        self._state_changed = QWaitCondition()
+        self.rate_bucket = TokenBucket(download_data.get('rate_limit', 0))
+        self.global_bucket = None
+        # Segment bookkeeping, shared by the connection threads
+        self._segment_mutex = QMutex()
+        self._claimed = set()   # starts of segments a connection is working on
+        self._writing = {}      # segment start -> bytes being written right now
+        self._abort_segments = False
+        self._meter = ProgressMeter()
+        self._checkpoint_mutex = QMutex()
+        self._last_checkpoint = 0.0
 
     def pause(self):
         with QMutexLocker(self._mutex):
             self.is_paused = True
+            self._state_changed.wakeAll()
             self.signals.status.emit(self.id, "Paused")
 
     def resume(self):
         with QMutexLocker(self._mutex):
             self.is_paused = False
+            self._state_changed.wakeAll()
             self.signals.status.emit(self.id, "Resuming...")
             self.start() # Ensure thread is running
 
-    def cancel(self):
+    def cancel(self, wait=True):
         with QMutexLocker(self._mutex):
             self.is_cancelled = True
+            self._state_changed.wakeAll()
         self.quit()
-        self.wait()
+        if wait:
+            self.wait()
+
+    def set_rate_limit(self, rate):
+        self.data['rate_limit'] = max(0, rate)
+        self.rate_bucket.set_rate(self.data['rate_limit'])
+
+    def _should_stop(self):
+        return self.is_cancelled or self.is_paused or self._abort_segments
+
+    def _wait(self, seconds):
+        """Sleep up to `seconds`, returning early if the worker is paused, resumed or cancelled."""
+        with QMutexLocker(self._mutex):
+            if not self.is_cancelled and not self.is_paused:
+                self._state_changed.wait(self._mutex, max(1, int(seconds * 1000)))
+
+    def _wait_while_paused(self):
+        with QMutexLocker(self._mutex):
+            while self.is_paused and not self.is_cancelled:
+                self._state_changed.wait(self._mutex)
+
+    def _throttle(self, amount):
+        self.rate_bucket.consume(amount, self._wait)
+        if self.global_bucket is not None:
+            self.global_bucket.consume(amount, self._wait)
 
     def run(self):
         """
         The core logic:
         1. Infinite loop to allow infinite retries.
         2. Check for Pause/Cancel.
-        3. Determine file size for Resume (Range header).
-        4. Stream download.
+        3. Probe the server for range support and size.
+        4. Download in parallel segments, or as a single stream.
         """
-        url = self.data['url']
-        filepath = self.data['filepath']
-        
+        self._load_journal()
+
         # Infinite retry loop
         while not self.is_cancelled:
             
             # 1. Handle Pause State
             if self.is_paused:
                 self.signals.status.emit(self.id, "Paused")
-                time.sleep(1) # Sleep to reduce CPU usage while paused
+                self._wait_while_paused() # Blocks until resume() or cancel()
                 continue
 
             # 2. Check finished state
@@ -78,84 +259,447 @@ class DownloadWorker(QThread):
                 return
 
             try:
-                # 3. Prepare for Resume
-                downloaded_bytes = 0
-                mode = 'wb'
-                headers = {}
-                
-                if os.path.exists(filepath):
-                    downloaded_bytes = os.path.getsize(filepath)
-                    # If we have bytes, try to resume
-                    if downloaded_bytes > 0:
-                        headers = {'Range': f'bytes={downloaded_bytes}-'}
-                        mode = 'ab' # Append mode
-
                 self.signals.status.emit(self.id, "Connecting...")
-                
-                # 4. Request
-                # stream=True is critical for large files and progress tracking
-                with requests.get(url, stream=True, headers=headers, timeout=10) as r:
-                    
-                    # Handle Range Not Satisfiable (416) - Likely finished or file changed
-                    if r.status_code == 416:
-                        # Assuming finished if file exists. verify size in real app.
-                        self.data['status'] = 'completed'
-                        self.signals.finished.emit(self.id)
-                        return
-
-                    # Handle server not supporting ranges (200 OK means it sent the whole file again)
-                    if r.status_code == 200 and downloaded_bytes > 0:
-                        # Server ignored range, must overwrite
-                        downloaded_bytes = 0
-                        mode = 'wb'
-                    
-                    r.raise_for_status() # Raise error for 404, 500, etc.
-
-                    total_length = int(r.headers.get('content-length', 0)) + downloaded_bytes
-                    
-                    # Store logic for speed calculation
-                    start_time = time.time()
-                    bytes_in_session = 0
-                    
-                    with open(filepath, mode) as f:
-                        for chunk in r.iter_content(chunk_size=8192):
-                            # Check control flags inside the stream loop
-                            if self.is_cancelled:
-                                return
-                            if self.is_paused:
-                                break # Break inner loop, outer loop will catch pause state
-
-                            if chunk:
-                                f.write(chunk)
-                                len_chunk = len(chunk)
-                                downloaded_bytes += len_chunk
-                                bytes_in_session += len_chunk
-                                
-                                # Calculate speed
-                                elapsed = time.time() - start_time
-                                speed = 0
-                                if elapsed > 0:
-                                    speed = bytes_in_session / elapsed
-                                
-                                self.signals.progress.emit(self.id, downloaded_bytes, total_length, speed)
-
-                # Check if we finished normally or paused
-                if not self.is_paused and not self.is_cancelled:
+                total, ranged, validators = self._probe(self.data['url'])
+                restart = self._remote_changed(total, validators)
+                if restart:
+                    self.signals.status.emit(self.id, "Remote file changed. Restarting...")
+                    self.data.pop('segments', None)
+                    self.data['downloaded_bytes'] = 0
+                self.data.update(validators)
+
+                if ranged and total >= 2 * self.min_segment_size:
+                    try:
+                        finished = self._download_segmented(total)
+                    except RangesNotSupported:
+                        self.data.pop('segments', None)
+                        finished = self._download_single(restart=True)
+                else:
+                    finished = self._download_single(restart=restart)
+
+                if finished and not self.is_paused and not self.is_cancelled:
                     self.data['status'] = 'completed'
+                    self._remove_journal()
                     self.signals.finished.emit(self.id)
-                    return 
+                    return
+
+            except RemoteFileChanged:
+                # Forget the old version entirely; the next probe plans a fresh download.
+                self.data.pop('segments', None)
+                self.data['downloaded_bytes'] = 0
+                self.data['etag'] = self.data['last_modified'] = None
 
             except requests.exceptions.RequestException as e:
                 # Network Error: Do not stop. Wait and Retry.
                 if not self.is_cancelled:
                     self.signals.status.emit(self.id, f"Network Error. Retrying in 5s...")
                     self.signals.error.emit(self.id, str(e))
-                    time.sleep(5) # Wait before retry
+                    self._wait(5) # Wait before retry
             except Exception as e:
                 # File/OS Error
                 if not self.is_cancelled:
                     self.signals.status.emit(self.id, f"Error: {str(e)}")
-                    time.sleep(5)
+                    self._wait(5)
+
+    def _probe(self, url):
+        """Return (total_bytes, supports_ranges, validators) from a HEAD request."""
+        validators = {'etag': None, 'last_modified': None}
+        try:
+            r = requests.head(url, allow_redirects=True, timeout=10)
+        except requests.exceptions.RequestException:
+            return 0, False, validators
+        if r.status_code >= 400:
+            # Some servers reject HEAD; the single-stream GET will tell us more.
+            return 0, False, validators
+        total = int(r.headers.get('content-length', 0) or 0)
+        ranged = r.headers.get('accept-ranges', '').strip().lower() == 'bytes'
+        validators['etag'] = r.headers.get('etag') or None
+        validators['last_modified'] = r.headers.get('last-modified') or None
+        return total, ranged and total > 0, validators
+
+    def _remote_changed(self, total, validators):
+        """True when the partial download on disk belongs to a different version of the remote file."""
+        for key in ('etag', 'last_modified'):
+            old, new = self.data.get(key), validators.get(key)
+            if old and new:
+                return old != new
+        old_total = self.data.get('total_bytes') or 0
+        return bool(old_total and total and old_total != total and self.data.get('downloaded_bytes'))
+
+    def _if_range(self):
+        """Validator for If-Range, so a changed file is sent whole instead of as a stale range."""
+        etag = self.data.get('etag')
+        if etag and not etag.startswith('W/'):
+            return etag
+        return self.data.get('last_modified')
+
+    # --- Journal ---
+
+    def _load_journal(self):
+        """Adopt the transfer state a previous run of this download checkpointed."""
+        try:
+            with open(journal_path(self.data['filepath'])) as f:
+                journal = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(journal, dict) or journal.get('url') != self.data['url']:
+            return
+        for key in JOURNAL_FIELDS:
+            if key in journal:
+                self.data[key] = journal[key]
+
+    def _write_journal(self, fd=None):
+        """Checkpoint transfer state; bytes are synced to disk before the journal counts them."""
+        with QMutexLocker(self._segment_mutex):
+            journal = {key: self.data[key] for key in JOURNAL_FIELDS if key in self.data}
+            if 'segments' in journal:
+                journal['segments'] = [dict(seg) for seg in journal['segments']]
+        if fd is not None:
+            getattr(os, 'fdatasync', os.fsync)(fd)
+        write_json_atomic(journal_path(self.data['filepath']), journal)
+
+    def _maybe_checkpoint(self, fd):
+        if time.monotonic() - self._last_checkpoint < self.checkpoint_interval:
+            return
+        # One connection writes the checkpoint; the others keep downloading.
+        if not self._checkpoint_mutex.tryLock():
+            return
+        try:
+            if time.monotonic() - self._last_checkpoint >= self.checkpoint_interval:
+                self._write_journal(fd)
+                self._last_checkpoint = time.monotonic()
+        finally:
+            self._checkpoint_mutex.unlock()
+
+    def _remove_journal(self):
+        try:
+            os.remove(journal_path(self.data['filepath']))
+        except OSError:
+            pass
+
+    def _emit_progress(self, downloaded, total, force=False):
+        report = self._meter.update(downloaded, total, force)
+        if report is not None:
+            speed, eta = report
+            self.signals.progress.emit(self.id, downloaded, total, speed, eta)
+
+    # --- Single stream ---
+
+    def _download_single(self, restart=False):
+        """Stream the whole file over one connection. Returns True once it is complete."""
+        url = self.data['url']
+        filepath = self.data['filepath']
+
+        # 3. Prepare for Resume
+        downloaded_bytes = 0
+        mode = 'wb'
+        headers = {}
+
+        if self.data.pop('segments', None) is not None:
+            # A preallocated segmented file has holes; its size says nothing about progress.
+            restart = True
+        if not restart and os.path.exists(filepath):
+            downloaded_bytes = os.path.getsize(filepath)
+            # If we have bytes, try to resume
+            if downloaded_bytes > 0:
+                headers = {'Range': f'bytes={downloaded_bytes}-'}
+                if self._if_range():
+                    # A changed file comes back whole (200) instead of being appended to.
+                    headers['If-Range'] = self._if_range()
+                mode = 'ab' # Append mode
+
+        # 4. Request
+        # stream=True is critical for large files and progress tracking
+        with requests.get(url, stream=True, headers=headers, timeout=10) as r:
+
+            # Handle Range Not Satisfiable (416) - Likely finished or file changed
+            if r.status_code == 416:
+                # Assuming finished if file exists. verify size in real app.
+                return True
+
+            # Handle server not supporting ranges (200 OK means it sent the whole file again)
+            if r.status_code == 200 and downloaded_bytes > 0:
+                # Server ignored range, must overwrite
+                downloaded_bytes = 0
+                mode = 'wb'
+
+            r.raise_for_status() # Raise error for 404, 500, etc.
+
+            total_length = int(r.headers.get('content-length', 0)) + downloaded_bytes
+            self.data['total_bytes'] = total_length
+
+            # Store logic for speed calculation
+            self._meter.reset(downloaded_bytes)
+            self._last_checkpoint = 0.0
+
+            with open(filepath, mode) as f:
+                for chunk in r.iter_content(chunk_size=self.chunk_size):
+                    # Check control flags inside the stream loop
+                    if self.is_cancelled or self.is_paused:
+                        # Keep the validators even if no periodic checkpoint has run yet.
+                        f.flush()
+                        self._write_journal(f.fileno())
+                        self._emit_progress(downloaded_bytes, total_length, force=True)
+                        return False # outer loop will catch pause/cancel state
+
+                    if chunk:
+                        self._throttle(len(chunk))
+                        f.write(chunk)
+                        downloaded_bytes += len(chunk)
+                        self.data['downloaded_bytes'] = downloaded_bytes
+                        self._emit_progress(downloaded_bytes, total_length)
+                        if time.monotonic() - self._last_checkpoint >= self.checkpoint_interval:
+                            f.flush()
+                            self._maybe_checkpoint(f.fileno())
+        self._emit_progress(downloaded_bytes, total_length, force=True)
+        return True
+
+    # --- Segmented ---
+
+    def _download_segmented(self, total):
+        """Fetch the file as parallel byte ranges. Returns True once every segment is complete."""
+        filepath = self.data['filepath']
+        segments = self.data.get('segments')
+        if not segments or self.data.get('total_bytes') != total or not self._file_matches(filepath, total):
+            segments = self._plan_segments(total)
+            self.data['segments'] = segments
+        self.data['total_bytes'] = total
+
+        self._claimed.clear()
+        self._writing.clear()
+        self._abort_segments = False
+        self.data['downloaded_bytes'] = self._segments_done()
+        self._meter.reset(self.data['downloaded_bytes'])
+        self._last_checkpoint = 0.0
+        self.signals.status.emit(self.id, "Downloading...")
+
+        fd = os.open(filepath, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size != total:
+                os.ftruncate(fd, total)
+            workers = max(1, self.connections)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pytpo-dl-segment") as pool:
+                futures = [pool.submit(self._run_connection, fd, total) for _ in range(workers)]
+                errors = []
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        self._abort_segments = True
+                        errors.append(e)
+            if errors:
+                raise errors[0]
+        finally:
+            try:
+                self._write_journal(fd)
+            finally:
+                os.close(fd)
+                self._emit_progress(self._segments_done(), total, force=True)
+
+        return all(seg['done'] >= seg['end'] - seg['start'] for seg in self.data['segments'])
+
+    @staticmethod
+    def _file_matches(filepath, total):
+        try:
+            return os.path.getsize(filepath) == total
+        except OSError:
+            return False
+
+    def _plan_segments(self, total):
+        count = max(1, min(self.connections, total // self.min_segment_size))
+        size = total // count
+        segments = []
+        for index in range(count):
+            start = index * size
+            end = total if index == count - 1 else start + size
+            segments.append({'start': start, 'end': end, 'done': 0})
+        return segments
+
+    def _segments_done(self):
+        # Callers hold _segment_mutex, or run before the connections start.
+        return sum(seg['done'] for seg in self.data['segments'])
+
+    def _remaining(self, seg):
+        return seg['end'] - seg['start'] - seg['done'] - self._writing.get(seg['start'], 0)
+
+    def _claim_segment(self):
+        """Take an idle unfinished segment, or split the largest one in progress."""
+        with QMutexLocker(self._segment_mutex):
+            segments = self.data['segments']
+            for seg in segments:
+                if seg['start'] not in self._claimed and self._remaining(seg) > 0:
+                    self._claimed.add(seg['start'])
+                    return seg
+
+            # Rebalance: take the back half of whichever connection has the most left.
+            busy = [seg for seg in segments if seg['start'] in self._claimed]
+            victim = max(busy, key=self._remaining, default=None)
+            if victim is None or self._remaining(victim) < 2 * self.min_segment_size:
+                return None
+            cut = victim['end'] - self._remaining(victim) // 2
+            stolen = {'start': cut, 'end': victim['end'], 'done': 0}
+            victim['end'] = cut
+            segments.insert(segments.index(victim) + 1, stolen)
+            self._claimed.add(cut)
+            return stolen
+
+    def _release_segment(self, seg):
+        with QMutexLocker(self._segment_mutex):
+            self._claimed.discard(seg['start'])
+
+    def _run_connection(self, fd, total):
+        """One connection: keep claiming segments until nothing is left to fetch."""
+        session = requests.Session()
+        try:
+            while not self._should_stop():
+                seg = self._claim_segment()
+                if seg is None:
+                    return
+                try:
+                    self._fetch_segment(session, fd, seg, total)
+                except requests.exceptions.RequestException as e:
+                    # Hand the segment back with its progress kept, then retry.
+                    self._release_segment(seg)
+                    if not self._should_stop():
+                        self.signals.status.emit(self.id, "Network Error. Retrying in 5s...")
+                        self.signals.error.emit(self.id, str(e))
+                        self._wait(5)
+                    continue
+                self._release_segment(seg)
+        finally:
+            session.close()
+
+    def _fetch_segment(self, session, fd, seg, total):
+        offset = seg['start'] + seg['done']
+        if offset >= seg['end']:
+            return
+        headers = {'Range': f"bytes={offset}-{seg['end'] - 1}"}
+        if self._if_range():
+            headers['If-Range'] = self._if_range()
+        with session.get(self.data['url'], stream=True, headers=headers, timeout=10) as r:
+            if r.status_code == 200:
+                if 'If-Range' in headers:
+                    raise RemoteFileChanged(self.data['url'])
+                raise RangesNotSupported(self.data['url'])
+            r.raise_for_status()
+            if r.status_code != 206:
+                raise RangesNotSupported(self.data['url'])
+
+            for chunk in r.iter_content(chunk_size=self.chunk_size):
+                if self._should_stop():
+                    return
+                if not chunk:
+                    continue
+                self._throttle(len(chunk))
+                if self._should_stop():
+                    return
+                # The segment may have been shortened by a split since the request started.
+                with QMutexLocker(self._segment_mutex):
+                    offset = seg['start'] + seg['done']
+                    chunk = chunk[:max(0, seg['end'] - offset)]
+                    self._writing[seg['start']] = len(chunk)
+                if chunk:
+                    os.pwrite(fd, chunk, offset)
+                with QMutexLocker(self._segment_mutex):
+                    self._writing.pop(seg['start'], None)
+                    seg['done'] += len(chunk)
+                    # Derived from the segments rather than accumulated, so nothing else
+                    # writing this key can make the running total drift.
+                    downloaded = self._segments_done()
+                    self.data['downloaded_bytes'] = downloaded
+                    finished = seg['start'] + seg['done'] >= seg['end']
+                self._emit_progress(downloaded, total)
+                self._maybe_checkpoint(fd)
+                if finished:
+                    return
+
+class DownloadScheduler(QObject):
+    """
+    Decides which downloads may transfer.
+
+    At most `max_active` workers run at once; other active downloads wait in a queue
+    ordered by priority (higher first), then by when they were queued. A slot frees up
+    when a download completes, is paused or is removed. The scheduler also owns the
+    global TokenBucket that every worker shares.
+    """
+    def __init__(self, max_active=MAX_ACTIVE_DOWNLOADS, global_rate=0, parent=None):
+        super().__init__(parent)
+        self.max_active = max(1, max_active)
+        self.global_bucket = TokenBucket(global_rate)
+        self.workers = {}       # Map id -> DownloadWorker
+        self.active = set()     # ids allowed to transfer
+        self._queue = []        # heap of (-priority, sequence, id)
+        self._queued = {}       # Map id -> sequence of its live heap entry
+        self._sequence = itertools.count()
+
+    def add(self, worker):
+        self.workers[worker.id] = worker
+        worker.global_bucket = self.global_bucket
+        worker.signals.finished.connect(self._on_finished)
+
+    def enqueue(self, uid):
+        worker = self.workers.get(uid)
+        if worker is None or uid in self.active or uid in self._queued:
+            return
+        self._push(uid)
+        self._dispatch()
+        if uid in self._queued:
+            worker.signals.status.emit(uid, "Queued")
+
+    def pause(self, uid):
+        self._queued.pop(uid, None)
+        self.active.discard(uid)
+        worker = self.workers.get(uid)
+        if worker is not None:
+            worker.pause()
+        self._dispatch()
+
+    def remove(self, uid):
+        self._queued.pop(uid, None)
+        self.active.discard(uid)
+        self.workers.pop(uid, None)
+        self._dispatch()
+
+    def set_priority(self, uid, priority):
+        worker = self.workers.get(uid)
+        if worker is None:
+            return
+        worker.data['priority'] = priority
+        if uid in self._queued:
+            self._push(uid) # the old heap entry goes stale
+
+    def set_max_active(self, count):
+        # Lowering the limit lets running downloads finish rather than interrupting them.
+        self.max_active = max(1, count)
+        self._dispatch()
+
+    def set_global_rate(self, rate):
+        self.global_bucket.set_rate(rate)
+
+    def queued_ids(self):
+        """Queued downloads in the order they will start."""
+        live = [entry for entry in self._queue if self._queued.get(entry[2]) == entry[1]]
+        return [uid for _priority, _sequence, uid in sorted(live)]
+
+    def _push(self, uid):
+        sequence = next(self._sequence)
+        self._queued[uid] = sequence
+        heapq.heappush(self._queue, (-self.workers[uid].data.get('priority', 0), sequence, uid))
+
+    def _dispatch(self):
+        while self._queue and len(self.active) < self.max_active:
+            _priority, sequence, uid = heapq.heappop(self._queue)
+            if self._queued.get(uid) != sequence:
+                continue # paused, removed or re-queued since
+            del self._queued[uid]
+            self.active.add(uid)
+            self.workers[uid].resume()
+
+    @Slot(str)
+    def _on_finished(self, uid):
+        self.active.discard(uid)
+        self._dispatch()
+
 
 class DownloadItemWidget(QFrame):
     """GUI Widget representing a single download row."""
@@ -183,11 +727,22 @@ class DownloadItemWidget(QFrame):
             self.progress_bar.setValue(pct)
         layout.addWidget(self.progress_bar)
 
-        # Bottom Row: Speed and Buttons
+        # Bottom Row: Speed, Limits and Buttons
         btn_layout = QHBoxLayout()
         self.lbl_speed = QLabel("0 KB/s")
         btn_layout.addWidget(self.lbl_speed)
         btn_layout.addStretch()
+
+        btn_layout.addWidget(QLabel("Priority:"))
+        self.priority_input = QSpinBox()
+        self.priority_input.setRange(-10, 10)
+        self.priority_input.setValue(download_data.get('priority', 0))
+        btn_layout.addWidget(self.priority_input)
+        btn_layout.addWidget(QLabel("KB/s:"))
+        self.rate_input = QSpinBox()
+        self.rate_input.setRange(0, 1000000)
+        self.rate_input.setValue(download_data.get('rate_limit', 0) // 1024)
+        btn_layout.addWidget(self.rate_input)
         
         self.btn_toggle = QPushButton("Pause" if download_data['status'] == 'active' else "Resume")
         self.btn_cancel = QPushButton("Remove")
@@ -198,16 +753,28 @@ class DownloadItemWidget(QFrame):
 
         self.setLayout(layout)
 
-    def update_progress(self, current, total, speed):
+    def update_progress(self, current, total, speed, eta=-1.0):
         if total > 0:
             pct = int((current / total) * 100)
+            self.progress_bar.setRange(0, 100)
             self.progress_bar.setValue(pct)
             self.progress_bar.setFormat(f"{self.format_bytes(current)} / {self.format_bytes(total)} ({pct}%)")
         else:
             self.progress_bar.setRange(0, 0) # Indeterminate
             self.progress_bar.setFormat(f"{self.format_bytes(current)}")
         
-        self.lbl_speed.setText(f"{self.format_bytes(speed)}/s")
+        text = f"{self.format_bytes(speed)}/s"
+        if eta >= 0:
+            text += f" - {self.format_eta(eta)} left"
+        self.lbl_speed.setText(text)
+
+    def format_eta(self, seconds):
+        seconds = int(seconds)
+        if seconds >= 3600:
+            return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+        if seconds >= 60:
+            return f"{seconds // 60}m {seconds % 60:02d}s"
+        return f"{seconds}s"
 
     def format_bytes(self, size):
         power = 2**10
@@ -226,7 +793,21 @@ class MainWindow(QMainWindow):
         
         self.workers = {} # Map id -> DownloadWorker
         self.widgets = {} # Map id -> DownloadItemWidget
-        self.download_list_data = [] # List of dicts
+        self.downloads = {} # Map id -> download dict, in display order
+        self.scheduler = DownloadScheduler(MAX_ACTIVE_DOWNLOADS, parent=self)
+
+        # Progress signals are only recorded; one timer tick per frame applies them all.
+        self._pending_progress = {} # Map id -> (current, total, speed, eta)
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.setInterval(16)
+        self._progress_timer.timeout.connect(self.flush_progress)
+
+        # Debounced checkpoint of the download list while transfers run.
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(CHECKPOINT_INTERVAL_MS)
+        self._save_timer.timeout.connect(self.save_state)
 
         self.init_ui()
         self.load_state()
@@ -266,6 +847,19 @@ class MainWindow(QMainWindow):
         name_layout.addWidget(self.name_input)
         input_layout.addLayout(name_layout)
 
+        # Priority and per-download limit
+        options_layout = QHBoxLayout()
+        options_layout.addWidget(QLabel("Priority:"))
+        self.priority_input = QSpinBox()
+        self.priority_input.setRange(-10, 10)
+        options_layout.addWidget(self.priority_input)
+        options_layout.addWidget(QLabel("Limit (KB/s, 0 = none):"))
+        self.rate_input = QSpinBox()
+        self.rate_input.setRange(0, 1000000)
+        options_layout.addWidget(self.rate_input)
+        options_layout.addStretch()
+        input_layout.addLayout(options_layout)
+
         # Add Button
         self.btn_add = QPushButton("Add Download")
         self.btn_add.clicked.connect(self.add_new_download)
@@ -274,6 +868,22 @@ class MainWindow(QMainWindow):
         input_group.setLayout(input_layout)
         main_layout.addWidget(input_group)
 
+        # --- Scheduler Settings ---
+        settings_layout = QHBoxLayout()
+        settings_layout.addWidget(QLabel("Max active:"))
+        self.max_active_input = QSpinBox()
+        self.max_active_input.setRange(1, 20)
+        self.max_active_input.setValue(self.scheduler.max_active)
+        self.max_active_input.valueChanged.connect(self.scheduler.set_max_active)
+        settings_layout.addWidget(self.max_active_input)
+        settings_layout.addWidget(QLabel("Total limit (KB/s, 0 = none):"))
+        self.global_rate_input = QSpinBox()
+        self.global_rate_input.setRange(0, 1000000)
+        self.global_rate_input.valueChanged.connect(lambda kb: self.scheduler.set_global_rate(kb * 1024))
+        settings_layout.addWidget(self.global_rate_input)
+        settings_layout.addStretch()
+        main_layout.addLayout(settings_layout)
+
         # --- Download List Area ---
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
@@ -323,10 +933,12 @@ class MainWindow(QMainWindow):
             "filepath": filepath,
             "status": "active",
             "downloaded_bytes": 0,
-            "total_bytes": 0
+            "total_bytes": 0,
+            "priority": self.priority_input.value(),
+            "rate_limit": self.rate_input.value() * 1024,
         }
 
-        self.download_list_data.append(new_data)
+        self.downloads[new_data['id']] = new_data
         self.create_download_row(new_data)
         self.save_state()
         
@@ -335,7 +947,7 @@ class MainWindow(QMainWindow):
         self.name_input.clear()
 
     def create_download_row(self, data):
-        """Creates the widget and starts the worker."""
+        """Creates the widget and queues the worker with the scheduler."""
         # 1. Create Widget
         item_widget = DownloadItemWidget(data)
         self.scroll_layout.addWidget(item_widget)
@@ -344,42 +956,46 @@ class MainWindow(QMainWindow):
         # 2. Setup Worker
         worker = DownloadWorker(data)
         self.workers[data['id']] = worker
+        self.scheduler.add(worker)
 
         # 3. Connect UI Buttons
         item_widget.btn_toggle.clicked.connect(lambda: self.toggle_download(data['id']))
         item_widget.btn_cancel.clicked.connect(lambda: self.remove_download(data['id']))
+        item_widget.priority_input.valueChanged.connect(lambda value: self.set_download_priority(data['id'], value))
+        item_widget.rate_input.valueChanged.connect(lambda kb: self.set_download_rate_limit(data['id'], kb * 1024))
 
         # 4. Connect Worker Signals
         worker.signals.progress.connect(self.on_progress)
         worker.signals.status.connect(self.on_status)
         worker.signals.finished.connect(self.on_finished)
         
-        # 5. Start if active
+        # 5. Queue if active; the scheduler starts it when a slot is free
         if data['status'] == 'active':
-            worker.start()
+            self.scheduler.enqueue(data['id'])
+        elif data['status'] == 'completed':
+            item_widget.lbl_status.setText("Completed")
+            item_widget.btn_toggle.setEnabled(False)
         else:
             item_widget.lbl_status.setText("Paused")
 
     def toggle_download(self, uid):
-        worker = self.workers.get(uid)
         widget = self.widgets.get(uid)
         
-        if worker.is_paused:
-            worker.resume()
+        if self.downloads[uid]['status'] == 'paused':
+            # Update data model first; enqueue may start the worker straight away
+            self.downloads[uid]['status'] = 'active'
             widget.btn_toggle.setText("Pause")
-            # Update data model
-            for d in self.download_list_data:
-                if d['id'] == uid: d['status'] = 'active'
+            self.scheduler.enqueue(uid)
         else:
-            worker.pause()
+            self.downloads[uid]['status'] = 'paused'
             widget.btn_toggle.setText("Resume")
-            for d in self.download_list_data:
-                if d['id'] == uid: d['status'] = 'paused'
+            self.scheduler.pause(uid)
         
         self.save_state()
 
     def remove_download(self, uid):
         # Stop worker
+        self.scheduler.remove(uid)
         if uid in self.workers:
             self.workers[uid].cancel()
             del self.workers[uid]
@@ -390,23 +1006,41 @@ class MainWindow(QMainWindow):
             del self.widgets[uid]
 
         # Remove from data
-        self.download_list_data = [d for d in self.download_list_data if d['id'] != uid]
+        self.downloads.pop(uid, None)
+        self._pending_progress.pop(uid, None)
         self.save_state()
 
+    def set_download_priority(self, uid, priority):
+        """Change a download's priority; a queued download moves to its new place in line."""
+        self.scheduler.set_priority(uid, priority)
+        self.schedule_save()
+
+    def set_download_rate_limit(self, uid, rate):
+        """Change a download's own limit in bytes per second (0 = none), even mid-transfer."""
+        if uid in self.workers:
+            self.workers[uid].set_rate_limit(rate)
+            self.schedule_save()
+
     # --- Signal Slots ---
 
-    @Slot(str, int, int, float)
-    def on_progress(self, uid, current, total, speed):
-        if uid in self.widgets:
-            self.widgets[uid].update_progress(current, total, speed)
-            # Update data model for persistence
-            for d in self.download_list_data:
-                if d['id'] == uid:
-                    d['downloaded_bytes'] = current
-                    d['total_bytes'] = total
-            
-            # Save occasionally could be added here, but causes I/O overhead.
-            # We rely on save at stop/start/close for now.
+    @Slot(str, 'qint64', 'qint64', float, float)
+    def on_progress(self, uid, current, total, speed, eta):
+        # Only the latest report per download matters; widgets are updated in flush_progress.
+        self._pending_progress[uid] = (current, total, speed, eta)
+        if not self._progress_timer.isActive():
+            self._progress_timer.start()
+
+    def flush_progress(self):
+        pending, self._pending_progress = self._pending_progress, {}
+        for uid, (current, total, speed, eta) in pending.items():
+            widget = self.widgets.get(uid)
+            if uid not in self.downloads or widget is None:
+                continue
+            # Display only: the worker owns the byte counts in the download dict, and these
+            # reports are queued snapshots that may already be older than its last write.
+            widget.update_progress(current, total, speed, eta)
+        if pending:
+            self.schedule_save()
 
     @Slot(str, str)
     def on_status(self, uid, status_text):
@@ -415,21 +1049,29 @@ class MainWindow(QMainWindow):
 
     @Slot(str)
     def on_finished(self, uid):
+        # Apply the final byte count queued just before this signal.
+        self.flush_progress()
         if uid in self.widgets:
             self.widgets[uid].lbl_status.setText("Completed")
             self.widgets[uid].btn_toggle.setEnabled(False)
             self.widgets[uid].progress_bar.setValue(100)
-            
-            for d in self.download_list_data:
-                if d['id'] == uid: d['status'] = 'completed'
+
+            if uid in self.downloads:
+                self.downloads[uid]['status'] = 'completed'
             self.save_state()
 
     # --- Persistence ---
 
+    def schedule_save(self):
+        """Save within CHECKPOINT_INTERVAL_MS, coalescing every change made until then."""
+        if not self._save_timer.isActive():
+            self._save_timer.start()
+
     def save_state(self):
+        self._save_timer.stop()
+        queue = [{key: d[key] for key in QUEUE_FIELDS if key in d} for d in self.downloads.values()]
         try:
-            with open(STATE_FILE, 'w') as f:
-                json.dump(self.download_list_data, f, indent=4)
+            write_json_atomic(STATE_FILE, queue)
         except Exception as e:
             print(f"Failed to save state: {e}")
 
@@ -440,8 +1082,8 @@ class MainWindow(QMainWindow):
         try:
             with open(STATE_FILE, 'r') as f:
                 data = json.load(f)
-                self.download_list_data = data
-                for d in self.download_list_data:
+                self.downloads = {d['id']: d for d in data}
+                for d in self.downloads.values():
                     # Reset completed ones to just display
                     # Resume active ones
                     self.create_download_row(d)
@@ -450,13 +1092,16 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         """Handle app closure."""
+        # Stop every worker at once, then give each time to checkpoint its journal
+        for worker in self.workers.values():
+            worker.cancel(wait=False)
+        for worker in self.workers.values():
+            worker.wait(SHUTDOWN_TIMEOUT_MS)
+
         # Save state one last time
+        self.flush_progress()
         self.save_state()
         
-        # Stop all threads cleanly
-        for uid, worker in self.workers.items():
-            worker.cancel()
-        
         event.accept()
 
 if __name__ == "__main__":
@@ -4,16 +4,19 @@ import ast
 import json
 import shutil
 import subprocess
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import Any, Callable
 
-from PySide6.QtCore import QByteArray, QPoint, QSize, Qt
+from PySide6.QtCore import SLOT, QByteArray, QObject, QPoint, QSize, Qt, QTimer, Signal, Slot
 from PySide6.QtDBus import (
     QDBusArgument,
     QDBusConnection,
     QDBusInterface,
     QDBusMessage,
     QDBusObjectPath,
+    QDBusPendingCallWatcher,
+    QDBusServiceWatcher,
     QDBusSignature,
     QDBusVariant,
 )
@@ -35,6 +38,31 @@ MENU_INTERFACE = "com.canonical.dbusmenu"
 DEFAULT_ITEM_PATH = "/StatusNotifierItem"
 PREFERRED_ICON_SIZE = 22
 BUSCTL = shutil.which("busctl")
+DBUS_SERVICE = "org.freedesktop.DBus"
+DBUS_PATH = "/org/freedesktop/DBus"
+ITEM_PROPERTIES = (
+    "Id",
+    "Title",
+    "Status",
+    "IconName",
+    "AttentionIconName",
+    "OverlayIconName",
+    "ToolTip",
+    "Menu",
+    "ItemIsMenu",
+)
+# Item signals and the properties each one invalidates; pixmap names are fetched lazily.
+ITEM_SIGNAL_PROPERTIES = {
+    "NewTitle": ("Title",),
+    "NewIcon": ("IconName", "IconPixmap"),
+    "NewAttentionIcon": ("AttentionIconName", "AttentionIconPixmap"),
+    "NewOverlayIcon": ("OverlayIconName", "OverlayIconPixmap"),
+    "NewStatus": ("Status",),
+    "NewToolTip": ("ToolTip",),
+    "NewMenu": ("Menu",),
+}
+PIXMAP_PROPERTIES = ("IconPixmap", "AttentionIconPixmap", "OverlayIconPixmap")
+WATCHER_SIGNALS = ("StatusNotifierItemRegistered", "StatusNotifierItemUnregistered")
 
 
 def dbus_to_python(value: Any) -> Any:
@@ -297,15 +325,19 @@ def tooltip_title(value: Any) -> str:
 
 
 def best_text(bus: QDBusConnection, service: str, path: str) -> str:
-    title = str(call_property(bus, service, path, ITEM_INTERFACE, "Title") or "").strip()
+    return best_text_from(lambda name: call_property(bus, service, path, ITEM_INTERFACE, name), service, path)
+
+
+def best_text_from(lookup: Callable[[str], Any], service: str, path: str) -> str:
+    title = str(lookup("Title") or "").strip()
     if title:
         return title
 
-    tip_title = tooltip_title(call_property(bus, service, path, ITEM_INTERFACE, "ToolTip"))
+    tip_title = tooltip_title(lookup("ToolTip"))
     if tip_title:
         return tip_title
 
-    item_id = str(call_property(bus, service, path, ITEM_INTERFACE, "Id") or "").strip()
+    item_id = str(lookup("Id") or "").strip()
     if item_id:
         return item_id
 
@@ -427,59 +459,70 @@ class TrayIconResolver:
         if cached is not None:
             return cached
 
-        icon_name = str(call_property(self.bus, service, path, ITEM_INTERFACE, "IconName") or "").strip()
-        overlay_name = str(call_property(self.bus, service, path, ITEM_INTERFACE, "OverlayIconName") or "").strip()
-        attention_name = str(call_property(self.bus, service, path, ITEM_INTERFACE, "AttentionIconName") or "").strip()
+        names = {
+            name: call_property(self.bus, service, path, ITEM_INTERFACE, name)
+            for name in ("IconName", "OverlayIconName", "AttentionIconName")
+        }
+        resolved = self.resolve_from(
+            names.get,
+            lambda name: self._pixmap_property(service, path, name),
+        )
+        self._cache[cache_key] = resolved
+        return resolved
+
+    def resolve_from(
+        self,
+        lookup: Callable[[str], Any],
+        pixmap_lookup: Callable[[str], Any],
+    ) -> ResolvedTrayIcon:
+        """
+        Resolve an icon from already fetched item properties.
+
+        ``pixmap_lookup`` is only called for a pixmap property once the names
+        before it in the fallback order failed to resolve.
+        """
+        icon_name = str(lookup("IconName") or "").strip()
+        overlay_name = str(lookup("OverlayIconName") or "").strip()
+        attention_name = str(lookup("AttentionIconName") or "").strip()
 
-        icon_pixmap = self._pixmap_property(service, path, "IconPixmap")
-        overlay_pixmap = self._pixmap_property(service, path, "OverlayIconPixmap")
-        attention_pixmap = self._pixmap_property(service, path, "AttentionIconPixmap")
         # 1. Try primary name
         if icon_name:
             resolved = self._resolve_name(icon_name)
             if resolved is not None:
-                self._cache[cache_key] = resolved
                 return resolved
 
         # 2. Try primary pixmap
-        resolved = self._resolve_pixmap(icon_pixmap, source="IconPixmap")
+        resolved = self._resolve_pixmap(pixmap_lookup("IconPixmap"), source="IconPixmap")
         if resolved is not None:
-            self._cache[cache_key] = resolved
             return resolved
 
         # 3. Try attention name/pixmap
         if attention_name:
             resolved = self._resolve_name(attention_name, source_prefix="AttentionIconName")
             if resolved is not None:
-                self._cache[cache_key] = resolved
                 return resolved
 
-        resolved = self._resolve_pixmap(attention_pixmap, source="AttentionIconPixmap")
+        resolved = self._resolve_pixmap(pixmap_lookup("AttentionIconPixmap"), source="AttentionIconPixmap")
         if resolved is not None:
-            self._cache[cache_key] = resolved
             return resolved
 
         # 4. Try overlay name/pixmap
         if overlay_name:
             resolved = self._resolve_name(overlay_name, source_prefix="OverlayIconName")
             if resolved is not None:
-                self._cache[cache_key] = resolved
                 return resolved
 
-        resolved = self._resolve_pixmap(overlay_pixmap, source="OverlayIconPixmap")
+        resolved = self._resolve_pixmap(pixmap_lookup("OverlayIconPixmap"), source="OverlayIconPixmap")
         if resolved is not None:
-            self._cache[cache_key] = resolved
             return resolved
 
         # 5. Final fallback
         fallback, fallback_name = pleasant_fallback_icon()
-        resolved = ResolvedTrayIcon(
+        return ResolvedTrayIcon(
             icon=fallback,
             source="fallback",
             icon_name=fallback_name,
         )
-        self._cache[cache_key] = resolved
-        return resolved
 
     def _pixmap_property(self, service: str, path: str, name: str) -> Any:
         value = call_property(self.bus, service, path, ITEM_INTERFACE, name)
@@ -946,10 +989,71 @@ class CompletedTrayItemButton(QToolButton):
         super().mousePressEvent(event)
 
 
-class TrayDiscovery:
-    def __init__(self, bus: QDBusConnection | None = None) -> None:
+@dataclass(slots=True)
+class _TrayItemState:
+    item_id: str
+    service: str
+    path: str
+    owner: str = ""
+    properties: dict[str, Any] = field(default_factory=dict)
+    in_flight: set[str] = field(default_factory=set)
+    stale: set[str] = field(default_factory=set)
+    pixmaps: dict[str, Any] = field(default_factory=dict)
+    pixmap_request: int = 0
+    pixmaps_in_flight: bool = False
+    loaded: bool = False
+    alive: bool = False
+    dead: bool = False
+    icon_key: tuple[Any, ...] | None = None
+    resolved: ResolvedTrayIcon | None = None
+    item: CompletedTrayItem | None = None
+
+
+def property_get_message(service: str, path: str, interface: str, name: str) -> QDBusMessage:
+    message = QDBusMessage.createMethodCall(service, path, PROPERTIES_INTERFACE, "Get")
+    message.setArguments([interface, name])
+    return message
+
+
+def reply_value(reply: QDBusMessage) -> Any:
+    if reply.type() != QDBusMessage.ReplyMessage or not reply.arguments():
+        return None
+    return dbus_to_python(reply.arguments()[0])
+
+
+class TrayDiscovery(QObject):
+    """
+    StatusNotifierItem discovery.
+
+    ``get_items`` queries the watcher and every item synchronously. After
+    ``start`` the same data is kept up to date without blocking: item properties
+    are requested with asynchronous ``Properties.Get`` calls that are all in
+    flight at once, results are cached per item, and item signals (``NewIcon``,
+    ``NewTitle``, ``NewStatus``, ...) refetch only the properties they invalidate.
+    ``itemsChanged`` is emitted once per batch of updates; ``items`` returns the
+    cached snapshot.
+    """
+
+    itemsChanged = Signal()
+    _pixmapsFetched = Signal(str, int, object)
+
+    def __init__(self, bus: QDBusConnection | None = None, parent: QObject | None = None) -> None:
+        super().__init__(parent)
         self.bus = bus or QDBusConnection.sessionBus()
         self.icon_resolver = TrayIconResolver(self.bus)
+        self._states: dict[str, _TrayItemState] = {}
+        self._owners: dict[tuple[str, str], str] = {}
+        self._pending_calls: set[QDBusPendingCallWatcher] = set()
+        self._started = False
+        self._refreshing = False
+        self._refresh_again = False
+        self._service_watcher: QDBusServiceWatcher | None = None
+        self._pixmap_executor: ThreadPoolExecutor | None = None
+        self._emit_timer = QTimer(self)
+        self._emit_timer.setSingleShot(True)
+        self._emit_timer.setInterval(0)
+        self._emit_timer.timeout.connect(self.itemsChanged.emit)
+        self._pixmapsFetched.connect(self._apply_pixmaps)
 
     def get_items(self, visible_only: bool = False) -> list[CompletedTrayItem]:
         if not self.bus.isConnected():
@@ -998,6 +1102,306 @@ class TrayDiscovery:
             items.append(item)
         
         return items
+
+    def start(self) -> bool:
+        if self._started:
+            return True
+        if not self.bus.isConnected():
+            return False
+        self._started = True
+
+        for member in ITEM_SIGNAL_PROPERTIES:
+            self.bus.connect("", "", ITEM_INTERFACE, member, self, SLOT("_on_item_signal(QDBusMessage)"))
+        for interface in WATCHER_INTERFACES:
+            for member in WATCHER_SIGNALS:
+                self.bus.connect("", WATCHER_PATH, interface, member, self, SLOT("_on_watcher_signal(QDBusMessage)"))
+
+        # Built with a service up front: setConnection() on an empty watcher blocks under PySide6.
+        self._service_watcher = QDBusServiceWatcher(
+            WATCHER_SERVICES[0],
+            self.bus,
+            QDBusServiceWatcher.WatchForOwnerChange,
+            self,
+        )
+        for service in WATCHER_SERVICES[1:]:
+            self._service_watcher.addWatchedService(service)
+        self._service_watcher.serviceOwnerChanged.connect(self._on_service_owner_changed)
+
+        self.refresh()
+        return True
+
+    def stop(self) -> None:
+        if not self._started:
+            return
+        self._started = False
+        for member in ITEM_SIGNAL_PROPERTIES:
+            self.bus.disconnect("", "", ITEM_INTERFACE, member, self, SLOT("_on_item_signal(QDBusMessage)"))
+        for interface in WATCHER_INTERFACES:
+            for member in WATCHER_SIGNALS:
+                self.bus.disconnect("", WATCHER_PATH, interface, member, self, SLOT("_on_watcher_signal(QDBusMessage)"))
+        if self._service_watcher is not None:
+            self._service_watcher.deleteLater()
+            self._service_watcher = None
+        if self._pixmap_executor is not None:
+            self._pixmap_executor.shutdown(wait=False, cancel_futures=True)
+            self._pixmap_executor = None
+        self._states.clear()
+        self._owners.clear()
+        self._refreshing = False
+        self._refresh_again = False
+
+    def items(self, visible_only: bool = False) -> list[CompletedTrayItem]:
+        items: list[CompletedTrayItem] = []
+        for state in self._states.values():
+            item = state.item
+            if item is None or not state.alive or state.dead:
+                continue
+            if visible_only and not item.is_visible:
+                continue
+            items.append(item)
+        return items
+
+    def refresh(self) -> None:
+        """Re-read the watcher's item list; known items keep their cached state."""
+        if not self._started:
+            return
+        if self._refreshing:
+            self._refresh_again = True
+            return
+        self._refreshing = True
+        self._request_registered_items(0)
+
+    def _request_registered_items(self, index: int) -> None:
+        targets = [(service, interface) for service in WATCHER_SERVICES for interface in WATCHER_INTERFACES]
+        if index >= len(targets):
+            self._apply_registered_items([])
+            return
+        service, interface = targets[index]
+
+        def finished(reply: QDBusMessage) -> None:
+            value = reply_value(reply)
+            if isinstance(value, (list, tuple)):
+                self._apply_registered_items([str(item).strip() for item in value if str(item).strip()])
+            else:
+                self._request_registered_items(index + 1)
+
+        self._async_call(
+            property_get_message(service, WATCHER_PATH, interface, "RegisteredStatusNotifierItems"),
+            finished,
+        )
+
+    def _apply_registered_items(self, item_ids: list[str]) -> None:
+        if not self._started:
+            return
+        self._refreshing = False
+        wanted = list(dict.fromkeys(item_ids))
+
+        removed = [item_id for item_id in self._states if item_id not in wanted]
+        for item_id in removed:
+            self._drop(item_id)
+        if removed:
+            self._schedule_emit()
+
+        for item_id in wanted:
+            if item_id in self._states:
+                continue
+            service, path = split_item_id(item_id)
+            if not service:
+                continue
+            state = _TrayItemState(item_id=item_id, service=service, path=path)
+            self._states[item_id] = state
+            if self._service_watcher is not None:
+                self._service_watcher.addWatchedService(service)
+            self._request_owner(state)
+            self._fetch(state, ITEM_PROPERTIES)
+
+        if self._refresh_again:
+            self._refresh_again = False
+            self.refresh()
+
+    def _drop(self, item_id: str) -> None:
+        state = self._states.pop(item_id, None)
+        if state is None:
+            return
+        if self._owners.get((state.owner, state.path)) == item_id:
+            del self._owners[(state.owner, state.path)]
+        if self._service_watcher is not None and not any(
+            other.service == state.service for other in self._states.values()
+        ):
+            self._service_watcher.removeWatchedService(state.service)
+
+    def _request_owner(self, state: _TrayItemState) -> None:
+        message = QDBusMessage.createMethodCall(DBUS_SERVICE, DBUS_PATH, DBUS_SERVICE, "GetNameOwner")
+        message.setArguments([state.service])
+
+        def finished(reply: QDBusMessage) -> None:
+            if self._states.get(state.item_id) is not state:
+                return
+            owner = str(reply_value(reply) or "").strip()
+            if not owner:
+                # Registered with the watcher but gone from the bus.
+                state.dead = True
+                self._schedule_emit()
+                return
+            state.owner = owner
+            self._owners[(owner, state.path)] = state.item_id
+
+        self._async_call(message, finished)
+
+    def _fetch(self, state: _TrayItemState, names: tuple[str, ...] | list[str]) -> None:
+        for name in names:
+            if name in state.in_flight:
+                # Coalesce with the call in flight; it is repeated once it lands.
+                state.stale.add(name)
+                continue
+            state.in_flight.add(name)
+            self._async_call(
+                property_get_message(state.service, state.path, ITEM_INTERFACE, name),
+                lambda reply, name=name: self._property_fetched(state, name, reply),
+            )
+
+    def _property_fetched(self, state: _TrayItemState, name: str, reply: QDBusMessage) -> None:
+        state.in_flight.discard(name)
+        if self._states.get(state.item_id) is not state:
+            return
+        if reply.type() == QDBusMessage.ReplyMessage:
+            state.alive = True
+            state.properties[name] = reply_value(reply)
+        else:
+            state.properties.pop(name, None)
+
+        if name in state.stale:
+            state.stale.discard(name)
+            self._fetch(state, (name,))
+        if state.in_flight:
+            return
+        state.loaded = True
+        self._update_item(state)
+
+    def _update_item(self, state: _TrayItemState) -> None:
+        if not state.loaded:
+            return
+        properties = state.properties
+        icon_key = (
+            properties.get("IconName"),
+            properties.get("AttentionIconName"),
+            properties.get("OverlayIconName"),
+            state.pixmap_request,
+            len(state.pixmaps),
+        )
+        if state.resolved is None or state.icon_key != icon_key:
+            missing: list[str] = []
+
+            def pixmap_lookup(name: str) -> Any:
+                if name in state.pixmaps:
+                    return state.pixmaps[name]
+                missing.append(name)
+                return None
+
+            state.resolved = self.icon_resolver.resolve_from(properties.get, pixmap_lookup)
+            state.icon_key = icon_key
+            if missing and BUSCTL and not state.pixmaps_in_flight:
+                # PySide cannot demarshal a(iiay), so pixmaps come from busctl off the UI thread.
+                state.pixmaps_in_flight = True
+                self._pixmap_pool().submit(
+                    self._fetch_pixmaps,
+                    state.item_id,
+                    state.pixmap_request,
+                    state.service,
+                    state.path,
+                    tuple(missing),
+                )
+
+        status = str(properties.get("Status") or "Unknown").strip() or "Unknown"
+        state.item = CompletedTrayItem(
+            bus=self.bus,
+            item_id=state.item_id,
+            service=state.service,
+            path=state.path,
+            menu_path=str(properties.get("Menu") or "").strip(),
+            item_is_menu=to_bool(properties.get("ItemIsMenu"), default=False),
+            title=best_text_from(properties.get, state.service, state.path),
+            status=status,
+            icon_name=state.resolved.icon_name,
+            icon=state.resolved.icon,
+        )
+        self._schedule_emit()
+
+    def _pixmap_pool(self) -> ThreadPoolExecutor:
+        if self._pixmap_executor is None:
+            self._pixmap_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pytpo-tray-pixmap")
+        return self._pixmap_executor
+
+    def _fetch_pixmaps(self, item_id: str, request: int, service: str, path: str, names: tuple[str, ...]) -> None:
+        values = {name: call_property_via_busctl(service, path, ITEM_INTERFACE, name) for name in names}
+        self._pixmapsFetched.emit(item_id, request, values)
+
+    @Slot(str, int, object)
+    def _apply_pixmaps(self, item_id: str, request: int, values: dict[str, Any]) -> None:
+        state = self._states.get(item_id)
+        if state is None:
+            return
+        state.pixmaps_in_flight = False
+        if request != state.pixmap_request:
+            self._update_item(state)
+            return
+        state.pixmaps.update(values)
+        self._update_item(state)
+
+    def _schedule_emit(self) -> None:
+        if not self._emit_timer.isActive():
+            self._emit_timer.start()
+
+    def _async_call(self, message: QDBusMessage, callback: Callable[[QDBusMessage], None]) -> None:
+        watcher = QDBusPendingCallWatcher(self.bus.asyncCall(message), self)
+        self._pending_calls.add(watcher)
+
+        def finished(_watcher: QDBusPendingCallWatcher) -> None:
+            self._pending_calls.discard(watcher)
+            watcher.deleteLater()
+            callback(watcher.reply())
+
+        watcher.finished.connect(finished)
+
+    @Slot(QDBusMessage)
+    def _on_item_signal(self, message: QDBusMessage) -> None:
+        item_id = self._owners.get((message.service(), message.path()))
+        state = self._states.get(item_id or "")
+        if state is None:
+            return
+        member = message.member()
+        arguments = message.arguments()
+        if member == "NewStatus" and arguments:
+            # The new status travels with the signal; no round trip needed.
+            state.properties["Status"] = str(dbus_to_python(arguments[0]) or "")
+            self._update_item(state)
+            return
+
+        names = ITEM_SIGNAL_PROPERTIES.get(member, ())
+        invalidated = [name for name in names if name in PIXMAP_PROPERTIES]
+        if invalidated:
+            for name in invalidated:
+                state.pixmaps.pop(name, None)
+            state.pixmap_request += 1
+        properties = [name for name in names if name not in PIXMAP_PROPERTIES]
+        if properties:
+            self._fetch(state, properties)
+        else:
+            self._update_item(state)
+
+    @Slot(QDBusMessage)
+    def _on_watcher_signal(self, _message: QDBusMessage) -> None:
+        self.refresh()
+
+    def _on_service_owner_changed(self, service: str, _old_owner: str, _new_owner: str) -> None:
+        if service not in WATCHER_SERVICES:
+            # The item's process restarted or exited; its cached state is no longer valid.
+            for item_id in [item_id for item_id, state in self._states.items() if state.service == service]:
+                self._drop(item_id)
+            self._schedule_emit()
+        self.refresh()
+
+
 if __name__ == "__main__":
     import sys
 
@@ -1022,15 +1426,23 @@ if __name__ == "__main__":
     root.addLayout(row)
 
     discovery = TrayDiscovery()
-    items = discovery.get_items(visible_only=True)
-
-    if not items:
-        row.addWidget(QLabel("No tray items found"))
-    else:
-        for item in items:
-            row.addWidget(item.create_button(window))
 
-    row.addStretch(1)
+    def rebuild_row() -> None:
+        while row.count():
+            child = row.takeAt(0).widget()
+            if child is not None:
+                child.deleteLater()
+        items = discovery.items(visible_only=True)
+        if not items:
+            row.addWidget(QLabel("No tray items found"))
+        else:
+            for item in items:
+                row.addWidget(item.create_button(window))
+        row.addStretch(1)
+
+    discovery.itemsChanged.connect(rebuild_row)
+    rebuild_row()
+    discovery.start()
 
     window.show()
     raise SystemExit(app.exec())
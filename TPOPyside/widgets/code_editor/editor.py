@@ -328,6 +328,8 @@ class CodeEditor(QPlainTextEdit):
         self._inline_suggestion_text = ""
         self._inline_suggestion_anchor_pos = -1
         self._inline_suggestion_anchor_revision = -1
+        # (remaining text, expected cursor position, expected character count) while typing through ghost text.
+        self._inline_type_through: tuple[str, int, int] | None = None
         self._completion_ui_cfg = dict(_COMPLETION_UI_DEFAULTS)
         self._hover_signature_cache: OrderedDict[tuple[str, str, int], str] = OrderedDict()
         self._hover_signature_futures: dict[tuple[str, str, int], concurrent.futures.Future] = {}
@@ -3182,7 +3184,41 @@ class CodeEditor(QPlainTextEdit):
             text = text[overlap:]
         return text
 
+    def _note_inline_type_through(self, key: int, text: str) -> None:
+        self._inline_type_through = None
+        suggestion = self._inline_suggestion_text
+        typed = str(text or "")
+        if key in {Qt.Key_Return, Qt.Key_Enter, Qt.Key_Backspace, Qt.Key_Delete} or not typed.isprintable():
+            return
+        if self.textCursor().hasSelection() or len(typed) >= len(suggestion) or not suggestion.startswith(typed):
+            return
+        self._inline_type_through = (
+            suggestion[len(typed):],
+            int(self._inline_suggestion_anchor_pos) + len(typed),
+            int(self.document().characterCount()) + len(typed),
+        )
+
+    def _resume_inline_type_through(self) -> bool:
+        pending = self._inline_type_through
+        self._inline_type_through = None
+        if pending is None or self._inline_suggestion_text:
+            return False
+        remaining, expected_pos, expected_chars = pending
+        cursor = self.textCursor()
+        # Auto-pairing or auto-indent change the character count; fall back to a fresh request then.
+        if cursor.hasSelection() or int(cursor.position()) != expected_pos:
+            return False
+        if int(self.document().characterCount()) != expected_chars or not remaining.strip():
+            return False
+        self._inline_suggestion_text = remaining
+        self._inline_suggestion_anchor_pos = expected_pos
+        self._inline_suggestion_anchor_revision = int(self.document().revision())
+        self.viewport().update()
+        return True
+
     def _on_cursor_moved_inline_suggestion(self) -> None:
+        if self._inline_type_through is not None and self._resume_inline_type_through():
+            return
         if not self._inline_suggestion_text:
             return
         if int(self.textCursor().position()) != int(self._inline_suggestion_anchor_pos):
@@ -4558,6 +4594,7 @@ class CodeEditor(QPlainTextEdit):
                 Qt.Key_Return,
                 Qt.Key_Enter,
             } or (text and not (mods & (Qt.ControlModifier | Qt.AltModifier | Qt.MetaModifier))):
+                self._note_inline_type_through(key, text)
                 self.clear_inline_suggestion()
 
         if self.is_completion_popup_visible():
@@ -0,0 +1,254 @@
+"""Block-level markdown rendering with a source-keyed HTML cache.
+
+``MarkdownViewerWidget`` re-renders on every debounced edit; converting (and pygments
+highlighting) the whole document each time dominates live preview of long files. The
+renderer here splits a document into top-level blocks, converts each distinct block once,
+and reports which blocks changed so the page can be patched instead of replaced.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import re
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import markdown
+
+_FENCE_RE = re.compile(r"^\s{0,3}(`{3,}|~{3,})")
+_LIST_ITEM_RE = re.compile(r"^\s{0,3}(?:[-*+]|\d+[.)])\s+\S")
+_IDCOUNT_RE = re.compile(r"^(.*)_([0-9]+)$")
+# Constructs that resolve across blocks; documents using them render as one block.
+_WHOLE_DOCUMENT_RE = re.compile(
+    r"^\s{0,3}(?:\[[^\]]+\]:\s|\[TOC\]\s*$|<(?!!--)[A-Za-z])",
+    re.MULTILINE,
+)
+
+
+def create_preview_parser() -> markdown.Markdown:
+    """The markdown pipeline used by the viewer (toc, admonitions, math, highlighted fences)."""
+    return markdown.Markdown(
+        extensions=[
+            "tables",
+            "toc",
+            "admonition",
+            "pymdownx.details",
+            "pymdownx.arithmatex",
+            "pymdownx.superfences",
+            "pymdownx.highlight",
+        ],
+        extension_configs={
+            "toc": {"title": "Table of Contents", "permalink": False},
+            "pymdownx.arithmatex": {"generic": True},
+            "pymdownx.superfences": {
+                "custom_fences": [{
+                    "name": "mermaid",
+                    "class": "mermaid",
+                    "format": lambda src, *a, **k: f'<pre class="mermaid">{src}</pre>'
+                }]
+            },
+            "pymdownx.highlight": {"linenums": True, "css_class": "codehilite", "guess_lang": False},
+        },
+    )
+
+
+def _continues_previous_block(line: str, previous_content: str, in_quote: bool) -> bool:
+    # Markdown joins list items and blockquotes across blank lines.
+    if _LIST_ITEM_RE.match(line):
+        return bool(_LIST_ITEM_RE.match(previous_content)) or previous_content[:1].isspace()
+    return in_quote and line.lstrip().startswith(">")
+
+
+def split_markdown_blocks(text: str) -> list[str]:
+    """Split ``text`` at blank lines that begin a new, independently renderable block.
+
+    Fenced code and ``$$`` math stay whole, and indented lines, further list items or quote
+    lines after a blank line stay with the block above (list bodies, admonitions, details).
+    """
+    source = str(text or "").replace("\r\n", "\n").replace("\r", "\n")
+    if _WHOLE_DOCUMENT_RE.search(source):
+        return [source]
+    blocks: list[str] = []
+    current: list[str] = []
+    fence = ""
+    in_math = False
+    in_quote = False
+    previous_blank = False
+    previous_content = ""
+    for line in source.split("\n"):
+        stripped = line.strip()
+        if (
+            current
+            and previous_blank
+            and stripped
+            and not fence
+            and not in_math
+            and not line[0].isspace()
+            and not _continues_previous_block(line, previous_content, in_quote)
+        ):
+            blocks.append("\n".join(current))
+            current = []
+        current.append(line)
+        match = _FENCE_RE.match(line)
+        if fence:
+            if (
+                match is not None
+                and match.group(1)[0] == fence[0]
+                and len(match.group(1)) >= len(fence)
+                and not stripped[len(match.group(1)) :].strip()
+            ):
+                fence = ""
+        elif match is not None:
+            fence = match.group(1)
+        elif stripped.startswith("$$") and stripped.count("$$") % 2 == 1:
+            in_math = not in_math
+        if stripped:
+            # Lazy continuation lines keep a quote open until a blank line ends the paragraph.
+            in_quote = stripped.startswith(">") or (in_quote and not previous_blank)
+            previous_content = line
+        previous_blank = not stripped
+    blocks.append("\n".join(current))
+    return blocks
+
+
+def _unique_id(candidate: str, used: set[str]) -> str:
+    # Same suffixing as markdown.extensions.toc.unique().
+    while candidate in used or not candidate:
+        match = _IDCOUNT_RE.match(candidate)
+        if match:
+            candidate = f"{match.group(1)}_{int(match.group(2)) + 1}"
+        else:
+            candidate = f"{candidate}_1"
+    return candidate
+
+
+def _flatten_toc(tokens: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    flat: list[dict[str, Any]] = []
+    for token in tokens or []:
+        item = dict(token)
+        children = item.pop("children", None) or []
+        item["children"] = []
+        flat.append(item)
+        flat.extend(_flatten_toc(children))
+    return flat
+
+
+@dataclass(frozen=True, slots=True)
+class RenderedBlock:
+    key: str
+    html: str
+
+
+@dataclass(slots=True)
+class MarkdownRender:
+    blocks: list[RenderedBlock]
+    toc_tokens: list[dict[str, Any]] = field(default_factory=list)
+    converted: int = 0
+
+    @property
+    def html(self) -> str:
+        return "\n".join(block.html for block in self.blocks)
+
+
+@dataclass(frozen=True, slots=True)
+class BlockPatch:
+    """Keep ``keep_prefix`` page blocks, drop the next ``remove_count``, insert ``insert`` there."""
+
+    keep_prefix: int
+    remove_count: int
+    insert: list[RenderedBlock]
+
+    @property
+    def empty(self) -> bool:
+        return self.remove_count == 0 and not self.insert
+
+
+def diff_blocks(old_keys: list[str], new_blocks: list[RenderedBlock]) -> BlockPatch:
+    """Smallest prefix/suffix-preserving patch turning ``old_keys`` into ``new_blocks``."""
+    new_keys = [block.key for block in new_blocks]
+    limit = min(len(old_keys), len(new_keys))
+    prefix = 0
+    while prefix < limit and old_keys[prefix] == new_keys[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < limit - prefix
+        and old_keys[len(old_keys) - 1 - suffix] == new_keys[len(new_keys) - 1 - suffix]
+    ):
+        suffix += 1
+    return BlockPatch(
+        keep_prefix=prefix,
+        remove_count=len(old_keys) - prefix - suffix,
+        insert=list(new_blocks[prefix : len(new_blocks) - suffix]),
+    )
+
+
+class MarkdownBlockRenderer:
+    """Render markdown block by block, converting each distinct block source once.
+
+    ``make_parser`` builds the configured ``markdown.Markdown`` instance; it is created once
+    and ``reset()`` between blocks. Heading ids are de-duplicated across blocks the same way
+    the toc extension does within a single document.
+    """
+
+    def __init__(
+        self,
+        make_parser: Callable[[], markdown.Markdown] = create_preview_parser,
+        *,
+        max_entries: int = 4096,
+    ) -> None:
+        self._make_parser = make_parser
+        self._parser: markdown.Markdown | None = None
+        self._max_entries = max(16, int(max_entries))
+        self._cache: OrderedDict[bytes, tuple[str, list[dict[str, Any]]]] = OrderedDict()
+        self.conversions = 0
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def render(self, text: str) -> MarkdownRender:
+        blocks: list[RenderedBlock] = []
+        toc_tokens: list[dict[str, Any]] = []
+        used_ids: set[str] = set()
+        converted = 0
+        for source in split_markdown_blocks(text):
+            if not source.strip():
+                continue
+            cached, was_converted = self._convert(source)
+            converted += int(was_converted)
+            block_html, block_toc = cached
+            for token in block_toc:
+                token = dict(token)
+                original = str(token.get("id", "") or "")
+                unique = _unique_id(original, used_ids)
+                if unique != original:
+                    block_html = block_html.replace(f'id="{original}"', f'id="{unique}"', 1)
+                    token["id"] = unique
+                used_ids.add(unique)
+                toc_tokens.append(token)
+            key = hashlib.blake2b(block_html.encode("utf-8"), digest_size=12).hexdigest()
+            blocks.append(RenderedBlock(key=key, html=block_html))
+        return MarkdownRender(blocks=blocks, toc_tokens=toc_tokens, converted=converted)
+
+    def _convert(self, source: str) -> tuple[tuple[str, list[dict[str, Any]]], bool]:
+        digest = hashlib.blake2b(source.encode("utf-8"), digest_size=16).digest()
+        cached = self._cache.get(digest)
+        if cached is not None:
+            self._cache.move_to_end(digest)
+            return cached, False
+        parser = self._parser
+        if parser is None:
+            parser = self._parser = self._make_parser()
+        else:
+            parser.reset()
+        block_html = parser.convert(source)
+        toc = _flatten_toc(copy.deepcopy(getattr(parser, "toc_tokens", []) or []))
+        self.conversions += 1
+        entry = (block_html, toc)
+        self._cache[digest] = entry
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
+        return entry, True
@@ -3,7 +3,6 @@ from __future__ import annotations
 
 import enum
 import json
-import markdown
 import re
 from pathlib import Path
 from typing import Optional
@@ -16,6 +15,12 @@ from PySide6.QtWebEngineCore import QWebEngineSettings, QWebEnginePage
 from PySide6.QtWebEngineWidgets import QWebEngineView
 
 from TPOPyside.dialogs.reusable_file_dialog import FileDialog
+from TPOPyside.widgets.markdown_render_cache import (
+    MarkdownBlockRenderer,
+    MarkdownRender,
+    create_preview_parser,
+    diff_blocks,
+)
 
 
 # ---- JS bridge for copy buttons ----
@@ -81,8 +86,14 @@ class MarkdownViewerWidget(QWidget):
         self._pending_anchor: str = ""
         self._shell_ready: bool = False
         self._shell_loading: bool = False
-        self._pending_md_html: str = ""
+        self._pending_render: MarkdownRender | None = None
         self._pending_base_url: QUrl = QUrl()
+        # Rendered blocks currently in the page, patched by element id on later renders.
+        self._block_renderer = MarkdownBlockRenderer(create_preview_parser)
+        self._page_block_keys: list[str] = []
+        self._page_block_ids: list[str] = []
+        self._page_base_href: str | None = None
+        self._next_block_id: int = 0
         self._pending_scroll_ratio: float | None = None
         self._pending_scroll_smooth: bool = False
         self._preferred_page_bg: str = ""
@@ -382,45 +393,26 @@ class MarkdownViewerWidget(QWidget):
         return tb
 
     # ---------- rendering ----------
+    # Patching more than this share of the page's blocks falls back to replacing it.
+    _FULL_RENDER_CHANGE_RATIO = 0.6
+
     def setMarkdown(self, text: str, base_url: QUrl | None = None):
         self.raw_markdown_text = text or ""
         base_url = self._normalize_base_url(base_url)
 
-        md = markdown.Markdown(
-            extensions=[
-                "tables",
-                "toc",
-                "admonition",
-                "pymdownx.details",
-                "pymdownx.arithmatex",
-                "pymdownx.superfences",
-                "pymdownx.highlight",
-            ],
-            extension_configs={
-                "toc": {"title": "Table of Contents", "permalink": False},
-                "pymdownx.arithmatex": {"generic": True},
-                "pymdownx.superfences": {
-                    "custom_fences": [{
-                        "name": "mermaid",
-                        "class": "mermaid",
-                        "format": lambda src, *a, **k: f'<pre class="mermaid">{src}</pre>'
-                    }]
-                },
-                "pymdownx.highlight": {"linenums": True, "css_class": "codehilite", "guess_lang": False},
-            },
-        )
-        md_html = md.convert(self.raw_markdown_text)
+        # Unchanged blocks come from the render cache; only edited ones are converted again.
+        rendered = self._block_renderer.render(self.raw_markdown_text)
 
         # Build native TOC from markdown library tokens
         self._toc_items.clear()
         try:
-            for item in getattr(md, "toc_tokens", []) or []:
+            for item in rendered.toc_tokens:
                 self._collect_toc_tokens(item, level=1)
         except Exception:
             self._toc_items.clear()
 
         self._rebuild_toc_widget()
-        self._queue_markdown_html_render(md_html, base_url=base_url)
+        self._queue_markdown_render(rendered, base_url=base_url)
         self._last_query, self._hit_count, self._hit_index = "", 0, -1
         self._pending_search = False
         self.searchResultsChanged.emit("", 0)
@@ -435,8 +427,8 @@ class MarkdownViewerWidget(QWidget):
                 return QUrl(text + "/")
         return QUrl(base_url)
 
-    def _queue_markdown_html_render(self, md_html: str, *, base_url: QUrl) -> None:
-        self._pending_md_html = str(md_html or "")
+    def _queue_markdown_render(self, rendered: MarkdownRender, *, base_url: QUrl) -> None:
+        self._pending_render = rendered
         self._pending_base_url = self._normalize_base_url(base_url)
         if not self._shell_ready:
             self._ensure_shell_loaded(self._pending_base_url)
@@ -447,27 +439,63 @@ class MarkdownViewerWidget(QWidget):
         if self._shell_ready or self._shell_loading:
             return
         self._shell_loading = True
+        self._page_block_keys = []
+        self._page_block_ids = []
+        self._page_base_href = None
         self.web_view.setHtml(self._shell_document_html(), baseUrl=self._normalize_base_url(base_url))
 
     def _render_pending_markdown_payload(self) -> None:
-        if not self._shell_ready:
+        if not self._shell_ready or self._pending_render is None:
             return
-        md_html = str(self._pending_md_html or "")
+        rendered = self._pending_render
         base_href = self._normalize_base_url(self._pending_base_url).toString()
-        self._pending_md_html = ""
+        self._pending_render = None
         self._pending_base_url = QUrl()
 
-        js = (
-            f"MV_setBaseHref({json.dumps(base_href)});"
-            f"MV_setMarkdownHtml({json.dumps(md_html)});"
-        )
-        self.web_view.page().runJavaScript(js)
+        js = self._markdown_page_update_js(rendered, base_href)
+        if js:
+            self.web_view.page().runJavaScript(js)
         if self._pending_anchor:
             anchor = self._pending_anchor
             self._pending_anchor = ""
             self.web_view.page().runJavaScript(f"MV_scrollToAnchor({self._repr_js(anchor)});")
         self._schedule_pending_scroll_apply()
 
+    def _markdown_page_update_js(self, rendered: MarkdownRender, base_href: str) -> str:
+        """Script that brings the page to ``rendered``: a block patch when possible, else a full swap."""
+        new_keys = [block.key for block in rendered.blocks]
+        patch = diff_blocks(self._page_block_keys, rendered.blocks)
+        if base_href == self._page_base_href and self._page_block_ids:
+            if patch.empty:
+                return ""
+            changed = max(patch.remove_count, len(patch.insert))
+            if changed <= max(1, len(new_keys)) * self._FULL_RENDER_CHANGE_RATIO:
+                kept_before = self._page_block_ids[: patch.keep_prefix]
+                removed = self._page_block_ids[patch.keep_prefix : patch.keep_prefix + patch.remove_count]
+                kept_after = self._page_block_ids[patch.keep_prefix + patch.remove_count :]
+                inserts = [(self._new_block_id(), block.html) for block in patch.insert]
+                self._page_block_ids = kept_before + [block_id for block_id, _html in inserts] + kept_after
+                self._page_block_keys = new_keys
+                after_id = kept_before[-1] if kept_before else None
+                return f"MV_patchBlocks({json.dumps(removed)}, {json.dumps(after_id)}, {json.dumps(inserts)});"
+
+        ids = [self._new_block_id() for _block in rendered.blocks]
+        self._page_block_ids = ids
+        self._page_block_keys = new_keys
+        self._page_base_href = base_href
+        md_html = "\n".join(
+            f'<div class="mv-block" id="{block_id}">{block.html}</div>'
+            for block_id, block in zip(ids, rendered.blocks)
+        )
+        return (
+            f"MV_setBaseHref({json.dumps(base_href)});"
+            f"MV_setMarkdownHtml({json.dumps(md_html)});"
+        )
+
+    def _new_block_id(self) -> str:
+        self._next_block_id += 1
+        return f"mvb-{self._next_block_id}"
+
     def _shell_document_html(self) -> str:
         return f"""<!DOCTYPE html>
 <html>
@@ -579,6 +607,58 @@ window.MV_setMarkdownHtml = function(html) {
   return true;
 }
 
+// Replace only the changed top-level blocks; the first block still on screen keeps its position.
+window.MV_patchBlocks = function(removeIds, afterId, inserts) {
+  const root = document.getElementById('md-root');
+  if (!root) return false;
+  if (window.MV_clearMarks) MV_clearMarks();
+  const removed = new Set(removeIds || []);
+  let anchor = null;
+  let anchorTop = 0;
+  // Blocks use display: contents, so measure through their first and last children.
+  const edges = (block) => {
+    const first = block.firstElementChild;
+    const last = block.lastElementChild;
+    if (!first || !last) return null;
+    return { top: first.getBoundingClientRect().top, bottom: last.getBoundingClientRect().bottom };
+  };
+  for (const block of root.children) {
+    if (removed.has(block.id)) continue;
+    const rect = edges(block);
+    if (rect && rect.bottom > 0) { anchor = block; anchorTop = rect.top; break; }
+  }
+  (removeIds || []).forEach((id) => {
+    const el = document.getElementById(id);
+    if (el && el.parentNode === root) root.removeChild(el);
+  });
+  let ref = afterId ? document.getElementById(afterId) : null;
+  const added = [];
+  (inserts || []).forEach(([id, html]) => {
+    const el = document.createElement('div');
+    el.className = 'mv-block';
+    el.id = id;
+    el.innerHTML = html || '';
+    if (ref && ref.parentNode === root) root.insertBefore(el, ref.nextSibling);
+    else root.insertBefore(el, root.firstChild);
+    ref = el;
+    added.push(el);
+  });
+  added.forEach((el) => {
+    setupCodeBlocks(el);
+    renderArithmatexWithKaTeX(el);
+  });
+  if (added.some((el) => el.querySelector('pre.mermaid'))) {
+    try { mermaid.run({ nodes: added.flatMap((el) => Array.from(el.querySelectorAll('pre.mermaid'))) }); }
+    catch (e) { console.error('Mermaid error', e); }
+  }
+  const anchorRect = (anchor && anchor.isConnected) ? edges(anchor) : null;
+  if (anchorRect) {
+    const delta = anchorRect.top - anchorTop;
+    if (delta) window.scrollBy(0, delta);
+  }
+  return true;
+}
+
 // Scroll to heading id (used by native Qt TOC)
 window.MV_scrollToAnchor = function(anchor) {
   if (!anchor) return false;
@@ -992,6 +1072,8 @@ window.MV_scrollToRatio = function(ratio, smooth) {
   --font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
   --font-size: 12pt;
 }
+.mv-block { display: contents; }
+html { overflow-anchor: none; }
 body {
   margin: 0;
   background: var(--page-bg);
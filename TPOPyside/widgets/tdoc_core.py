@@ -1291,51 +1291,93 @@ class TDocProjectIndex:
             if content is None:
                 continue
 
-            metadata, body_lines, body_start_line, fm_issues = parse_doc_frontmatter(content)
-            doc_metadata[rel_path] = metadata
-            for issue in fm_issues:
-                frontmatter_issues.append(
-                    {"file": rel_path, "line": issue["line"], "message": issue["message"]}
-                )
+            metadata, fm_issues, index_enabled, links = TDocProjectIndex.scan_document_links(content)
+            TDocProjectIndex.accumulate_document_references(
+                rel_path,
+                metadata,
+                fm_issues,
+                index_enabled,
+                links,
+                alias_to_symbol,
+                symbol_refs,
+                unresolved_refs,
+                doc_metadata,
+                frontmatter_issues,
+            )
 
-            if not is_index_enabled(metadata):
-                continue
+        return symbol_refs, unresolved_refs, doc_metadata, frontmatter_issues
 
-            for offset, line in enumerate(body_lines):
-                line_no = body_start_line + offset
-                rendered_col = 0
-                last_raw_pos = 0
-                for match in LINK_PATTERN.finditer(line):
-                    pre_text = line[last_raw_pos:match.start()]
-                    if pre_text:
-                        rendered_col += len(pre_text)
-                    raw = match.group("label")
-                    label = link_effective_target(raw)
-                    shown = link_display_text(raw)
-                    if not shown:
-                        shown = match.group(0)
-                    if not label:
-                        rendered_col += len(shown)
-                        last_raw_pos = match.end()
-                        continue
+    @staticmethod
+    def scan_document_links(content):
+        """Parse one document into ``(metadata, frontmatter_issues, index_enabled, links)``.
 
-                    # [foo.tdoc] and [foo.tdoc#L42] are file links, not symbols.
-                    file_path, _ = parse_file_link(label)
-                    start_col = int(rendered_col + 1)
-                    end_col = int(rendered_col + len(shown) + 1)
+        ``links`` holds ``(label, line, start_col, end_col)`` for every symbol link
+        (file links are skipped). Labels are left unresolved so the result stays
+        valid when only the project aliases change.
+        """
+        metadata, body_lines, body_start_line, fm_issues = parse_doc_frontmatter(content)
+        index_enabled = is_index_enabled(metadata)
+        links = []
+        if not index_enabled:
+            return metadata, fm_issues, index_enabled, links
+
+        for offset, line in enumerate(body_lines):
+            line_no = body_start_line + offset
+            rendered_col = 0
+            last_raw_pos = 0
+            for match in LINK_PATTERN.finditer(line):
+                pre_text = line[last_raw_pos:match.start()]
+                if pre_text:
+                    rendered_col += len(pre_text)
+                raw = match.group("label")
+                label = link_effective_target(raw)
+                shown = link_display_text(raw)
+                if not shown:
+                    shown = match.group(0)
+                if not label:
                     rendered_col += len(shown)
                     last_raw_pos = match.end()
-                    if file_path:
-                        continue
+                    continue
 
-                    symbol = alias_to_symbol.get(label.casefold())
-                    ref = (rel_path, line_no, start_col, end_col)
-                    if symbol:
-                        symbol_refs[symbol].add(ref)
-                    else:
-                        unresolved_refs[label].add(ref)
+                # [foo.tdoc] and [foo.tdoc#L42] are file links, not symbols.
+                file_path, _ = parse_file_link(label)
+                start_col = int(rendered_col + 1)
+                end_col = int(rendered_col + len(shown) + 1)
+                rendered_col += len(shown)
+                last_raw_pos = match.end()
+                if file_path:
+                    continue
+                links.append((label, line_no, start_col, end_col))
+        return metadata, fm_issues, index_enabled, links
 
-        return symbol_refs, unresolved_refs, doc_metadata, frontmatter_issues
+    @staticmethod
+    def accumulate_document_references(
+        rel_path,
+        metadata,
+        fm_issues,
+        index_enabled,
+        links,
+        alias_to_symbol,
+        symbol_refs,
+        unresolved_refs,
+        doc_metadata,
+        frontmatter_issues,
+    ):
+        """Merge one scanned document into the reference maps of ``collect_symbol_references``."""
+        doc_metadata[rel_path] = metadata
+        for issue in fm_issues:
+            frontmatter_issues.append(
+                {"file": rel_path, "line": issue["line"], "message": issue["message"]}
+            )
+        if not index_enabled:
+            return
+        for label, line_no, start_col, end_col in links:
+            symbol = alias_to_symbol.get(label.casefold())
+            ref = (rel_path, line_no, start_col, end_col)
+            if symbol:
+                symbol_refs[symbol].add(ref)
+            else:
+                unresolved_refs[label].add(ref)
 
     @staticmethod
     def normalize_symbol_in_documents(root_path, alias_to_symbol, canonical_symbol):
@@ -1395,7 +1437,13 @@ class TDocProjectIndex:
         return touched_files, replacements
 
     @staticmethod
-    def validate_project(root_path, content_overrides=None, doc_rel_paths=None):
+    def validate_project(root_path, content_overrides=None, doc_rel_paths=None, *, aliases=None, references=None):
+        """Validate the marker file and documents of a TDOC project.
+
+        ``aliases`` (the ``load_aliases`` tuple) and ``references`` (the
+        ``collect_symbol_references`` tuple for the same ``doc_rel_paths``) may be
+        supplied by a caller that already holds them, e.g. an in-memory index.
+        """
         findings = []
         marker = TDocProjectIndex.marker_path(root_path)
         normalized_overrides = TDocProjectIndex._normalize_content_overrides(content_overrides)
@@ -1609,7 +1657,7 @@ class TDocProjectIndex:
             include_patterns_loaded,
             ignore_patterns_loaded,
             _,
-        ) = TDocProjectIndex.load_aliases(root_path)
+        ) = aliases if aliases is not None else TDocProjectIndex.load_aliases(root_path)
         effective_includes = include_patterns_loaded or include_patterns
         effective_ignores = ignore_patterns_loaded or ignore_patterns
         frontmatter_schema, schema_issues = TDocProjectIndex.load_frontmatter_schema(
@@ -1625,14 +1673,16 @@ class TDocProjectIndex:
                     "file": str(issue.get("file") or "").strip() or None,
                 }
             )
-        _, unresolved_refs, _, frontmatter_issues = TDocProjectIndex.collect_symbol_references(
-            root_path,
-            alias_to_symbol,
-            effective_includes,
-            effective_ignores,
-            content_overrides=normalized_overrides,
-            rel_path_filter=rel_filter,
-        )
+        if references is None:
+            references = TDocProjectIndex.collect_symbol_references(
+                root_path,
+                alias_to_symbol,
+                effective_includes,
+                effective_ignores,
+                content_overrides=normalized_overrides,
+                rel_path_filter=rel_filter,
+            )
+        _, unresolved_refs, _, frontmatter_issues = references
         for issue in frontmatter_issues:
             findings.append(
                 {
@@ -1892,11 +1942,12 @@ class TDocProjectIndex:
         return rows
 
     @staticmethod
-    def build_index(root_path):
+    def build_index(root_path, *, aliases=None, references=None):
         """Generates index.tdoc at project root if .tdocproject marker exists.
 
         Managed index content is stored under a dashed separator line so
-        users can keep comments/notes above it.
+        users can keep comments/notes above it. ``aliases`` and ``references``
+        may be passed in to reuse already parsed project data.
         """
         root = Path(root_path)
         if not TDocProjectIndex.has_project_marker(root):
@@ -1909,10 +1960,12 @@ class TDocProjectIndex:
             include_patterns,
             ignore_patterns,
             symbol_to_metadata,
-        ) = TDocProjectIndex.load_aliases(root)
-        symbol_refs, unresolved_refs, doc_metadata, frontmatter_issues = TDocProjectIndex.collect_symbol_references(
-            root, alias_to_symbol, include_patterns, ignore_patterns
-        )
+        ) = aliases if aliases is not None else TDocProjectIndex.load_aliases(root)
+        if references is None:
+            references = TDocProjectIndex.collect_symbol_references(
+                root, alias_to_symbol, include_patterns, ignore_patterns
+            )
+        symbol_refs, unresolved_refs, doc_metadata, frontmatter_issues = references
         marker_lines = []
         marker_path = TDocProjectIndex.marker_path(root)
         try:
@@ -4,9 +4,11 @@ import html
 import os
 import re
 import uuid
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Callable
 
+from PySide6.QtCore import QCoreApplication, QTimer
 from PySide6.QtGui import QColor, QPalette, QTextCursor
 
 from TPOPyside.widgets.tdoc_core import (
@@ -96,6 +98,128 @@ def resolve_tdoc_root_for_path(file_path: str | None, *, project_root: str | Non
     return str(Path.cwd())
 
 
+def _stat_signature(path: Path | None) -> tuple[int, int] | None:
+    if path is None:
+        return None
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return int(stat.st_mtime_ns), int(stat.st_size)
+
+
+@dataclass(frozen=True)
+class TDocProjectContext:
+    """Aliases and frontmatter schema of one TDOC root; shared, treat as read-only."""
+
+    root: str
+    alias_to_symbol: dict[str, str] = field(default_factory=dict)
+    symbol_to_aliases: dict[str, list[str]] = field(default_factory=dict)
+    symbol_to_section: dict[str, str] = field(default_factory=dict)
+    symbol_to_metadata: dict[str, dict[str, str]] = field(default_factory=dict)
+    frontmatter_schema: dict[str, object] = field(default_factory=dict)
+    frontmatter_schema_issues: list[dict] = field(default_factory=list)
+    schema_path: Path | None = None
+    signature: tuple = ()
+
+
+class TDocProjectContextCache:
+    """Project contexts keyed by TDOC root, shared by every open TDOC editor.
+
+    A context is re-validated by stat'ing the marker and schema files, and at
+    most once per event-loop turn per root, so resolving hundreds of links while
+    painting a document costs a dictionary lookup each.
+    """
+
+    def __init__(self) -> None:
+        self._contexts: dict[str, TDocProjectContext] = {}
+        self._checked_this_turn: set[str] = set()
+        self._turn_reset_pending = False
+        self.loads = 0
+
+    def get(self, root: str) -> TDocProjectContext:
+        key = str(root or "")
+        cached = self._contexts.get(key)
+        if cached is not None and key in self._checked_this_turn:
+            return cached
+        if cached is not None and self._signature(key, cached.schema_path) == cached.signature:
+            self._mark_checked(key)
+            return cached
+        context = self._load(key)
+        self._contexts[key] = context
+        self._mark_checked(key)
+        return context
+
+    def invalidate(self, root: str | None = None) -> None:
+        if root is None:
+            self._contexts.clear()
+            self._checked_this_turn.clear()
+            return
+        key = str(root or "")
+        self._contexts.pop(key, None)
+        self._checked_this_turn.discard(key)
+
+    def _mark_checked(self, key: str) -> None:
+        if QCoreApplication.instance() is None:
+            # Without an event loop there is no "turn" to batch on; always re-check.
+            return
+        self._checked_this_turn.add(key)
+        if not self._turn_reset_pending:
+            self._turn_reset_pending = True
+            QTimer.singleShot(0, self._reset_turn)
+
+    def _reset_turn(self) -> None:
+        self._turn_reset_pending = False
+        self._checked_this_turn.clear()
+
+    @staticmethod
+    def _signature(root: str, schema_path: Path | None) -> tuple:
+        return (
+            _stat_signature(TDocProjectIndex.marker_path(root)),
+            _stat_signature(schema_path),
+        )
+
+    @staticmethod
+    def _schema_path(root: str) -> Path | None:
+        try:
+            lines = TDocProjectIndex.marker_path(root).read_text(encoding="utf-8").splitlines()
+        except Exception:
+            return None
+        schema_rel, _line, _issues = TDocProjectIndex._frontmatter_schema_config_from_lines(lines)
+        text = str(schema_rel or "").strip()
+        if not text:
+            return None
+        candidate = Path(text).expanduser()
+        return candidate if candidate.is_absolute() else Path(root) / candidate
+
+    def _load(self, root: str) -> TDocProjectContext:
+        self.loads += 1
+        schema_path = self._schema_path(root)
+        signature = self._signature(root, schema_path)
+        aliases, symbol_to_aliases, symbol_to_section, _inc, _ign, symbol_to_metadata = TDocProjectIndex.load_aliases(
+            root
+        )
+        schema_payload, schema_issues = TDocProjectIndex.load_frontmatter_schema(root)
+        return TDocProjectContext(
+            root=root,
+            alias_to_symbol=aliases if isinstance(aliases, dict) else {},
+            symbol_to_aliases=symbol_to_aliases if isinstance(symbol_to_aliases, dict) else {},
+            symbol_to_section=symbol_to_section if isinstance(symbol_to_section, dict) else {},
+            symbol_to_metadata=symbol_to_metadata if isinstance(symbol_to_metadata, dict) else {},
+            frontmatter_schema=schema_payload if isinstance(schema_payload, dict) else {},
+            frontmatter_schema_issues=schema_issues if isinstance(schema_issues, list) else [],
+            schema_path=schema_path,
+            signature=signature,
+        )
+
+
+_SHARED_PROJECT_CONTEXTS = TDocProjectContextCache()
+
+
+def shared_tdoc_project_contexts() -> TDocProjectContextCache:
+    return _SHARED_PROJECT_CONTEXTS
+
+
 class TDocDocumentWidget(TDocEditorWidget):
     """Reusable TDOC document view/editor for IDE tab integration."""
 
@@ -115,13 +239,9 @@ class TDocDocumentWidget(TDocEditorWidget):
 
         self.file_path: str | None = None
         self._tdoc_root = ""
-        self._alias_to_symbol: dict[str, str] = {}
-        self._symbol_to_aliases: dict[str, list[str]] = {}
-        self._symbol_to_section: dict[str, str] = {}
-        self._symbol_to_metadata: dict[str, dict[str, str]] = {}
+        self._project_contexts = shared_tdoc_project_contexts()
+        self._project_context = TDocProjectContext(root="")
         self._frontmatter_cache: dict[str, tuple[int, int, dict[str, str], list[dict]]] = {}
-        self._frontmatter_schema: dict[str, object] = {}
-        self._frontmatter_schema_issues: list[dict] = []
 
         self.resolve_symbol = self._resolve_symbol_link
         self.resolve_image_path = self._resolve_image_link_target
@@ -146,28 +266,24 @@ class TDocDocumentWidget(TDocEditorWidget):
         self.refresh_project_context()
 
     def refresh_project_context(self) -> None:
+        """Re-resolve the TDOC root for the current file and pick up its shared context."""
         root = resolve_tdoc_root_for_path(self.file_path, project_root=self._project_root)
         self._tdoc_root = self._canonicalize(root)
-        aliases, symbol_to_aliases, symbol_to_section, _inc, _ign, symbol_to_metadata = TDocProjectIndex.load_aliases(
-            self._tdoc_root
-        )
-        self._alias_to_symbol = aliases if isinstance(aliases, dict) else {}
-        self._symbol_to_aliases = (
-            symbol_to_aliases if isinstance(symbol_to_aliases, dict) else {}
-        )
-        self._symbol_to_section = symbol_to_section if isinstance(symbol_to_section, dict) else {}
-        self._symbol_to_metadata = symbol_to_metadata if isinstance(symbol_to_metadata, dict) else {}
-        schema_payload, schema_issues = TDocProjectIndex.load_frontmatter_schema(self._tdoc_root)
-        self._frontmatter_schema = schema_payload if isinstance(schema_payload, dict) else {}
-        self._frontmatter_schema_issues = schema_issues if isinstance(schema_issues, list) else []
+        self._project_context = self._project_contexts.get(self._tdoc_root)
+
+    def project_context(self) -> TDocProjectContext:
+        """The shared context for the current root, re-validated at most once per event-loop turn."""
+        if self._tdoc_root:
+            self._project_context = self._project_contexts.get(self._tdoc_root)
+        return self._project_context
 
     def _resolve_symbol_link(self, label: str) -> str:
         if not isinstance(label, str):
             return ""
-        self.refresh_project_context()
-        if not self._alias_to_symbol:
+        alias_to_symbol = self.project_context().alias_to_symbol
+        if not alias_to_symbol:
             return label.strip()
-        return TDocProjectIndex.resolve_symbol(label, self._alias_to_symbol)
+        return TDocProjectIndex.resolve_symbol(label, alias_to_symbol)
 
     def load_file(self, path: str) -> bool:
         target = str(path or "").strip()
@@ -310,10 +426,10 @@ class TDocDocumentWidget(TDocEditorWidget):
         name = str(symbol_name or "").strip()
         if not name:
             return ""
-        self.refresh_project_context()
-        aliases = self._symbol_to_aliases.get(name, [])
-        section = str(self._symbol_to_section.get(name) or "").strip()
-        metadata = self._symbol_to_metadata.get(name, {})
+        context = self.project_context()
+        aliases = context.symbol_to_aliases.get(name, [])
+        section = str(context.symbol_to_section.get(name) or "").strip()
+        metadata = context.symbol_to_metadata.get(name, {})
         rows: list[tuple[str, str]] = [("Symbol", name)]
         if section:
             rows.append(("Section", section))
@@ -382,11 +498,11 @@ class TDocDocumentWidget(TDocEditorWidget):
         return ""
 
     def _list_symbol_completion_candidates(self) -> list[str]:
-        self.refresh_project_context()
+        symbol_to_aliases = self.project_context().symbol_to_aliases
         out: list[str] = []
         seen: set[str] = set()
-        for symbol in sorted(self._symbol_to_aliases.keys(), key=str.casefold):
-            aliases = self._symbol_to_aliases.get(symbol, [symbol])
+        for symbol in sorted(symbol_to_aliases.keys(), key=str.casefold):
+            aliases = symbol_to_aliases.get(symbol, [symbol])
             for candidate in aliases:
                 text = str(candidate or "").strip()
                 if not text:
@@ -462,8 +578,7 @@ class TDocDocumentWidget(TDocEditorWidget):
     ) -> list[str]:
         _ = query
         _ = existing_keys
-        self.refresh_project_context()
-        schema = self._frontmatter_schema if isinstance(self._frontmatter_schema, dict) else {}
+        schema = self.project_context().frontmatter_schema
         if not schema:
             return []
 
@@ -545,8 +660,14 @@ def collect_tdoc_diagnostics(
     source: str = "tdoc",
     content_overrides: dict[str, str] | None = None,
     focus_paths: list[str] | set[str] | None = None,
+    index_for_root: Callable[[str], object | None] | None = None,
 ) -> tuple[str, dict[str, list[dict]]]:
-    """Return `(resolved_root, diagnostics_by_file)` for TDOC validation."""
+    """Return `(resolved_root, diagnostics_by_file)` for TDOC validation.
+
+    `index_for_root` may return a populated project index (anything with a
+    `validate(content_overrides=..., doc_rel_paths=...)` method) so documents are
+    not re-parsed from disk.
+    """
 
     cpath = canonicalize(file_path)
     root = canonicalize(resolve_tdoc_root_for_path(cpath, project_root=project_root))
@@ -567,11 +688,15 @@ def collect_tdoc_diagnostics(
                 normalized.add(rel)
         doc_rel_paths = normalized
 
-    findings = TDocProjectIndex.validate_project(
-        root,
-        content_overrides=content_overrides,
-        doc_rel_paths=doc_rel_paths,
-    )
+    index = index_for_root(root) if callable(index_for_root) else None
+    if index is not None:
+        findings = index.validate(content_overrides=content_overrides, doc_rel_paths=doc_rel_paths)
+    else:
+        findings = TDocProjectIndex.validate_project(
+            root,
+            content_overrides=content_overrides,
+            doc_rel_paths=doc_rel_paths,
+        )
     marker_path = canonicalize(str(Path(root) / PROJECT_MARKER_FILENAME))
 
     by_file: dict[str, list[dict]] = {}
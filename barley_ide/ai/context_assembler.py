@@ -3,11 +3,16 @@ from __future__ import annotations
 import ast
 import os
 import re
+import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 from barley_ide.ai.prompt_overrides import DEFAULT_INLINE_SYSTEM_PROMPT, infer_language_for_path
+from barley_ide.ai.retrieval_index import QUERY_STOP_WORDS, ChunkingConfig, ProjectRetrievalIndex
+
+RETRIEVAL_INDEX_FILENAME = "retrieval-index.json"
 
 
 @dataclass(slots=True)
@@ -22,6 +27,8 @@ class ContextAssembler:
     def __init__(self, project_root: str, canonicalize) -> None:
         self.project_root = str(project_root or "")
         self._canonicalize = canonicalize
+        self._index_lock = threading.Lock()
+        self._retrieval_index: ProjectRetrievalIndex | None = None
 
     def assemble_inline(
         self,
@@ -37,10 +44,7 @@ class ContextAssembler:
         imports_outline_max_imports: int = 50,
         imports_outline_max_symbols: int = 120,
         retrieval_file_read_cap_chars: int = 18000,
-        retrieval_same_dir_file_limit: int = 40,
         retrieval_recent_file_limit: int = 80,
-        retrieval_walk_file_limit: int = 120,
-        retrieval_total_candidate_limit: int = 180,
         retrieval_snippet_char_cap: int = 420,
         retrieval_snippet_segment_limit: int = 80,
         recent_files: list[str] | None = None,
@@ -77,10 +81,7 @@ class ContextAssembler:
             file_read_cap_chars=max(1, int(retrieval_file_read_cap_chars)),
             snippet_char_cap=max(1, int(retrieval_snippet_char_cap)),
             snippet_segment_limit=max(1, int(retrieval_snippet_segment_limit)),
-            same_dir_file_limit=max(0, int(retrieval_same_dir_file_limit)),
             recent_file_limit=max(0, int(retrieval_recent_file_limit)),
-            walk_file_limit=max(0, int(retrieval_walk_file_limit)),
-            total_candidate_limit=max(0, int(retrieval_total_candidate_limit)),
             recent_files=recent_files or [],
         )
 
@@ -131,10 +132,7 @@ class ContextAssembler:
                 "imports_outline_max_imports": int(imports_outline_max_imports),
                 "imports_outline_max_symbols": int(imports_outline_max_symbols),
                 "retrieval_file_read_cap_chars": int(retrieval_file_read_cap_chars),
-                "retrieval_same_dir_file_limit": int(retrieval_same_dir_file_limit),
                 "retrieval_recent_file_limit": int(retrieval_recent_file_limit),
-                "retrieval_walk_file_limit": int(retrieval_walk_file_limit),
-                "retrieval_total_candidate_limit": int(retrieval_total_candidate_limit),
                 "retrieval_snippet_char_cap": int(retrieval_snippet_char_cap),
                 "retrieval_snippet_segment_limit": int(retrieval_snippet_segment_limit),
             },
@@ -263,10 +261,7 @@ class ContextAssembler:
         file_read_cap_chars: int,
         snippet_char_cap: int,
         snippet_segment_limit: int,
-        same_dir_file_limit: int,
         recent_file_limit: int,
-        walk_file_limit: int,
-        total_candidate_limit: int,
         recent_files: list[str],
     ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
         if retrieval_snippets <= 0:
@@ -276,151 +271,86 @@ class ContextAssembler:
         if not index_dir.is_dir():
             return [], {"enabled": False, "reason": "index_unavailable"}
 
+        index = self.retrieval_index(
+            ChunkingConfig(
+                file_read_cap_chars=file_read_cap_chars,
+                snippet_char_cap=snippet_char_cap,
+                snippet_segment_limit=snippet_segment_limit,
+            )
+        )
+        index.ensure_started()
+        if not index.is_ready():
+            return [], {"enabled": True, "reason": "index_building", "items": []}
+
         query = self._extract_query_tokens(source_text, line)
         if not query:
             return [], {"enabled": True, "reason": "no_query_tokens", "items": []}
 
-        candidates = self._candidate_source_files(
-            file_path=file_path,
-            recent_files=recent_files,
-            same_dir_file_limit=same_dir_file_limit,
-            recent_file_limit=recent_file_limit,
-            walk_file_limit=walk_file_limit,
-            total_candidate_limit=total_candidate_limit,
-        )
-        recency_rank = {self._canonicalize_path(p): idx for idx, p in enumerate(recent_files)}
-
-        ranked: list[tuple[float, str, str]] = []
         current = self._canonicalize_path(file_path)
         current_dir = os.path.dirname(current)
-        for path in candidates:
+        recent = recent_files[:recent_file_limit] if recent_file_limit > 0 else []
+        recency_rank = {self._canonicalize_path(p): idx for idx, p in enumerate(recent)}
+
+        def _boost(path: str) -> float:
+            bonus = 0.0
+            if os.path.dirname(path) == current_dir:
+                bonus += 2.5
             cpath = self._canonicalize_path(path)
-            if cpath == current or not cpath.endswith((".py", ".pyw", ".pyi")):
-                continue
-            text = self._read_text_capped(cpath, cap_chars=file_read_cap_chars)
-            if not text:
-                continue
-            snippets = self._split_snippets(
-                text,
-                cap_each=snippet_char_cap,
-                max_segments=snippet_segment_limit,
-            )
-            if not snippets:
-                continue
-            for snippet in snippets:
-                score = self._snippet_score(
-                    snippet=snippet,
-                    query_tokens=query,
-                    path=cpath,
-                    current_dir=current_dir,
-                    recency_rank=recency_rank,
-                )
-                if score <= 0:
-                    continue
-                ranked.append((score, cpath, snippet))
+            if cpath in recency_rank:
+                bonus += max(0.0, 1.6 - (recency_rank[cpath] * 0.1))
+            return bonus
 
-        ranked.sort(key=lambda item: (-item[0], item[1].lower(), item[2][:32]))
-        selected = ranked[:retrieval_snippets]
+        started = time.perf_counter()
+        hits = index.query(query, limit=retrieval_snippets, exclude_path=current, boost=_boost)
+        latency_ms = (time.perf_counter() - started) * 1000.0
         out: list[dict[str, Any]] = []
-        for score, path, snippet in selected:
-            out.append({"path": self._rel_path(path), "score": float(score), "text": snippet})
-        return out, {"enabled": True, "reason": "ok", "query_tokens": sorted(query), "items": out}
+        for hit in hits:
+            out.append({"path": self._rel_path(hit.path), "score": float(hit.score), "text": hit.text})
+        return out, {
+            "enabled": True,
+            "reason": "ok",
+            "query_tokens": sorted(query),
+            "items": out,
+            "latency_ms": latency_ms,
+            "index": index.stats(),
+        }
 
     def _extract_query_tokens(self, source_text: str, line: int) -> set[str]:
         lines = source_text.splitlines()
         current_line = lines[line - 1] if 1 <= line <= len(lines) else ""
         tokens = set(re.findall(r"[A-Za-z_][A-Za-z0-9_]{1,40}", current_line))
-        return {tok.lower() for tok in tokens if tok.lower() not in {"self", "true", "false", "none"}}
-
-    def _candidate_source_files(
-        self,
-        *,
-        file_path: str,
-        recent_files: list[str],
-        same_dir_file_limit: int,
-        recent_file_limit: int,
-        walk_file_limit: int,
-        total_candidate_limit: int,
-    ) -> list[str]:
-        out: list[str] = []
-        seen: set[str] = set()
-
-        def _add(path: str) -> None:
-            c = self._canonicalize_path(path)
-            if not c or c in seen:
-                return
-            seen.add(c)
-            out.append(c)
-
-        current = self._canonicalize_path(file_path)
-        current_dir = os.path.dirname(current)
-        if os.path.isdir(current_dir):
-            try:
-                for name in sorted(os.listdir(current_dir)):
-                    if not name.endswith((".py", ".pyw", ".pyi")):
-                        continue
-                    _add(os.path.join(current_dir, name))
-                    if same_dir_file_limit > 0 and len(out) >= same_dir_file_limit:
-                        break
-            except Exception:
-                pass
-
-        if recent_file_limit > 0:
-            recent_added = 0
-            for path in recent_files:
-                before = len(out)
-                _add(path)
-                if len(out) > before:
-                    recent_added += 1
-                if recent_added >= recent_file_limit:
-                    break
-
-        root = self._canonicalize_path(self.project_root)
-        count = 0
-        for dirpath, dirnames, filenames in os.walk(root):
-            dirnames[:] = [d for d in dirnames if d not in {".git", ".venv", "__pycache__", ".ruff_cache", ".mypy_cache"}]
-            for fname in sorted(filenames):
-                if not fname.endswith((".py", ".pyw", ".pyi")):
-                    continue
-                _add(os.path.join(dirpath, fname))
-                count += 1
-                if (walk_file_limit > 0 and count >= walk_file_limit) or (
-                    total_candidate_limit > 0 and len(out) >= total_candidate_limit
-                ):
-                    return out
-        return out
-
-    def _split_snippets(self, text: str, cap_each: int, max_segments: int) -> list[str]:
-        chunks = [chunk.strip() for chunk in re.split(r"\n\s*\n", text) if chunk.strip()]
-        out: list[str] = []
-        for chunk in chunks:
-            if len(chunk) > cap_each:
-                out.append(chunk[:cap_each])
-            else:
-                out.append(chunk)
-            if len(out) >= max_segments:
-                break
-        return out
-
-    def _snippet_score(
-        self,
-        *,
-        snippet: str,
-        query_tokens: set[str],
-        path: str,
-        current_dir: str,
-        recency_rank: dict[str, int],
-    ) -> float:
-        low = snippet.lower()
-        overlap = sum(1 for token in query_tokens if token in low)
-        if overlap <= 0:
-            return 0.0
-        score = float(overlap * 3)
-        if os.path.dirname(path) == current_dir:
-            score += 2.5
-        if path in recency_rank:
-            score += max(0.0, 1.6 - (recency_rank[path] * 0.1))
-        return score
+        return {tok.lower() for tok in tokens if tok.lower() not in QUERY_STOP_WORDS}
+
+    def retrieval_index(self, chunking: ChunkingConfig | None = None) -> ProjectRetrievalIndex:
+        with self._index_lock:
+            if self._retrieval_index is None:
+                cache_path = Path(self.project_root) / ".cache" / "completion" / RETRIEVAL_INDEX_FILENAME
+                self._retrieval_index = ProjectRetrievalIndex(
+                    self._canonicalize_path(self.project_root),
+                    cache_path=str(cache_path),
+                    chunking=chunking,
+                )
+            elif chunking is not None:
+                self._retrieval_index.configure(chunking)
+            return self._retrieval_index
+
+    def notify_paths_changed(self, paths: list[str]) -> None:
+        """Feed saved files / changed directories to the retrieval index, if it is in use."""
+        index = self._retrieval_index
+        if index is None:
+            return
+        clean = [self._canonicalize_path(p) for p in paths if str(p or "").strip()]
+        if clean:
+            index.schedule_refresh(clean)
+
+    def retrieval_stats(self) -> dict[str, Any]:
+        index = self._retrieval_index
+        return index.stats() if index is not None else {"ready": False, "queries": 0}
+
+    def shutdown(self) -> None:
+        index = self._retrieval_index
+        if index is not None:
+            index.shutdown()
 
     def _estimate_tokens(self, text: str) -> int:
         return max(1, int((len(text) + 3) // 4))
@@ -437,14 +367,6 @@ class ContextAssembler:
         except Exception:
             return path
 
-    def _read_text_capped(self, path: str, cap_chars: int) -> str:
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = f.read(cap_chars)
-            return str(data or "")
-        except Exception:
-            return ""
-
     def _canonicalize_path(self, path: str) -> str:
         try:
             return self._canonicalize(path)
@@ -3,15 +3,27 @@ from __future__ import annotations
 import concurrent.futures
 import queue
 import re
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from typing import Any
 
 from PySide6.QtCore import QObject, QTimer, Signal
 
 from barley_ide.ai.context_assembler import ContextAssembler
+from barley_ide.ai.latency import LatencyHistogram
 from barley_ide.ai.prompt_overrides import resolve_system_prompt
-from barley_ide.ai.provider_base import AIProviderClient, InlineCompletionRequest
+from barley_ide.ai.provider_base import (
+    AIProviderClient,
+    InlineCancelToken,
+    InlineCompletionRequest,
+)
 from barley_ide.ai.settings_schema import NormalizedAIAssistConfig, default_ai_settings
+from barley_ide.ai.suggestion_cache import (
+    InlineCacheKey,
+    InlineSuggestionCache,
+    make_cache_key,
+    split_at_cursor,
+)
 
 
 @dataclass(slots=True)
@@ -27,12 +39,19 @@ class _InlineWorkItem:
     token: int
     cfg: NormalizedAIAssistConfig
     recent_files: list[str]
+    cancel: InlineCancelToken = field(default_factory=InlineCancelToken)
+    started_at: float = 0.0
+    doc_prefix: str = ""
+    cache_key: InlineCacheKey | None = None
 
 
 class InlineSuggestionController(QObject):
-    suggestionReady = Signal(object)  # {editor_id, token, text, trigger, metadata}
+    suggestionReady = Signal(object)  # {editor_id, token, text, trigger, metadata, partial}
     statusMessage = Signal(str)
 
+    # Streamed ghost text is pushed to the GUI at most this often; the final payload always follows.
+    PARTIAL_INTERVAL_S = 0.03
+
     def __init__(
         self,
         *,
@@ -47,6 +66,7 @@ class InlineSuggestionController(QObject):
         self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="pytpo-ai-inline")
         self._active_futures: set[concurrent.futures.Future] = set()
         self._inflight_by_editor: dict[str, concurrent.futures.Future] = {}
+        self._cancel_by_editor: dict[str, InlineCancelToken] = {}
         self._result_queue: queue.Queue[dict[str, Any]] = queue.Queue()
 
         self._result_pump = QTimer(self)
@@ -59,9 +79,16 @@ class InlineSuggestionController(QObject):
         self._latest_token_by_editor: dict[str, int] = {}
         self._token_counter = 0
         self._cfg = NormalizedAIAssistConfig.from_mapping(default_ai_settings())
+        self._first_visible_latency = LatencyHistogram()
+        self._complete_latency = LatencyHistogram()
+        self._first_visible_token_by_editor: dict[str, int] = {}
+        self._cache = InlineSuggestionCache()
 
     def update_settings(self, ai_cfg: Any) -> None:
+        previous = self._cfg
         self._cfg = NormalizedAIAssistConfig.from_mapping(ai_cfg)
+        if (previous.base_url, previous.prompt_overrides) != (self._cfg.base_url, self._cfg.prompt_overrides):
+            self._cache.clear()
         if not self._cfg.enabled:
             self.cancel_all(clear=True)
 
@@ -93,6 +120,8 @@ class InlineSuggestionController(QObject):
 
         self._pending_by_editor.pop(item.editor_id, None)
         self._stop_timer(item.editor_id)
+        if self._serve_from_cache(item):
+            return
         self._start_worker(item)
 
     def request_passive(
@@ -125,6 +154,8 @@ class InlineSuggestionController(QObject):
             return
         if not self._should_passive_trigger(item.prefix, item.previous_char, item.cfg.min_prefix_chars):
             return
+        if self._serve_from_cache(item):
+            return
 
         self._pending_by_editor[item.editor_id] = item
         timer = self._debounce_timers.get(item.editor_id)
@@ -147,6 +178,9 @@ class InlineSuggestionController(QObject):
                 inflight.cancel()
             except Exception:
                 pass
+        cancel = self._cancel_by_editor.pop(key, None)
+        if cancel is not None:
+            cancel.cancel()
         self._latest_token_by_editor[key] = self._next_token()
         if clear:
             self.suggestionReady.emit(
@@ -183,6 +217,9 @@ class InlineSuggestionController(QObject):
                 fut.cancel()
             except Exception:
                 pass
+        for cancel in list(self._cancel_by_editor.values()):
+            cancel.cancel()
+        self._cancel_by_editor.clear()
         self._active_futures.clear()
         self._inflight_by_editor.clear()
 
@@ -194,6 +231,19 @@ class InlineSuggestionController(QObject):
             except Exception:
                 pass
 
+    def cache_stats(self) -> dict[str, Any]:
+        return self._cache.stats()
+
+    def latency_stats(self) -> dict[str, Any]:
+        stats: dict[str, Any] = {
+            "first_visible": self._first_visible_latency.snapshot(),
+            "complete": self._complete_latency.snapshot(),
+        }
+        provider_stats = getattr(self._provider, "latency_stats", None)
+        if callable(provider_stats):
+            stats["provider"] = provider_stats()
+        return stats
+
     def _build_item(
         self,
         *,
@@ -216,7 +266,7 @@ class InlineSuggestionController(QObject):
         token = self._next_token()
         self._latest_token_by_editor[key] = token
 
-        return _InlineWorkItem(
+        item = _InlineWorkItem(
             editor_id=key,
             file_path=str(file_path or ""),
             source_text=str(source_text or ""),
@@ -229,6 +279,34 @@ class InlineSuggestionController(QObject):
             cfg=self._cfg,
             recent_files=list(recent_files or []),
         )
+        doc_prefix, doc_suffix = split_at_cursor(item.source_text, item.line, item.column)
+        item.doc_prefix = doc_prefix
+        item.cache_key = make_cache_key(file_path=item.file_path, prefix=doc_prefix, suffix=doc_suffix, model=item.cfg.model)
+        return item
+
+    def _serve_from_cache(self, item: _InlineWorkItem) -> bool:
+        if item.cache_key is None or not item.cfg.model:
+            return False
+        hit = self._cache.lookup(item.cache_key, item.doc_prefix)
+        if hit is None:
+            return False
+        self._pending_by_editor.pop(item.editor_id, None)
+        self._stop_timer(item.editor_id)
+        superseded = self._cancel_by_editor.pop(item.editor_id, None)
+        if superseded is not None:
+            superseded.cancel()
+        self._handle_worker_result(
+            {
+                "editor_id": item.editor_id,
+                "token": item.token,
+                "trigger": item.trigger,
+                "text": hit.text,
+                "ok": True,
+                "status_text": "AI suggestion reused.",
+                "metadata": {"cache": hit.kind},
+            }
+        )
+        return True
 
     def _flush_debounced(self, editor_id: str) -> None:
         item = self._pending_by_editor.pop(editor_id, None)
@@ -243,7 +321,12 @@ class InlineSuggestionController(QObject):
                 existing.cancel()
             except Exception:
                 pass
+        superseded = self._cancel_by_editor.pop(item.editor_id, None)
+        if superseded is not None:
+            # Closes the superseded request's socket so its worker frees up immediately.
+            superseded.cancel()
 
+        item.started_at = time.perf_counter()
         try:
             fut = self._executor.submit(self._run_worker, item)
         except Exception:
@@ -252,6 +335,7 @@ class InlineSuggestionController(QObject):
             return
 
         self._inflight_by_editor[item.editor_id] = fut
+        self._cancel_by_editor[item.editor_id] = item.cancel
         self._active_futures.add(fut)
         fut.add_done_callback(lambda future: self._queue_result(item.editor_id, future))
 
@@ -260,6 +344,7 @@ class InlineSuggestionController(QObject):
         current = self._inflight_by_editor.get(editor_id)
         if current is future:
             self._inflight_by_editor.pop(editor_id, None)
+            self._cancel_by_editor.pop(editor_id, None)
 
         if future.cancelled():
             return
@@ -292,6 +377,10 @@ class InlineSuggestionController(QObject):
         token = int(payload.get("token") or 0)
         if not editor_id or token <= 0:
             return
+        cache_key = payload.pop("cache_key", None)
+        if isinstance(cache_key, tuple) and payload.get("ok") and not payload.get("partial"):
+            # Superseded answers are still valid for the position they were asked for.
+            self._cache.store(cache_key[0], cache_key[1], str(payload.get("text") or ""))
         if token != int(self._latest_token_by_editor.get(editor_id, 0)):
             return
 
@@ -299,6 +388,16 @@ class InlineSuggestionController(QObject):
         trigger = str(payload.get("trigger") or "manual")
         text = str(payload.get("text") or "")
         status_text = str(payload.get("status_text") or "").strip()
+        elapsed_ms = float(payload.get("elapsed_ms") or 0.0)
+
+        if ok and text.strip() and self._first_visible_token_by_editor.get(editor_id) != token:
+            self._first_visible_token_by_editor[editor_id] = token
+            self._first_visible_latency.record(elapsed_ms)
+        if payload.get("partial"):
+            self.suggestionReady.emit(payload)
+            return
+        if ok:
+            self._complete_latency.record(elapsed_ms)
 
         if not ok and trigger == "manual" and status_text:
             self.statusMessage.emit(status_text)
@@ -332,10 +431,7 @@ class InlineSuggestionController(QObject):
             imports_outline_max_imports=cfg.imports_outline_max_imports,
             imports_outline_max_symbols=cfg.imports_outline_max_symbols,
             retrieval_file_read_cap_chars=cfg.retrieval_file_read_cap_chars,
-            retrieval_same_dir_file_limit=cfg.retrieval_same_dir_file_limit,
             retrieval_recent_file_limit=cfg.retrieval_recent_file_limit,
-            retrieval_walk_file_limit=cfg.retrieval_walk_file_limit,
-            retrieval_total_candidate_limit=cfg.retrieval_total_candidate_limit,
             retrieval_snippet_char_cap=cfg.retrieval_snippet_char_cap,
             retrieval_snippet_segment_limit=cfg.retrieval_snippet_segment_limit,
             recent_files=item.recent_files,
@@ -362,7 +458,36 @@ class InlineSuggestionController(QObject):
             max_output_tokens=cfg.max_output_tokens,
             timeout_s=max(0.5, float(cfg.inline_timeout_ms) / 1000.0),
         )
-        result = self._provider.complete_inline(request)
+        last_partial = [0.0, ""]
+
+        def on_delta(accumulated: str) -> None:
+            now = time.perf_counter()
+            if now - last_partial[0] < self.PARTIAL_INTERVAL_S:
+                return
+            partial = self._sanitize_partial(accumulated, prefix=item.prefix)
+            if not partial.strip() or partial == last_partial[1]:
+                return
+            last_partial[0] = now
+            last_partial[1] = partial
+            self._result_queue.put(
+                {
+                    "editor_id": item.editor_id,
+                    "token": item.token,
+                    "trigger": item.trigger,
+                    "text": partial,
+                    "ok": True,
+                    "partial": True,
+                    "status_text": "",
+                    "metadata": metadata,
+                    "elapsed_ms": (now - item.started_at) * 1000.0,
+                }
+            )
+
+        result = self._provider.complete_inline(request, on_delta=on_delta, cancel=item.cancel)
+        latency = result.details.get("latency") if isinstance(result.details, dict) else None
+        if isinstance(latency, dict):
+            metadata["latency"] = dict(latency)
+        elapsed_ms = (time.perf_counter() - item.started_at) * 1000.0
         if not result.ok:
             return {
                 "editor_id": item.editor_id,
@@ -372,6 +497,7 @@ class InlineSuggestionController(QObject):
                 "ok": False,
                 "status_text": str(result.status_text or "AI request failed."),
                 "metadata": metadata,
+                "elapsed_ms": elapsed_ms,
             }
 
         text = self._sanitize_completion(str(result.text or ""), prefix=item.prefix)
@@ -383,6 +509,8 @@ class InlineSuggestionController(QObject):
             "ok": True,
             "status_text": str(result.status_text or ""),
             "metadata": metadata,
+            "elapsed_ms": elapsed_ms,
+            "cache_key": (item.cache_key, item.doc_prefix) if item.cache_key is not None else None,
         }
 
     def _sanitize_completion(self, text: str, *, prefix: str) -> str:
@@ -402,6 +530,21 @@ class InlineSuggestionController(QObject):
             cleaned = cleaned[:2400]
         return cleaned
 
+    def _sanitize_partial(self, text: str, *, prefix: str) -> str:
+        raw = str(text or "").replace("\r", "")
+        if raw.lstrip().startswith("```"):
+            # Hold back until the opening fence line is complete, then hide it.
+            _head, sep, rest = raw.lstrip().partition("\n")
+            if not sep:
+                return ""
+            raw = rest
+            fence_at = raw.rfind("\n`")
+            if fence_at >= 0 and set(raw[fence_at + 1:].strip()) <= {"`"}:
+                raw = raw[:fence_at]
+        if prefix and prefix.startswith(raw):
+            return ""
+        return self._sanitize_completion(raw, prefix=prefix)
+
     def _should_passive_trigger(self, prefix: str, previous_char: str, min_prefix_chars: int) -> bool:
         if len(str(prefix or "")) >= max(1, int(min_prefix_chars or 1)):
             return True
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Any
+
+DEFAULT_BUCKETS_MS: tuple[float, ...] = (25, 50, 100, 200, 400, 800, 1600, 3200, 6400, 12800)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; thread-safe, cheap enough to record per request."""
+
+    def __init__(self, buckets_ms: tuple[float, ...] = DEFAULT_BUCKETS_MS) -> None:
+        self._bounds = tuple(sorted(float(b) for b in buckets_ms))
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._lock = threading.Lock()
+        self._total = 0
+        self._sum_ms = 0.0
+        self._max_ms = 0.0
+
+    def record(self, value_ms: float) -> None:
+        value = max(0.0, float(value_ms))
+        with self._lock:
+            self._counts[bisect.bisect_left(self._bounds, value)] += 1
+            self._total += 1
+            self._sum_ms += value
+            self._max_ms = max(self._max_ms, value)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (the max for the overflow bucket)."""
+        with self._lock:
+            if not self._total:
+                return 0.0
+            target = max(1, round(min(1.0, max(0.0, q)) * self._total))
+            seen = 0
+            for idx, count in enumerate(self._counts):
+                seen += count
+                if seen >= target:
+                    return self._bounds[idx] if idx < len(self._bounds) else self._max_ms
+            return self._max_ms
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            buckets = {f"le_{int(bound)}": count for bound, count in zip(self._bounds, self._counts)}
+            buckets["overflow"] = self._counts[-1]
+            total = self._total
+            mean = (self._sum_ms / total) if total else 0.0
+            max_ms = self._max_ms
+        return {
+            "count": total,
+            "mean_ms": mean,
+            "max_ms": max_ms,
+            "p50_ms": self.percentile(0.5),
+            "p90_ms": self.percentile(0.9),
+            "p99_ms": self.percentile(0.99),
+            "buckets": buckets,
+        }
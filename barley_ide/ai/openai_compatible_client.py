@@ -1,21 +1,173 @@
 from __future__ import annotations
 
+import base64
+import functools
 import hashlib
+import http.client
 import json
 import socket
 import ssl
+import threading
 import time
 import urllib.error
+import urllib.parse
 import urllib.request
 from typing import Any
 
-from barley_ide.ai.provider_base import AIProviderClient, InlineCompletionRequest, InlineCompletionResult, ModelListResult, ProviderResult
+from barley_ide.ai.latency import LatencyHistogram
+from barley_ide.ai.provider_base import (
+    AIProviderClient,
+    InlineCancelToken,
+    InlineCompletionRequest,
+    InlineCompletionResult,
+    InlineDeltaCallback,
+    ModelListResult,
+    ProviderResult,
+)
+
+_Endpoint = tuple[str, str, int | None]
+
+
+class _ProviderError(Exception):
+    def __init__(self, status_text: str, *, http_status: int | None = None, error_kind: str = "request_failed") -> None:
+        super().__init__(status_text)
+        self.status_text = status_text
+        self.http_status = http_status
+        self.error_kind = error_kind
+
+
+class KeepAliveConnectionPool:
+    """Idle HTTP/1.1 connections keyed by (scheme, host, port), reused across inline requests.
+
+    Honours the same ``*_proxy``/``no_proxy`` environment as ``urllib``: HTTPS endpoints
+    are reached through a CONNECT tunnel, plain HTTP ones by sending the absolute URL to
+    the proxy.
+    """
+
+    def __init__(self, *, max_idle_per_endpoint: int = 2, idle_timeout_s: float = 30.0) -> None:
+        self._max_idle = max(1, int(max_idle_per_endpoint))
+        self._idle_timeout_s = max(1.0, float(idle_timeout_s))
+        self._lock = threading.Lock()
+        self._idle: dict[_Endpoint, list[tuple[float, http.client.HTTPConnection]]] = {}
+        self._opened = 0
+        self._reused = 0
+
+    def acquire(self, endpoint: _Endpoint, timeout_s: float) -> tuple[http.client.HTTPConnection, bool]:
+        now = time.monotonic()
+        stale: list[http.client.HTTPConnection] = []
+        conn: http.client.HTTPConnection | None = None
+        with self._lock:
+            idle = self._idle.get(endpoint, [])
+            while idle:
+                stamp, candidate = idle.pop()
+                if now - stamp <= self._idle_timeout_s and candidate.sock is not None:
+                    conn = candidate
+                    break
+                stale.append(candidate)
+            if conn is not None:
+                self._reused += 1
+            else:
+                self._opened += 1
+        for item in stale:
+            item.close()
+        if conn is not None:
+            conn.timeout = timeout_s
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout_s)
+            return conn, True
+        scheme, host, port = endpoint
+        proxy = self._proxy_for(endpoint)
+        if scheme == "https":
+            context = ssl.create_default_context()
+            if proxy is None:
+                return http.client.HTTPSConnection(host, port, timeout=timeout_s, context=context), False
+            proxy_host, proxy_port, proxy_headers = proxy
+            conn = http.client.HTTPSConnection(proxy_host, proxy_port, timeout=timeout_s, context=context)
+            conn.set_tunnel(host, port, headers=proxy_headers)
+            return conn, False
+        if proxy is None:
+            return http.client.HTTPConnection(host, port, timeout=timeout_s), False
+        proxy_host, proxy_port, _proxy_headers = proxy
+        return http.client.HTTPConnection(proxy_host, proxy_port, timeout=timeout_s), False
+
+    def request_target(self, endpoint: _Endpoint, path: str) -> tuple[str, dict[str, str]]:
+        """Request-target and extra headers for ``path``; forwarding proxies need the full URL."""
+        scheme, host, port = endpoint
+        proxy = self._proxy_for(endpoint)
+        if scheme == "https" or proxy is None:
+            return path, {}
+        netloc = host if port is None else f"{host}:{port}"
+        return f"{scheme}://{netloc}{path}", proxy[2]
+
+    @staticmethod
+    def _proxy_for(endpoint: _Endpoint) -> tuple[str, int, dict[str, str]] | None:
+        scheme, host, port = endpoint
+        proxy_url = urllib.request.getproxies().get(scheme)
+        if not proxy_url:
+            return None
+        netloc = host if port is None else f"{host}:{port}"
+        if urllib.request.proxy_bypass(netloc):
+            return None
+        if "://" not in proxy_url:
+            proxy_url = f"http://{proxy_url}"
+        parts = urllib.parse.urlsplit(proxy_url)
+        if not parts.hostname:
+            return None
+        headers: dict[str, str] = {}
+        if parts.username is not None:
+            credentials = f"{urllib.parse.unquote(parts.username)}:{urllib.parse.unquote(parts.password or '')}"
+            token = base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+            headers["Proxy-Authorization"] = f"Basic {token}"
+        default_port = 443 if parts.scheme == "https" else 80
+        return parts.hostname, parts.port or default_port, headers
+
+    def release(self, endpoint: _Endpoint, conn: http.client.HTTPConnection) -> None:
+        if conn.sock is None:
+            return
+        with self._lock:
+            idle = self._idle.setdefault(endpoint, [])
+            if len(idle) < self._max_idle:
+                idle.append((time.monotonic(), conn))
+                return
+        conn.close()
+
+    def discard(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def abort(self, conn: http.client.HTTPConnection) -> None:
+        """Interrupt a request blocked on ``conn`` from another thread."""
+        sock = conn.sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def close_all(self) -> None:
+        with self._lock:
+            conns = [conn for idle in self._idle.values() for _stamp, conn in idle]
+            self._idle.clear()
+        for conn in conns:
+            self.discard(conn)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            idle = sum(len(items) for items in self._idle.values())
+            return {"opened": self._opened, "reused": self._reused, "idle": idle}
 
 
 class OpenAICompatibleClient(AIProviderClient):
     _MODEL_CACHE_TTL_S = 180.0
     _model_cache: dict[str, tuple[float, list[str]]] = {}
 
+    def __init__(self, *, pool: KeepAliveConnectionPool | None = None) -> None:
+        self._pool = pool if pool is not None else KeepAliveConnectionPool()
+        self._first_token_latency = LatencyHistogram()
+        self._total_latency = LatencyHistogram()
+
     def fetch_models(
         self,
         *,
@@ -103,7 +255,13 @@ class OpenAICompatibleClient(AIProviderClient):
             error_kind=models_res.error_kind,
         )
 
-    def complete_inline(self, request: InlineCompletionRequest) -> InlineCompletionResult:
+    def complete_inline(
+        self,
+        request: InlineCompletionRequest,
+        *,
+        on_delta: InlineDeltaCallback | None = None,
+        cancel: InlineCancelToken | None = None,
+    ) -> InlineCompletionResult:
         base_url = self._normalize_base_url(request.base_url)
         if not base_url:
             return InlineCompletionResult(ok=False, status_text="Base URL is missing.", error_kind="invalid_config")
@@ -118,42 +276,251 @@ class OpenAICompatibleClient(AIProviderClient):
             ],
             "temperature": 0.15,
             "max_tokens": max(1, int(request.max_output_tokens or 160)),
-            "stream": False,
+            "stream": bool(request.stream),
             "n": 1,
         }
-
-        result = self._request_json(
-            method="POST",
-            url=f"{base_url}/chat/completions",
-            payload=payload,
-            api_key=request.api_key,
-            org_id=request.org_id,
-            project_id=request.project_id,
-            timeout_s=float(request.timeout_s or 10.0),
-        )
-        if not result["ok"]:
+        token = cancel if cancel is not None else InlineCancelToken()
+        started = time.perf_counter()
+        timing: dict[str, Any] = {"streamed": False, "connection_reused": False}
+        try:
+            text, usage = self._post_completion(
+                url=f"{base_url}/chat/completions",
+                payload=payload,
+                request=request,
+                on_delta=on_delta,
+                cancel=token,
+                started=started,
+                timing=timing,
+            )
+        except _ProviderError as exc:
+            if token.cancelled:
+                return self._cancelled_result(started, timing)
+            self._record_latency(started, timing, ok=False)
             return InlineCompletionResult(
                 ok=False,
-                status_text=str(result.get("status_text") or "AI request failed."),
-                http_status=result.get("http_status"),
-                error_kind=str(result.get("error_kind") or "request_failed"),
+                status_text=exc.status_text,
+                http_status=exc.http_status,
+                error_kind=exc.error_kind,
+                details={"latency": dict(timing)},
             )
 
-        obj = result.get("json")
-        if not isinstance(obj, dict):
-            return InlineCompletionResult(ok=False, status_text="Provider returned invalid completion payload.", error_kind="parse_error")
-
-        text = self._extract_completion_text(obj)
+        if token.cancelled:
+            return self._cancelled_result(started, timing)
+        self._record_latency(started, timing, ok=True)
         if not text.strip():
-            return InlineCompletionResult(ok=False, status_text="Provider returned empty completion.", error_kind="empty")
-
+            return InlineCompletionResult(
+                ok=False,
+                status_text="Provider returned empty completion.",
+                error_kind="empty",
+                details={"latency": dict(timing)},
+            )
         return InlineCompletionResult(
             ok=True,
             status_text="AI completion received.",
             text=text,
-            usage=obj.get("usage") if isinstance(obj.get("usage"), dict) else {},
+            usage=usage,
+            details={"latency": dict(timing)},
+        )
+
+    def latency_stats(self) -> dict[str, Any]:
+        return {
+            "first_token": self._first_token_latency.snapshot(),
+            "total": self._total_latency.snapshot(),
+            "connections": self._pool.stats(),
+        }
+
+    def close(self) -> None:
+        self._pool.close_all()
+
+    def _post_completion(
+        self,
+        *,
+        url: str,
+        payload: dict[str, Any],
+        request: InlineCompletionRequest,
+        on_delta: InlineDeltaCallback | None,
+        cancel: InlineCancelToken,
+        started: float,
+        timing: dict[str, Any],
+    ) -> tuple[str, dict[str, Any]]:
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        body = json.dumps(payload, ensure_ascii=True).encode("utf-8")
+        headers = self._build_headers(
+            api_key=request.api_key,
+            org_id=request.org_id,
+            project_id=request.project_id,
+            accept="text/event-stream, application/json" if payload.get("stream") else "application/json",
+        )
+        timeout_s = max(0.5, float(request.timeout_s or 10.0))
+        endpoint = (parts.scheme, parts.hostname or "", parts.port)
+
+        try:
+            conn, response = self._send(endpoint, path, body, headers, timeout_s, cancel, timing)
+        except _ProviderError:
+            raise
+        except Exception as exc:
+            raise self._transport_error(exc) from exc
+
+        closer = functools.partial(self._pool.abort, conn)
+        cancel.attach(closer)
+        reusable = False
+        try:
+            if response.status >= 400:
+                body_text = response.read().decode("utf-8", errors="replace")
+                reusable = not response.will_close
+                raise _ProviderError(
+                    self._friendly_http_status_text(int(response.status), body_text),
+                    http_status=int(response.status),
+                    error_kind="http_error",
+                )
+            content_type = str(response.getheader("Content-Type") or "").lower()
+            if "text/event-stream" in content_type:
+                timing["streamed"] = True
+                text, usage = self._read_event_stream(response, on_delta, cancel, started, timing)
+            else:
+                raw = response.read().decode("utf-8", errors="replace")
+                obj = json.loads(raw) if raw.strip() else {}
+                if not isinstance(obj, dict):
+                    raise _ProviderError("Provider returned invalid completion payload.", error_kind="parse_error")
+                text = self._extract_completion_text(obj)
+                usage = obj.get("usage") if isinstance(obj.get("usage"), dict) else {}
+                timing["first_token_ms"] = (time.perf_counter() - started) * 1000.0
+                if text and on_delta is not None and not cancel.cancelled:
+                    on_delta(text)
+            reusable = not response.will_close and not cancel.cancelled
+            return text, usage
+        except _ProviderError:
+            raise
+        except ValueError as exc:
+            if cancel.cancelled:
+                raise _ProviderError("AI request cancelled.", error_kind="cancelled") from exc
+            raise _ProviderError("Provider returned invalid completion payload.", error_kind="parse_error") from exc
+        except Exception as exc:
+            raise self._transport_error(exc) from exc
+        finally:
+            cancel.detach(closer)
+            if reusable:
+                self._pool.release(endpoint, conn)
+            else:
+                self._pool.discard(conn)
+
+    def _send(
+        self,
+        endpoint: tuple[str, str, int | None],
+        path: str,
+        body: bytes,
+        headers: dict[str, str],
+        timeout_s: float,
+        cancel: InlineCancelToken,
+        timing: dict[str, Any],
+    ) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        target, proxy_headers = self._pool.request_target(endpoint, path)
+        if proxy_headers:
+            headers = {**headers, **proxy_headers}
+        # A pooled connection may have been closed by the server while idle; retry once on a fresh one.
+        for attempt in range(2):
+            conn, reused = self._pool.acquire(endpoint, timeout_s)
+            closer = functools.partial(self._pool.abort, conn)
+            cancel.attach(closer)
+            try:
+                if cancel.cancelled:
+                    raise _ProviderError("AI request cancelled.", error_kind="cancelled")
+                conn.request("POST", target, body=body, headers=headers)
+                response = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self._pool.discard(conn)
+                if reused and attempt == 0 and not cancel.cancelled:
+                    continue
+                raise
+            except BaseException:
+                self._pool.discard(conn)
+                raise
+            finally:
+                cancel.detach(closer)
+            timing["connection_reused"] = reused
+            return conn, response
+        raise http.client.RemoteDisconnected("Endpoint closed the connection.")
+
+    def _read_event_stream(
+        self,
+        response: http.client.HTTPResponse,
+        on_delta: InlineDeltaCallback | None,
+        cancel: InlineCancelToken,
+        started: float,
+        timing: dict[str, Any],
+    ) -> tuple[str, dict[str, Any]]:
+        chunks: list[str] = []
+        usage: dict[str, Any] = {}
+        data_lines: list[str] = []
+        done = False
+        while not done and not cancel.cancelled:
+            raw_line = response.readline()
+            if not raw_line:
+                break
+            line = raw_line.decode("utf-8", errors="replace").rstrip("\r\n")
+            if line:
+                if line.startswith("data:"):
+                    data_lines.append(line[5:].lstrip(" "))
+                continue
+            if not data_lines:
+                continue
+            data = "\n".join(data_lines)
+            data_lines = []
+            if data.strip() == "[DONE]":
+                done = True
+                break
+            event = json.loads(data)
+            if not isinstance(event, dict):
+                continue
+            if isinstance(event.get("usage"), dict):
+                usage = event["usage"]
+            delta = self._extract_delta_text(event)
+            if not delta:
+                continue
+            if "first_token_ms" not in timing:
+                timing["first_token_ms"] = (time.perf_counter() - started) * 1000.0
+            chunks.append(delta)
+            if on_delta is not None and not cancel.cancelled:
+                on_delta("".join(chunks))
+        if done and not cancel.cancelled:
+            # Drain the terminating chunk so the connection can go back to the pool.
+            response.read()
+        return "".join(chunks), usage
+
+    def _cancelled_result(self, started: float, timing: dict[str, Any]) -> InlineCompletionResult:
+        timing["total_ms"] = (time.perf_counter() - started) * 1000.0
+        return InlineCompletionResult(
+            ok=False,
+            status_text="AI request cancelled.",
+            error_kind="cancelled",
+            details={"latency": dict(timing)},
         )
 
+    def _record_latency(self, started: float, timing: dict[str, Any], *, ok: bool) -> None:
+        total_ms = (time.perf_counter() - started) * 1000.0
+        timing["total_ms"] = total_ms
+        if not ok:
+            return
+        self._total_latency.record(total_ms)
+        if "first_token_ms" in timing:
+            self._first_token_latency.record(float(timing["first_token_ms"]))
+
+    def _transport_error(self, exc: BaseException) -> _ProviderError:
+        if isinstance(exc, ssl.SSLError):
+            message = "TLS handshake failed. Check endpoint certificate settings."
+        elif isinstance(exc, (socket.timeout, TimeoutError)):
+            message = "Connection timed out. Endpoint is unreachable."
+        elif isinstance(exc, ConnectionRefusedError):
+            message = "Connection refused by endpoint."
+        elif isinstance(exc, (OSError, http.client.HTTPException)):
+            message = "Could not reach AI endpoint. Check base URL and network connectivity."
+        else:
+            return _ProviderError("Unexpected provider response.", error_kind="unknown")
+        return _ProviderError(message, error_kind="network")
+
     def _request_json(
         self,
         *,
@@ -169,21 +536,7 @@ class OpenAICompatibleClient(AIProviderClient):
         if payload is not None:
             data_bytes = json.dumps(payload, ensure_ascii=True).encode("utf-8")
 
-        headers = {
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-            "User-Agent": "PyTPO-AI/1.0",
-        }
-        token = str(api_key or "").strip()
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
-        org_val = str(org_id or "").strip()
-        if org_val:
-            headers["OpenAI-Organization"] = org_val
-        project_val = str(project_id or "").strip()
-        if project_val:
-            headers["OpenAI-Project"] = project_val
-
+        headers = self._build_headers(api_key=api_key, org_id=org_id, project_id=project_id)
         req = urllib.request.Request(url=url, method=method.upper(), data=data_bytes, headers=headers)
         try:
             with urllib.request.urlopen(req, timeout=max(0.5, float(timeout_s))) as resp:
@@ -241,6 +594,23 @@ class OpenAICompatibleClient(AIProviderClient):
                 "error_kind": "unknown",
             }
 
+    def _build_headers(self, *, api_key: str, org_id: str, project_id: str, accept: str = "application/json") -> dict[str, str]:
+        headers = {
+            "Accept": accept,
+            "Content-Type": "application/json",
+            "User-Agent": "PyTPO-AI/1.0",
+        }
+        token = str(api_key or "").strip()
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        org_val = str(org_id or "").strip()
+        if org_val:
+            headers["OpenAI-Organization"] = org_val
+        project_val = str(project_id or "").strip()
+        if project_val:
+            headers["OpenAI-Project"] = project_val
+        return headers
+
     def _model_cache_key(self, base_url: str, api_key: str) -> str:
         digest = hashlib.sha256(str(api_key or "").encode("utf-8")).hexdigest()[:16]
         return f"{base_url}|{digest}"
@@ -296,3 +666,17 @@ class OpenAICompatibleClient(AIProviderClient):
         if isinstance(text, str):
             return text
         return ""
+
+    def _extract_delta_text(self, event: dict[str, Any]) -> str:
+        choices = event.get("choices")
+        if not isinstance(choices, list) or not choices:
+            return ""
+        first = choices[0]
+        if not isinstance(first, dict):
+            return ""
+        delta = first.get("delta")
+        if isinstance(delta, dict):
+            content = delta.get("content")
+            return content if isinstance(content, str) else ""
+        text = first.get("text")
+        return text if isinstance(text, str) else ""
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import threading
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -30,6 +32,7 @@ class InlineCompletionRequest:
     user_prompt: str
     max_output_tokens: int
     timeout_s: float
+    stream: bool = True
 
 
 @dataclass(slots=True)
@@ -38,6 +41,53 @@ class InlineCompletionResult(ProviderResult):
     usage: dict[str, Any] = field(default_factory=dict)
 
 
+class InlineCancelToken:
+    """Cross-thread cancel flag for one inline request.
+
+    Providers attach closers that abort their transport (e.g. shut down the socket),
+    so a superseded request stops reading instead of running to completion.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._closers: list[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            closers = list(self._closers)
+            self._closers.clear()
+        for closer in closers:
+            try:
+                closer()
+            except Exception:
+                pass
+
+    def attach(self, closer: Callable[[], None]) -> None:
+        with self._lock:
+            if not self._cancelled:
+                self._closers.append(closer)
+                return
+        closer()
+
+    def detach(self, closer: Callable[[], None]) -> None:
+        with self._lock:
+            try:
+                self._closers.remove(closer)
+            except ValueError:
+                pass
+
+
+InlineDeltaCallback = Callable[[str], None]
+
+
 class AIProviderClient(ABC):
     @abstractmethod
     def fetch_models(
@@ -65,5 +115,12 @@ class AIProviderClient(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def complete_inline(self, request: InlineCompletionRequest) -> InlineCompletionResult:
+    def complete_inline(
+        self,
+        request: InlineCompletionRequest,
+        *,
+        on_delta: InlineDeltaCallback | None = None,
+        cancel: InlineCancelToken | None = None,
+    ) -> InlineCompletionResult:
+        """Complete ``request``; ``on_delta`` receives the accumulated text while streaming."""
         raise NotImplementedError
@@ -0,0 +1,487 @@
+from __future__ import annotations
+
+import concurrent.futures
+import heapq
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from barley_ide.services.file_io import atomic_write_text
+
+INDEX_FORMAT_VERSION = 1
+SOURCE_SUFFIXES = (".py", ".pyw", ".pyi")
+SKIPPED_DIR_NAMES = {".git", ".venv", "__pycache__", ".ruff_cache", ".mypy_cache", ".cache", ".tide"}
+QUERY_STOP_WORDS = {"self", "true", "false", "none"}
+BM25_K1 = 1.2
+BM25_B = 0.75
+STALE_AFTER_S = 300.0
+LATENCY_WINDOW = 256
+
+_IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]{1,40}")
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-cased identifiers plus their snake/camel-case parts."""
+    out: list[str] = []
+    for ident in _IDENT_RE.findall(text):
+        low = ident.lower()
+        out.append(low)
+        parts = [part.lower() for piece in ident.split("_") for part in _CAMEL_RE.findall(piece)]
+        if len(parts) > 1:
+            out.extend(part for part in parts if len(part) > 1 and part != low)
+    return out
+
+
+def split_chunks(text: str, *, cap_each: int, max_segments: int) -> list[str]:
+    """Blank-line separated chunks, each capped; mirrors the pre-index snippet split."""
+    out: list[str] = []
+    for chunk in re.split(r"\n\s*\n", text):
+        chunk = chunk.strip()
+        if not chunk:
+            continue
+        out.append(chunk[:cap_each])
+        if len(out) >= max_segments:
+            break
+    return out
+
+
+@dataclass(frozen=True, slots=True)
+class ChunkingConfig:
+    file_read_cap_chars: int = 18000
+    snippet_char_cap: int = 420
+    snippet_segment_limit: int = 80
+
+
+@dataclass(slots=True)
+class _Chunk:
+    path: str
+    text: str
+    length: int
+    term_freqs: dict[str, int]
+
+
+@dataclass(slots=True)
+class _FileEntry:
+    mtime_ns: int
+    size: int
+    chunk_ids: list[int] = field(default_factory=list)
+
+
+@dataclass(frozen=True, slots=True)
+class RetrievalHit:
+    score: float
+    path: str
+    text: str
+
+
+class ProjectRetrievalIndex:
+    """Chunked BM25 inverted index over the project's Python sources.
+
+    Files are re-read only when their ``(mtime_ns, size)`` changes. Updates run
+    on a single background worker; queries only touch in-memory postings and
+    never block on a refresh.
+    """
+
+    def __init__(
+        self,
+        project_root: str,
+        *,
+        cache_path: str | None = None,
+        chunking: ChunkingConfig | None = None,
+    ) -> None:
+        self.project_root = os.path.abspath(str(project_root or ""))
+        self._cache_path = Path(cache_path) if cache_path else None
+        self._chunking = chunking or ChunkingConfig()
+        self._lock = threading.RLock()
+        self._files: dict[str, _FileEntry] = {}
+        self._chunks: dict[int, _Chunk] = {}
+        self._postings: dict[str, dict[int, int]] = {}
+        self._total_length = 0
+        self._next_chunk_id = 1
+        self._ready = False
+        self._dirty = False
+        self._last_full_refresh = 0.0
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="pytpo-ai-retrieval")
+        self._pending_paths: set[str] = set()
+        self._pending_full = False
+        self._worker: concurrent.futures.Future | None = None
+
+        self._latencies_ms: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._queries = 0
+        self._hits = 0
+        self._misses_not_ready = 0
+        self._last_refresh_ms = 0.0
+
+    # ---------- State ----------
+
+    def is_ready(self) -> bool:
+        return self._ready
+
+    def configure(self, chunking: ChunkingConfig) -> None:
+        """Switch chunking limits; a change re-chunks every file on the next refresh."""
+        with self._lock:
+            if chunking == self._chunking:
+                return
+            self._chunking = chunking
+            self._clear_locked()
+            self._ready = False
+        self.schedule_refresh()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies_ms)
+            queries = self._queries
+            hits = self._hits
+            files = len(self._files)
+            chunks = len(self._chunks)
+            terms = len(self._postings)
+
+        def _pct(q: float) -> float:
+            if not latencies:
+                return 0.0
+            return float(latencies[min(len(latencies) - 1, int(q * (len(latencies) - 1) + 0.5))])
+
+        return {
+            "ready": self._ready,
+            "files": files,
+            "chunks": chunks,
+            "terms": terms,
+            "queries": queries,
+            "hits": hits,
+            "hit_rate": (hits / queries) if queries else 0.0,
+            "not_ready": self._misses_not_ready,
+            "latency_ms_p50": _pct(0.5),
+            "latency_ms_p95": _pct(0.95),
+            "latency_ms_max": float(latencies[-1]) if latencies else 0.0,
+            "last_refresh_ms": self._last_refresh_ms,
+        }
+
+    # ---------- Background maintenance ----------
+
+    def schedule_refresh(self, paths: Iterable[str] | None = None) -> None:
+        """Queue a refresh of ``paths`` (files or directories), or of the whole project."""
+        with self._lock:
+            if paths is None:
+                self._pending_full = True
+            else:
+                self._pending_paths.update(os.path.abspath(str(p)) for p in paths if str(p or "").strip())
+            if self._worker is not None:
+                return
+            try:
+                self._worker = self._executor.submit(self._drain_pending)
+            except RuntimeError:
+                self._worker = None
+
+    def ensure_started(self) -> None:
+        """Load the persisted index (or build one) in the background if nothing is loaded yet."""
+        with self._lock:
+            stale = (time.monotonic() - self._last_full_refresh) > STALE_AFTER_S
+            busy = self._worker is not None
+        if (not self._ready or stale) and not busy:
+            self.schedule_refresh()
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + max(0.0, float(timeout))
+        while True:
+            with self._lock:
+                worker = self._worker
+            if worker is None or worker.done():
+                return True
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            concurrent.futures.wait([worker], timeout=remaining)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.save()
+
+    def _drain_pending(self) -> None:
+        while True:
+            with self._lock:
+                full = self._pending_full
+                paths = set(self._pending_paths)
+                self._pending_full = False
+                self._pending_paths.clear()
+                if not full and not paths:
+                    # Cleared under the lock so a concurrent schedule_refresh starts a new worker.
+                    self._worker = None
+                    break
+            started = time.perf_counter()
+            try:
+                if full:
+                    if not self._ready and not self._files:
+                        self.load()
+                    self._refresh_full()
+                else:
+                    self._refresh_paths(paths)
+            except Exception:
+                # Keep the worker loop alive; the next save/watch event retries.
+                continue
+            self._last_refresh_ms = (time.perf_counter() - started) * 1000.0
+        self.save()
+
+    def _iter_source_files(self, top: str, *, recursive: bool) -> Iterable[str]:
+        if not recursive:
+            try:
+                names = sorted(os.listdir(top))
+            except OSError:
+                return
+            for name in names:
+                if name.endswith(SOURCE_SUFFIXES):
+                    path = os.path.join(top, name)
+                    if os.path.isfile(path):
+                        yield path
+            return
+        for dirpath, dirnames, filenames in os.walk(top):
+            dirnames[:] = [d for d in dirnames if d not in SKIPPED_DIR_NAMES]
+            for fname in sorted(filenames):
+                if fname.endswith(SOURCE_SUFFIXES):
+                    yield os.path.join(dirpath, fname)
+
+    def _is_indexable(self, path: str) -> bool:
+        if not path.endswith(SOURCE_SUFFIXES):
+            return False
+        try:
+            rel = os.path.relpath(path, self.project_root)
+        except ValueError:
+            return False
+        parts = rel.replace("\\", "/").split("/")
+        if parts[0] == "..":
+            return False
+        return not any(part in SKIPPED_DIR_NAMES for part in parts[:-1])
+
+    def _refresh_full(self) -> None:
+        seen: set[str] = set()
+        for path in self._iter_source_files(self.project_root, recursive=True):
+            seen.add(path)
+            self._update_file(path)
+        with self._lock:
+            for path in [p for p in self._files if p not in seen]:
+                self._remove_file_locked(path)
+            self._ready = True
+            self._last_full_refresh = time.monotonic()
+
+    def _refresh_paths(self, paths: set[str]) -> None:
+        for path in sorted(paths):
+            if os.path.isdir(path):
+                if not self._is_indexable(os.path.join(path, "x.py")):
+                    continue
+                present = set(self._iter_source_files(path, recursive=False))
+                for child in present:
+                    self._update_file(child)
+                with self._lock:
+                    gone = [p for p in self._files if os.path.dirname(p) == path and p not in present]
+                    for child in gone:
+                        self._remove_file_locked(child)
+                continue
+            if not self._is_indexable(path):
+                continue
+            if os.path.isfile(path):
+                self._update_file(path)
+            else:
+                with self._lock:
+                    self._remove_file_locked(path)
+
+    def _update_file(self, path: str) -> None:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            with self._lock:
+                self._remove_file_locked(path)
+            return
+        key = (int(stat.st_mtime_ns), int(stat.st_size))
+        with self._lock:
+            entry = self._files.get(path)
+            if entry is not None and (entry.mtime_ns, entry.size) == key:
+                return
+            chunking = self._chunking
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                text = handle.read(chunking.file_read_cap_chars)
+        except (OSError, UnicodeDecodeError):
+            text = ""
+        chunks = split_chunks(text, cap_each=chunking.snippet_char_cap, max_segments=chunking.snippet_segment_limit)
+        with self._lock:
+            self._remove_file_locked(path)
+            entry = _FileEntry(mtime_ns=key[0], size=key[1])
+            for chunk_text in chunks:
+                self._add_chunk_locked(path, chunk_text, entry)
+            self._files[path] = entry
+            self._dirty = True
+
+    def _add_chunk_locked(self, path: str, text: str, entry: _FileEntry) -> None:
+        terms = tokenize(text)
+        if not terms:
+            return
+        freqs: dict[str, int] = {}
+        for term in terms:
+            freqs[term] = freqs.get(term, 0) + 1
+        chunk_id = self._next_chunk_id
+        self._next_chunk_id += 1
+        self._chunks[chunk_id] = _Chunk(path=path, text=text, length=len(terms), term_freqs=freqs)
+        self._total_length += len(terms)
+        for term, tf in freqs.items():
+            self._postings.setdefault(term, {})[chunk_id] = tf
+        entry.chunk_ids.append(chunk_id)
+
+    def _remove_file_locked(self, path: str) -> None:
+        entry = self._files.pop(path, None)
+        if entry is None:
+            return
+        for chunk_id in entry.chunk_ids:
+            chunk = self._chunks.pop(chunk_id, None)
+            if chunk is None:
+                continue
+            self._total_length -= chunk.length
+            for term in chunk.term_freqs:
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                postings.pop(chunk_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._dirty = True
+
+    def _clear_locked(self) -> None:
+        self._files.clear()
+        self._chunks.clear()
+        self._postings.clear()
+        self._total_length = 0
+        self._dirty = True
+
+    # ---------- Query ----------
+
+    def query(
+        self,
+        query_tokens: Iterable[str],
+        *,
+        limit: int,
+        exclude_path: str = "",
+        boost: Callable[[str], float] | None = None,
+    ) -> list[RetrievalHit]:
+        """Top ``limit`` chunks by BM25, plus ``boost(path)`` for chunks that matched."""
+        started = time.perf_counter()
+        terms = {term for raw in query_tokens for term in tokenize(str(raw))}
+        exclude = os.path.abspath(exclude_path) if exclude_path else ""
+        hits: list[RetrievalHit] = []
+        with self._lock:
+            if not self._ready:
+                self._misses_not_ready += 1
+                return []
+            n_chunks = len(self._chunks)
+            if terms and n_chunks and limit > 0:
+                chunks = self._chunks
+                length_scale = BM25_K1 * BM25_B / max(1.0, self._total_length / n_chunks)
+                length_base = BM25_K1 * (1.0 - BM25_B)
+                scores: dict[int, float] = {}
+                for term in terms:
+                    postings = self._postings.get(term)
+                    if not postings:
+                        continue
+                    df = len(postings)
+                    idf = math.log(1.0 + (n_chunks - df + 0.5) / (df + 0.5))
+                    weight = idf * (BM25_K1 + 1.0)
+                    for chunk_id, tf in postings.items():
+                        norm = tf + length_base + length_scale * chunks[chunk_id].length
+                        scores[chunk_id] = scores.get(chunk_id, 0.0) + weight * tf / norm
+                boosts: dict[str, float] = {}
+
+                def _total(item: tuple[int, float]) -> float:
+                    path = chunks[item[0]].path
+                    if path == exclude:
+                        return -1.0
+                    if boost is None:
+                        return item[1]
+                    bonus = boosts.get(path)
+                    if bonus is None:
+                        bonus = boosts[path] = float(boost(path))
+                    return item[1] + bonus
+
+                for item in heapq.nlargest(limit, scores.items(), key=_total):
+                    total = _total(item)
+                    if total < 0:
+                        continue
+                    chunk = chunks[item[0]]
+                    hits.append(RetrievalHit(total, chunk.path, chunk.text))
+            self._queries += 1
+            if hits:
+                self._hits += 1
+            self._latencies_ms.append((time.perf_counter() - started) * 1000.0)
+        return hits
+
+    # ---------- Persistence ----------
+
+    def load(self) -> bool:
+        path = self._cache_path
+        if path is None or not path.is_file():
+            return False
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        if not isinstance(payload, dict) or payload.get("version") != INDEX_FORMAT_VERSION:
+            return False
+        if payload.get("root") != self.project_root:
+            return False
+        with self._lock:
+            if list(payload.get("chunking") or []) != [
+                self._chunking.file_read_cap_chars,
+                self._chunking.snippet_char_cap,
+                self._chunking.snippet_segment_limit,
+            ]:
+                return False
+            self._clear_locked()
+            for file_path, raw in dict(payload.get("files") or {}).items():
+                if not isinstance(raw, dict):
+                    continue
+                entry = _FileEntry(mtime_ns=int(raw.get("mtime_ns") or 0), size=int(raw.get("size") or 0))
+                for chunk_text in raw.get("chunks") or []:
+                    self._add_chunk_locked(str(file_path), str(chunk_text), entry)
+                self._files[str(file_path)] = entry
+            self._dirty = False
+            # Serve the persisted snapshot right away; the refresh that follows re-stats it.
+            self._ready = True
+        return True
+
+    def save(self) -> bool:
+        path = self._cache_path
+        if path is None or not path.parent.is_dir():
+            return False
+        with self._lock:
+            if not self._dirty or not self._ready:
+                return True
+            payload = {
+                "version": INDEX_FORMAT_VERSION,
+                "root": self.project_root,
+                "chunking": [
+                    self._chunking.file_read_cap_chars,
+                    self._chunking.snippet_char_cap,
+                    self._chunking.snippet_segment_limit,
+                ],
+                "files": {
+                    file_path: {
+                        "mtime_ns": entry.mtime_ns,
+                        "size": entry.size,
+                        "chunks": [self._chunks[cid].text for cid in entry.chunk_ids if cid in self._chunks],
+                    }
+                    for file_path, entry in self._files.items()
+                },
+            }
+            self._dirty = False
+        try:
+            atomic_write_text(str(path), json.dumps(payload, separators=(",", ":")), fsync=False)
+        except OSError:
+            with self._lock:
+                self._dirty = True
+            return False
+        return True
@@ -28,6 +28,8 @@ class AIAssistSettings(TypedDict, total=False):
     imports_outline_max_imports: int
     imports_outline_max_symbols: int
     retrieval_file_read_cap_chars: int
+    # No longer applied: retrieval is served from the project index rather than a per-request
+    # scan. Kept so existing settings files keep loading and saving unchanged.
     retrieval_same_dir_file_limit: int
     retrieval_recent_file_limit: int
     retrieval_walk_file_limit: int
@@ -171,10 +173,7 @@ class NormalizedAIAssistConfig:
     imports_outline_max_imports: int
     imports_outline_max_symbols: int
     retrieval_file_read_cap_chars: int
-    retrieval_same_dir_file_limit: int
     retrieval_recent_file_limit: int
-    retrieval_walk_file_limit: int
-    retrieval_total_candidate_limit: int
     retrieval_snippet_char_cap: int
     retrieval_snippet_segment_limit: int
     prompt_overrides: list[dict[str, Any]]
@@ -199,10 +198,7 @@ class NormalizedAIAssistConfig:
             imports_outline_max_imports=int(n["imports_outline_max_imports"]),
             imports_outline_max_symbols=int(n["imports_outline_max_symbols"]),
             retrieval_file_read_cap_chars=int(n["retrieval_file_read_cap_chars"]),
-            retrieval_same_dir_file_limit=int(n["retrieval_same_dir_file_limit"]),
             retrieval_recent_file_limit=int(n["retrieval_recent_file_limit"]),
-            retrieval_walk_file_limit=int(n["retrieval_walk_file_limit"]),
-            retrieval_total_candidate_limit=int(n["retrieval_total_candidate_limit"]),
             retrieval_snippet_char_cap=int(n["retrieval_snippet_char_cap"]),
             retrieval_snippet_segment_limit=int(n["retrieval_snippet_segment_limit"]),
             prompt_overrides=[dict(item) for item in n["prompt_overrides"]],
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+# Only the text near the cursor reaches the prompt, so hashing a bounded window keeps
+# keystroke-time hashing cheap on large files without changing which requests collide.
+PREFIX_WINDOW_CHARS = 16000
+SUFFIX_WINDOW_CHARS = 8000
+# Tail of the prefix kept per entry to confirm a typed-through match.
+TYPED_THROUGH_ANCHOR_CHARS = 256
+_ENTRY_OVERHEAD_BYTES = 160
+
+
+@dataclass(frozen=True, slots=True)
+class InlineCacheKey:
+    file_path: str
+    prefix_hash: str
+    suffix_hash: str
+    model: str
+
+
+@dataclass(frozen=True, slots=True)
+class InlineCacheHit:
+    text: str
+    kind: str  # "exact" or "typed_through"
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    key: InlineCacheKey
+    text: str
+    prefix_window: str
+    size: int
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8", errors="surrogatepass"), digest_size=16).hexdigest()
+
+
+def split_at_cursor(source_text: str, line: int, column: int) -> tuple[str, str]:
+    """Return ``(prefix, suffix)`` windows around 1-based ``line`` / 0-based ``column``."""
+    text = str(source_text or "")
+    offset = 0
+    for _ in range(max(0, int(line) - 1)):
+        nl = text.find("\n", offset)
+        if nl < 0:
+            offset = len(text)
+            break
+        offset = nl + 1
+    line_end = text.find("\n", offset)
+    if line_end < 0:
+        line_end = len(text)
+    offset = min(line_end, offset + max(0, int(column)))
+    return text[max(0, offset - PREFIX_WINDOW_CHARS):offset], text[offset:offset + SUFFIX_WINDOW_CHARS]
+
+
+def make_cache_key(*, file_path: str, prefix: str, suffix: str, model: str) -> InlineCacheKey:
+    return InlineCacheKey(
+        file_path=str(file_path or ""),
+        prefix_hash=_digest(prefix),
+        suffix_hash=_digest(suffix),
+        model=str(model or ""),
+    )
+
+
+class InlineSuggestionCache:
+    """Memory-bounded LRU of completed inline suggestions.
+
+    Besides exact hits, a lookup whose prefix extends a cached prefix by exactly the
+    leading characters of that suggestion ("typing through" ghost text) is answered
+    with the remaining tail.
+    """
+
+    def __init__(self, *, max_entries: int = 256, max_bytes: int = 1_000_000, typed_through_candidates: int = 8) -> None:
+        self._max_entries = max(1, int(max_entries))
+        self._max_bytes = max(1024, int(max_bytes))
+        self._max_candidates = max(1, int(typed_through_candidates))
+        self._entries: OrderedDict[InlineCacheKey, _CacheEntry] = OrderedDict()
+        self._recent_by_anchor: dict[tuple[str, str, str], list[InlineCacheKey]] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._typed_through_hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+
+    def lookup(self, key: InlineCacheKey, prefix: str) -> InlineCacheHit | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return InlineCacheHit(text=entry.text, kind="exact")
+
+        for candidate_key in reversed(self._recent_by_anchor.get(self._anchor(key), [])):
+            candidate = self._entries.get(candidate_key)
+            if candidate is None:
+                continue
+            remaining = self._typed_through(candidate, prefix)
+            if remaining is None:
+                continue
+            self._entries.move_to_end(candidate_key)
+            self._typed_through_hits += 1
+            self.store(key, prefix, remaining, count=False)
+            return InlineCacheHit(text=remaining, kind="typed_through")
+
+        self._misses += 1
+        return None
+
+    def store(self, key: InlineCacheKey, prefix: str, text: str, *, count: bool = True) -> None:
+        value = str(text or "")
+        if not value.strip():
+            return
+        window = prefix[-TYPED_THROUGH_ANCHOR_CHARS:]
+        size = len(value) * 2 + len(window) * 2 + _ENTRY_OVERHEAD_BYTES
+        if size > self._max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = _CacheEntry(key=key, text=value, prefix_window=window, size=size)
+        self._bytes += size
+        anchor = self._recent_by_anchor.setdefault(self._anchor(key), [])
+        anchor.append(key)
+        if len(anchor) > self._max_candidates:
+            del anchor[0]
+        if count:
+            self._stores += 1
+        while self._entries and (len(self._entries) > self._max_entries or self._bytes > self._max_bytes):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._recent_by_anchor.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self._hits + self._typed_through_hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self._hits,
+            "typed_through_hits": self._typed_through_hits,
+            "misses": self._misses,
+            "stores": self._stores,
+            "evictions": self._evictions,
+            "hit_rate": ((self._hits + self._typed_through_hits) / lookups) if lookups else 0.0,
+        }
+
+    def _typed_through(self, entry: _CacheEntry, prefix: str) -> str | None:
+        # The new prefix must be the cached prefix plus a proper leading slice of the suggestion.
+        # Prefix windows slide, so compare the tail we kept instead of re-hashing.
+        for typed_len in range(1, len(entry.text)):
+            typed = entry.text[:typed_len]
+            if not prefix.endswith(typed):
+                continue
+            if prefix[: len(prefix) - typed_len].endswith(entry.prefix_window):
+                remaining = entry.text[typed_len:]
+                return remaining if remaining.strip() else None
+        return None
+
+    def _remove(self, key: InlineCacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        anchor_key = self._anchor(key)
+        anchor = self._recent_by_anchor.get(anchor_key)
+        if anchor is not None:
+            try:
+                anchor.remove(key)
+            except ValueError:
+                pass
+            if not anchor:
+                self._recent_by_anchor.pop(anchor_key, None)
+
+    @staticmethod
+    def _anchor(key: InlineCacheKey) -> tuple[str, str, str]:
+        return (key.file_path, key.suffix_hash, key.model)
@@ -21,13 +21,26 @@ if _MONITOR_LAUNCH is not None:
         )
     )
 
-from PySide6.QtGui import QIcon
-from PySide6.QtWidgets import QApplication
+from barley_ide.startup_profile import (
+    active_profiler,
+    split_profile_args,
+    start_profiler_from_argv,
+    startup_mark,
+    startup_phase,
+)
 
-from barley_ide.file_dialog_settings import configure_shared_file_dialog_defaults
-from barley_ide.storage_paths import migrate_legacy_ide_storage
-from barley_ide.ui.python_ide import PythonIDE, request_project_activation
-from barley_ide.settings_manager import SettingsManager
+# Started before the heavy imports below so their cost shows up in the report.
+start_profiler_from_argv(sys.argv[1:])
+
+with startup_phase("import barley_ide.ui.python_ide"):
+    from PySide6.QtCore import QTimer
+    from PySide6.QtGui import QIcon
+    from PySide6.QtWidgets import QApplication
+
+    from barley_ide.file_dialog_settings import configure_shared_file_dialog_defaults
+    from barley_ide.storage_paths import migrate_legacy_ide_storage
+    from barley_ide.ui.python_ide import PythonIDE, request_project_activation
+    from barley_ide.settings_manager import SettingsManager
 
 
 def _linger_non_daemon_threads(
@@ -131,10 +144,23 @@ def _startup_project_from_cli_or_settings(argv: list[str]) -> str | None:
     return None
 
 
+def _finish_startup_profile(app: QApplication) -> None:
+    profiler = active_profiler()
+    if profiler is None:
+        return
+    profiler.mark("first event loop turn")
+    profiler.write_report()
+    if profiler.exit_after_report:
+        app.quit()
+
+
 def main(argv: list[str] | None = None) -> int:
     runtime_args = list(sys.argv[1:] if argv is None else argv)
+    start_profiler_from_argv(runtime_args)
+    runtime_args = split_profile_args(runtime_args)[0]
     cli_args, force_no_project = _split_startup_args(runtime_args)
-    startup_project = None if force_no_project else _startup_project_from_cli_or_settings(cli_args)
+    with startup_phase("resolve startup project"):
+        startup_project = None if force_no_project else _startup_project_from_cli_or_settings(cli_args)
     start_no_project_mode = startup_project is None
     if start_no_project_mode:
         os.environ[PythonIDE.NO_PROJECT_MODE_ENV] = "1"
@@ -149,7 +175,8 @@ def main(argv: list[str] | None = None) -> int:
     if request_project_activation(target_project):
         return 0
 
-    app = QApplication([sys.argv[0], *cli_args])
+    with startup_phase("create QApplication"):
+        app = QApplication([sys.argv[0], *cli_args])
     if hasattr(app, "setDesktopFileName"):
         app.setDesktopFileName("barley-ide")
     configure_shared_file_dialog_defaults()
@@ -163,9 +190,16 @@ def main(argv: list[str] | None = None) -> int:
         icon = QIcon(str(icon_path))
         if not icon.isNull():
             app.setWindowIcon(icon)
-    ide = PythonIDE()
-    ide.apply_selected_theme()
-    ide.show()
+    with startup_phase("construct PythonIDE"):
+        ide = PythonIDE()
+    with startup_phase("apply theme"):
+        ide.apply_selected_theme()
+    with startup_phase("show main window"):
+        ide.show()
+    startup_mark("main window shown")
+    if active_profiler() is not None:
+        # Queued after the IDE's own startup pipeline, which is scheduled from showEvent.
+        QTimer.singleShot(0, lambda: _finish_startup_profile(app))
     exit_code = int(app.exec())
     lingering = _linger_non_daemon_threads()
     if lingering:
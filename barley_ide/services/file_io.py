@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+import stat
 import tempfile
 from pathlib import Path
 
@@ -21,22 +22,78 @@ def atomic_write_text(
     *,
     encoding: str = "utf-8",
     create_backup: bool = False,
+    fsync: bool = True,
+    preserve_metadata: bool = True,
 ) -> None:
+    """Write ``text`` via temp file + rename so readers never see a truncated file.
+
+    When ``preserve_metadata`` is set, the mode and (where permitted) ownership of
+    an existing target are carried over to the replacement file.
+    """
     target = Path(path)
     target.parent.mkdir(parents=True, exist_ok=True)
 
+    existing_stat: os.stat_result | None = None
+    if preserve_metadata:
+        try:
+            existing_stat = os.stat(target)
+        except OSError:
+            existing_stat = None
+
     if create_backup and target.exists():
         backup = target.with_suffix(target.suffix + ".bak")
         backup.write_bytes(target.read_bytes())
 
+    data = text.encode(encoding)
     fd, tmp_path = tempfile.mkstemp(prefix=target.name + ".", suffix=".tmp", dir=str(target.parent))
     try:
-        with os.fdopen(fd, "w", encoding=encoding) as handle:
-            handle.write(text)
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            if existing_stat is not None:
+                _copy_file_metadata(handle.fileno(), existing_stat)
+            if fsync:
+                os.fsync(handle.fileno())
         os.replace(tmp_path, target)
+        if fsync:
+            _fsync_directory(target.parent)
     finally:
         if os.path.exists(tmp_path):
             try:
                 os.unlink(tmp_path)
             except Exception:
                 pass
+
+
+def _copy_file_metadata(fd: int, existing_stat: os.stat_result) -> None:
+    try:
+        os.fchmod(fd, stat.S_IMODE(existing_stat.st_mode))
+    except (AttributeError, OSError):
+        pass
+    chown = getattr(os, "fchown", None)
+    if not callable(chown):
+        return
+    try:
+        chown(fd, existing_stat.st_uid, existing_stat.st_gid)
+    except OSError:
+        # Unprivileged users may only keep the group; ownership changes are best effort.
+        try:
+            chown(fd, -1, existing_stat.st_gid)
+        except OSError:
+            pass
+
+
+def _fsync_directory(directory: Path) -> None:
+    flags = getattr(os, "O_DIRECTORY", None)
+    if flags is None:
+        return
+    try:
+        dir_fd = os.open(str(directory), os.O_RDONLY | flags)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
@@ -0,0 +1,222 @@
+"""Memory-mapped line index for read-only viewing of very large text files."""
+
+from __future__ import annotations
+
+import bisect
+import mmap
+import os
+import re
+import threading
+from array import array
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+
+_INDEX_CHUNK_BYTES = 4 * 1024 * 1024
+_SEARCH_CHUNK_BYTES = 8 * 1024 * 1024
+MAX_RENDERED_LINE_CHARS = 4096
+
+
+@dataclass(frozen=True, slots=True)
+class LargeFileMatch:
+    line: int
+    start_column: int
+    end_column: int
+    byte_offset: int
+    byte_end: int
+
+
+class LargeFileLineIndex:
+    """Maps a file read-only and records the byte offset of every line start.
+
+    The offset table is built on a background thread so the caller can start
+    rendering the head of the file immediately; readers only ever see the
+    prefix of the table that has already been published.
+    """
+
+    def __init__(self, path: str, *, encoding: str = "utf-8") -> None:
+        self.path = str(path)
+        self.encoding = str(encoding or "utf-8")
+        self._handle = open(self.path, "rb")
+        try:
+            self.size_bytes = int(os.fstat(self._handle.fileno()).st_size)
+            self._map: mmap.mmap | None = (
+                mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ) if self.size_bytes > 0 else None
+            )
+        except Exception:
+            self._handle.close()
+            raise
+        self._offsets = array("q", [0])
+        self._lock = threading.Lock()
+        self._scanned_bytes = 0
+        self._complete = self.size_bytes == 0
+        self._cancelled = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # -------- indexing --------
+
+    def start(self) -> None:
+        if self._complete or self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._build_offsets,
+            name="pytpo-large-file-index",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self._complete
+
+    def _build_offsets(self) -> None:
+        data = self._map
+        if data is None:
+            return
+        pos = 0
+        size = self.size_bytes
+        while pos < size and not self._cancelled.is_set():
+            end = min(size, pos + _INDEX_CHUNK_BYTES)
+            chunk = data[pos:end]
+            found = array("q")
+            hit = chunk.find(b"\n")
+            while hit >= 0:
+                line_start = pos + hit + 1
+                if line_start < size:
+                    found.append(line_start)
+                hit = chunk.find(b"\n", hit + 1)
+            with self._lock:
+                self._offsets.extend(found)
+                self._scanned_bytes = end
+            pos = end
+        with self._lock:
+            self._complete = not self._cancelled.is_set()
+
+    def is_complete(self) -> bool:
+        return self._complete
+
+    def progress(self) -> float:
+        if self.size_bytes <= 0:
+            return 1.0
+        return min(1.0, float(self._scanned_bytes) / float(self.size_bytes))
+
+    def line_count(self) -> int:
+        """Number of lines whose start offset is known so far."""
+        with self._lock:
+            return len(self._offsets)
+
+    # -------- reading --------
+
+    def _line_span(self, line: int) -> tuple[int, int] | None:
+        with self._lock:
+            count = len(self._offsets)
+            if line < 0 or line >= count:
+                return None
+            start = int(self._offsets[line])
+            if line + 1 < count:
+                end = int(self._offsets[line + 1])
+            elif self._complete:
+                end = self.size_bytes
+            else:
+                # The next line start has not been published yet; only render up to
+                # what the indexer has scanned so a partial line is never shown twice.
+                end = max(start, int(self._scanned_bytes))
+        return start, end
+
+    def line_text(self, line: int, *, max_chars: int = MAX_RENDERED_LINE_CHARS) -> str | None:
+        span = self._line_span(line)
+        if span is None or self._map is None:
+            return "" if span is not None else None
+        start, end = span
+        limit = max(0, int(max_chars)) * 4
+        raw = self._map[start:min(end, start + limit) if limit else end]
+        text = raw.decode(self.encoding, errors="replace").rstrip("\r\n")
+        if max_chars and len(text) > max_chars:
+            text = text[:max_chars]
+        return text
+
+    def line_for_offset(self, offset: int) -> int:
+        with self._lock:
+            return max(0, bisect.bisect_right(self._offsets, int(offset)) - 1)
+
+    def offset_for_line(self, line: int) -> int | None:
+        span = self._line_span(line)
+        return None if span is None else span[0]
+
+    # -------- searching --------
+
+    def iter_matches(
+        self,
+        pattern: str,
+        *,
+        start_offset: int = 0,
+        ignore_case: bool = False,
+        regex: bool = True,
+        cancelled: Callable[[], bool] | None = None,
+    ) -> Iterator[LargeFileMatch]:
+        """Stream matches from ``start_offset`` to end of file in bounded chunks.
+
+        Chunks are cut on line boundaries so a per-line pattern never straddles two
+        chunks. Columns are reported in characters of the decoded line.
+        """
+        data = self._map
+        if data is None or not pattern:
+            return
+        source = pattern if regex else re.escape(pattern)
+        flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+        compiled = re.compile(source.encode(self.encoding), flags)
+        size = self.size_bytes
+        pos = max(0, min(int(start_offset), size))
+        while pos < size:
+            if callable(cancelled) and cancelled():
+                return
+            end = min(size, pos + _SEARCH_CHUNK_BYTES)
+            if end < size:
+                newline = data.find(b"\n", end)
+                end = size if newline < 0 else newline + 1
+            for match in compiled.finditer(data, pos, end):
+                if match.end() == match.start():
+                    continue
+                byte_start = match.start()
+                self._wait_for_offset(byte_start, cancelled)
+                line = self.line_for_offset(byte_start)
+                line_start = self.offset_for_line(line) or 0
+                prefix = data[line_start:byte_start].decode(self.encoding, errors="replace")
+                matched = data[byte_start:match.end()].decode(self.encoding, errors="replace")
+                yield LargeFileMatch(
+                    line=line,
+                    start_column=len(prefix),
+                    end_column=len(prefix) + len(matched),
+                    byte_offset=byte_start,
+                    byte_end=match.end(),
+                )
+            pos = end
+
+    def _wait_for_offset(self, offset: int, cancelled: Callable[[], bool] | None) -> None:
+        # Line numbers are only exact once the indexer has passed ``offset``.
+        while not self._complete and self._scanned_bytes <= offset:
+            if callable(cancelled) and cancelled():
+                return
+            if self._cancelled.is_set():
+                return
+            self._cancelled.wait(0.01)
+
+    # -------- lifecycle --------
+
+    def close(self) -> None:
+        self._cancelled.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(1.0)
+        data = self._map
+        self._map = None
+        if data is not None:
+            try:
+                data.close()
+            except Exception:
+                pass
+        try:
+            self._handle.close()
+        except Exception:
+            pass
@@ -0,0 +1,431 @@
+"""Incremental, persistent index of a TDOC project.
+
+``TDocProjectIndex`` in ``TPOPyside.widgets.tdoc_core`` is stateless: every
+query re-reads the marker file and re-parses every ``.tdoc`` document. This
+module keeps the per-document parse results in memory, keyed by
+``(mtime_ns, size)`` with a content digest as a second check, so a refresh
+only re-parses documents that actually changed. Backlinks, aliases and
+validation are answered from memory and the cache is persisted as JSON
+between sessions.
+
+The cache is thread-safe; refreshes are expected to run on a worker thread
+(see ``barley_ide.ui.tdoc_index_manager``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from barley_ide.services.file_io import atomic_write_text
+from TPOPyside.widgets.tdoc_core import DOC_SUFFIX, TDocProjectIndex
+
+CACHE_FORMAT_VERSION = 1
+
+TDocLink = tuple[str, int, int, int]  # (label, line, start_col, end_col)
+TDocRef = tuple[str, int, int, int]  # (rel_path, line, start_col, end_col)
+
+
+@dataclass(slots=True)
+class TDocFileRecord:
+    rel_path: str
+    mtime_ns: int
+    size: int
+    digest: str
+    metadata: dict[str, str] = field(default_factory=dict)
+    frontmatter_issues: list[dict] = field(default_factory=list)
+    index_enabled: bool = True
+    links: list[TDocLink] = field(default_factory=list)
+
+    def to_json(self) -> dict:
+        return {
+            "mtime_ns": self.mtime_ns,
+            "size": self.size,
+            "digest": self.digest,
+            "metadata": self.metadata,
+            "frontmatter_issues": self.frontmatter_issues,
+            "index_enabled": self.index_enabled,
+            "links": [list(link) for link in self.links],
+        }
+
+    @classmethod
+    def from_json(cls, rel_path: str, payload: dict) -> "TDocFileRecord":
+        return cls(
+            rel_path=rel_path,
+            mtime_ns=int(payload.get("mtime_ns") or 0),
+            size=int(payload.get("size") or 0),
+            digest=str(payload.get("digest") or ""),
+            metadata={str(k): str(v) for k, v in dict(payload.get("metadata") or {}).items()},
+            frontmatter_issues=[dict(item) for item in payload.get("frontmatter_issues") or [] if isinstance(item, dict)],
+            index_enabled=bool(payload.get("index_enabled", True)),
+            links=[
+                (str(item[0]), int(item[1]), int(item[2]), int(item[3]))
+                for item in payload.get("links") or []
+                if isinstance(item, (list, tuple)) and len(item) == 4
+            ],
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class TDocRefreshStats:
+    root: str
+    scanned: int = 0
+    reparsed: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    full: bool = False
+    elapsed_ms: float = 0.0
+
+
+def _content_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _stat_key(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return int(stat.st_mtime_ns), int(stat.st_size)
+
+
+def _parse_record(rel_path: str, stat_key: tuple[int, int], digest: str, content: str) -> TDocFileRecord:
+    metadata, fm_issues, index_enabled, links = TDocProjectIndex.scan_document_links(content)
+    return TDocFileRecord(
+        rel_path=rel_path,
+        mtime_ns=stat_key[0],
+        size=stat_key[1],
+        digest=digest,
+        metadata=dict(metadata) if isinstance(metadata, dict) else {},
+        frontmatter_issues=[dict(issue) for issue in fm_issues],
+        index_enabled=bool(index_enabled),
+        links=list(links),
+    )
+
+
+class TDocProjectIndexCache:
+    """In-memory parse cache for one TDOC project root."""
+
+    def __init__(self, root: str, *, cache_path: str | None = None) -> None:
+        self._root = str(root or "")
+        self._cache_path = Path(cache_path) if cache_path else None
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._records: dict[str, TDocFileRecord] = {}
+        self._labels: dict[str, set[TDocRef]] = {}
+        self._aliases: tuple | None = None
+        self._marker_key: tuple[int, int] | None = None
+        self._indexed_marker_key: tuple[int, int] | None = None
+        self._populated = False
+        self._dirty = False
+
+    @property
+    def root(self) -> str:
+        return self._root
+
+    def is_populated(self) -> bool:
+        return self._populated
+
+    def document_count(self) -> int:
+        with self._lock:
+            return len(self._records)
+
+    # ---------- Persistence ----------
+
+    def load(self) -> bool:
+        """Restore records from the persisted cache; stale entries are fixed by the next refresh."""
+        path = self._cache_path
+        if path is None or not path.is_file():
+            return False
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        if not isinstance(payload, dict):
+            return False
+        if payload.get("version") != CACHE_FORMAT_VERSION or payload.get("root") != self._root:
+            return False
+        raw_files = payload.get("files")
+        if not isinstance(raw_files, dict):
+            return False
+        records: dict[str, TDocFileRecord] = {}
+        for rel_path, raw in raw_files.items():
+            if isinstance(raw, dict):
+                records[str(rel_path)] = TDocFileRecord.from_json(str(rel_path), raw)
+        with self._lock:
+            self._records = records
+            self._rebuild_label_index()
+            self._populated = True
+            self._dirty = False
+        return True
+
+    def save(self) -> bool:
+        path = self._cache_path
+        if path is None:
+            return False
+        with self._lock:
+            if not self._dirty:
+                return True
+            payload = {
+                "version": CACHE_FORMAT_VERSION,
+                "root": self._root,
+                "files": {rel: record.to_json() for rel, record in self._records.items()},
+            }
+            self._dirty = False
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(str(path), json.dumps(payload, separators=(",", ":")), fsync=False)
+        except OSError:
+            with self._lock:
+                self._dirty = True
+            return False
+        return True
+
+    # ---------- Refresh ----------
+
+    def aliases(self) -> tuple:
+        """Return the ``TDocProjectIndex.load_aliases`` tuple, reloading only when the marker changed."""
+        marker = TDocProjectIndex.marker_path(self._root)
+        key = _stat_key(marker)
+        with self._lock:
+            if self._aliases is not None and key == self._marker_key:
+                return self._aliases
+        loaded = TDocProjectIndex.load_aliases(self._root)
+        with self._lock:
+            self._aliases = loaded
+            self._marker_key = key
+        return loaded
+
+    def refresh(self, changed_paths: Iterable[str] | None = None) -> TDocRefreshStats:
+        """Bring the cache up to date with the files on disk.
+
+        With ``changed_paths`` only those documents are re-checked. A full scan
+        (stat every document, re-parse the ones whose stat and digest changed) is
+        done instead when the cache is empty or the include/ignore rules in the
+        marker file changed.
+        """
+        started = time.perf_counter()
+        with self._refresh_lock:
+            aliases = self.aliases()
+            include_patterns, ignore_patterns = aliases[3], aliases[4]
+            with self._lock:
+                marker_changed = self._marker_key != self._indexed_marker_key
+                previous = dict(self._records)
+            full = changed_paths is None or not self._populated or marker_changed
+
+            requested_rels: set[str] = set()
+            if not full:
+                requested_rels = self._rel_paths_for(changed_paths or [])
+                if not requested_rels:
+                    return TDocRefreshStats(root=self._root, elapsed_ms=(time.perf_counter() - started) * 1000.0)
+            candidates = TDocProjectIndex.iter_doc_paths(
+                self._root,
+                include_patterns,
+                ignore_patterns,
+                rel_path_filter=None if full else requested_rels,
+            )
+
+            records = {} if full else dict(previous)
+            seen: set[str] = set()
+            reparsed = unchanged = 0
+            restamped = False
+            for path, rel_path in candidates:
+                seen.add(rel_path)
+                stat_key = _stat_key(path)
+                if stat_key is None:
+                    continue
+                cached = previous.get(rel_path)
+                if cached is not None and (cached.mtime_ns, cached.size) == stat_key:
+                    records[rel_path] = cached
+                    unchanged += 1
+                    continue
+                try:
+                    data = path.read_bytes()
+                except OSError:
+                    continue
+                digest = _content_digest(data)
+                if cached is not None and cached.digest == digest:
+                    cached.mtime_ns, cached.size = stat_key
+                    restamped = True
+                    records[rel_path] = cached
+                    unchanged += 1
+                    continue
+                records[rel_path] = _parse_record(rel_path, stat_key, digest, data.decode("utf-8", errors="replace"))
+                reparsed += 1
+
+            if full:
+                removed = len(set(previous) - seen)
+            else:
+                removed = 0
+                for rel_path in requested_rels - seen:
+                    if records.pop(rel_path, None) is not None:
+                        removed += 1
+
+            with self._lock:
+                changed = bool(reparsed or removed) or set(records) != set(previous)
+                self._records = records
+                if changed or not self._populated:
+                    self._rebuild_label_index()
+                self._populated = True
+                self._indexed_marker_key = self._marker_key
+                self._dirty = self._dirty or changed or restamped
+        return TDocRefreshStats(
+            root=self._root,
+            scanned=len(seen),
+            reparsed=reparsed,
+            unchanged=unchanged,
+            removed=removed,
+            full=full,
+            elapsed_ms=(time.perf_counter() - started) * 1000.0,
+        )
+
+    def _rel_paths_for(self, paths: Iterable[str]) -> set[str]:
+        root = Path(self._root)
+        rels: set[str] = set()
+        for raw in paths:
+            text = str(raw or "").strip()
+            if not text or not text.lower().endswith(DOC_SUFFIX):
+                continue
+            try:
+                rel = str(Path(os.path.abspath(text)).relative_to(root)).replace("\\", "/")
+            except ValueError:
+                continue
+            if rel and not rel.startswith(".."):
+                rels.add(rel)
+        return rels
+
+    def _rebuild_label_index(self) -> None:
+        labels: dict[str, set[TDocRef]] = defaultdict(set)
+        for rel_path, record in self._records.items():
+            if not record.index_enabled:
+                continue
+            for label, line_no, start_col, end_col in record.links:
+                labels[label.casefold()].add((rel_path, line_no, start_col, end_col))
+        self._labels = dict(labels)
+
+    # ---------- Queries ----------
+
+    def references(
+        self,
+        *,
+        content_overrides: dict[str, str] | None = None,
+        rel_paths: Iterable[str] | None = None,
+    ) -> tuple:
+        """Return the ``collect_symbol_references`` tuple built from cached records.
+
+        ``content_overrides`` maps absolute paths to unsaved editor text; those
+        documents are parsed from the override instead of the cache. When
+        ``rel_paths`` narrows the query, those few documents are re-stat'ed so a
+        save that the background refresh has not picked up yet is still seen.
+        """
+        aliases = self.aliases()
+        alias_to_symbol = aliases[0]
+        overrides: dict[str, str] = {}
+        for raw_path, text in dict(content_overrides or {}).items():
+            rels = self._rel_paths_for([raw_path])
+            if rels:
+                overrides[next(iter(rels))] = str(text if text is not None else "")
+
+        symbol_refs: dict = defaultdict(set)
+        unresolved_refs: dict = defaultdict(set)
+        doc_metadata: dict = {}
+        frontmatter_issues: list = []
+        with self._lock:
+            records = dict(self._records)
+        if rel_paths is None:
+            rel_list = sorted(records, key=str.casefold)
+        else:
+            fresh = TDocProjectIndex.iter_doc_paths(self._root, aliases[3], aliases[4], rel_path_filter=rel_paths)
+            rel_list = []
+            for path, rel_path in fresh:
+                rel_list.append(rel_path)
+                record = records.get(rel_path)
+                if rel_path in overrides:
+                    continue
+                if record is not None and (record.mtime_ns, record.size) == _stat_key(path):
+                    continue
+                try:
+                    overrides[rel_path] = path.read_text(encoding="utf-8")
+                except (OSError, UnicodeDecodeError):
+                    records.pop(rel_path, None)
+        for rel_path in rel_list:
+            if rel_path in overrides:
+                metadata, fm_issues, index_enabled, links = TDocProjectIndex.scan_document_links(overrides[rel_path])
+            elif rel_path in records:
+                record = records[rel_path]
+                metadata, fm_issues, index_enabled, links = (
+                    record.metadata,
+                    record.frontmatter_issues,
+                    record.index_enabled,
+                    record.links,
+                )
+            else:
+                continue
+            TDocProjectIndex.accumulate_document_references(
+                rel_path,
+                metadata,
+                fm_issues,
+                index_enabled,
+                links,
+                alias_to_symbol,
+                symbol_refs,
+                unresolved_refs,
+                doc_metadata,
+                frontmatter_issues,
+            )
+        return symbol_refs, unresolved_refs, doc_metadata, frontmatter_issues
+
+    def backlinks(self, symbol_or_alias: str) -> list[TDocRef]:
+        """All references to the symbol behind ``symbol_or_alias`` (any of its aliases)."""
+        query = str(symbol_or_alias or "").strip()
+        if not query:
+            return []
+        alias_to_symbol, symbol_to_aliases = self.aliases()[:2]
+        symbol = TDocProjectIndex.resolve_symbol(query, alias_to_symbol)
+        names = {symbol, *(symbol_to_aliases.get(symbol) or ())}
+        refs: set[TDocRef] = set()
+        with self._lock:
+            for name in names:
+                refs.update(self._labels.get(str(name).casefold(), ()))
+        return sorted(refs, key=lambda ref: (ref[0].casefold(), ref[1], ref[2]))
+
+    def unresolved_labels(self) -> dict[str, list[TDocRef]]:
+        alias_to_symbol = self.aliases()[0]
+        with self._lock:
+            items = [(label, refs) for label, refs in self._labels.items() if label not in alias_to_symbol]
+        return {label: sorted(refs, key=lambda ref: (ref[0].casefold(), ref[1], ref[2])) for label, refs in items}
+
+    def validate(
+        self,
+        *,
+        content_overrides: dict[str, str] | None = None,
+        doc_rel_paths: Iterable[str] | None = None,
+    ) -> list[dict]:
+        rel_list = None if doc_rel_paths is None else list(doc_rel_paths)
+        marker = TDocProjectIndex._canonical_text_path(TDocProjectIndex.marker_path(self._root))
+        if marker in TDocProjectIndex._normalize_content_overrides(content_overrides):
+            # Unsaved marker edits change aliases and include rules; the cache can't answer that.
+            return TDocProjectIndex.validate_project(
+                self._root,
+                content_overrides=content_overrides,
+                doc_rel_paths=rel_list,
+            )
+        return TDocProjectIndex.validate_project(
+            self._root,
+            content_overrides=content_overrides,
+            doc_rel_paths=rel_list,
+            aliases=self.aliases(),
+            references=self.references(content_overrides=content_overrides, rel_paths=rel_list),
+        )
+
+    def write_index_file(self) -> Path | None:
+        """Write ``index.tdoc`` from the cached records (call ``refresh`` first)."""
+        aliases = self.aliases()
+        return TDocProjectIndex.build_index(self._root, aliases=aliases, references=self.references())
@@ -324,6 +324,7 @@ IDE_KEY_ALIASES: dict[str, str] = {
     "projects": "projects",
     "projects.last_create_in": "projects.last_create_in",
     "autosave": "autosave",
+    "workspace_restore": "workspace_restore",
     "lint": "lint",
     "completion": "completion",
     "completion.max_items": "completion.max_items",
@@ -428,6 +429,7 @@ IDE_KEY_PREFIXES: tuple[str, ...] = (
     "run",
     "projects",
     "autosave",
+    "workspace_restore",
     "lint",
     "completion",
     "ai_assist",
@@ -601,6 +603,7 @@ class SettingsManager:
             "run",
             "projects",
             "autosave",
+            "workspace_restore",
             "lint",
             "completion",
             "ai_assist",
@@ -637,6 +640,7 @@ class SettingsManager:
                 "run",
                 "projects",
                 "autosave",
+                "workspace_restore",
                 "lint",
                 "completion",
                 "ai_assist",
@@ -1234,6 +1238,19 @@ class SettingsManager:
             autosave["debounce_ms"] = 1200
         data["autosave"] = autosave
 
+        workspace_restore = data.get("workspace_restore")
+        if not isinstance(workspace_restore, dict):
+            workspace_restore = {}
+        workspace_restore = deep_merge_defaults(workspace_restore, default_ide_settings()["workspace_restore"])
+        workspace_restore["lazy_tabs"] = bool(workspace_restore.get("lazy_tabs", True))
+        try:
+            workspace_restore["prefetch_recent_tabs"] = max(
+                0, min(50, int(workspace_restore.get("prefetch_recent_tabs", 3)))
+            )
+        except Exception:
+            workspace_restore["prefetch_recent_tabs"] = 3
+        data["workspace_restore"] = workspace_restore
+
         lint = data.get("lint")
         if not isinstance(lint, dict):
             lint = {}
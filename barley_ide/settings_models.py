@@ -238,6 +238,11 @@ class IdeAutosaveSettings(TypedDict, total=False):
     debounce_ms: int
 
 
+class IdeWorkspaceRestoreSettings(TypedDict, total=False):
+    lazy_tabs: bool
+    prefetch_recent_tabs: int
+
+
 class IdeGitHubSettings(TypedDict, total=False):
     username: str
     use_token_for_git: bool
@@ -323,6 +328,7 @@ class IdeSettings(TypedDict, total=False):
     run: RunSettings
     projects: IdeProjectHistorySettings
     autosave: IdeAutosaveSettings
+    workspace_restore: IdeWorkspaceRestoreSettings
     lint: LintSettings
     completion: IdeCompletionSettings
     ai_assist: AIAssistSettings
@@ -649,6 +655,10 @@ def default_ide_settings() -> IdeSettings:
             "enabled": False,
             "debounce_ms": 1200,
         },
+        "workspace_restore": {
+            "lazy_tabs": True,
+            "prefetch_recent_tabs": 3,
+        },
         "lint": {
             "enabled": True,
             "respect_excludes": True,
@@ -0,0 +1,315 @@
+"""Opt-in startup profiling for ``--profile-startup``.
+
+The profiler records wall-clock phases of IDE startup, the inclusive and self
+time of every module imported while it is active, and the moment lazily loaded
+features are first pulled in. A JSON report (plus a short text summary) is
+written once the main window has processed its first event-loop turn.
+
+Nothing here is active unless the flag is passed, so the module only imports
+the standard library.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import importlib.abc
+import json
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+PROFILE_STARTUP_ARG = "--profile-startup"
+PROFILE_STARTUP_EXIT_ARG = "--profile-startup-exit"
+REPORT_SUMMARY_IMPORT_LIMIT = 25
+
+_ACTIVE_PROFILER: "StartupProfiler | None" = None
+
+
+@dataclass(slots=True)
+class StartupPhase:
+    name: str
+    start_ms: float
+    duration_ms: float
+
+
+@dataclass(slots=True)
+class ImportTiming:
+    module: str
+    start_ms: float
+    inclusive_ms: float
+    self_ms: float
+    depth: int
+    thread: str
+
+
+@dataclass(slots=True)
+class StartupReport:
+    started_at: float
+    total_ms: float
+    python: str
+    argv: list[str]
+    phases: list[StartupPhase] = field(default_factory=list)
+    marks: dict[str, float] = field(default_factory=dict)
+    imports: list[ImportTiming] = field(default_factory=list)
+    lazy_features: dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Delegating loader that times ``exec_module`` of the wrapped loader."""
+
+    def __init__(self, loader, fullname: str, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._fullname = fullname
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        create = getattr(self._loader, "create_module", None)
+        return create(spec) if callable(create) else None
+
+    def exec_module(self, module) -> None:
+        with self._profiler._timed_import(self._fullname):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name: str):
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._local, "busy", False):
+            return None
+        self._local.busy = True
+        try:
+            spec = None
+            for finder in sys.meta_path:
+                if finder is self:
+                    continue
+                find = getattr(finder, "find_spec", None)
+                if not callable(find):
+                    continue
+                spec = find(fullname, path, target)
+                if spec is not None:
+                    break
+        finally:
+            self._local.busy = False
+        if spec is None or spec.loader is None or not hasattr(spec.loader, "exec_module"):
+            return spec
+        spec.loader = _TimedLoader(spec.loader, fullname, self._profiler)
+        return spec
+
+
+class StartupProfiler:
+    """Collects startup phases and import timings for a single IDE launch."""
+
+    def __init__(self, *, report_path: str | None = None, exit_after_report: bool = False):
+        self._t0 = time.perf_counter()
+        self._started_at = time.time()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._phases: list[StartupPhase] = []
+        self._marks: dict[str, float] = {}
+        self._imports: list[ImportTiming] = []
+        self._lazy_features: dict[str, float] = {}
+        self._finder: _TimingFinder | None = None
+        self._report_written: Path | None = None
+        self.report_path = str(report_path or "").strip() or None
+        self.exit_after_report = bool(exit_after_report)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._t0) * 1000.0
+
+    def install_import_hook(self) -> None:
+        if self._finder is not None:
+            return
+        self._finder = _TimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def remove_import_hook(self) -> None:
+        finder = self._finder
+        self._finder = None
+        if finder is None:
+            return
+        try:
+            sys.meta_path.remove(finder)
+        except ValueError:
+            pass
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = self.elapsed_ms()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._phases.append(StartupPhase(str(name), start, self.elapsed_ms() - start))
+
+    def mark(self, name: str) -> None:
+        with self._lock:
+            self._marks.setdefault(str(name), self.elapsed_ms())
+
+    def note_lazy_feature(self, name: str) -> None:
+        with self._lock:
+            self._lazy_features.setdefault(str(name), self.elapsed_ms())
+
+    @contextlib.contextmanager
+    def _timed_import(self, fullname: str) -> Iterator[None]:
+        stack: list[list[float]] = getattr(self._local, "stack", None) or []
+        self._local.stack = stack
+        start = self.elapsed_ms()
+        frame = [0.0]  # accumulated inclusive time of nested imports
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            inclusive = self.elapsed_ms() - start
+            if stack:
+                stack[-1][0] += inclusive
+            timing = ImportTiming(
+                module=fullname,
+                start_ms=start,
+                inclusive_ms=inclusive,
+                self_ms=max(0.0, inclusive - frame[0]),
+                depth=len(stack),
+                thread=threading.current_thread().name,
+            )
+            with self._lock:
+                self._imports.append(timing)
+
+    def report(self) -> StartupReport:
+        with self._lock:
+            return StartupReport(
+                started_at=self._started_at,
+                total_ms=self.elapsed_ms(),
+                python=sys.version.split()[0],
+                argv=list(sys.argv),
+                phases=list(self._phases),
+                marks=dict(self._marks),
+                imports=list(self._imports),
+                lazy_features=dict(self._lazy_features),
+            )
+
+    def write_report(self) -> Path | None:
+        """Write the JSON report and a text summary next to it; return the JSON path."""
+        if self._report_written is not None:
+            return self._report_written
+        self.remove_import_hook()
+        report = self.report()
+        target = self._resolve_report_path()
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(json.dumps(report.to_dict(), indent=2), encoding="utf-8")
+            target.with_suffix(".txt").write_text(format_report_summary(report), encoding="utf-8")
+        except OSError as exc:
+            print(f"[startup-profile] could not write report: {exc}", file=sys.stderr)
+            return None
+        self._report_written = target
+        print(f"[startup-profile] {report.total_ms:.1f} ms to first event loop turn; report: {target}", file=sys.stderr)
+        return target
+
+    def _resolve_report_path(self) -> Path:
+        if self.report_path:
+            return Path(self.report_path).expanduser()
+        from barley_ide.storage_paths import ide_cache_dir
+
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self._started_at))
+        return ide_cache_dir() / "startup-profiles" / f"startup-{stamp}.json"
+
+
+def format_report_summary(report: StartupReport, *, import_limit: int = REPORT_SUMMARY_IMPORT_LIMIT) -> str:
+    lines = [
+        f"Startup profile ({report.python}): {report.total_ms:.1f} ms total",
+        "",
+        "Phases:",
+    ]
+    for phase in sorted(report.phases, key=lambda item: item.start_ms):
+        lines.append(f"  {phase.start_ms:9.1f} ms  {phase.duration_ms:9.1f} ms  {phase.name}")
+    if report.marks:
+        lines.extend(["", "Marks:"])
+        for name, at_ms in sorted(report.marks.items(), key=lambda item: item[1]):
+            lines.append(f"  {at_ms:9.1f} ms  {name}")
+    if report.lazy_features:
+        lines.extend(["", "Lazy features loaded during startup:"])
+        for name, at_ms in sorted(report.lazy_features.items(), key=lambda item: item[1]):
+            lines.append(f"  {at_ms:9.1f} ms  {name}")
+    top_level = [item for item in report.imports if item.depth == 0]
+    lines.extend(
+        [
+            "",
+            f"Imports: {len(report.imports)} modules, "
+            f"{sum(item.inclusive_ms for item in top_level):.1f} ms inclusive at top level",
+            f"Slowest by self time (top {import_limit}):",
+        ]
+    )
+    for item in sorted(report.imports, key=lambda entry: entry.self_ms, reverse=True)[:import_limit]:
+        lines.append(f"  {item.self_ms:9.1f} ms self  {item.inclusive_ms:9.1f} ms incl  {item.module}")
+    return "\n".join(lines) + "\n"
+
+
+def split_profile_args(argv: list[str]) -> tuple[list[str], bool, str | None, bool]:
+    """Strip profiling flags; return ``(remaining, enabled, report_path, exit_after)``."""
+    remaining: list[str] = []
+    enabled = False
+    report_path: str | None = None
+    exit_after = False
+    for arg in argv:
+        if arg == PROFILE_STARTUP_ARG:
+            enabled = True
+            continue
+        if arg.startswith(PROFILE_STARTUP_ARG + "="):
+            enabled = True
+            report_path = arg.split("=", 1)[1] or None
+            continue
+        if arg == PROFILE_STARTUP_EXIT_ARG:
+            enabled = True
+            exit_after = True
+            continue
+        remaining.append(arg)
+    return remaining, enabled, report_path, exit_after
+
+
+def start_profiler_from_argv(argv: list[str]) -> StartupProfiler | None:
+    """Activate the global profiler (with import hook) when a profiling flag is present."""
+    global _ACTIVE_PROFILER
+    _remaining, enabled, report_path, exit_after = split_profile_args(argv)
+    if not enabled:
+        return None
+    if _ACTIVE_PROFILER is None:
+        _ACTIVE_PROFILER = StartupProfiler(report_path=report_path, exit_after_report=exit_after)
+        _ACTIVE_PROFILER.install_import_hook()
+    return _ACTIVE_PROFILER
+
+
+def active_profiler() -> StartupProfiler | None:
+    return _ACTIVE_PROFILER
+
+
+def startup_phase(name: str):
+    """Context manager timing ``name`` when profiling is active, a no-op otherwise."""
+    profiler = _ACTIVE_PROFILER
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.phase(name)
+
+
+def startup_mark(name: str) -> None:
+    profiler = _ACTIVE_PROFILER
+    if profiler is not None:
+        profiler.mark(name)
+
+
+def note_lazy_feature(name: str) -> None:
+    profiler = _ACTIVE_PROFILER
+    if profiler is not None:
+        profiler.note_lazy_feature(name)
+
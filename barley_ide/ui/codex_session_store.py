@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from barley_ide.services.file_io import atomic_write_text
+from barley_ide.storage_paths import ide_cache_dir
+
+CODEX_SESSION_INDEX_VERSION = 1
+_METADATA_SCAN_LINE_LIMIT = 500
+
 
 @dataclass(slots=True)
 class CodexSessionRecord:
@@ -81,16 +90,36 @@ def _is_non_user_facing_user_text(text: str) -> bool:
     return False
 
 
-def read_codex_session(log_path: Path) -> CodexSessionRecord | None:
+@dataclass(slots=True)
+class _IndexedSessionFile:
+    path: str
+    mtime_ns: int
+    size: int
+    session_id: str = ""
+    cwd: str = ""
+    model: str = ""
+    first_user_message: str = ""
+    # All metadata was found (or the scan limit reached), so appends cannot change it.
+    complete: bool = False
+
+    def to_record(self) -> CodexSessionRecord:
+        return CodexSessionRecord(
+            session_id=self.session_id,
+            cwd=self.cwd,
+            model=self.model,
+            first_user_message=self.first_user_message,
+            updated_at=datetime.fromtimestamp(self.mtime_ns / 1_000_000_000),
+            log_path=Path(self.path),
+        )
+
+
+def _scan_session_metadata(log_path: Path, entry: _IndexedSessionFile) -> bool:
     session_id = ""
     cwd = ""
     model = ""
     first_user_message = ""
     fallback_user_message = ""
-    try:
-        updated_at = datetime.fromtimestamp(log_path.stat().st_mtime)
-    except Exception:
-        updated_at = datetime.now()
+    complete = False
     try:
         with log_path.open("r", encoding="utf-8") as handle:
             for index, raw in enumerate(handle):
@@ -123,67 +152,287 @@ def read_codex_session(log_path: Path) -> CodexSessionRecord | None:
                     if text and not _is_non_user_facing_user_text(text):
                         first_user_message = text
                 if session_id and cwd and model and first_user_message:
+                    complete = True
                     break
-                if index >= 500:
+                if index >= _METADATA_SCAN_LINE_LIMIT:
+                    complete = True
                     break
     except Exception:
+        return False
+    entry.session_id = session_id
+    entry.cwd = cwd
+    entry.model = model
+    entry.first_user_message = first_user_message or fallback_user_message
+    entry.complete = complete
+    return True
+
+
+def read_codex_session(log_path: Path) -> CodexSessionRecord | None:
+    try:
+        stat = log_path.stat()
+        mtime_ns, size = int(stat.st_mtime_ns), int(stat.st_size)
+    except Exception:
+        mtime_ns, size = time.time_ns(), 0
+    entry = _IndexedSessionFile(path=str(log_path), mtime_ns=mtime_ns, size=size)
+    if not _scan_session_metadata(log_path, entry) or not entry.session_id:
         return None
-    if not session_id:
+    return entry.to_record()
+
+
+def codex_session_index_path() -> Path:
+    return ide_cache_dir() / "codex-session-index.json"
+
+
+class CodexSessionIndex:
+    """Persistent session metadata catalogue for ``~/.codex/sessions``.
+
+    A refresh stats the session tree and only re-reads logs whose (mtime, size)
+    changed; logs whose metadata is already complete are not re-read when they
+    grow. Lookups by id are dictionary hits.
+    """
+
+    def __init__(
+        self,
+        sessions_dir: Path | None = None,
+        *,
+        cache_path: Path | None = None,
+        min_refresh_interval_s: float = 1.0,
+    ) -> None:
+        self._sessions_dir = Path(sessions_dir) if sessions_dir is not None else codex_sessions_dir()
+        self._cache_path = cache_path
+        self._min_refresh_interval_s = max(0.0, float(min_refresh_interval_s))
+        self._lock = threading.RLock()
+        self._files: dict[str, _IndexedSessionFile] = {}
+        self._ordered: list[_IndexedSessionFile] | None = None
+        self._by_id: dict[str, _IndexedSessionFile] = {}
+        self._last_refresh = 0.0
+        self._loaded = False
+        self.parses = 0
+
+    @property
+    def sessions_dir(self) -> Path:
+        return self._sessions_dir
+
+    def load(self) -> bool:
+        with self._lock:
+            self._loaded = True
+            if self._cache_path is None:
+                return False
+            try:
+                payload = json.loads(self._cache_path.read_text(encoding="utf-8"))
+            except Exception:
+                return False
+            if not isinstance(payload, dict) or payload.get("version") != CODEX_SESSION_INDEX_VERSION:
+                return False
+            if payload.get("sessions_dir") != str(self._sessions_dir):
+                return False
+            files: dict[str, _IndexedSessionFile] = {}
+            for raw in payload.get("files") or []:
+                try:
+                    entry = _IndexedSessionFile(**raw)
+                except Exception:
+                    continue
+                files[entry.path] = entry
+            self._files = files
+            self._ordered = None
+            return True
+
+    def save(self) -> bool:
+        with self._lock:
+            if self._cache_path is None:
+                return False
+            payload = {
+                "version": CODEX_SESSION_INDEX_VERSION,
+                "sessions_dir": str(self._sessions_dir),
+                "files": [asdict(entry) for entry in self._files.values()],
+            }
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(str(self._cache_path), json.dumps(payload, separators=(",", ":")), fsync=False)
+        except Exception:
+            return False
+        return True
+
+    def refresh(self, *, force: bool = False) -> bool:
+        """Bring the index up to date with the session tree; returns True when anything changed."""
+        with self._lock:
+            if not self._loaded:
+                self.load()
+            now = time.monotonic()
+            if not force and self._last_refresh and now - self._last_refresh < self._min_refresh_interval_s:
+                return False
+            self._last_refresh = now
+            seen: set[str] = set()
+            changed = False
+            for path_text, mtime_ns, size in self._walk():
+                seen.add(path_text)
+                entry = self._files.get(path_text)
+                if entry is not None and entry.mtime_ns == mtime_ns and entry.size == size:
+                    continue
+                if entry is not None and entry.complete and size >= entry.size:
+                    entry.mtime_ns, entry.size = mtime_ns, size
+                    changed = True
+                    continue
+                fresh = _IndexedSessionFile(path=path_text, mtime_ns=mtime_ns, size=size)
+                self.parses += 1
+                if not _scan_session_metadata(Path(path_text), fresh):
+                    continue
+                self._files[path_text] = fresh
+                changed = True
+            for stale in [path for path in self._files if path not in seen]:
+                del self._files[stale]
+                changed = True
+            if changed or self._ordered is None:
+                self._rebuild_order()
+        if changed:
+            self.save()
+        return changed
+
+    def list_sessions(
+        self,
+        *,
+        limit: int | None = None,
+        offset: int = 0,
+        project_dir: Path | None = None,
+        query: str = "",
+        refresh: bool = True,
+    ) -> list[CodexSessionRecord]:
+        matches = self._matching(project_dir=project_dir, query=query, refresh=refresh)
+        start = max(0, int(offset))
+        stop = None if limit is None else start + max(1, int(limit))
+        return [entry.to_record() for entry in matches[start:stop]]
+
+    def count_sessions(self, *, project_dir: Path | None = None, query: str = "", refresh: bool = True) -> int:
+        return len(self._matching(project_dir=project_dir, query=query, refresh=refresh))
+
+    def find(self, session_id: str) -> CodexSessionRecord | None:
+        normalized = str(session_id or "").strip()
+        if not normalized:
+            return None
+        with self._lock:
+            if self._ordered is None:
+                self.refresh()
+            entry = self._lookup(normalized)
+            if entry is None or not os.path.isfile(entry.path):
+                # New or moved log: one forced refresh, then match on the rollout file name as well.
+                self.refresh(force=True)
+                entry = self._lookup(normalized)
+            if entry is None:
+                return None
+            record = entry.to_record()
+            record.session_id = record.session_id or normalized
+            return record
+
+    def forget(self, log_paths: list[Path]) -> None:
+        with self._lock:
+            removed = False
+            for path in log_paths:
+                removed = self._files.pop(str(path), None) is not None or removed
+            if removed:
+                self._rebuild_order()
+        if removed:
+            self.save()
+
+    def _lookup(self, session_id: str) -> _IndexedSessionFile | None:
+        entry = self._by_id.get(session_id.casefold())
+        if entry is not None:
+            return entry
+        suffix = f"{session_id}.jsonl"
+        for candidate in sorted(self._files.values(), key=lambda item: item.mtime_ns, reverse=True):
+            if candidate.path.endswith(suffix):
+                return candidate
         return None
-    return CodexSessionRecord(
-        session_id=session_id,
-        cwd=cwd,
-        model=model,
-        first_user_message=first_user_message or fallback_user_message,
-        updated_at=updated_at,
-        log_path=log_path,
-    )
+
+    def _matching(self, *, project_dir: Path | None, query: str, refresh: bool) -> list[_IndexedSessionFile]:
+        with self._lock:
+            if refresh or self._ordered is None:
+                self.refresh()
+            ordered = list(self._ordered or [])
+        project_key = canonical_path_text(str(project_dir or ""))
+        needle = str(query or "").strip().casefold()
+        if not project_key and not needle:
+            return ordered
+        matches: list[_IndexedSessionFile] = []
+        for entry in ordered:
+            if project_key and canonical_path_text(entry.cwd) != project_key:
+                continue
+            if needle:
+                haystack = "\n".join([entry.first_user_message, entry.cwd, entry.model, entry.session_id]).casefold()
+                if needle not in haystack:
+                    continue
+            matches.append(entry)
+        return matches
+
+    def _rebuild_order(self) -> None:
+        ordered: list[_IndexedSessionFile] = []
+        by_id: dict[str, _IndexedSessionFile] = {}
+        for entry in sorted(self._files.values(), key=lambda item: item.mtime_ns, reverse=True):
+            if not entry.session_id:
+                continue
+            key = entry.session_id.casefold()
+            if key in by_id:
+                continue
+            by_id[key] = entry
+            ordered.append(entry)
+        self._ordered = ordered
+        self._by_id = by_id
+
+    def _walk(self) -> list[tuple[str, int, int]]:
+        found: list[tuple[str, int, int]] = []
+        stack = [str(self._sessions_dir)]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for item in entries:
+                        try:
+                            if item.is_dir(follow_symlinks=False):
+                                stack.append(item.path)
+                            elif item.name.endswith(".jsonl") and item.is_file():
+                                stat = item.stat()
+                                found.append((item.path, int(stat.st_mtime_ns), int(stat.st_size)))
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return found
+
+
+_SHARED_INDEX: CodexSessionIndex | None = None
+_SHARED_INDEX_LOCK = threading.Lock()
+
+
+def codex_session_index() -> CodexSessionIndex:
+    global _SHARED_INDEX
+    with _SHARED_INDEX_LOCK:
+        if _SHARED_INDEX is None or _SHARED_INDEX.sessions_dir != codex_sessions_dir():
+            _SHARED_INDEX = CodexSessionIndex(codex_sessions_dir(), cache_path=codex_session_index_path())
+        return _SHARED_INDEX
 
 
 def list_codex_sessions(
     *,
     limit: int | None = None,
+    offset: int = 0,
     project_dir: Path | None = None,
+    query: str = "",
+    refresh: bool = True,
 ) -> list[CodexSessionRecord]:
-    sessions_dir = codex_sessions_dir()
-    if not sessions_dir.is_dir():
-        return []
-    project_key = canonical_path_text(str(project_dir or ""))
-    try:
-        candidates = sorted(
-            sessions_dir.rglob("*.jsonl"),
-            key=lambda path: path.stat().st_mtime,
-            reverse=True,
-        )
-    except Exception:
-        return []
-    found: list[CodexSessionRecord] = []
-    seen_ids: set[str] = set()
-    max_items = None if limit is None else max(1, int(limit))
-    for log_path in candidates:
-        session = read_codex_session(log_path)
-        if session is None:
-            continue
-        session_key = session.session_id.casefold()
-        if session_key in seen_ids:
-            continue
-        if project_key and canonical_path_text(session.cwd) != project_key:
-            continue
-        seen_ids.add(session_key)
-        found.append(session)
-        if max_items is not None and len(found) >= max_items:
-            break
-    return found
+    return codex_session_index().list_sessions(
+        limit=limit,
+        offset=offset,
+        project_dir=project_dir,
+        query=query,
+        refresh=refresh,
+    )
+
+
+def count_codex_sessions(*, project_dir: Path | None = None, query: str = "", refresh: bool = True) -> int:
+    return codex_session_index().count_sessions(project_dir=project_dir, query=query, refresh=refresh)
 
 
 def find_codex_session(session_id: str) -> CodexSessionRecord | None:
-    normalized = str(session_id or "").strip()
-    if not normalized:
-        return None
-    for session in list_codex_sessions(limit=None):
-        if session.session_id == normalized:
-            return session
-    return None
+    return codex_session_index().find(session_id)
 
 
 def delete_codex_sessions(log_paths: list[Path]) -> tuple[list[Path], list[str]]:
@@ -204,4 +453,6 @@ def delete_codex_sessions(log_paths: list[Path]) -> tuple[list[Path], list[str]]
             failures.append(f"{raw_path}: {exc}")
             continue
         deleted.append(Path(raw_path))
+    if deleted and _SHARED_INDEX is not None:
+        _SHARED_INDEX.forget(deleted)
     return deleted, failures
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import concurrent.futures
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+
+# parse_event(decoded JSON line) -> zero or more (kind, value) events; runs on the worker thread.
+SessionLogParser = Callable[[dict[str, Any]], list[tuple[str, Any]]]
+
+
+@dataclass(slots=True)
+class _TailRead:
+    generation: int
+    start: int
+    end: int
+    events: list[tuple[str, Any]] = field(default_factory=list)
+
+
+def read_session_log_events(path: Path, start: int, parse_event: SessionLogParser) -> _TailRead:
+    """Parse complete lines appended to ``path`` after byte offset ``start``."""
+    result = _TailRead(generation=0, start=start, end=start)
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return result
+    if size < start:
+        # Truncated or replaced log: start over.
+        start = 0
+        result.start = 0
+    if size == start:
+        result.end = start
+        return result
+    try:
+        with open(path, "rb") as handle:
+            handle.seek(start)
+            chunk = handle.read(size - start)
+    except OSError:
+        return result
+    # A writer may be mid-line; leave the unterminated tail for the next read.
+    complete = chunk.rfind(b"\n") + 1
+    result.end = start + complete
+    for raw_line in chunk[:complete].splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except Exception:
+            continue
+        if not isinstance(data, dict):
+            continue
+        try:
+            result.events.extend(parse_event(data))
+        except Exception:
+            continue
+    return result
+
+
+class CodexSessionLogTail(QObject):
+    """Single tail reader for the active Codex session log.
+
+    Change notifications come from ``QFileSystemWatcher``; a poll timer only runs while
+    the log has not been located yet or cannot be watched. Reads happen on one worker
+    thread and each pass hands every parsed event to ``eventsRead`` at once.
+    """
+
+    eventsRead = Signal(object)  # list[(kind, value)]
+
+    POLL_INTERVAL_MS = 500
+    # Locating a log that does not exist yet forces a session index refresh; don't retry per stdout line.
+    RESOLVE_RETRY_S = 0.25
+
+    def __init__(
+        self,
+        *,
+        resolve_path: Callable[[str], Path | None],
+        parse_event: SessionLogParser,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._resolve_path = resolve_path
+        self._parse_event = parse_event
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="pytpo-codex-tail")
+        self._future: concurrent.futures.Future | None = None
+        self._generation = 0
+        self._active = False
+        self._session_id = ""
+        self._path: Path | None = None
+        self._position = 0
+        self._start_from_beginning = False
+        self._reread_requested = False
+        self._next_resolve_at = 0.0
+        self.reads = 0
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(self.POLL_INTERVAL_MS)
+        self._poll_timer.timeout.connect(self.poke)
+
+        self._result_pump = QTimer(self)
+        self._result_pump.setInterval(16)
+        self._result_pump.timeout.connect(self._drain_result)
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    @property
+    def log_path(self) -> Path | None:
+        return self._path
+
+    def start(self, session_id: str | None, *, from_beginning: bool) -> None:
+        """Follow ``session_id``'s log; without ``from_beginning`` only lines written from now on are read."""
+        self._reset_path()
+        self._active = True
+        self._session_id = str(session_id or "").strip()
+        self._start_from_beginning = bool(from_beginning)
+        if self._session_id:
+            self.ensure_path()
+        self._update_poll_timer()
+
+    def switch_session(self, session_id: str) -> None:
+        """A new session id was announced mid-turn; its log is read from the beginning."""
+        if not self._active:
+            return
+        self.start(session_id, from_beginning=True)
+        self.poke()
+
+    def stop(self) -> None:
+        self._reset_path()
+        self._active = False
+        self._session_id = ""
+        self._poll_timer.stop()
+
+    def ensure_path(self) -> bool:
+        if not self._active or not self._session_id:
+            return False
+        if self._path is not None:
+            return True
+        now = time.monotonic()
+        if now < self._next_resolve_at:
+            return False
+        path = self._resolve_path(self._session_id)
+        if path is None:
+            self._next_resolve_at = now + self.RESOLVE_RETRY_S
+            return False
+        self._path = Path(path)
+        if self._start_from_beginning:
+            self._position = 0
+        else:
+            try:
+                self._position = self._path.stat().st_size
+            except OSError:
+                self._position = 0
+        self._start_from_beginning = False
+        self._watch_path()
+        self._update_poll_timer()
+        return True
+
+    def poke(self) -> None:
+        """Schedule a read of newly appended lines; coalesces with a read already in flight."""
+        if not self.ensure_path() or self._path is None:
+            return
+        if self._future is not None:
+            self._reread_requested = True
+            return
+        self._submit()
+
+    def drain(self) -> None:
+        """Synchronously deliver everything written so far (used when a turn ends)."""
+        if self._future is not None:
+            try:
+                self._future.result(timeout=5.0)
+            except Exception:
+                pass
+            self._reread_requested = False
+            self._drain_result()
+        if not self.ensure_path() or self._path is None:
+            return
+        read = read_session_log_events(self._path, self._position, self._parse_event)
+        read.generation = self._generation
+        self._apply(read)
+
+    def shutdown(self) -> None:
+        self.stop()
+        self._result_pump.stop()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self) -> None:
+        path = self._path
+        if path is None:
+            return
+        generation = self._generation
+        start = self._position
+        parse_event = self._parse_event
+
+        def _read() -> _TailRead:
+            read = read_session_log_events(path, start, parse_event)
+            read.generation = generation
+            return read
+
+        try:
+            self._future = self._executor.submit(_read)
+        except RuntimeError:
+            self._future = None
+            return
+        self._reread_requested = False
+        if not self._result_pump.isActive():
+            self._result_pump.start()
+
+    def _drain_result(self) -> None:
+        future = self._future
+        if future is None:
+            self._result_pump.stop()
+            return
+        if not future.done():
+            return
+        self._future = None
+        try:
+            read = future.result()
+        except Exception:
+            read = None
+        if read is not None:
+            self._apply(read)
+        if self._reread_requested and self._active:
+            self._submit()
+        if self._future is None:
+            self._result_pump.stop()
+
+    def _apply(self, read: _TailRead) -> None:
+        if read.generation != self._generation or not self._active:
+            return
+        if read.start != self._position and read.start != 0:
+            return
+        self._position = read.end
+        self.reads += 1
+        if read.events:
+            self.eventsRead.emit(read.events)
+
+    def _on_file_changed(self, path_text: str) -> None:
+        # Editors and some writers replace the file, which drops it from the watcher.
+        if path_text not in self._watcher.files() and os.path.exists(path_text):
+            self._watcher.addPath(path_text)
+        self.poke()
+
+    def _watch_path(self) -> None:
+        if self._path is None:
+            return
+        path_text = str(self._path)
+        if path_text not in self._watcher.files():
+            self._watcher.addPath(path_text)
+
+    def _reset_path(self) -> None:
+        self._generation += 1
+        self._reread_requested = False
+        watched = self._watcher.files()
+        if watched:
+            self._watcher.removePaths(watched)
+        self._path = None
+        self._position = 0
+        self._next_resolve_at = 0.0
+
+    def _update_poll_timer(self) -> None:
+        watching = self._path is not None and str(self._path) in self._watcher.files()
+        if self._active and self._session_id and not watching:
+            if not self._poll_timer.isActive():
+                self._poll_timer.start()
+        else:
+            self._poll_timer.stop()
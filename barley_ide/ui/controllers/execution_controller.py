@@ -11,7 +11,6 @@ from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QToolButton
 
 from barley_ide.lang_rust.cargo_discovery import discover_workspace_root_for_file, find_nearest_cargo_project_dir
-from barley_ide.ui.debugger.lldb_dap_backend import LldbDapDebuggerBackend
 from TPOPyside.widgets.terminal_widget import TerminalWidget
 
 _CPP_RUNNABLE_SUFFIXES = {".c", ".cpp", ".cc", ".cxx", ".cu"}
@@ -262,6 +261,8 @@ class ExecutionController:
 
     @staticmethod
     def rust_debugger_available() -> bool:
+        from barley_ide.ui.debugger.lldb_dap_backend import LldbDapDebuggerBackend
+
         return bool(LldbDapDebuggerBackend.is_available())
 
     def can_run_rust_current_context(self) -> bool:
@@ -1628,7 +1629,7 @@ class ExecutionController:
         return ok
 
     def _start_debugger_for_rust_current_file(self, file_path: str) -> bool:
-        if not LldbDapDebuggerBackend.is_available():
+        if not self.rust_debugger_available():
             self.ide.statusBar().showMessage(
                 "Rust debugging requires an LLDB debug adapter in PATH (lldb-dap or lldb-vscode).",
                 3200,
@@ -1663,7 +1664,7 @@ class ExecutionController:
         name = str(config_name or "").strip()
         if not name:
             return False
-        if not LldbDapDebuggerBackend.is_available():
+        if not self.rust_debugger_available():
             self.ide.statusBar().showMessage(
                 "Rust debugging requires an LLDB debug adapter in PATH (lldb-dap or lldb-vscode).",
                 3200,
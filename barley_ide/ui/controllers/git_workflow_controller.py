@@ -8,11 +8,6 @@ from pathlib import Path
 from PySide6.QtWidgets import QDialog, QInputDialog, QMessageBox
 
 from barley_ide.git.github_auth import GitHubAuthStore
-from barley_ide.git.github_release_service import GitHubReleaseService
-from barley_ide.ui.dialogs.git_branches_dialog import GitBranchesDialog
-from barley_ide.ui.dialogs.git_commit_dialog import GitCommitDialog
-from barley_ide.ui.dialogs.git_releases_dialog import GitReleasesDialog
-from barley_ide.ui.dialogs.share_to_github_dialog import ShareToGitHubDialog
 
 
 class GitWorkflowController:
@@ -205,6 +200,8 @@ class GitWorkflowController:
                 else:
                     if context is not None:
                         selection_target = context.repo_root or context.selected_path or self.project_root
+        from barley_ide.ui.dialogs.share_to_github_dialog import ShareToGitHubDialog
+
         dialog = ShareToGitHubDialog(
             project_root=selection_target,
             token=token,
@@ -246,6 +243,9 @@ class GitWorkflowController:
             except Exception:
                 initial_commit_message = ""
                 initial_release_message = ""
+        from barley_ide.git.github_release_service import GitHubReleaseService
+        from barley_ide.ui.dialogs.git_commit_dialog import GitCommitDialog
+
         release_service = GitHubReleaseService(
             git_service=self.git_service,
             github_token_provider=lambda: self.ide._github_auth_store.get(),
@@ -306,6 +306,9 @@ class GitWorkflowController:
                 self.open_settings(initial_page_id="ide-github")
             return
 
+        from barley_ide.git.github_release_service import GitHubReleaseService
+        from barley_ide.ui.dialogs.git_releases_dialog import GitReleasesDialog
+
         release_service = GitHubReleaseService(
             git_service=self.git_service,
             github_token_provider=lambda: self.ide._github_auth_store.get(),
@@ -478,6 +481,8 @@ class GitWorkflowController:
         repo_root = self._ensure_git_repo()
         if not repo_root:
             return
+        from barley_ide.ui.dialogs.git_branches_dialog import GitBranchesDialog
+
         dialog = GitBranchesDialog(
             git_service=self.git_service,
             repo_root=repo_root,
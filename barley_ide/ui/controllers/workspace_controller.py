@@ -4,10 +4,12 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
+from typing import Callable
 
 from PySide6.QtCore import QObject, QTimer
 
 from barley_ide.ui.editor_workspace import EditorWidget
+from barley_ide.ui.save_manager import DocumentSaveManager, SaveResult
 
 
 class WorkspaceController(QObject):
@@ -26,6 +28,9 @@ class WorkspaceController(QObject):
         self._external_file_watch_timer.setInterval(1500)
         self._external_file_watch_timer.timeout.connect(self._check_external_file_updates)
 
+        self._save_manager = DocumentSaveManager(parent=self)
+        self._autosaved_since_report = 0
+
         self.ide._autosave_timer = self._autosave_timer
         self.ide._external_file_watch_timer = self._external_file_watch_timer
         self.ide._external_file_signatures = self._external_file_signatures
@@ -42,6 +47,56 @@ class WorkspaceController(QObject):
     def external_watch_timer(self) -> QTimer:
         return self._external_file_watch_timer
 
+    @property
+    def save_manager(self) -> DocumentSaveManager:
+        return self._save_manager
+
+    def save_widget_async(
+        self,
+        widget: object,
+        *,
+        source: str,
+        on_saved: Callable[[object, str], None] | None = None,
+        on_result: Callable[[SaveResult], None] | None = None,
+    ) -> bool:
+        """Save ``widget`` through the background save pipeline.
+
+        Falls back to the widget's synchronous ``save_file`` when it has no async
+        variant. ``on_saved(widget, canonical_path)`` runs on the UI thread after the
+        write has landed and the external-change signature has been refreshed;
+        ``on_result`` receives the :class:`SaveResult` of every attempted write,
+        failed ones included. Returns False when no write was attempted.
+        """
+        path = self._document_widget_path(widget)
+        if not path:
+            return False
+
+        def _after_save() -> None:
+            cpath = self._canonical_path(path)
+            self._note_editor_saved(widget, source=source)
+            if callable(on_saved):
+                on_saved(widget, cpath)
+
+        async_saver = getattr(widget, "save_file_async", None)
+        if not callable(async_saver):
+            saver = getattr(widget, "save_file", None)
+            if not callable(saver):
+                return False
+            ok = bool(saver())
+            if ok:
+                _after_save()
+            if callable(on_result):
+                on_result(SaveResult(self._canonical_path(path), ok))
+            return ok
+
+        def _finished(result: SaveResult) -> None:
+            if result.ok:
+                _after_save()
+            if callable(on_result):
+                on_result(result)
+
+        return bool(async_saver(self._save_manager, on_finished=_finished))
+
     def _configure_autosave_timer(self) -> None:
         if self.ide.is_project_read_only() or not bool(self._autosave_config().get("enabled", False)):
             self._autosave_timer.stop()
@@ -96,33 +151,23 @@ class WorkspaceController(QObject):
         if not save_targets:
             return
 
-        saved_count = 0
-        refresh_dirs: set[str] = set()
         for widget in save_targets:
-            path = self._document_widget_path(widget)
-            if not path:
-                continue
-            saver = getattr(widget, "save_file", None)
-            if not callable(saver):
-                continue
-            if not saver():
-                continue
-            saved_count += 1
-            cpath = self._canonical_path(path)
-            refresh_dirs.add(os.path.dirname(cpath))
-            self._note_editor_saved(widget, source="autosave")
-            if isinstance(code_editor, EditorWidget):
-                self._attach_editor_lint_hooks(code_editor)
-                self._request_lint_for_editor(code_editor, reason="save", include_source_if_modified=False)
-            elif self._is_tdoc_related_path(cpath):
-                self._schedule_tdoc_validation(cpath, delay_ms=0)
-
-        for folder in refresh_dirs:
-            self.refresh_subtree(folder)
-
-        if saved_count:
-            self.ide.statusBar().showMessage(f"Auto-saved {saved_count} file(s).", 1400)
-            self.schedule_git_status_refresh(delay_ms=120)
+            self.save_widget_async(widget, source="autosave", on_saved=self._on_autosave_finished)
+
+    def _on_autosave_finished(self, widget: object, cpath: str) -> None:
+        self._autosaved_since_report += 1
+        if not self._save_manager.pending_paths():
+            count = self._autosaved_since_report
+            self._autosaved_since_report = 0
+            self.ide.statusBar().showMessage(f"Auto-saved {count} file(s).", 1400)
+        code_editor = self._editor_from_document_widget(widget)
+        if isinstance(code_editor, EditorWidget):
+            self._attach_editor_lint_hooks(code_editor)
+            self._request_lint_for_editor(code_editor, reason="save", include_source_if_modified=False)
+        elif self._is_tdoc_related_path(cpath):
+            self._schedule_tdoc_validation(cpath, delay_ms=0)
+        self.refresh_subtree(os.path.dirname(cpath))
+        self.schedule_git_status_refresh(delay_ms=120)
 
     def _note_editor_saved(self, ed: object, *, source: str) -> None:
         path = self._document_widget_path(ed)
@@ -147,6 +192,10 @@ class WorkspaceController(QObject):
                     pass
         elif self._is_tdoc_related_path(saved_path):
             self._schedule_tdoc_validation(saved_path, delay_ms=0)
+        assembler = getattr(self.ide, "_ai_context_assembler", None)
+        notify_retrieval = getattr(assembler, "notify_paths_changed", None)
+        if callable(notify_retrieval):
+            notify_retrieval([saved_path])
         self._external_conflict_signatures.pop(saved_path, None)
         sig = self._external_file_signature(saved_path)
         if sig is not None:
@@ -207,6 +256,9 @@ class WorkspaceController(QObject):
             self._external_conflict_signatures.pop(key, None)
 
         for path in current_paths:
+            if self._save_manager.is_saving(path):
+                # Our own write is mid-flight; the signature is refreshed once it lands.
+                continue
             sig = self._external_file_signature(path)
             if sig is None:
                 continue
@@ -410,3 +462,5 @@ class WorkspaceController(QObject):
     def stop(self) -> None:
         self._autosave_timer.stop()
         self._external_file_watch_timer.stop()
+        self._save_manager.flush()
+        self._save_manager.shutdown()
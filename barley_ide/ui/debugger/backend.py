@@ -50,6 +50,7 @@ class DebuggerBackend(QObject):
     paused = Signal(dict)
     watchValuesUpdated = Signal(dict)
     evaluationResult = Signal(dict)
+    variablesReceived = Signal(dict)
     exceptionRaised = Signal(dict)
     fatalError = Signal(dict)
     processEnded = Signal(dict)
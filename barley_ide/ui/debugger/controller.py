@@ -25,6 +25,7 @@ class DebuggerController(QObject):
     paused = Signal(dict)
     watchValuesUpdated = Signal(dict)
     evaluationResult = Signal(dict)
+    variablesReceived = Signal(dict)
     exceptionRaised = Signal(dict)
     fatalError = Signal(dict)
     processEnded = Signal(dict)
@@ -59,6 +60,7 @@ class DebuggerController(QObject):
         self.backend.paused.connect(self.paused)
         self.backend.watchValuesUpdated.connect(self.watchValuesUpdated)
         self.backend.evaluationResult.connect(self.evaluationResult)
+        self.backend.variablesReceived.connect(self.variablesReceived)
         self.backend.exceptionRaised.connect(self.exceptionRaised)
         self.backend.fatalError.connect(self.fatalError)
         self.backend.processEnded.connect(self.processEnded)
@@ -260,6 +262,14 @@ class DebuggerController(QObject):
             return False
         return self.backend.send_command("evaluate", {"expression": expr})
 
+    def request_variables(self, reference: int, start: int = 0, count: int = 100) -> bool:
+        if int(reference or 0) <= 0:
+            return False
+        return self.backend.send_command(
+            "variables",
+            {"reference": int(reference), "start": max(0, int(start)), "count": max(1, int(count))},
+        )
+
     def is_active(self) -> bool:
         return self.backend.state != ExecutionState.IDLE
 
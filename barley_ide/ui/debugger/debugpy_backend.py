@@ -14,6 +14,8 @@ from .backend import DebugLaunchKind, DebugLaunchRequest, DebuggerBackend, Execu
 from .python_backend import normalize_breakpoint_map
 from .terminal_bridge import DebugTerminalBridge
 
+VARIABLES_PAGE_SIZE = 100
+
 
 class DebugpyPythonDebuggerBackend(DebuggerBackend):
     def __init__(self, parent=None, *, ide=None, io_host=None):
@@ -32,6 +34,14 @@ class DebugpyPythonDebuggerBackend(DebuggerBackend):
         self._current_thread_id: int | None = None
         self._current_frame_id: int | None = None
         self._current_frames: list[dict] = []
+        self._stop_generation = 0
+        self._next_variable_ref = 0
+        self._variable_refs: dict[int, tuple[str, object]] = {}
+        self._variable_totals: dict[int, int] = {}
+        self._variable_children: dict[int, list[dict]] = {}
+        self._variable_pages: dict[tuple[int, int, int], dict] = {}
+        self._variable_fetches: dict[tuple[int, int, int], bool] = {}
+        self._frame_scopes: dict[int, dict[str, int] | list[Callable[[dict[str, int]], None]]] = {}
         self._exited_info: dict | None = None
         self._launch_request: DebugLaunchRequest | None = None
         self._stop_stage = 0
@@ -136,6 +146,14 @@ class DebugpyPythonDebuggerBackend(DebuggerBackend):
             expression = str((extra or {}).get("expression") or "").strip()
             self._evaluate_expression(expression, emit_signal=True)
             return True
+        if action == "variables":
+            payload = extra or {}
+            self._request_variables(
+                int(payload.get("reference") or 0),
+                int(payload.get("start") or 0),
+                int(payload.get("count") or VARIABLES_PAGE_SIZE),
+            )
+            return True
         mapping = {
             "continue": ("continue", self._continue_arguments()),
             "next": ("next", self._thread_arguments()),
@@ -149,6 +167,7 @@ class DebugpyPythonDebuggerBackend(DebuggerBackend):
         command, arguments = target
         self._send_request(command, arguments, callback=None)
         if action in {"continue", "next", "step"}:
+            self._clear_variables()
             self._apply_state(ExecutionState.RUNNING)
         return True
 
@@ -177,6 +196,7 @@ class DebugpyPythonDebuggerBackend(DebuggerBackend):
         self._current_thread_id = None
         self._current_frame_id = None
         self._current_frames = []
+        self._clear_variables()
         self._watch_expressions = []
         self._exited_info = None
         self._launch_request = None
@@ -484,6 +504,7 @@ class DebugpyPythonDebuggerBackend(DebuggerBackend):
                     self._target_exit_poll.start()
             return
         if event == "continued":
+            self._clear_variables()
             self._apply_state(ExecutionState.RUNNING)
             return
         if event == "exited":
@@ -512,9 +533,17 @@ class DebugpyPythonDebuggerBackend(DebuggerBackend):
             self.fatalError.emit({"message": "debugpy stopped without a thread id.", "traceback": ""})
             return
         self._current_thread_id = thread_id
-        self._send_request("stackTrace", {"threadId": thread_id}, lambda success, data, message: self._handle_stack_trace_response(success, data, message, body))
+        self._clear_variables()
+        generation = self._stop_generation
+        self._send_request(
+            "stackTrace",
+            {"threadId": thread_id},
+            lambda success, data, message: self._handle_stack_trace_response(success, data, message, body, generation),
+        )
 
-    def _handle_stack_trace_response(self, success: bool, body: dict, message: str, stopped_body: dict) -> None:
+    def _handle_stack_trace_response(self, success: bool, body: dict, message: str, stopped_body: dict, generation: int) -> None:
+        if generation != self._stop_generation:
+            return
         if not success:
             self.fatalError.emit({"message": message or "Failed to fetch debug stack.", "traceback": ""})
             return
@@ -524,15 +553,18 @@ class DebugpyPythonDebuggerBackend(DebuggerBackend):
             if not isinstance(raw, dict):
                 continue
             source = raw.get("source") or {}
+            frame_id = int(raw.get("id") or 0)
             frames.append(
                 {
-                    "id": int(raw.get("id") or 0),
+                    "id": frame_id,
                     "file": str((source.get("path") or "")),
                     "line": int(raw.get("line") or 0),
                     "column": int(raw.get("column") or 1),
                     "function": str(raw.get("name") or "<module>"),
-                    "locals": {},
-                    "globals": {},
+                    "scopes": [
+                        {"name": "Locals", "variables_reference": self._new_variable_ref("scope", (frame_id, "locals"))},
+                        {"name": "Globals", "variables_reference": self._new_variable_ref("scope", (frame_id, "globals"))},
+                    ],
                 }
             )
         if not frames:
@@ -540,106 +572,186 @@ class DebugpyPythonDebuggerBackend(DebuggerBackend):
             return
         self._current_frames = frames
         self._current_frame_id = int(frames[0].get("id") or 0)
-        self._populate_frame_scopes(0, stopped_body)
-
-    def _populate_frame_scopes(self, index: int, stopped_body: dict) -> None:
-        if index >= len(self._current_frames):
-            self._finalize_stopped_payload(stopped_body)
-            return
-        frame = self._current_frames[index]
-        frame_id = int(frame.get("id") or 0)
-        self._send_request("scopes", {"frameId": frame_id}, lambda success, body, message, i=index: self._handle_scopes_response(success, body, message, i, stopped_body))
-
-    def _handle_scopes_response(self, success: bool, body: dict, message: str, index: int, stopped_body: dict) -> None:
-        if not success:
-            self._populate_frame_scopes(index + 1, stopped_body)
-            return
-        scopes = [item for item in (body.get("scopes") or []) if isinstance(item, dict)]
-        target = {"locals": None, "globals": None}
-        for scope in scopes:
-            name = str(scope.get("name") or "").strip().lower()
-            if name == "locals" and target["locals"] is None:
-                target["locals"] = int(scope.get("variablesReference") or 0)
-            elif name == "globals" and target["globals"] is None:
-                target["globals"] = int(scope.get("variablesReference") or 0)
-        self._load_scope_variables(index, target, "locals", stopped_body)
-
-    def _load_scope_variables(self, index: int, refs: dict[str, int | None], scope_name: str, stopped_body: dict) -> None:
-        ref = int(refs.get(scope_name) or 0)
-        if ref <= 0:
-            next_scope = "globals" if scope_name == "locals" else None
-            if next_scope is None:
-                self._populate_frame_scopes(index + 1, stopped_body)
-            else:
-                self._load_scope_variables(index, refs, next_scope, stopped_body)
-            return
-        self._send_request(
-            "variables",
-            {"variablesReference": ref},
-            lambda success, body, message, i=index, r=refs, name=scope_name: self._handle_variables_response(success, body, message, i, r, name, stopped_body),
-        )
 
-    def _handle_variables_response(
-        self,
-        success: bool,
-        body: dict,
-        message: str,
-        index: int,
-        refs: dict[str, int | None],
-        scope_name: str,
-        stopped_body: dict,
-    ) -> None:
-        if success:
-            values: dict[str, str] = {}
-            for item in (body.get("variables") or []):
-                if not isinstance(item, dict):
-                    continue
-                values[str(item.get("name") or "")] = str(item.get("value") or "")
-            self._current_frames[index][scope_name] = values
-        next_scope = "globals" if scope_name == "locals" else None
-        if next_scope is None:
-            self._populate_frame_scopes(index + 1, stopped_body)
-        else:
-            self._load_scope_variables(index, refs, next_scope, stopped_body)
-
-    def _finalize_stopped_payload(self, stopped_body: dict) -> None:
+        # Everything below goes out at once and is routed back by request seq. Only the
+        # selected frame's locals are prefetched; other frames load when expanded.
+        top_locals = int(frames[0]["scopes"][0]["variables_reference"])
+        self._fetch_variables(top_locals, 0, VARIABLES_PAGE_SIZE)
         if self._watch_expressions:
             self._collect_watch_values(
                 list(self._watch_expressions),
-                [],
-                lambda watches: self._emit_paused_payload(stopped_body, watches),
+                lambda watches: self._emit_paused_payload(stopped_body, watches, generation),
             )
         else:
-            self._emit_paused_payload(stopped_body, [])
+            self._emit_paused_payload(stopped_body, [], generation)
 
         reason = str(stopped_body.get("reason") or "").strip().lower()
         if reason == "exception":
             self._request_exception_info()
 
-    def _emit_paused_payload(self, stopped_body: dict, watches: list[dict]) -> None:
+    def _emit_paused_payload(self, stopped_body: dict, watches: list[dict], generation: int) -> None:
+        if generation != self._stop_generation:
+            return
         top_frame = self._current_frames[0] if self._current_frames else {}
         self.paused.emit(
             {
                 "file": str(top_frame.get("file") or ""),
                 "line": int(top_frame.get("line") or 0),
                 "function": str(top_frame.get("function") or ""),
-                "locals": dict(top_frame.get("locals") or {}),
-                "globals": dict(top_frame.get("globals") or {}),
+                # Outermost first, like the built-in runner, so the session view selects the
+                # frame that stopped.
                 "stack": [
                     {
                         "file": str(frame.get("file") or ""),
                         "line": int(frame.get("line") or 0),
                         "function": str(frame.get("function") or ""),
-                        "locals": dict(frame.get("locals") or {}),
-                        "globals": dict(frame.get("globals") or {}),
+                        "scopes": [dict(scope) for scope in frame.get("scopes") or []],
                     }
-                    for frame in self._current_frames
+                    for frame in reversed(self._current_frames)
                 ],
                 "watches": watches,
                 "reason": str(stopped_body.get("reason") or ""),
             }
         )
 
+    def _new_variable_ref(self, kind: str, target) -> int:
+        # Adapter references are wrapped in ids that are never reused, so a late reply for an
+        # older stop cannot land on an item of the current one.
+        self._next_variable_ref += 1
+        self._variable_refs[self._next_variable_ref] = (kind, target)
+        return self._next_variable_ref
+
+    def _clear_variables(self) -> None:
+        self._stop_generation += 1
+        self._variable_refs.clear()
+        self._variable_totals.clear()
+        self._variable_children.clear()
+        self._variable_pages.clear()
+        self._variable_fetches.clear()
+        self._frame_scopes.clear()
+
+    def _request_variables(self, reference: int, start: int, count: int) -> None:
+        key = (int(reference), max(0, int(start)), max(1, int(count)))
+        cached = self._variable_pages.get(key)
+        if cached is not None:
+            self.variablesReceived.emit(dict(cached))
+            return
+        self._fetch_variables(*key, requested=True)
+
+    def _fetch_variables(self, reference: int, start: int, count: int, *, requested: bool = False) -> None:
+        """Fetch one page into the cache; it is emitted only once the IDE has asked for it."""
+        key = (reference, start, count)
+        if key in self._variable_pages:
+            return
+        if key in self._variable_fetches:
+            self._variable_fetches[key] = self._variable_fetches[key] or requested
+            return
+        self._variable_fetches[key] = requested
+        entry = self._variable_refs.get(reference)
+        if entry is None:
+            self._finish_variables_page(key, [], 0, "Variables are no longer available")
+            return
+        children = self._variable_children.get(reference)
+        if children is not None:
+            self._finish_variables_page(key, children[start : start + count], len(children), "")
+            return
+        kind, target = entry
+        if kind == "scope":
+            frame_id, scope_name = target
+            self._with_frame_scopes(frame_id, lambda scopes: self._fetch_dap_variables(key, int(scopes.get(scope_name) or 0)))
+        else:
+            self._fetch_dap_variables(key, int(target))
+
+    def _with_frame_scopes(self, frame_id: int, callback: Callable[[dict[str, int]], None]) -> None:
+        scopes = self._frame_scopes.get(frame_id)
+        if isinstance(scopes, dict):
+            callback(scopes)
+            return
+        if isinstance(scopes, list):
+            scopes.append(callback)
+            return
+        self._frame_scopes[frame_id] = [callback]
+        generation = self._stop_generation
+        self._send_request(
+            "scopes",
+            {"frameId": frame_id},
+            lambda success, body, message: self._handle_scopes_response(success, body, frame_id, generation),
+        )
+
+    def _handle_scopes_response(self, success: bool, body: dict, frame_id: int, generation: int) -> None:
+        if generation != self._stop_generation:
+            return
+        scopes: dict[str, int] = {}
+        for scope in (body.get("scopes") or []) if success else []:
+            if not isinstance(scope, dict):
+                continue
+            name = str(scope.get("name") or "").strip().lower()
+            if name in {"locals", "globals"} and name not in scopes:
+                scopes[name] = int(scope.get("variablesReference") or 0)
+        waiting = self._frame_scopes.get(frame_id)
+        self._frame_scopes[frame_id] = scopes
+        for callback in waiting if isinstance(waiting, list) else []:
+            callback(scopes)
+
+    def _fetch_dap_variables(self, key: tuple[int, int, int], dap_reference: int) -> None:
+        if dap_reference <= 0:
+            self._finish_variables_page(key, [], 0, "")
+            return
+        generation = self._stop_generation
+        _reference, start, count = key
+        self._send_request(
+            "variables",
+            {"variablesReference": dap_reference, "start": start, "count": count},
+            lambda success, body, message: self._handle_variables_response(success, body, message, key, generation),
+        )
+
+    def _handle_variables_response(self, success: bool, body: dict, message: str, key: tuple[int, int, int], generation: int) -> None:
+        if generation != self._stop_generation:
+            return
+        reference, start, count = key
+        if not success:
+            self._finish_variables_page(key, [], 0, message or "Failed to load variables")
+            return
+        variables: list[dict] = []
+        for item in (body.get("variables") or []):
+            if not isinstance(item, dict):
+                continue
+            child_dap_reference = int(item.get("variablesReference") or 0)
+            child_reference = 0
+            if child_dap_reference > 0:
+                child_reference = self._new_variable_ref("dap", child_dap_reference)
+                advertised = int(item.get("namedVariables") or 0) + int(item.get("indexedVariables") or 0)
+                if advertised > 0:
+                    self._variable_totals[child_reference] = advertised
+            variables.append(
+                {
+                    "name": str(item.get("name") or ""),
+                    "value": str(item.get("value") or ""),
+                    "type": str(item.get("type") or ""),
+                    "variables_reference": child_reference,
+                }
+            )
+        if len(variables) > count or (start == 0 and len(variables) < count):
+            # The adapter sent every child (debugpy ignores start/count); later pages are
+            # sliced locally instead of asking again.
+            self._variable_children[reference] = variables
+            self._finish_variables_page(key, variables[start : start + count], len(variables), "")
+            return
+        total = start + len(variables)
+        if len(variables) == count:
+            total = max(self._variable_totals.get(reference, 0), total + 1)
+        self._finish_variables_page(key, variables, total, "")
+
+    def _finish_variables_page(self, key: tuple[int, int, int], variables: list[dict], total: int, error: str) -> None:
+        reference, start, _count = key
+        payload = {"reference": reference, "start": start, "total": total, "variables": variables}
+        if error:
+            payload["error"] = error
+        else:
+            self._variable_pages[key] = payload
+        if self._variable_fetches.pop(key, False):
+            self.variablesReceived.emit(dict(payload))
+
     def _request_exception_info(self) -> None:
         thread_id = int(self._current_thread_id or 0)
         if thread_id <= 0:
@@ -667,33 +779,32 @@ class DebugpyPythonDebuggerBackend(DebuggerBackend):
         if not self._watch_expressions:
             self.watchValuesUpdated.emit({"watches": []})
             return
-        self._collect_watch_values(list(self._watch_expressions), [], lambda watches: self.watchValuesUpdated.emit({"watches": watches}))
+        self._collect_watch_values(list(self._watch_expressions), lambda watches: self.watchValuesUpdated.emit({"watches": watches}))
 
     def _collect_watch_values(
         self,
         expressions: list[str],
-        results: list[dict],
         done: Callable[[list[dict]], None],
     ) -> None:
         if not expressions:
-            done(results)
+            done([])
             return
-        expr = str(expressions[0] or "").strip()
-        self._evaluate_expression(
-            expr,
-            emit_signal=False,
-            done=lambda result: self._finish_watch_evaluation(expressions[1:], results, result, done),
-        )
-
-    def _finish_watch_evaluation(
-        self,
-        remaining: list[str],
-        results: list[dict],
-        result: dict,
-        done: Callable[[list[dict]], None],
-    ) -> None:
-        results.append(result)
-        self._collect_watch_values(remaining, results, done)
+        # All evaluations are in flight together; results keep the expression order.
+        results: list[dict | None] = [None] * len(expressions)
+        remaining = [len(expressions)]
+
+        def finish(index: int, result: dict) -> None:
+            results[index] = result
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                done([item for item in results if item is not None])
+
+        for index, expression in enumerate(expressions):
+            self._evaluate_expression(
+                str(expression or "").strip(),
+                emit_signal=False,
+                done=lambda result, i=index: finish(i, result),
+            )
 
     def _evaluate_expression(
         self,
@@ -226,6 +226,9 @@ class BdbPythonDebuggerBackend(DebuggerBackend):
         if event == "evaluation_result":
             self.evaluationResult.emit(data)
             return
+        if event == "variables":
+            self.variablesReceived.emit(data)
+            return
         if event == "output":
             self.stdoutReceived.emit(str(data.get("text") or ""))
             return
@@ -423,6 +426,7 @@ class PythonDebuggerBackend(DebuggerBackend):
         self._impl.paused.connect(self.paused)
         self._impl.watchValuesUpdated.connect(self.watchValuesUpdated)
         self._impl.evaluationResult.connect(self.evaluationResult)
+        self._impl.variablesReceived.connect(self.variablesReceived)
         self._impl.exceptionRaised.connect(self.exceptionRaised)
         self._impl.fatalError.connect(self.fatalError)
         self._impl.processEnded.connect(self.processEnded)
@@ -1,14 +1,89 @@
 from __future__ import annotations
 
 import bdb
+import contextlib
 import importlib.util
+import itertools
 import json
 import os
+import reprlib
 import runpy
+import signal
 import sys
+import threading
+import time
 import traceback
+import types
 
 PROTO_PREFIX = "__DBG__:"
+# "monitoring" (3.12+), "frame" (settrace, untraced frames without breakpoints) or "bdb".
+TRACE_BACKEND_ENV = "PYTPO_DEBUG_TRACE_BACKEND"
+_MONITORING = getattr(sys, "monitoring", None)
+
+VARIABLES_PAGE_SIZE = 100
+VARIABLES_PAGE_LIMIT = 500
+# Bounds for rendering one value and one page of values while paused.
+REPR_MAX_CHARS = 512
+REPR_TIMEOUT_SECONDS = 0.25
+VARIABLES_PAGE_BUDGET_SECONDS = 1.0
+
+_SAFE_REPR = reprlib.Repr()
+_SAFE_REPR.maxlevel = 3
+_SAFE_REPR.maxstring = REPR_MAX_CHARS
+_SAFE_REPR.maxother = REPR_MAX_CHARS
+_SAFE_REPR.maxlong = 120
+_SAFE_REPR.maxlist = _SAFE_REPR.maxtuple = _SAFE_REPR.maxset = _SAFE_REPR.maxfrozenset = 20
+_SAFE_REPR.maxdeque = _SAFE_REPR.maxarray = 20
+_SAFE_REPR.maxdict = 10
+_SEQUENCE_TYPES = (list, tuple)
+_ITERABLE_TYPES = (dict, set, frozenset)
+
+
+class _ReprTimeout(BaseException):
+    pass
+
+
+def _raise_repr_timeout(_signum, _frame):
+    raise _ReprTimeout()
+
+
+@contextlib.contextmanager
+def _repr_deadline(seconds):
+    """Interrupt a slow ``__repr__`` with SIGALRM where that is possible (POSIX, main thread)."""
+    if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    previous_handler = signal.getsignal(signal.SIGALRM)
+    if previous_handler is None:
+        yield
+        return
+    signal.signal(signal.SIGALRM, _raise_repr_timeout)
+    previous_timer = signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+        if previous_timer[0] > 0:
+            signal.setitimer(signal.ITIMER_REAL, *previous_timer)
+
+
+def bounded_repr(value):
+    try:
+        with _repr_deadline(REPR_TIMEOUT_SECONDS):
+            text = _SAFE_REPR.repr(value)
+    except _ReprTimeout:
+        return f"<{type(value).__name__}: repr timed out>"
+    except Exception:
+        return "<repr-error>"
+    if len(text) > REPR_MAX_CHARS:
+        text = text[: REPR_MAX_CHARS - 3] + "..."
+    return text
+
+
+def _is_dunder(name):
+    text = str(name)
+    return text.startswith("__") and text.endswith("__")
 
 
 def send_event(event, data=None):
@@ -17,8 +92,177 @@ def send_event(event, data=None):
     sys.stderr.flush()
 
 
+def select_trace_backend(requested=None):
+    name = str(requested or os.environ.get(TRACE_BACKEND_ENV) or "").strip().lower()
+    if name == "monitoring" and _MONITORING is None:
+        name = "frame"
+    if name in {"monitoring", "frame", "bdb"}:
+        return name
+    return "monitoring" if _MONITORING is not None else "frame"
+
+
+class _MonitoringTracer:
+    """Drive a ``RemoteDebugger`` from ``sys.monitoring`` instead of ``sys.settrace``.
+
+    While running to a breakpoint only code objects containing one get LINE events, and
+    lines without a breakpoint disable themselves after their first hit. PY_START stays on
+    to discover newly executed code objects, but each location disables itself once seen.
+    Return, yield, unwind and raise events are only enabled while stepping.
+    """
+
+    TOOL_NAME = "pytpo-debugger"
+
+    def __init__(self, debugger):
+        self.debugger = debugger
+        self.tool_id = _MONITORING.DEBUGGER_ID
+        self.mode = "continue"
+        self.step_frame = None
+        self.thread_id = None
+        self.line_codes = set()
+        self.active = False
+        events = _MONITORING.events
+        self._callbacks = {
+            events.PY_START: self._on_start,
+            events.PY_RESUME: self._on_start,
+            events.LINE: self._on_line,
+            events.PY_RETURN: self._on_return,
+            events.PY_YIELD: self._on_return,
+            events.PY_UNWIND: self._on_unwind,
+            events.RAISE: self._on_raise,
+        }
+        self._stepping_events = (
+            events.PY_START | events.PY_RESUME | events.PY_RETURN | events.PY_YIELD | events.PY_UNWIND | events.RAISE
+        )
+
+    def start(self):
+        _MONITORING.use_tool_id(self.tool_id, self.TOOL_NAME)
+        for event, callback in self._callbacks.items():
+            _MONITORING.register_callback(self.tool_id, event, callback)
+        self.thread_id = threading.get_ident()
+        self.active = True
+        self._apply_events(restart=False)
+
+    def stop(self):
+        if not self.active:
+            return
+        self.active = False
+        _MONITORING.set_events(self.tool_id, 0)
+        for code in self.line_codes:
+            _MONITORING.set_local_events(self.tool_id, code, 0)
+        self.line_codes.clear()
+        for event in self._callbacks:
+            _MONITORING.register_callback(self.tool_id, event, None)
+        _MONITORING.free_tool_id(self.tool_id)
+
+    def resume(self, action, frame):
+        if action == "next" and frame is not None:
+            self.mode = "next"
+            self.step_frame = frame
+        elif action in {"step", "next"}:
+            self.mode = "step"
+            self.step_frame = None
+        else:
+            self.mode = "continue"
+            self.step_frame = None
+        if frame is not None and self.mode != "continue":
+            self._enable_lines(frame.f_code)
+        if self.active:
+            self._apply_events(restart=self.mode != "continue")
+
+    def breakpoints_changed(self, frame):
+        # Frames already running never see PY_START again, so arm the paused stack too.
+        while frame is not None:
+            if self.debugger.code_has_breakpoint(frame.f_code):
+                self._enable_lines(frame.f_code)
+            frame = frame.f_back
+        if self.active:
+            self._apply_events(restart=True)
+
+    def _apply_events(self, *, restart):
+        stepping = self.mode != "continue"
+        for code in list(self.line_codes):
+            if stepping and self.step_frame is not None and code is self.step_frame.f_code:
+                continue
+            if not self.debugger.code_has_breakpoint(code) and not (stepping and self.mode == "step"):
+                _MONITORING.set_local_events(self.tool_id, code, 0)
+                self.line_codes.discard(code)
+        events = _MONITORING.events.PY_START | _MONITORING.events.PY_RESUME
+        _MONITORING.set_events(self.tool_id, self._stepping_events if stepping else events)
+        if restart:
+            # Re-arm locations that returned DISABLE under the previous breakpoints or mode.
+            _MONITORING.restart_events()
+
+    def _enable_lines(self, code):
+        if code not in self.line_codes:
+            self.line_codes.add(code)
+            _MONITORING.set_local_events(self.tool_id, code, _MONITORING.events.LINE)
+
+    def _on_debug_thread(self):
+        return threading.get_ident() == self.thread_id
+
+    def _on_start(self, code, _offset):
+        debugger = self.debugger
+        if debugger.code_has_breakpoint(code):
+            self._enable_lines(code)
+        elif self.mode == "step" and debugger._is_user_file(debugger.canonic(code.co_filename)):
+            self._enable_lines(code)
+        return _MONITORING.DISABLE
+
+    def _on_line(self, code, line_number):
+        if not self._on_debug_thread():
+            return None
+        debugger = self.debugger
+        filename = debugger.canonic(code.co_filename)
+        frame = sys._getframe(1)
+        if debugger._has_breakpoint(filename, line_number):
+            if debugger._breakpoint_should_pause(frame, filename, line_number):
+                debugger.pause(frame)
+            return None
+        if self.mode == "continue":
+            return _MONITORING.DISABLE
+        if self.mode == "next":
+            should_stop = frame is self.step_frame
+        else:
+            should_stop = debugger._is_user_file(filename)
+        if should_stop:
+            debugger.pause(frame)
+        return None
+
+    def _on_return(self, code, _offset, _value):
+        self._frame_exiting(code)
+
+    def _on_unwind(self, code, _offset, _exception):
+        self._frame_exiting(code)
+
+    def _frame_exiting(self, code):
+        if self.mode == "continue" or not self._on_debug_thread():
+            return
+        frame = sys._getframe(2)
+        if self.mode == "next":
+            if frame is not self.step_frame:
+                return
+            # Leaving the stepped frame stops at the next line of the caller, like bdb.
+            self.mode = "step"
+            self.step_frame = None
+            _MONITORING.restart_events()
+        caller = frame.f_back
+        if caller is not None and self.debugger._is_user_file(self.debugger.canonic(caller.f_code.co_filename)):
+            self._enable_lines(caller.f_code)
+
+    def _on_raise(self, code, _offset, exception):
+        if self.mode == "continue" or not self._on_debug_thread():
+            return
+        frame = sys._getframe(1)
+        if self.mode == "next":
+            if frame is not self.step_frame:
+                return
+        elif not self.debugger._is_user_file(self.debugger.canonic(code.co_filename)):
+            return
+        self.debugger.user_exception(frame, (type(exception), exception, exception.__traceback__))
+
+
 class RemoteDebugger(bdb.Bdb):
-    def __init__(self):
+    def __init__(self, trace_backend=None):
         super().__init__()
         self.mainpyfile = None
         self.paused_frame = None
@@ -31,6 +275,32 @@ class RemoteDebugger(bdb.Bdb):
         self.breakpoint_hits = {}
         self.watch_expressions = []
         self.last_resume_action = "continue"
+        self._variable_refs = {}
+        self._variable_pages = {}
+        self._next_variable_ref = 1
+        self.trace_backend = select_trace_backend(trace_backend)
+        self.tracer = _MonitoringTracer(self) if self.trace_backend == "monitoring" else None
+        self._breakpoint_code_cache = {}
+
+    def code_has_breakpoint(self, code):
+        cached = self._breakpoint_code_cache.get(code)
+        if cached is None:
+            lines = self.breakpoint_specs.get(self.canonic(code.co_filename))
+            cached = bool(lines) and any(line in lines for _start, _end, line in code.co_lines())
+            self._breakpoint_code_cache[code] = cached
+        return cached
+
+    def dispatch_call(self, frame, arg):
+        # Frame-local tracing: a frame whose code has no breakpoint runs untraced unless a
+        # step is in progress; bdb itself only narrows this down to the whole file.
+        if (
+            self.trace_backend == "frame"
+            and self.botframe is not None
+            and not self.stop_here(frame)
+            and not self.code_has_breakpoint(frame.f_code)
+        ):
+            return None
+        return super().dispatch_call(frame, arg)
 
     def user_line(self, frame):
         filename = self.canonic(frame.f_code.co_filename)
@@ -45,16 +315,17 @@ class RemoteDebugger(bdb.Bdb):
         if has_breakpoint and not self._breakpoint_should_pause(frame, filename, line_number):
             self._resume_skipping_frame()
             return
+        self.pause(frame)
 
+    def pause(self, frame):
         self.paused_frame = frame
+        self._clear_variables()
         send_event(
             "stop",
             {
-                "file": filename,
-                "line": line_number,
+                "file": self.canonic(frame.f_code.co_filename),
+                "line": int(frame.f_lineno),
                 "function": frame.f_code.co_name,
-                "locals": self.get_safe_dict(frame.f_locals),
-                "globals": self.get_safe_globals(frame.f_globals),
                 "stack": self.get_stack_data(frame),
                 "watches": self.current_watches_payload(),
             },
@@ -75,27 +346,8 @@ class RemoteDebugger(bdb.Bdb):
             },
         )
 
-    def get_safe_dict(self, values):
-        safe = {}
-        for key, value in values.items():
-            try:
-                safe[str(key)] = repr(value)
-            except Exception:
-                safe[str(key)] = "<repr-error>"
-        return safe
-
-    def get_safe_globals(self, values):
-        safe = {}
-        for key, value in values.items():
-            if str(key).startswith("__") and str(key).endswith("__"):
-                continue
-            try:
-                safe[str(key)] = repr(value)
-            except Exception:
-                safe[str(key)] = "<repr-error>"
-        return safe
-
     def get_stack_data(self, frame):
+        # Frame summaries only; scope contents are fetched with "variables" on demand.
         frames = []
         current = frame
         while current is not None:
@@ -104,14 +356,110 @@ class RemoteDebugger(bdb.Bdb):
                     "file": self.canonic(current.f_code.co_filename),
                     "line": current.f_lineno,
                     "function": current.f_code.co_name,
-                    "locals": self.get_safe_dict(current.f_locals),
-                    "globals": self.get_safe_globals(current.f_globals),
+                    "scopes": [
+                        {"name": "Locals", "variables_reference": self._new_variable_ref("locals", current)},
+                        {"name": "Globals", "variables_reference": self._new_variable_ref("globals", current)},
+                    ],
                 }
             )
             current = current.f_back
         frames.reverse()
         return frames
 
+    def _new_variable_ref(self, kind, target):
+        # References are never reused, so a late reply for an older stop cannot be misfiled.
+        ref = self._next_variable_ref
+        self._next_variable_ref += 1
+        self._variable_refs[ref] = [kind, target, None]
+        return ref
+
+    def _clear_variables(self):
+        self._variable_refs.clear()
+        self._variable_pages.clear()
+
+    def variables_payload(self, reference, start=0, count=VARIABLES_PAGE_SIZE):
+        try:
+            ref = int(reference or 0)
+            start = max(0, int(start or 0))
+            count = max(1, min(VARIABLES_PAGE_LIMIT, int(count or VARIABLES_PAGE_SIZE)))
+        except Exception:
+            return {"reference": reference, "start": 0, "total": 0, "variables": [], "error": "Invalid request"}
+        cached = self._variable_pages.get((ref, start, count))
+        if cached is not None:
+            return cached
+        entry = self._variable_refs.get(ref)
+        if entry is None:
+            return {"reference": ref, "start": start, "total": 0, "variables": [], "error": "Variables are no longer available"}
+
+        try:
+            total, children = self._child_page(entry, start, count)
+        except Exception as exc:
+            return {"reference": ref, "start": start, "total": 0, "variables": [], "error": f"{type(exc).__name__}: {exc}"}
+        variables = []
+        deadline = time.monotonic() + VARIABLES_PAGE_BUDGET_SECONDS
+        for name, value in children:
+            if variables and time.monotonic() > deadline:
+                # The rest of the page stays unloaded; the IDE asks again from here.
+                break
+            variables.append(
+                {
+                    "name": name,
+                    "value": bounded_repr(value),
+                    "type": type(value).__name__,
+                    "variables_reference": self._new_variable_ref("value", value) if self._has_children(value) else 0,
+                }
+            )
+        payload = {"reference": ref, "start": start, "total": total, "variables": variables}
+        self._variable_pages[(ref, start, count)] = payload
+        return payload
+
+    def _child_page(self, entry, start, count):
+        kind, target, names = entry
+        if kind in {"locals", "globals"} or names is not None:
+            if names is None:
+                names = entry[2] = self._named_children(kind, target)
+            page = names[start : start + count]
+            namespace = self._namespace(kind, target)
+            return len(names), [(name, namespace[name]) for name in page if name in namespace]
+        if isinstance(target, _SEQUENCE_TYPES):
+            return len(target), [(str(start + offset), value) for offset, value in enumerate(target[start : start + count])]
+        if isinstance(target, dict):
+            items = itertools.islice(target.items(), start, start + count)
+            return len(target), [(bounded_repr(key), value) for key, value in items]
+        if isinstance(target, _ITERABLE_TYPES):
+            items = itertools.islice(target, start, start + count)
+            return len(target), [(str(start + offset), value) for offset, value in enumerate(items)]
+        names = entry[2] = self._named_children(kind, target)
+        namespace = self._namespace(kind, target)
+        return len(names), [(name, namespace[name]) for name in names[start : start + count] if name in namespace]
+
+    @staticmethod
+    def _namespace(kind, target):
+        if kind == "locals":
+            return target.f_locals
+        if kind == "globals":
+            return target.f_globals
+        return vars(target)
+
+    def _named_children(self, kind, target):
+        namespace = self._namespace(kind, target)
+        skip_dunders = kind == "globals" or isinstance(target, (type, types.ModuleType))
+        return sorted(
+            (str(name) for name in namespace if not (skip_dunders and _is_dunder(name))),
+            key=lambda name: (name.startswith("_"), name.lower()),
+        )
+
+    @staticmethod
+    def _has_children(value):
+        if isinstance(value, (str, bytes, bytearray, int, float, complex, bool)) or value is None:
+            return False
+        if isinstance(value, _SEQUENCE_TYPES + _ITERABLE_TYPES):
+            return len(value) > 0
+        try:
+            return bool(vars(value))
+        except Exception:
+            return False
+
     def _is_library_path(self, filename):
         path = str(filename or "")
         if not path:
@@ -190,7 +538,7 @@ class RemoteDebugger(bdb.Bdb):
             return {"expression": expr, "status": "error", "error": "Program is not paused"}
         try:
             value = eval(expr, active_frame.f_globals, active_frame.f_locals)
-            rendered = repr(value)
+            rendered = bounded_repr(value)
             return {
                 "expression": expr,
                 "status": "ok",
@@ -257,6 +605,11 @@ class RemoteDebugger(bdb.Bdb):
                     pass
 
         self.breakpoint_specs = new_specs
+        self._breakpoint_code_cache = {}
+        if self.tracer is not None:
+            self.tracer.breakpoints_changed(self.paused_frame)
+        elif self.trace_backend == "frame":
+            self._arm_stack(self.paused_frame, only_breakpoints=True)
         self.breakpoint_hits = {
             key: value
             for key, value in self.breakpoint_hits.items()
@@ -265,14 +618,34 @@ class RemoteDebugger(bdb.Bdb):
         send_event("breakpoints_set", {"files": sorted(self.breakpoint_specs)})
 
     def _resume_skipping_frame(self):
-        action = str(self.last_resume_action or "continue")
-        if action == "next" and self.paused_frame is not None:
-            self.set_next(self.paused_frame)
+        self._apply_resume(str(self.last_resume_action or "continue"))
+
+    def resume(self, action):
+        self._clear_variables()
+        self.last_resume_action = str(action)
+        self._apply_resume(self.last_resume_action)
+
+    def _apply_resume(self, action):
+        frame = self.paused_frame
+        if self.tracer is not None:
+            self.tracer.resume(action, frame)
             return
-        if action == "step":
+        if action == "next" and frame is not None:
+            self.set_next(frame)
+        elif action in {"step", "next"}:
             self.set_step()
+        else:
+            self.set_continue()
             return
-        self.set_continue()
+        if self.trace_backend == "frame":
+            self._arm_stack(frame)
+
+    def _arm_stack(self, frame, *, only_breakpoints=False):
+        # Callers entered while running untraced need a local trace to stop after a return.
+        while frame is not None and frame is not self.botframe:
+            if frame.f_trace is None and (not only_breakpoints or self.code_has_breakpoint(frame.f_code)):
+                frame.f_trace = self.trace_dispatch
+            frame = frame.f_back
 
     def wait_for_command(self):
         while True:
@@ -285,20 +658,8 @@ class RemoteDebugger(bdb.Bdb):
                 continue
 
             action = cmd.get("action")
-            if action == "step":
-                self.last_resume_action = "step"
-                self.set_step()
-                return
-            if action == "next":
-                self.last_resume_action = "next"
-                if self.paused_frame is not None:
-                    self.set_next(self.paused_frame)
-                else:
-                    self.set_step()
-                return
-            if action == "continue":
-                self.last_resume_action = "continue"
-                self.set_continue()
+            if action in {"step", "next", "continue"}:
+                self.resume(action)
                 return
             if action == "quit":
                 raise SystemExit(0)
@@ -315,6 +676,16 @@ class RemoteDebugger(bdb.Bdb):
                 result = self._evaluate_expression(cmd.get("expression") or "")
                 result.pop("raw_value", None)
                 send_event("evaluation_result", result)
+                continue
+            if action == "variables":
+                send_event(
+                    "variables",
+                    self.variables_payload(
+                        cmd.get("reference"),
+                        cmd.get("start") or 0,
+                        cmd.get("count") or VARIABLES_PAGE_SIZE,
+                    ),
+                )
 
     def wait_for_initial_setup(self):
         while True:
@@ -361,7 +732,30 @@ class RemoteDebugger(bdb.Bdb):
             "__package__": None,
             "__cached__": None,
         }
-        self.runctx(code, globals_dict, globals_dict)
+        self.run_traced(code, globals_dict, globals_dict)
+
+    def run_traced(self, cmd, globals_dict, locals_dict):
+        tracer = self.tracer
+        if tracer is not None:
+            try:
+                tracer.start()
+            except ValueError:
+                # Another tool already holds the debugger slot; fall back to settrace.
+                self.tracer = None
+                self.trace_backend = "frame"
+        if self.tracer is None:
+            self.runctx(cmd, globals_dict, locals_dict)
+            return
+        self.reset()
+        if isinstance(cmd, str):
+            cmd = compile(cmd, "<string>", "exec")
+        try:
+            exec(cmd, globals_dict, locals_dict)
+        except bdb.BdbQuit:
+            pass
+        finally:
+            self.quitting = True
+            tracer.stop()
 
     @staticmethod
     def resolve_module_entry(module_name):
@@ -388,7 +782,7 @@ class RemoteDebugger(bdb.Bdb):
         original_argv = sys.argv[:]
         try:
             sys.argv = [entry_spec.origin, *argv]
-            self.runctx(
+            self.run_traced(
                 "runpy.run_module(module_name, run_name='__main__', alter_sys=True)",
                 {"runpy": runpy, "module_name": module_name},
                 {},
@@ -410,18 +804,25 @@ def main():
     try:
         if launch_mode == "module":
             entry_spec = debugger.resolve_module_entry(launch_target)
-            send_event("started", {"file": debugger.canonic(entry_spec.origin), "module": launch_target})
+            send_event(
+                "started",
+                {
+                    "file": debugger.canonic(entry_spec.origin),
+                    "module": launch_target,
+                    "trace_backend": debugger.trace_backend,
+                },
+            )
             initial_action = debugger.wait_for_initial_setup()
             if initial_action in {"step", "next"}:
-                debugger.set_step()
+                debugger.resume("step")
             debugger.run_module(launch_target, launch_args)
         else:
             target_script = os.path.abspath(launch_target)
             sys.argv = [target_script, *launch_args]
-            send_event("started", {"file": debugger.canonic(target_script)})
+            send_event("started", {"file": debugger.canonic(target_script), "trace_backend": debugger.trace_backend})
             initial_action = debugger.wait_for_initial_setup()
             if initial_action in {"step", "next"}:
-                debugger.set_step()
+                debugger.resume("step")
             debugger.run_script(target_script)
     except SystemExit:
         pass
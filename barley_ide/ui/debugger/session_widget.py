@@ -28,7 +28,6 @@ from .backend import ExecutionState
 from .controller import DebuggerController
 from .io_terminal_widget import DebuggerIoTerminalWidget
 from .python_backend import PythonDebuggerBackend
-from .lldb_dap_backend import LldbDapDebuggerBackend
 
 
 class DebuggerSessionWidget(QWidget):
@@ -45,6 +44,10 @@ class DebuggerSessionWidget(QWidget):
     )
     _STEP_SKIP_LINE = 'Frame skipped from debugging during step-in.'
     _STEP_SKIP_NOTE_PREFIX = 'Note: may have been skipped because of "justMyCode" option'
+    VARIABLES_PAGE_SIZE = 100
+    _ROLE_VARIABLES_REF = Qt.UserRole
+    _ROLE_VARIABLES_LOADED = Qt.UserRole + 1
+    _ROLE_MORE_START = Qt.UserRole + 2
 
     def __init__(self, ide, *, session_key: str, session_label: str, backend_id: str = "python", parent=None):
         super().__init__(parent)
@@ -57,6 +60,9 @@ class DebuggerSessionWidget(QWidget):
         self._state = ExecutionState.IDLE
         self._last_visual_state = "idle"
         self._stack_frames: list[dict] = []
+        # Lazily fetched scope/child pages for the current stop, keyed by variables reference.
+        self._variable_items: dict[int, QTreeWidgetItem] = {}
+        self._variable_pages: dict[int, dict] = {}
         self._watch_expressions: list[str] = []
         self._debug_io_terminal: DebuggerIoTerminalWidget | None = None
 
@@ -66,6 +72,8 @@ class DebuggerSessionWidget(QWidget):
 
     def _create_backend(self):
         if self._backend_id == "rust":
+            from .lldb_dap_backend import LldbDapDebuggerBackend
+
             return LldbDapDebuggerBackend(self, ide=self.ide)
         return PythonDebuggerBackend(self, ide=self.ide)
 
@@ -211,6 +219,8 @@ class DebuggerSessionWidget(QWidget):
         self.variables_view.setAlternatingRowColors(True)
         self.variables_view.setMinimumHeight(0)
         self.variables_view.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Ignored)
+        self.variables_view.itemExpanded.connect(self._on_variable_item_expanded)
+        self.variables_view.itemClicked.connect(self._on_variable_item_clicked)
 
         self.watches_host = QWidget(self)
         self.watches_host.setMinimumHeight(0)
@@ -298,6 +308,7 @@ class DebuggerSessionWidget(QWidget):
         self.controller.paused.connect(self._on_paused)
         self.controller.watchValuesUpdated.connect(self._on_watch_values_updated)
         self.controller.evaluationResult.connect(self._on_evaluation_result)
+        self.controller.variablesReceived.connect(self._on_variables_received)
         self.controller.exceptionRaised.connect(self._on_exception)
         self.controller.fatalError.connect(self._on_fatal_error)
         self.controller.processEnded.connect(self._on_process_ended)
@@ -378,6 +389,7 @@ class DebuggerSessionWidget(QWidget):
             self._state = ExecutionState.IDLE
         if self._state in {ExecutionState.STARTING, ExecutionState.RUNNING}:
             self._last_visual_state = "running"
+            self._clear_variable_pages()
         elif self._state == ExecutionState.PAUSED:
             self._last_visual_state = "paused"
         self._set_summary(self.status_text())
@@ -387,6 +399,7 @@ class DebuggerSessionWidget(QWidget):
     def _on_started(self, data: dict) -> None:
         self._last_visual_state = "running"
         self._stack_frames = []
+        self._clear_variable_pages()
         self.stack_view.clear()
         self.variables_view.clear()
         self.watch_values.clear()
@@ -593,6 +606,7 @@ class DebuggerSessionWidget(QWidget):
         return url.toString()
 
     def _render_pause_data(self, data: dict) -> None:
+        self._clear_variable_pages()
         raw_stack = data.get("stack")
         if isinstance(raw_stack, list) and raw_stack:
             self._stack_frames = [item for item in raw_stack if isinstance(item, dict)]
@@ -641,8 +655,21 @@ class DebuggerSessionWidget(QWidget):
 
     def _render_frame_variables(self, frame: dict) -> None:
         self.variables_view.clear()
+        self._variable_items = {}
         self.variables_view.setHeaderLabels(["Name", "Value"])
 
+        scopes = [scope for scope in (frame.get("scopes") or []) if isinstance(scope, dict)]
+        if scopes:
+            # Scope contents are requested on expansion; only the first scope opens eagerly.
+            for index, scope in enumerate(scopes):
+                item = QTreeWidgetItem([str(scope.get("name") or "Scope"), ""])
+                self.variables_view.addTopLevelItem(item)
+                self._bind_variable_item(item, int(scope.get("variables_reference") or 0))
+                if index == 0:
+                    item.setExpanded(True)
+            self.variables_view.resizeColumnToContents(0)
+            return
+
         locals_item = QTreeWidgetItem(["Locals", ""])
         globals_item = QTreeWidgetItem(["Globals", ""])
         self.variables_view.addTopLevelItem(locals_item)
@@ -654,6 +681,76 @@ class DebuggerSessionWidget(QWidget):
         globals_item.setExpanded(True)
         self.variables_view.resizeColumnToContents(0)
 
+    def _clear_variable_pages(self) -> None:
+        self._variable_items = {}
+        self._variable_pages = {}
+
+    def _bind_variable_item(self, item: QTreeWidgetItem, reference: int) -> None:
+        if reference <= 0:
+            return
+        item.setData(0, self._ROLE_VARIABLES_REF, reference)
+        item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+        self._variable_items[reference] = item
+
+    def _on_variable_item_expanded(self, item: QTreeWidgetItem) -> None:
+        reference = int(item.data(0, self._ROLE_VARIABLES_REF) or 0)
+        if reference <= 0 or item.data(0, self._ROLE_VARIABLES_LOADED):
+            return
+        item.setData(0, self._ROLE_VARIABLES_LOADED, True)
+        cached = self._variable_pages.get(reference)
+        if cached is not None:
+            self._fill_variable_item(item, cached["variables"], int(cached["total"]), "")
+            return
+        if not self.controller.request_variables(reference, 0, self.VARIABLES_PAGE_SIZE):
+            item.addChild(QTreeWidgetItem(["<unavailable>", ""]))
+
+    def _on_variable_item_clicked(self, item: QTreeWidgetItem, _column: int) -> None:
+        start = item.data(0, self._ROLE_MORE_START)
+        parent = item.parent()
+        if start is None or int(start) < 0 or parent is None:
+            return
+        # -1 marks the row as an in-flight request until the page arrives.
+        item.setData(0, self._ROLE_MORE_START, -1)
+        item.setText(0, "Loading...")
+        reference = int(parent.data(0, self._ROLE_VARIABLES_REF) or 0)
+        self.controller.request_variables(reference, int(start), self.VARIABLES_PAGE_SIZE)
+
+    def _on_variables_received(self, data: dict) -> None:
+        reference = int(data.get("reference") or 0)
+        if reference <= 0:
+            return
+        start = max(0, int(data.get("start") or 0))
+        variables = [item for item in (data.get("variables") or []) if isinstance(item, dict)]
+        total = max(0, int(data.get("total") or 0))
+        cached = self._variable_pages.setdefault(reference, {"total": total, "variables": []})
+        if start == len(cached["variables"]):
+            cached["variables"].extend(variables)
+        cached["total"] = total
+        item = self._variable_items.get(reference)
+        if item is not None:
+            self._fill_variable_item(item, variables, total, str(data.get("error") or ""))
+
+    def _fill_variable_item(self, parent: QTreeWidgetItem, variables: list[dict], total: int, error: str) -> None:
+        for index in reversed(range(parent.childCount())):
+            if parent.child(index).data(0, self._ROLE_MORE_START) is not None:
+                parent.takeChild(index)
+        for variable in variables:
+            child = QTreeWidgetItem([str(variable.get("name") or ""), str(variable.get("value") or "")])
+            type_name = str(variable.get("type") or "")
+            if type_name:
+                child.setToolTip(1, type_name)
+            parent.addChild(child)
+            self._bind_variable_item(child, int(variable.get("variables_reference") or 0))
+        loaded = parent.childCount()
+        if error and not loaded:
+            parent.addChild(QTreeWidgetItem(["<error>", error]))
+        elif loaded < total:
+            more = QTreeWidgetItem([f"Load more... ({total - loaded} remaining)", ""])
+            more.setData(0, self._ROLE_MORE_START, loaded)
+            parent.addChild(more)
+        elif not loaded:
+            parent.addChild(QTreeWidgetItem(["<empty>", ""]))
+
     def _add_watch_expression(self) -> None:
         expression = str(self.watch_input.text() or "").strip()
         if not expression:
@@ -1,19 +1,39 @@
-from .git_branches_dialog import GitBranchesDialog
-from .git_commit_dialog import GitCommitDialog
-from .git_releases_dialog import GitReleasesDialog
-from .about_dialog import AboutDialog
-from .clone_repo_dialog import CloneRepositoryDialog
-from .check_for_updates_dialog import CheckForUpdatesDialog
-from .new_project_dialog import NewProjectDialog
-from .share_to_github_dialog import ShareToGitHubDialog
+"""IDE dialogs.
+
+Dialogs are resolved on first attribute access so that importing one dialog
+module (e.g. ``barley_ide.ui.dialogs.find_in_files_dialog``) does not pull in
+the git, GitHub and QtWebEngine-backed dialogs during startup.
+"""
+
+from importlib import import_module
+
+_DIALOG_MODULES = {
+    "AboutDialog": ".about_dialog",
+    "CheckForUpdatesDialog": ".check_for_updates_dialog",
+    "CloneRepositoryDialog": ".clone_repo_dialog",
+    "GitCommitDialog": ".git_commit_dialog",
+    "GitBranchesDialog": ".git_branches_dialog",
+    "GitReleasesDialog": ".git_releases_dialog",
+    "NewProjectDialog": ".new_project_dialog",
+    "ShareToGitHubDialog": ".share_to_github_dialog",
+}
 
 __all__ = [
     "AboutDialog",
     "CheckForUpdatesDialog",
     "CloneRepositoryDialog",
-    "GitCommitDialog",
     "GitBranchesDialog",
+    "GitCommitDialog",
     "GitReleasesDialog",
     "NewProjectDialog",
     "ShareToGitHubDialog",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _DIALOG_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -21,6 +21,7 @@ from PySide6.QtWidgets import (
 
 from barley_ide.ui.codex_session_store import (
     CodexSessionRecord,
+    count_codex_sessions,
     delete_codex_sessions,
     list_codex_sessions,
     session_preview_text,
@@ -29,6 +30,8 @@ from TPOPyside.dialogs.custom_dialog import DialogWindow
 
 
 class CodexSessionsDialog(DialogWindow):
+    PAGE_SIZE = 200
+
     def __init__(
         self,
         *,
@@ -42,6 +45,7 @@ class CodexSessionsDialog(DialogWindow):
         self._active_session_id = str(active_session_id or "").strip()
         self._sessions: list[CodexSessionRecord] = []
         self._sessions_by_id: dict[str, CodexSessionRecord] = {}
+        self._total_sessions = 0
         self.selected_session_id = ""
 
         self.setWindowTitle("Manage Codex Sessions")
@@ -92,6 +96,8 @@ class CodexSessionsDialog(DialogWindow):
         root.addWidget(self.tree, 1)
 
         actions = QHBoxLayout()
+        self.more_btn = QPushButton("Load More")
+        actions.addWidget(self.more_btn)
         actions.addStretch(1)
         self.attach_btn = QPushButton("Attach")
         self.delete_btn = QPushButton("Delete Selected")
@@ -102,9 +108,10 @@ class CodexSessionsDialog(DialogWindow):
         actions.addWidget(self.close_btn)
         root.addLayout(actions)
 
-        self.scope_combo.currentIndexChanged.connect(self._reload_sessions)
-        self.search_edit.textChanged.connect(self._rebuild_tree)
-        self.refresh_btn.clicked.connect(self._reload_sessions)
+        self.scope_combo.currentIndexChanged.connect(lambda _index: self._reload_sessions())
+        self.search_edit.textChanged.connect(lambda _text: self._reload_sessions(refresh=False))
+        self.refresh_btn.clicked.connect(lambda _checked=False: self._reload_sessions())
+        self.more_btn.clicked.connect(self._load_more)
         self.tree.itemSelectionChanged.connect(self._update_buttons)
         self.tree.itemDoubleClicked.connect(self._on_item_double_clicked)
         self.attach_btn.clicked.connect(self._attach_selected)
@@ -135,20 +142,6 @@ class CodexSessionsDialog(DialogWindow):
                 pass
         return str(project_path)
 
-    def _session_matches_search(self, session: CodexSessionRecord) -> bool:
-        needle = str(self.search_edit.text() or "").strip().casefold()
-        if not needle:
-            return True
-        haystack = "\n".join(
-            [
-                str(session.first_user_message or ""),
-                str(session.cwd or ""),
-                str(session.model or ""),
-                str(session.session_id or ""),
-            ]
-        ).casefold()
-        return needle in haystack
-
     def _selected_sessions(self) -> list[CodexSessionRecord]:
         selected: list[CodexSessionRecord] = []
         seen_ids: set[str] = set()
@@ -165,12 +158,15 @@ class CodexSessionsDialog(DialogWindow):
 
     def _update_summary_label(self, visible_sessions: list[CodexSessionRecord]) -> None:
         scope_label = "all local sessions" if self._scoped_project_dir() is None else "current project sessions"
-        self.summary_label.setText(f"Showing {len(visible_sessions)} {scope_label}.")
+        if len(visible_sessions) < self._total_sessions:
+            self.summary_label.setText(f"Showing {len(visible_sessions)} of {self._total_sessions} {scope_label}.")
+        else:
+            self.summary_label.setText(f"Showing {len(visible_sessions)} {scope_label}.")
 
     def _rebuild_tree(self) -> None:
         selected_ids = {session.session_id for session in self._selected_sessions()}
         self.tree.clear()
-        visible = [session for session in self._sessions if self._session_matches_search(session)]
+        visible = list(self._sessions)
         self._update_summary_label(visible)
 
         grouped: dict[str, list[CodexSessionRecord]] = defaultdict(list)
@@ -205,12 +201,31 @@ class CodexSessionsDialog(DialogWindow):
 
         self._update_buttons()
 
-    def _reload_sessions(self) -> None:
-        self._sessions = list_codex_sessions(limit=None, project_dir=self._scoped_project_dir())
+    def _reload_sessions(self, *, refresh: bool = True) -> None:
+        # Searching re-filters the in-memory index; only Refresh and scope changes rescan the log tree.
+        query = str(self.search_edit.text() or "")
+        project_dir = self._scoped_project_dir()
+        self._total_sessions = count_codex_sessions(project_dir=project_dir, query=query, refresh=refresh)
+        self._sessions = list_codex_sessions(limit=self.PAGE_SIZE, project_dir=project_dir, query=query, refresh=False)
         self._sessions_by_id = {session.session_id: session for session in self._sessions}
         self._rebuild_tree()
 
+    def _load_more(self) -> None:
+        page = list_codex_sessions(
+            limit=self.PAGE_SIZE,
+            offset=len(self._sessions),
+            project_dir=self._scoped_project_dir(),
+            query=str(self.search_edit.text() or ""),
+            refresh=False,
+        )
+        if not page:
+            return
+        self._sessions.extend(page)
+        self._sessions_by_id.update({session.session_id: session for session in page})
+        self._rebuild_tree()
+
     def _update_buttons(self) -> None:
+        self.more_btn.setVisible(len(self._sessions) < self._total_sessions)
         has_selection = bool(self._selected_sessions())
         self.attach_btn.setEnabled(has_selection)
         self.delete_btn.setEnabled(has_selection)
@@ -25,8 +25,12 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from barley_ide.services.file_io import atomic_write_text
 from barley_ide.ui.icons.asset_icons import apply_tab_close_icon, app_palette_icon, has_asset_icon
+from barley_ide.ui.save_manager import DocumentSaveManager, SaveResult
 from barley_ide.ui.widgets.code_editor import CodeEditor
+from barley_ide.ui.widgets.large_file_viewer import LargeFileViewerWidget
+from barley_ide.ui.widgets.pending_document_tab import PendingDocumentTab
 
 
 class DropZone(Enum):
@@ -57,8 +61,17 @@ class LargeFileAnalysis:
     line_count: int | None = None
 
 
+class LargeFileOpenMode(Enum):
+    FULL = "full"
+    REDUCED = "reduced"
+    VIEWER = "viewer"
+
+
 LARGE_FILE_WARNING_SIZE_BYTES = 1024 * 1024
 LARGE_FILE_WARNING_LINE_THRESHOLD = 20000
+# Above this size the editable CodeEditor is not offered at all; the file can only be
+# opened in the memory-mapped read-only viewer.
+LARGE_FILE_VIEWER_ONLY_SIZE_BYTES = 64 * 1024 * 1024
 _LARGE_FILE_LINE_SCAN_CHUNK_BYTES = 256 * 1024
 
 
@@ -109,7 +122,8 @@ def analyze_large_text_file(path: str) -> LargeFileAnalysis | None:
     return LargeFileAnalysis(path=cpath, size_bytes=size_bytes, line_count=line_count)
 
 
-def prompt_large_file_open(parent: QWidget | None, analysis: LargeFileAnalysis) -> tuple[bool, bool]:
+def prompt_large_file_open(parent: QWidget | None, analysis: LargeFileAnalysis) -> LargeFileOpenMode | None:
+    viewer_only = int(analysis.size_bytes) >= LARGE_FILE_VIEWER_ONLY_SIZE_BYTES
     msg = QMessageBox(parent)
     msg.setIcon(QMessageBox.Warning)
     msg.setWindowTitle("Large File")
@@ -120,20 +134,33 @@ def prompt_large_file_open(parent: QWidget | None, analysis: LargeFileAnalysis)
     ]
     if analysis.line_count is not None:
         details.append(f"Lines: {int(analysis.line_count):,}+")
+    if viewer_only:
+        hint = "Files of this size can only be opened in the read-only viewer."
+    else:
+        hint = "Reduced capability mode disables the heaviest editor features to improve responsiveness."
     msg.setInformativeText(
         "\n".join(details)
-        + "\n\nReduced capability mode disables the heaviest editor features to improve responsiveness."
+        + "\n\n" + hint
+        + "\nThe read-only viewer maps the file from disk and only renders visible lines."
     )
-    reduced_button = msg.addButton("Open Reduced Mode", QMessageBox.AcceptRole)
-    msg.addButton("Open Full", QMessageBox.DestructiveRole)
+    viewer_button = msg.addButton("Open Read-Only Viewer", QMessageBox.AcceptRole)
+    reduced_button = None
+    full_button = None
+    if not viewer_only:
+        reduced_button = msg.addButton("Open Reduced Mode", QMessageBox.AcceptRole)
+        full_button = msg.addButton("Open Full", QMessageBox.DestructiveRole)
     cancel_button = msg.addButton(QMessageBox.Cancel)
-    msg.setDefaultButton(reduced_button)
+    msg.setDefaultButton(viewer_button if viewer_only else reduced_button)
     msg.setEscapeButton(cancel_button)
     msg.exec()
     clicked = msg.clickedButton()
-    if clicked is cancel_button:
-        return False, False
-    return True, bool(clicked is reduced_button)
+    if clicked is viewer_button:
+        return LargeFileOpenMode.VIEWER
+    if reduced_button is not None and clicked is reduced_button:
+        return LargeFileOpenMode.REDUCED
+    if full_button is not None and clicked is full_button:
+        return LargeFileOpenMode.FULL
+    return None
 
 
 def _is_workspace_document_widget(widget: object) -> bool:
@@ -142,6 +169,10 @@ def _is_workspace_document_widget(widget: object) -> bool:
     return callable(getattr(widget, "display_name", None))
 
 
+def _is_pending_document_widget(widget: object) -> bool:
+    return isinstance(widget, PendingDocumentTab)
+
+
 def _widget_file_path(widget: object) -> str:
     return str(getattr(widget, "file_path", "") or "").strip()
 
@@ -472,8 +503,7 @@ class EditorWidget(CodeEditor):
         if not self.file_path:
             return False
         try:
-            with open(self.file_path, "w", encoding="utf-8") as f:
-                f.write(self.toPlainText())
+            atomic_write_text(self.file_path, self.toPlainText(), encoding="utf-8")
             self.document().setModified(False)
             self.set_file_path(self.file_path)
             return True
@@ -481,6 +511,40 @@ class EditorWidget(CodeEditor):
             QMessageBox.warning(self, "Save Error", f"Could not save file:\n{e}")
             return False
 
+    def save_file_async(
+        self,
+        save_manager: DocumentSaveManager,
+        *,
+        on_finished: Callable[[SaveResult], None] | None = None,
+    ) -> bool:
+        """Snapshot the document and hand the write to ``save_manager``.
+
+        The document is marked unmodified immediately so edits made while the write is
+        in flight show up as a fresh modification; a failed write restores the flag.
+        """
+        path = self.file_path
+        if not path:
+            return False
+        doc = self.document()
+        text = self.toPlainText()
+        doc.setModified(False)
+
+        def _finished(result: SaveResult) -> None:
+            try:
+                if result.ok:
+                    self.set_file_path(self.file_path)
+                else:
+                    doc.setModified(True)
+                    QMessageBox.warning(self, "Save Error", f"Could not save file:\n{result.error}")
+            except RuntimeError:
+                # Editor was closed while the write was in flight.
+                pass
+            if callable(on_finished):
+                on_finished(result)
+
+        save_manager.submit(path, text, encoding="utf-8", on_finished=_finished)
+        return True
+
 
 def _as_editor_widget(widget: object) -> EditorWidget | None:
     if isinstance(widget, EditorWidget):
@@ -922,6 +986,7 @@ class EditorTabs(QTabWidget):
         ed = self.currentWidget()
         if _is_workspace_document_widget(ed):
             ed.setFocus()
+            self.workspace.note_document_activated(ed)
 
     @staticmethod
     def _is_tab_pinned(ed: QWidget | None) -> bool:
@@ -1283,6 +1348,7 @@ class EditorWorkspace(QWidget):
         self._path_opener: Callable[[str], Any] | None = None
         self._default_editor_font_size = 10
         self._default_editor_font_family: str | None = None
+        self._activation_seq = 0
 
         self.root_splitter = QSplitter(Qt.Horizontal, self)
         self.root_splitter.setChildrenCollapsible(False)
@@ -1302,6 +1368,17 @@ class EditorWorkspace(QWidget):
         except Exception:
             pass
 
+    def note_document_activated(self, widget: QWidget) -> None:
+        """Stamp ``widget`` with a monotonically increasing most-recently-used sequence."""
+        self._activation_seq += 1
+        try:
+            setattr(widget, "_workspace_activation_seq", self._activation_seq)
+        except Exception:
+            pass
+
+    def seed_activation_seq(self, value: int) -> None:
+        self._activation_seq = max(self._activation_seq, int(value or 0))
+
     def set_path_opener(self, opener: Callable[[str], Any] | None) -> None:
         self._path_opener = opener if callable(opener) else None
 
@@ -1762,12 +1839,24 @@ class EditorWorkspace(QWidget):
         if preferred is not None:
             for i in range(preferred.count()):
                 w = preferred.widget(i)
-                if not _is_workspace_document_widget(w):
+                if not _is_workspace_document_widget(w) or _is_pending_document_widget(w):
                     continue
                 file_path = _widget_file_path(w)
                 if file_path and self._canonical_path(file_path) == target:
                     return w
         for widget in self.all_document_widgets():
+            if _is_pending_document_widget(widget):
+                continue
+            file_path = _widget_file_path(widget)
+            if file_path and self._canonical_path(file_path) == target:
+                return widget
+        return None
+
+    def find_pending_document_by_path(self, path: str) -> QWidget | None:
+        target = self._canonical_path(path)
+        for widget in self.all_document_widgets():
+            if not _is_pending_document_widget(widget) or bool(getattr(widget, "hydrating", False)):
+                continue
             file_path = _widget_file_path(widget)
             if file_path and self._canonical_path(file_path) == target:
                 return widget
@@ -1837,9 +1926,17 @@ class EditorWorkspace(QWidget):
             if os.path.exists(cpath):
                 large_file_analysis = analyze_large_text_file(cpath)
                 if large_file_analysis is not None:
-                    should_open, reduced_capability_mode = prompt_large_file_open(self, large_file_analysis)
-                    if not should_open:
+                    open_mode = prompt_large_file_open(self, large_file_analysis)
+                    if open_mode is None:
                         return None
+                    if open_mode is LargeFileOpenMode.VIEWER:
+                        return self.open_large_file_viewer(
+                            cpath,
+                            font_size=font_size,
+                            font_family=font_family,
+                            show_errors=show_errors,
+                        )
+                    reduced_capability_mode = open_mode is LargeFileOpenMode.REDUCED
             ed = EditorWidget(
                 None,
                 font_size=self._effective_font_size(font_size),
@@ -1874,6 +1971,33 @@ class EditorWorkspace(QWidget):
         tabs.add_editor(ed)
         return ed
 
+    def open_large_file_viewer(
+            self,
+            path: str,
+            font_size: int | None = None,
+            font_family: str | None = None,
+            *,
+            show_errors: bool = True,
+    ) -> LargeFileViewerWidget | None:
+        cpath = self._canonical_path(path)
+        for widget in self.all_document_widgets():
+            if isinstance(widget, LargeFileViewerWidget) and widget.file_path == cpath:
+                self._focus_editor_widget(widget)
+                return widget
+        viewer = LargeFileViewerWidget(parent=self)
+        viewer.set_editor_font_preferences(
+            family=self._effective_font_family(font_family),
+            point_size=self._effective_font_size(font_size),
+        )
+        if not viewer.load_file(cpath):
+            viewer.deleteLater()
+            if show_errors:
+                QMessageBox.warning(self, "Open Error", f"Could not map file for viewing:\n{cpath}")
+            return None
+        tabs = self._current_tabs() or self._ensure_one_main_tabs()
+        tabs.add_editor(viewer)
+        return viewer
+
     def ensure_editor_available(self, font_size: int = 10):
         _ = font_size
         return
@@ -50,6 +50,7 @@ from barley_ide.settings_manager import SettingsManager
 from barley_ide.services.document_outline_service import build_document_outline
 from barley_ide.services.file_open_classifier import FileOpenKind, classify_file_for_open
 from barley_ide.services.project_policy_service import ProjectPolicyService
+from barley_ide.startup_profile import note_lazy_feature, startup_mark, startup_phase
 from barley_ide.storage_paths import ide_config_dir, ide_no_project_workspace_dir, migrate_legacy_ide_storage
 from TPOPyside.shared_assets import shared_theme_dir
 
@@ -91,12 +92,15 @@ from barley_ide.ui.syntax_highlighting_runtime import configure_syntax_highlight
 
 from barley_ide.ui.editor_workspace import EditorTabs, EditorWidget, EditorWorkspace
 from barley_ide.ui.lint_manager import LintManager
+from barley_ide.ui.tdoc_index_manager import TDocIndexManager
+from barley_ide.ui.save_manager import SaveResult
 from barley_ide.ui.spellcheck_manager import SpellcheckManager
 from barley_ide.ui.debugger import DebuggerDockWidget
 from barley_ide.ui.widgets.code_editor import CodeEditor
-from barley_ide.ui.widgets.codex_agent_dock import CodexAgentDockWidget
 from barley_ide.ui.widgets.file_system_tree import FileSystemTreeWidget
 from barley_ide.ui.widgets.image_viewer import ImageViewerWidget
+from barley_ide.ui.widgets.large_file_viewer import LargeFileViewerWidget
+from barley_ide.ui.widgets.pending_document_tab import PendingDocumentTab
 from barley_ide.ui.widgets.markdown_editor_tab import MarkdownEditorTab
 from barley_ide.ui.widgets.sound_player_editor import SoundPlayerEditorWidget
 from barley_ide.ui.widgets.svg_editor_tab import SvgEditorTab
@@ -112,9 +116,11 @@ from TPOPyside.widgets.tdoc_support import (
     TDocProjectIndex,
     collect_tdoc_diagnostics,
     is_tdoc_document_path,
+    is_tdoc_project_marker_path,
     is_tdoc_related_path,
     parse_file_link,
     resolve_tdoc_root_for_path,
+    shared_tdoc_project_contexts,
 )
 
 try:
@@ -445,7 +451,7 @@ class PythonIDE(Window):
         self.commit_md_editor: EditorWidget | None = None
         self.commit_md_widget: MarkdownEditorTab | None = None
         self.dock_commit_md: QDockWidget | None = None
-        self.codex_agent_widget: CodexAgentDockWidget | None = None
+        self.codex_agent_widget = None  # CodexAgentDockWidget, built when the dock is first shown
         self.dock_codex_agent: QDockWidget | None = None
 
         self.lint_manager = LintManager(
@@ -456,6 +462,7 @@ class PythonIDE(Window):
             follow_symlinks_provider=self._lint_follow_symlinks,
             parent=self,
         )
+        self.tdoc_index_manager = TDocIndexManager(self)
         self.completion_manager = CompletionManager(
             project_root=self.project_root,
             canonicalize=self._canonical_path,
@@ -677,6 +684,11 @@ class PythonIDE(Window):
         self._project_fs_dir_signatures: dict[str, tuple[tuple[str, bool], ...]] = {}
         self._project_fs_pending_dirs: set[str] = set()
         self._project_fs_focus_refresh_at = 0.0
+        self._pending_tab_prefetch_queue: list[PendingDocumentTab] = []
+        self._pending_tab_hydration_active = False
+        self._pending_tab_prefetch_timer = QTimer(self)
+        self._pending_tab_prefetch_timer.setInterval(60)
+        self._pending_tab_prefetch_timer.timeout.connect(self._prefetch_next_pending_tab)
         self._project_fs_refresh_timer = QTimer(self)
         self._project_fs_refresh_timer.setSingleShot(True)
         self._project_fs_refresh_timer.setInterval(1200)
@@ -710,6 +722,7 @@ class PythonIDE(Window):
         self.spellcheck_manager = SpellcheckManager(self)
         self.action_registry = ActionRegistry
         self.explorer_controller = ExplorerController(self, None)
+        startup_mark("ide: services and controllers")
 
         self.setup_editor_workspace_service()
         self.setup_project_explorer()
@@ -727,9 +740,11 @@ class PythonIDE(Window):
         self.setup_bottom_panels()
         self.setup_commit_md_dock()
         self.setup_codex_agent_dock()
+        startup_mark("ide: panels and docks")
         self._setup_status_bar_widgets()
         self._bind_status_bar_debug_mirror()
         self.setup_menus()
+        startup_mark("ide: menus")
         self._apply_project_read_only_state(announce=False)
         self._restore_window_and_dock_layout()
         self._report_settings_load_errors(source="startup")
@@ -765,6 +780,7 @@ class PythonIDE(Window):
         self._refresh_runtime_action_states()
 
         self.statusBar().showMessage("Ready")
+        startup_mark("ide: constructed")
 
     # ---------- Startup ----------
 
@@ -782,6 +798,10 @@ class PythonIDE(Window):
             self._maybe_refresh_project_tree_on_focus()
 
     def _run_startup_pipeline(self):
+        with startup_phase("ide startup pipeline"):
+            self._run_startup_pipeline_steps()
+
+    def _run_startup_pipeline_steps(self):
         if not self._window_geometry_restored:
             self.resize(1280, 800)
 
@@ -999,7 +1019,7 @@ class PythonIDE(Window):
                 tree.set_workspace_repository_index(self.workspace_repository_index)
         if update_tree and changed:
             codex_widget = self.codex_agent_widget
-            if isinstance(codex_widget, CodexAgentDockWidget):
+            if codex_widget is not None:
                 refresh_fn = getattr(codex_widget, "refresh_context_scope", None)
                 if callable(refresh_fn):
                     try:
@@ -1046,6 +1066,7 @@ class PythonIDE(Window):
             self._project_fs_dir_signatures[cpath] = current
         if previous is not None and current is not None and previous == current:
             return
+        self._ai_context_assembler.notify_paths_changed([cpath])
         if not self._tree_directory_needs_refresh(cpath):
             self.schedule_git_status_refresh(delay_ms=120)
             return
@@ -1443,6 +1464,29 @@ class PythonIDE(Window):
         self.dock_codex_agent.setObjectName("dock_codex_agent")
         self.dock_codex_agent.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
         self.dock_codex_agent.setFeatures(features)
+        # The agent panel pulls in the chat renderer and session store; build it on first reveal.
+        self.dock_codex_agent.visibilityChanged.connect(self._on_codex_agent_dock_visibility_changed)
+
+        self.addDockWidget(Qt.RightDockWidgetArea, self.dock_codex_agent)
+        if isinstance(self.dock_commit_md, QDockWidget):
+            self.tabifyDockWidget(self.dock_commit_md, self.dock_codex_agent)
+        elif isinstance(self.dock_outline, QDockWidget):
+            self.tabifyDockWidget(self.dock_outline, self.dock_codex_agent)
+        self.dock_codex_agent.show()
+
+    def _on_codex_agent_dock_visibility_changed(self, visible: bool) -> None:
+        if visible:
+            self.ensure_codex_agent_widget()
+
+    def ensure_codex_agent_widget(self):
+        existing = self.codex_agent_widget
+        if existing is not None:
+            return existing
+        dock = self.dock_codex_agent
+        if not isinstance(dock, QDockWidget):
+            return None
+        note_lazy_feature("codex agent dock")
+        from barley_ide.ui.widgets.codex_agent_dock import CodexAgentDockWidget
 
         widget = CodexAgentDockWidget(
             project_dir_provider=lambda: str(self.project_root or ""),
@@ -1453,18 +1497,12 @@ class PythonIDE(Window):
             settings_provider=self._codex_agent_settings,
             settings_saver=self._save_codex_agent_settings,
             file_opener=self._open_codex_agent_file,
-            parent=self.dock_codex_agent,
+            parent=dock,
         )
         widget.statusMessage.connect(lambda msg: self.statusBar().showMessage(str(msg or ""), 2400))
         self.codex_agent_widget = widget
-        self.dock_codex_agent.setWidget(widget)
-
-        self.addDockWidget(Qt.RightDockWidgetArea, self.dock_codex_agent)
-        if isinstance(self.dock_commit_md, QDockWidget):
-            self.tabifyDockWidget(self.dock_commit_md, self.dock_codex_agent)
-        elif isinstance(self.dock_outline, QDockWidget):
-            self.tabifyDockWidget(self.dock_outline, self.dock_codex_agent)
-        self.dock_codex_agent.show()
+        dock.setWidget(widget)
+        return widget
 
     def _open_codex_agent_file(self, path: str) -> None:
         target = str(path or "").strip()
@@ -1476,6 +1514,7 @@ class PythonIDE(Window):
         dock = self.dock_codex_agent
         if not isinstance(dock, QDockWidget):
             return
+        self.ensure_codex_agent_widget()
         dock.show()
         dock.raise_()
 
@@ -1878,7 +1917,7 @@ class PythonIDE(Window):
         self._load_commit_md_into_dock()
         self._refresh_git_branch_status_label()
         codex_widget = self.codex_agent_widget
-        if isinstance(codex_widget, CodexAgentDockWidget):
+        if codex_widget is not None:
             refresh_fn = getattr(codex_widget, "refresh_context_scope", None)
             if callable(refresh_fn):
                 try:
@@ -2395,7 +2434,7 @@ class PythonIDE(Window):
         self._schedule_symbol_outline_refresh(immediate=True)
         self._refresh_git_branch_status_label()
         codex_widget = self.codex_agent_widget
-        if isinstance(codex_widget, CodexAgentDockWidget):
+        if codex_widget is not None:
             refresh_fn = getattr(codex_widget, "refresh_context_scope", None)
             if callable(refresh_fn):
                 try:
@@ -5054,7 +5093,7 @@ class PythonIDE(Window):
         self._apply_project_read_only_to_open_documents()
         self._configure_autosave_timer()
         codex_widget = self.codex_agent_widget
-        if isinstance(codex_widget, CodexAgentDockWidget):
+        if codex_widget is not None:
             sync_fn = getattr(codex_widget, "sync_project_read_only", None)
             if callable(sync_fn):
                 try:
@@ -5650,6 +5689,11 @@ class PythonIDE(Window):
         if not self._is_tdoc_related_path(cpath):
             return
         root = self._canonical_path(resolve_tdoc_root_for_path(cpath, project_root=self.project_root))
+        if is_tdoc_project_marker_path(cpath):
+            # Same-tick rewrites can keep mtime/size; don't wait for the stat check.
+            shared_tdoc_project_contexts().invalidate(root)
+        if TDocProjectIndex.has_project_marker(root):
+            self.tdoc_index_manager.schedule_refresh(root, [cpath])
         self._tdoc_pending_paths_by_root[root] = cpath
         timer = self._tdoc_validation_timers.get(root)
         if timer is None:
@@ -5680,6 +5724,7 @@ class PythonIDE(Window):
             source="tdoc",
             content_overrides=content_overrides,
             focus_paths=focus_paths,
+            index_for_root=self.tdoc_index_manager.ready_index_for_root,
         )
         self._set_tdoc_diagnostics_for_root(root, by_file)
 
@@ -5705,6 +5750,7 @@ class PythonIDE(Window):
                 source="tdoc",
                 content_overrides=content_overrides,
                 focus_paths=focus_paths,
+                index_for_root=self.tdoc_index_manager.ready_index_for_root,
             )
             roots.add(root)
             self._set_tdoc_diagnostics_for_root(root, by_file)
@@ -5746,6 +5792,7 @@ class PythonIDE(Window):
                 source="tdoc",
                 content_overrides=content_overrides,
                 focus_paths=focus_paths,
+                index_for_root=self.tdoc_index_manager.ready_index_for_root,
             )
             self._set_tdoc_diagnostics_for_root(resolved_root, by_file)
 
@@ -5819,19 +5866,22 @@ class PythonIDE(Window):
         if isinstance(alias_to_symbol, dict):
             symbol = str(alias_to_symbol.get(query.casefold(), query) or query).strip()
 
-        index_path = TDocProjectIndex.build_index(root_c)
-        if not index_path:
-            QMessageBox.information(
-                self,
-                "TDOC Index",
-                "Could not build/open index for this TDOC project.",
-            )
-            return
-        index_c = self._canonical_path(str(index_path))
-        self.open_file(index_c)
-        opened = self._find_open_document_for_path(index_c)
-        if isinstance(opened, TDocDocumentWidget):
-            opened.jump_to_symbol(symbol)
+        def _open_index(index_path, _error: str) -> None:
+            if not index_path:
+                QMessageBox.information(
+                    self,
+                    "TDOC Index",
+                    "Could not build/open index for this TDOC project.",
+                )
+                return
+            index_c = self._canonical_path(str(index_path))
+            self.open_file(index_c)
+            opened = self._find_open_document_for_path(index_c)
+            if isinstance(opened, TDocDocumentWidget):
+                opened.jump_to_symbol(symbol)
+
+        self.statusBar().showMessage("Building TDOC index...", 1500)
+        self.tdoc_index_manager.build_index_async(root_c, _open_index)
 
     def _on_tdoc_marker_index_entry_requested(self, widget_ref, symbol_or_alias: str) -> None:
         widget = widget_ref() if callable(widget_ref) else widget_ref
@@ -5918,29 +5968,44 @@ class PythonIDE(Window):
             self.statusBar().showMessage("No open TDOC documents.", 1800)
             return
 
-        built = 0
         missing_marker = 0
-        refreshed_roots: set[str] = set()
+        marker_roots: list[str] = []
         for root in roots:
             if not self._save_dirty_tdoc_documents_for_root(root):
                 return
             if not TDocProjectIndex.has_project_marker(root):
                 missing_marker += 1
                 continue
-            out = TDocProjectIndex.build_index(root)
-            if out is None:
-                continue
-            built += 1
-            refreshed_roots.add(root)
-            self._reload_open_tdoc_documents_for_root(root)
-            marker_path = self._canonical_path(str(Path(root) / PROJECT_MARKER_FILENAME))
-            self._refresh_tdoc_diagnostics_for_path(marker_path if os.path.exists(marker_path) else str(out))
-
-        for root in refreshed_roots:
-            self.refresh_subtree(root)
-        if refreshed_roots:
-            self.schedule_git_status_refresh(delay_ms=90)
+            marker_roots.append(root)
+        if not marker_roots:
+            self._report_tdoc_index_build(0, missing_marker)
+            return
+
+        pending = set(marker_roots)
+        built_roots: list[str] = []
+
+        def _on_built(root: str, out, _error: str) -> None:
+            pending.discard(root)
+            if out is not None:
+                built_roots.append(root)
+                self._reload_open_tdoc_documents_for_root(root)
+                marker_path = self._canonical_path(str(Path(root) / PROJECT_MARKER_FILENAME))
+                self._refresh_tdoc_diagnostics_for_path(marker_path if os.path.exists(marker_path) else str(out))
+                self.refresh_subtree(root)
+            if pending:
+                return
+            if built_roots:
+                self.schedule_git_status_refresh(delay_ms=90)
+            self._report_tdoc_index_build(len(built_roots), missing_marker)
+
+        self.statusBar().showMessage("Building TDOC index...", 1500)
+        for root in marker_roots:
+            self.tdoc_index_manager.build_index_async(
+                root,
+                lambda out, error, r=root: _on_built(r, out, error),
+            )
 
+    def _report_tdoc_index_build(self, built: int, missing_marker: int) -> None:
         if built and missing_marker:
             self.statusBar().showMessage(
                 f"Built TDOC index for {built} project(s); {missing_marker} missing .tdocproject.",
@@ -6205,12 +6270,19 @@ class PythonIDE(Window):
                 cpath = self._canonical_path(path)
                 if not cpath:
                     continue
+                if isinstance(tab_widget, PendingDocumentTab):
+                    view_state = dict(tab_widget.view_state)
+                else:
+                    view_state = self._capture_document_view_state(tab_widget)
                 entry: dict[str, object] = {
                     "file_path": cpath,
-                    "view_state": self._capture_document_view_state(tab_widget),
+                    "view_state": view_state,
                 }
                 if bool(getattr(tab_widget, "_tab_pinned", False)):
                     entry["pinned"] = True
+                activation_seq = int(getattr(tab_widget, "_workspace_activation_seq", 0) or 0)
+                if activation_seq > 0:
+                    entry["activation_seq"] = activation_seq
                 entries.append(entry)
             return {
                 "type": "tabs",
@@ -6478,6 +6550,8 @@ class PythonIDE(Window):
         QApplication.processEvents()
         tab_nodes = self._replace_workspace_root_splitter(layout_node)
 
+        restore_cfg = self._workspace_restore_config()
+        lazy_tabs = bool(restore_cfg.get("lazy_tabs", True))
         open_counts: dict[str, int] = {}
         restored = 0
         missing = 0
@@ -6494,11 +6568,18 @@ class PythonIDE(Window):
                 if not isinstance(file_path, str) or not file_path.strip():
                     restored_widgets.append(None)
                     continue
-                opened, was_missing = self._open_workspace_entry_in_tabs(
-                    file_path=file_path,
-                    target_tabs=tabs,
-                    open_counts=open_counts,
-                )
+                if lazy_tabs:
+                    opened, was_missing = self._add_pending_workspace_entry(
+                        entry=entry,
+                        target_tabs=tabs,
+                        open_counts=open_counts,
+                    )
+                else:
+                    opened, was_missing = self._open_workspace_entry_in_tabs(
+                        file_path=file_path,
+                        target_tabs=tabs,
+                        open_counts=open_counts,
+                    )
                 if was_missing:
                     missing += 1
                     restored_widgets.append(None)
@@ -6511,7 +6592,7 @@ class PythonIDE(Window):
                         except Exception:
                             pass
                     view_state = entry.get("view_state")
-                    if isinstance(view_state, dict):
+                    if isinstance(view_state, dict) and not isinstance(opened, PendingDocumentTab):
                         self._restore_document_view_state(opened, view_state)
                     restored_widgets.append(opened)
                     continue
@@ -6546,8 +6627,147 @@ class PythonIDE(Window):
         self._refresh_runtime_action_states()
         self.spellcheck_manager.refresh_active_widget(immediate=True)
         self._schedule_symbol_outline_refresh(immediate=True)
+        if lazy_tabs:
+            self._schedule_pending_tab_prefetch(int(restore_cfg.get("prefetch_recent_tabs", 3)))
         return restored, missing
 
+    def _workspace_restore_config(self) -> dict:
+        cfg = self.config.get("workspace_restore", {})
+        return cfg if isinstance(cfg, dict) else {}
+
+    def _add_pending_workspace_entry(
+        self,
+        *,
+        entry: dict,
+        target_tabs: EditorTabs,
+        open_counts: dict[str, int],
+    ) -> tuple[QWidget | None, bool]:
+        cpath = self._canonical_path(str(entry.get("file_path") or ""))
+        if not cpath or not os.path.exists(cpath):
+            return None, True
+        previous_count = int(open_counts.get(cpath, 0))
+        view_state = entry.get("view_state")
+        try:
+            activation_seq = int(entry.get("activation_seq", 0) or 0)
+        except Exception:
+            activation_seq = 0
+        placeholder = PendingDocumentTab(
+            file_path=cpath,
+            view_state=view_state if isinstance(view_state, dict) else None,
+            activation_seq=activation_seq,
+            duplicate_view=previous_count > 0,
+            parent=target_tabs,
+        )
+        placeholder.hydrationRequested.connect(self._hydrate_pending_document_tab)
+        self.editor_workspace.seed_activation_seq(activation_seq)
+        target_tabs.add_editor(placeholder)
+        open_counts[cpath] = previous_count + 1
+        return placeholder, False
+
+    def _pending_document_tabs(self) -> list[PendingDocumentTab]:
+        return [
+            widget
+            for widget in self._iter_open_document_widgets()
+            if isinstance(widget, PendingDocumentTab) and not widget.hydrating
+        ]
+
+    def _hydrate_pending_document_tab(
+        self,
+        placeholder: PendingDocumentTab,
+        *,
+        keep_current: bool = False,
+    ) -> QWidget | None:
+        if not isinstance(placeholder, PendingDocumentTab) or placeholder.hydrating:
+            return None
+        tabs = self._tabs_for_document_widget(placeholder)
+        cpath = self._canonical_path(placeholder.file_path or "")
+        if tabs is None or not cpath:
+            return None
+        placeholder.hydrating = True
+
+        index = tabs.indexOf(placeholder)
+        was_current = tabs.currentWidget() is placeholder
+        previous_current = tabs.currentWidget()
+        previous_focus = QApplication.focusWidget()
+        pinned = bool(getattr(placeholder, "_tab_pinned", False))
+        real_existing = self._find_open_document_for_path(cpath)
+        self._pending_tab_hydration_active = True
+        try:
+            opened, was_missing = self._open_workspace_entry_in_tabs(
+                file_path=cpath,
+                target_tabs=tabs,
+                open_counts={cpath: 1 if real_existing is not None else 0},
+            )
+        finally:
+            self._pending_tab_hydration_active = False
+
+        if isinstance(opened, QWidget) and tabs.indexOf(opened) >= 0:
+            current_idx = tabs.indexOf(opened)
+            target_idx = max(0, min(index, tabs.count() - 1))
+            if current_idx != target_idx:
+                tabs.tabBar().moveTab(current_idx, target_idx)
+            if pinned:
+                try:
+                    tabs._set_tab_pinned(opened, True, reflow=False)
+                except Exception:
+                    pass
+            setattr(opened, "_workspace_activation_seq", placeholder.activation_seq())
+            self._restore_document_view_state(opened, placeholder.view_state)
+
+        placeholder_idx = tabs.indexOf(placeholder)
+        if placeholder_idx >= 0:
+            tabs.removeTab(placeholder_idx)
+        placeholder.hide()
+        placeholder.deleteLater()
+
+        if keep_current and not was_current:
+            if isinstance(previous_current, QWidget) and tabs.indexOf(previous_current) >= 0:
+                tabs.setCurrentWidget(previous_current)
+            if isinstance(previous_focus, QWidget):
+                try:
+                    previous_focus.setFocus(Qt.OtherFocusReason)
+                except RuntimeError:
+                    pass
+        elif isinstance(opened, QWidget) and tabs.indexOf(opened) >= 0:
+            tabs.setCurrentWidget(opened)
+            opened.setFocus(Qt.OtherFocusReason)
+        try:
+            tabs._reflow_pinned_tabs()
+        except Exception:
+            pass
+        self.editor_workspace.request_cleanup_empty_panes()
+
+        if was_missing:
+            self.statusBar().showMessage(f"File no longer exists: {cpath}", 2400)
+            return None
+        return opened if isinstance(opened, QWidget) else None
+
+    def _schedule_pending_tab_prefetch(self, count: int) -> None:
+        pending = sorted(
+            self._pending_document_tabs(),
+            key=lambda widget: widget.activation_seq(),
+            reverse=True,
+        )
+        queue = [widget for widget in pending if widget.activation_seq() > 0][: max(0, int(count))]
+        self._pending_tab_prefetch_queue = queue
+        if queue:
+            self._pending_tab_prefetch_timer.start()
+
+    def _prefetch_next_pending_tab(self) -> None:
+        queue = self._pending_tab_prefetch_queue
+        while queue:
+            placeholder = queue.pop(0)
+            if placeholder.hydrating:
+                continue
+            try:
+                self._hydrate_pending_document_tab(placeholder, keep_current=True)
+            except RuntimeError:
+                # Placeholder was closed before its turn came up.
+                continue
+            break
+        if not queue:
+            self._pending_tab_prefetch_timer.stop()
+
     def save_workspace_slot(self, slot: int) -> None:
         if self.no_project_mode:
             self.statusBar().showMessage("Workspace slots are unavailable without an open project.", 2200)
@@ -6723,7 +6943,8 @@ class PythonIDE(Window):
             QMessageBox.information(self, "Rename TDOC Symbol/Alias", f"No matches found for '{old}'.")
             return
 
-        TDocProjectIndex.build_index(root)
+        shared_tdoc_project_contexts().invalidate(root)
+        self.tdoc_index_manager.build_index_async(root, lambda _out, _error, r=root: self.refresh_subtree(r))
         self._reload_open_tdoc_documents_for_root(root)
         marker_path = self._canonical_path(str(Path(root) / PROJECT_MARKER_FILENAME))
         if os.path.exists(marker_path):
@@ -6781,7 +7002,8 @@ class PythonIDE(Window):
             canonical_symbol,
         )
 
-        TDocProjectIndex.build_index(root)
+        shared_tdoc_project_contexts().invalidate(root)
+        self.tdoc_index_manager.build_index_async(root, lambda _out, _error, r=root: self.refresh_subtree(r))
         self._reload_open_tdoc_documents_for_root(root)
         marker_path = self._canonical_path(str(Path(root) / PROJECT_MARKER_FILENAME))
         if os.path.exists(marker_path):
@@ -6910,13 +7132,44 @@ class PythonIDE(Window):
         if not dirty_editors:
             return True
 
+        # Write all dirty files concurrently, then wait: the run must see every save.
+        saved_dirs: set[str] = set()
+
+        def _on_saved(widget: object, cpath: str) -> None:
+            saved_dirs.add(os.path.dirname(cpath))
+            code_editor = self._editor_from_document_widget(widget)
+            if isinstance(code_editor, EditorWidget):
+                self._attach_editor_lint_hooks(code_editor)
+                self._request_lint_for_editor(code_editor, reason="save", include_source_if_modified=False)
+
+        # The modified flag clears when a save is submitted, so judge the run on the
+        # save results themselves.
+        results: list[SaveResult] = []
+        submitted = 0
+        all_submitted = True
         for ed in dirty_editors:
-            self._focus_editor(ed)
-            saved_path = self._save_editor_for_run(ed)
-            if not saved_path:
-                self.statusBar().showMessage("Run canceled: save was canceled or failed.", 2200)
-                return False
-            self.refresh_subtree(os.path.dirname(saved_path))
+            if self.workspace_controller.save_widget_async(
+                ed,
+                source="save for run",
+                on_saved=_on_saved,
+                on_result=results.append,
+            ):
+                submitted += 1
+            else:
+                all_submitted = False
+        flushed = self.workspace_controller.save_manager.flush()
+
+        for folder in saved_dirs:
+            self.refresh_subtree(folder)
+        if not all_submitted:
+            self.statusBar().showMessage("Run canceled: save was canceled or failed.", 2200)
+            return False
+        if not flushed or len(results) < submitted:
+            self.statusBar().showMessage("Run canceled: saves are still being written.", 2200)
+            return False
+        if not all(result.ok for result in results):
+            self.statusBar().showMessage("Run canceled: save was canceled or failed.", 2200)
+            return False
 
         self.statusBar().showMessage(f"Saved {len(dirty_editors)} modified file(s).", 1400)
         return True
@@ -7193,7 +7446,12 @@ class PythonIDE(Window):
             notify()
         return wrapper
 
-    def _open_text_editor_tab(self, cpath: str, *, show_errors: bool) -> EditorWidget | None:
+    def _open_text_editor_tab(
+        self,
+        cpath: str,
+        *,
+        show_errors: bool,
+    ) -> EditorWidget | LargeFileViewerWidget | None:
         opened = self.editor_workspace.open_editor(
             os.path.basename(cpath),
             cpath,
@@ -7201,13 +7459,21 @@ class PythonIDE(Window):
             font_family=self.font_family,
             show_errors=show_errors,
         )
+        if isinstance(opened, LargeFileViewerWidget):
+            self._apply_image_viewer_background_to_widget(opened)
+            return opened
         if not isinstance(opened, EditorWidget):
             return None
         if not self._configure_opened_code_editor(opened, cpath=cpath):
             return None
         return opened
 
-    def _open_markdown_editor_tab(self, cpath: str, *, show_errors: bool) -> MarkdownEditorTab | None:
+    def _open_markdown_editor_tab(
+        self,
+        cpath: str,
+        *,
+        show_errors: bool,
+    ) -> MarkdownEditorTab | LargeFileViewerWidget | None:
         opened = self.editor_workspace.open_editor(
             os.path.basename(cpath),
             cpath,
@@ -7215,6 +7481,9 @@ class PythonIDE(Window):
             font_family=self.font_family,
             show_errors=show_errors,
         )
+        if isinstance(opened, LargeFileViewerWidget):
+            self._apply_image_viewer_background_to_widget(opened)
+            return opened
         if not isinstance(opened, EditorWidget):
             return None
         if not self._configure_opened_code_editor(opened, cpath=cpath):
@@ -7494,6 +7763,11 @@ class PythonIDE(Window):
             QTimer.singleShot(80, self.apply_default_layout)
             return opened
 
+        if not self._pending_tab_hydration_active:
+            pending = self.editor_workspace.find_pending_document_by_path(cpath)
+            if isinstance(pending, PendingDocumentTab) and self._find_open_document_for_path(cpath) is None:
+                return self._hydrate_pending_document_tab(pending)
+
         existing = self._find_open_document_for_path(cpath)
         if existing:
             self._track_widget_change_highlights(existing)
@@ -7558,6 +7832,11 @@ class PythonIDE(Window):
                 "Opened large file in reduced capability mode for better responsiveness.",
                 4200,
             )
+        elif isinstance(opened, LargeFileViewerWidget):
+            self.statusBar().showMessage(
+                "Opened large file in the read-only viewer; indexing lines in the background.",
+                4200,
+            )
 
         QTimer.singleShot(0, self.apply_default_layout)
         QTimer.singleShot(80, self.apply_default_layout)
@@ -7587,11 +7866,13 @@ class PythonIDE(Window):
             self.statusBar().showMessage("This tab cannot be saved.", 2200)
             return
 
-        if not widget.save_file():
-            return
+        self.workspace_controller.save_widget_async(
+            widget,
+            source="manual save",
+            on_saved=self._on_manual_save_finished,
+        )
 
-        cpath = self._canonical_path(path)
-        self._note_editor_saved(widget, source="manual save")
+    def _on_manual_save_finished(self, widget: object, cpath: str) -> None:
         code_editor = self._editor_from_document_widget(widget)
         if isinstance(code_editor, EditorWidget):
             self._assign_dock_identity(code_editor)
@@ -8244,7 +8525,7 @@ class PythonIDE(Window):
         self._configure_git_poll_timer()
         self.schedule_git_status_refresh(delay_ms=80)
         codex_widget = self.codex_agent_widget
-        if isinstance(codex_widget, CodexAgentDockWidget):
+        if codex_widget is not None:
             try:
                 codex_widget.reload_settings()
             except Exception:
@@ -8293,7 +8574,7 @@ class PythonIDE(Window):
                 self._apply_lint_visual_settings_to_editor(widget)
                 self._apply_editor_overview_settings_to_editor(widget)
                 self._apply_spellcheck_visual_settings_to_widget(widget)
-            elif isinstance(widget, (ImageViewerWidget, SoundPlayerEditorWidget, SvgEditorTab)):
+            elif isinstance(widget, (ImageViewerWidget, SoundPlayerEditorWidget, SvgEditorTab, LargeFileViewerWidget)):
                 self._apply_image_viewer_background_to_widget(widget)
         self.spellcheck_manager.refresh_active_widget(immediate=True)
         self._track_widget_change_highlights(self.commit_md_editor)
@@ -8409,13 +8690,14 @@ class PythonIDE(Window):
 
     def closeEvent(self, event: QCloseEvent):
         codex_widget = self.codex_agent_widget
-        if isinstance(codex_widget, CodexAgentDockWidget):
+        if codex_widget is not None:
             try:
                 codex_widget.shutdown()
             except Exception:
                 pass
         if hasattr(self, "workspace_controller"):
-            self.workspace_controller.stop()
+            # Land in-flight saves first so a failed write shows up in the prompt below.
+            self.workspace_controller.save_manager.flush()
         if hasattr(self, "spellcheck_manager"):
             self.spellcheck_manager.shutdown()
         if hasattr(self, "version_control_controller"):
@@ -8425,6 +8707,8 @@ class PythonIDE(Window):
         if not skip_prompt and not self._confirm_save_modified_editors():
             event.ignore()
             return
+        if hasattr(self, "workspace_controller"):
+            self.workspace_controller.stop()
 
         self._flush_commit_md_dock_save(report_conflict=True)
         self._commit_md_save_timer.stop()
@@ -8453,7 +8737,10 @@ class PythonIDE(Window):
 
         self.language_service_hub.shutdown()
         self.inline_suggestion_controller.shutdown()
+        self._ai_context_assembler.shutdown()
+        self._ai_provider_client.close()
         self.lint_manager.shutdown()
+        self.tdoc_index_manager.shutdown()
         if not skip_prompt and not self.no_project_mode:
             self._remember_recent_project(self.project_root, save=True)
         if self._instance_server is not None:
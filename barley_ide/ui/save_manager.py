@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import concurrent.futures
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from barley_ide.services.file_io import atomic_write_text
+
+
+@dataclass(frozen=True, slots=True)
+class SaveResult:
+    path: str
+    ok: bool
+    error: str = ""
+    coalesced: int = 1
+    elapsed_ms: float = 0.0
+
+
+@dataclass(slots=True)
+class _SaveRequest:
+    path: str
+    text: str
+    encoding: str
+    callbacks: list[Callable[[SaveResult], None]] = field(default_factory=list)
+    coalesced: int = 1
+
+
+class DocumentSaveManager(QObject):
+    """Writes document snapshots off the UI thread.
+
+    Saves of the same path never run concurrently: while one write is in flight,
+    further requests for that path collapse into a single queued snapshot holding
+    the newest text, and every caller's completion callback fires once the write
+    that covers its snapshot lands.
+    """
+
+    saveFinished = Signal(object)  # SaveResult
+
+    def __init__(
+        self,
+        parent: QObject | None = None,
+        *,
+        writer: Callable[..., None] = atomic_write_text,
+        max_workers: int = 2,
+    ) -> None:
+        super().__init__(parent)
+        self._writer = writer
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, int(max_workers)),
+            thread_name_prefix="pytpo-save",
+        )
+        self._inflight: dict[str, tuple[concurrent.futures.Future, _SaveRequest]] = {}
+        self._queued: dict[str, _SaveRequest] = {}
+
+        self._result_pump = QTimer(self)
+        self._result_pump.setInterval(16)
+        self._result_pump.timeout.connect(self._drain_results)
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.abspath(str(path or ""))
+
+    def submit(
+        self,
+        path: str,
+        text: str,
+        *,
+        encoding: str = "utf-8",
+        on_finished: Callable[[SaveResult], None] | None = None,
+    ) -> None:
+        key = self._key(path)
+        callbacks = [on_finished] if callable(on_finished) else []
+        if key in self._inflight:
+            queued = self._queued.get(key)
+            if queued is None:
+                self._queued[key] = _SaveRequest(key, str(text), encoding, callbacks)
+            else:
+                queued.text = str(text)
+                queued.encoding = encoding
+                queued.callbacks.extend(callbacks)
+                queued.coalesced += 1
+            return
+        self._start(_SaveRequest(key, str(text), encoding, callbacks))
+
+    def is_saving(self, path: str) -> bool:
+        key = self._key(path)
+        return key in self._inflight or key in self._queued
+
+    def pending_paths(self) -> set[str]:
+        return set(self._inflight) | set(self._queued)
+
+    def flush(self, timeout: float | None = 10.0) -> bool:
+        """Block until every queued save has been written; used on shutdown."""
+        deadline = None if timeout is None else time.monotonic() + max(0.0, float(timeout))
+        while self._inflight or self._queued:
+            futures = [future for future, _request in self._inflight.values()]
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            concurrent.futures.wait(futures, timeout=remaining)
+            self._drain_results()
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+        return not (self._inflight or self._queued)
+
+    def shutdown(self) -> None:
+        self.flush()
+        self._result_pump.stop()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _start(self, request: _SaveRequest) -> None:
+        future = self._executor.submit(self._write, request.path, request.text, request.encoding)
+        self._inflight[request.path] = (future, request)
+        if not self._result_pump.isActive():
+            self._result_pump.start()
+
+    def _write(self, path: str, text: str, encoding: str) -> float:
+        started = time.perf_counter()
+        self._writer(path, text, encoding=encoding)
+        return (time.perf_counter() - started) * 1000.0
+
+    def _drain_results(self) -> None:
+        finished = [key for key, (future, _request) in self._inflight.items() if future.done()]
+        for key in finished:
+            future, request = self._inflight.pop(key)
+            try:
+                elapsed_ms = float(future.result())
+                result = SaveResult(key, True, coalesced=request.coalesced, elapsed_ms=elapsed_ms)
+            except Exception as exc:
+                result = SaveResult(key, False, error=str(exc), coalesced=request.coalesced)
+            queued = self._queued.pop(key, None)
+            if queued is not None:
+                self._start(queued)
+            for callback in request.callbacks:
+                try:
+                    callback(result)
+                except Exception:
+                    pass
+            self.saveFinished.emit(result)
+        if not self._inflight and not self._queued:
+            self._result_pump.stop()
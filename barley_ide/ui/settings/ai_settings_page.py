@@ -267,6 +267,15 @@ class AIAssistSettingsPage(QWidget):
         self.retrieval_total_candidates_spin.setRange(0, 4000)
         retrieval_form.addRow("Total Candidate Limit", self.retrieval_total_candidates_spin)
 
+        # Retrieval now queries the persistent project index, so the old scan limits do nothing.
+        for spin in (
+            self.retrieval_same_dir_limit_spin,
+            self.retrieval_walk_limit_spin,
+            self.retrieval_total_candidates_spin,
+        ):
+            spin.setEnabled(False)
+            spin.setToolTip("No longer applies: snippets come from the project retrieval index.")
+
         self.retrieval_snippet_char_cap_spin = QSpinBox()
         self.retrieval_snippet_char_cap_spin.setRange(80, 8000)
         retrieval_form.addRow("Snippet Char Cap", self.retrieval_snippet_char_cap_spin)
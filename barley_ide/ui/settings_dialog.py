@@ -705,6 +705,27 @@ def create_default_settings_schema(theme_options: list[str] | None = None) -> Se
                             ),
                         ],
                     ),
+                    SchemaSection(
+                        title="Workspace Restore",
+                        fields=[
+                            SchemaField(
+                                id="ide-workspace-restore-lazy-tabs",
+                                key="workspace_restore.lazy_tabs",
+                                label="Open Restored Tabs On First Use",
+                                type="checkbox",
+                                scope="ide",
+                            ),
+                            SchemaField(
+                                id="ide-workspace-restore-prefetch",
+                                key="workspace_restore.prefetch_recent_tabs",
+                                label="Recently Used Tabs To Preload",
+                                type="spin",
+                                scope="ide",
+                                min=0,
+                                max=50,
+                            ),
+                        ],
+                    ),
                 ],
             ),
             SchemaPage(
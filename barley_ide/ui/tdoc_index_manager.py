@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import concurrent.futures
+import hashlib
+import os
+from pathlib import Path
+from typing import Callable
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from barley_ide.services.tdoc_index_service import TDocProjectIndexCache, TDocRefreshStats
+from barley_ide.storage_paths import ide_cache_dir
+
+
+def tdoc_index_cache_path(root: str) -> Path:
+    digest = hashlib.sha1(os.path.abspath(str(root or "")).encode("utf-8")).hexdigest()[:16]
+    return ide_cache_dir() / "tdoc-index" / f"{digest}.json"
+
+
+class TDocIndexManager(QObject):
+    """Owns one ``TDocProjectIndexCache`` per TDOC root and refreshes them off the UI thread.
+
+    Refresh requests for a root that already has a refresh in flight are merged
+    into a single follow-up refresh, so a burst of saves costs at most two passes.
+    Completion callbacks always run on the UI thread.
+    """
+
+    indexRefreshed = Signal(str, object)  # root, TDocRefreshStats
+
+    def __init__(self, parent: QObject | None = None, *, max_workers: int = 1) -> None:
+        super().__init__(parent)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, int(max_workers)),
+            thread_name_prefix="pytpo-tdoc-index",
+        )
+        self._indexes: dict[str, TDocProjectIndexCache] = {}
+        self._inflight: dict[str, tuple[concurrent.futures.Future, list[Callable]]] = {}
+        # root -> changed paths (None means full refresh) and callbacks waiting for it
+        self._queued: dict[str, tuple[set[str] | None, list[Callable]]] = {}
+        self._index_writes: list[tuple[concurrent.futures.Future, Callable | None]] = []
+
+        self._result_pump = QTimer(self)
+        self._result_pump.setInterval(25)
+        self._result_pump.timeout.connect(self._drain_results)
+
+    @staticmethod
+    def _key(root: str) -> str:
+        return os.path.abspath(str(root or ""))
+
+    def index_for_root(self, root: str) -> TDocProjectIndexCache:
+        key = self._key(root)
+        index = self._indexes.get(key)
+        if index is None:
+            index = TDocProjectIndexCache(key, cache_path=str(tdoc_index_cache_path(key)))
+            self._indexes[key] = index
+        return index
+
+    def ready_index_for_root(self, root: str) -> TDocProjectIndexCache | None:
+        """The root's index if it has been populated, else ``None`` (and a refresh is scheduled)."""
+        index = self.index_for_root(root)
+        if index.is_populated():
+            return index
+        self.schedule_refresh(root)
+        return None
+
+    def is_refreshing(self, root: str) -> bool:
+        key = self._key(root)
+        return key in self._inflight or key in self._queued
+
+    def schedule_refresh(
+        self,
+        root: str,
+        changed_paths: list[str] | None = None,
+        *,
+        on_finished: Callable[[TDocRefreshStats | None], None] | None = None,
+    ) -> None:
+        key = self._key(root)
+        callbacks = [on_finished] if callable(on_finished) else []
+        paths = None if changed_paths is None else {str(path) for path in changed_paths if str(path or "").strip()}
+        if key in self._inflight:
+            queued = self._queued.get(key)
+            if queued is None:
+                self._queued[key] = (paths, callbacks)
+            else:
+                queued_paths, queued_callbacks = queued
+                merged = None if queued_paths is None or paths is None else queued_paths | paths
+                self._queued[key] = (merged, queued_callbacks + callbacks)
+            return
+        self._start(key, paths, callbacks)
+
+    def build_index_async(self, root: str, on_finished: Callable[[Path | None, str], None] | None = None) -> None:
+        """Refresh ``root`` and write its ``index.tdoc`` on the worker; report ``(path, error)`` on the UI thread."""
+        key = self._key(root)
+        index = self.index_for_root(key)
+
+        def _write_after_refresh(_stats: TDocRefreshStats | None) -> None:
+            self._index_writes.append((self._executor.submit(index.write_index_file), on_finished))
+            if not self._result_pump.isActive():
+                self._result_pump.start()
+
+        self.schedule_refresh(key, on_finished=_write_after_refresh)
+
+    def shutdown(self) -> None:
+        self._result_pump.stop()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for index in self._indexes.values():
+            index.save()
+
+    def _start(self, key: str, paths: set[str] | None, callbacks: list[Callable]) -> None:
+        index = self.index_for_root(key)
+        changed = None if paths is None else sorted(paths)
+        future = self._executor.submit(self._refresh, index, changed)
+        self._inflight[key] = (future, callbacks)
+        if not self._result_pump.isActive():
+            self._result_pump.start()
+
+    @staticmethod
+    def _refresh(index: TDocProjectIndexCache, changed_paths: list[str] | None) -> TDocRefreshStats:
+        if not index.is_populated():
+            index.load()
+        stats = index.refresh(changed_paths)
+        index.save()
+        return stats
+
+    def _drain_results(self) -> None:
+        finished = [key for key, (future, _callbacks) in self._inflight.items() if future.done()]
+        for key in finished:
+            future, callbacks = self._inflight.pop(key)
+            try:
+                stats = future.result()
+            except Exception:
+                stats = None
+            queued = self._queued.pop(key, None)
+            if queued is not None:
+                self._start(key, *queued)
+            for callback in callbacks:
+                try:
+                    callback(stats)
+                except Exception:
+                    pass
+            if stats is not None:
+                self.indexRefreshed.emit(key, stats)
+        pending_writes: list[tuple[concurrent.futures.Future, Callable | None]] = []
+        for future, callback in self._index_writes:
+            if not future.done():
+                pending_writes.append((future, callback))
+                continue
+            if not callable(callback):
+                continue
+            try:
+                result, error = future.result(), ""
+            except Exception as exc:
+                result, error = None, str(exc)
+            try:
+                callback(result, error)
+            except Exception:
+                pass
+        self._index_writes = pending_writes
+        if not self._inflight and not self._queued and not self._index_writes:
+            self._result_pump.stop()
@@ -6,7 +6,7 @@ from typing import Callable
 
 import markdown
 from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QMouseEvent, QTextDocument, QTextOption
+from PySide6.QtGui import QMouseEvent, QTextCursor, QTextDocument, QTextOption
 from PySide6.QtWidgets import (
     QFrame,
     QHBoxLayout,
@@ -97,6 +97,25 @@ class ChatMarkdownBubble(QFrame):
     sizeHintChanged = Signal()
     _DIFF_SCROLL_THRESHOLD_LINES = 20
     _DIFF_MAX_BODY_HEIGHT = 280
+    _MARKDOWN_EXTENSIONS = ("fenced_code", "tables", "sane_lists", "nl2br")
+    _MARKDOWN_STYLE = (
+        "<style>"
+        "body { color: #e6edf3; font-size: 13px; }"
+        "p { margin: 0.1em 0 0.45em 0; }"
+        "ul, ol { margin: 0.15em 0 0.45em 1.25em; }"
+        "li > p { margin: 0; }"
+        "blockquote { margin: 0.25em 0; padding-left: 8px; border-left: 2px solid #3a4558; color: #c2cfdf; }"
+        "pre { background: #111722; border: 1px solid #2f3f56; border-radius: 6px; padding: 8px; }"
+        "code { font-family: 'Cascadia Code', 'Fira Code', 'Consolas', monospace; }"
+        "pre code { color: #e6edf3; }"
+        "table { border-collapse: collapse; margin: 0.25em 0 0.45em 0; }"
+        "th, td { border: 1px solid #334155; padding: 4px 6px; }"
+        "a { color: #8ab4f8; text-decoration: none; }"
+        "</style>"
+    )
+    # Placeholder text that absorbs QTextCursor.insertHtml's merge into the current block.
+    _INSERT_SENTINEL = "\u200b"
+    _markdown_parser: markdown.Markdown | None = None
 
     def __init__(
         self,
@@ -119,6 +138,11 @@ class ChatMarkdownBubble(QFrame):
         self._collapsible = role in {"tools", "diff"}
         self._collapsed = self._collapsible
         self._show_header = self._collapsible or bool(timestamp) or role != "assistant"
+        # Completed markdown blocks as (source, html); only the trailing open block is re-rendered.
+        self._markdown_blocks: list[tuple[str, str]] = []
+        self._markdown_tail: str | None = None
+        self._markdown_tail_start = 0
+        self.markdown_block_renders = 0
 
         self.setObjectName("codexBubble")
         self.setProperty("role", role)
@@ -174,6 +198,34 @@ class ChatMarkdownBubble(QFrame):
         self.append_line(text)
         self._apply_collapsed_state()
 
+    @property
+    def collapsed(self) -> bool:
+        return bool(self._collapsed and self._collapsible)
+
+    def set_collapsed(self, collapsed: bool) -> None:
+        if not self._collapsible or bool(collapsed) == self._collapsed:
+            return
+        self._collapsed = bool(collapsed)
+        self._apply_collapsed_state()
+
+    def rebind(
+        self,
+        text: str,
+        *,
+        timestamp: str | None = None,
+        item_count: int = 1,
+        collapsed: bool | None = None,
+    ) -> None:
+        """Reuse this bubble for another transcript entry of the same role."""
+        self.timestamp = timestamp
+        self._item_count = max(1, int(item_count))
+        self._refresh_header()
+        self._markdown_blocks = []
+        self._markdown_tail = None
+        self._collapsed = self._collapsible if collapsed is None else bool(collapsed and self._collapsible)
+        self._text = str(text or "").lstrip("\r\n")
+        self._apply_collapsed_state()
+
     def set_item_count(self, count: int) -> None:
         next_count = max(1, int(count))
         if next_count == self._item_count:
@@ -202,7 +254,7 @@ class ChatMarkdownBubble(QFrame):
             self._notify_size_hint_changed()
             return
         self._apply_body_scroll_behavior()
-        self.body.setHtml(self._render_html())
+        self._render_body()
         self._notify_size_hint_changed()
 
     def _toggle_collapsed(self) -> None:
@@ -219,7 +271,7 @@ class ChatMarkdownBubble(QFrame):
             self.preview.setText(self._collapsed_preview_text())
         else:
             self._apply_body_scroll_behavior()
-            self.body.setHtml(self._render_html())
+            self._render_body()
         if self.toggle_btn is not None:
             self.toggle_btn.setText("Expand" if collapsed else "Collapse")
         self._notify_size_hint_changed()
@@ -366,34 +418,122 @@ class ChatMarkdownBubble(QFrame):
             )
         return self._render_markdown_html(self._text)
 
+    def _render_body(self) -> None:
+        if self.role == "diff":
+            self.body.setHtml(self._render_html())
+            return
+        self._sync_markdown_document()
+
+    def _sync_markdown_document(self) -> None:
+        blocks = self._split_markdown_blocks(self._normalize_chat_markdown(self._text))
+        completed, tail = blocks[:-1], blocks[-1]
+        cached = self._markdown_blocks
+        keep = 0
+        limit = min(len(cached), len(completed))
+        while keep < limit and cached[keep][0] == completed[keep]:
+            keep += 1
+        if keep == len(cached) == len(completed) and tail == self._markdown_tail:
+            return
+        document = self.body.document()
+        cursor = QTextCursor(document)
+        if keep < len(cached) or self._markdown_tail is None or not cached:
+            # Earlier text changed (or nothing is committed yet): rebuild from cached block HTML.
+            del cached[keep:]
+            document.clear()
+            cursor = QTextCursor(document)
+            cursor.beginEditBlock()
+            for _source, block_html in cached:
+                self._insert_markdown_fragment(cursor, block_html)
+        else:
+            cursor.beginEditBlock()
+            # Removing up to an empty block would hand it the tail's block format; pin it with
+            # a placeholder character while the old tail is cut away.
+            cursor.setPosition(self._markdown_tail_start)
+            cursor.insertText(self._INSERT_SENTINEL)
+            cursor.movePosition(QTextCursor.End, QTextCursor.KeepAnchor)
+            cursor.removeSelectedText()
+            cursor.deletePreviousChar()
+        for source in completed[len(cached) :]:
+            block_html = self._render_markdown_block(source)
+            self._insert_markdown_fragment(cursor, block_html)
+            cached.append((source, block_html))
+        cursor.movePosition(QTextCursor.End)
+        self._markdown_tail_start = cursor.position()
+        self._insert_markdown_fragment(cursor, self._render_markdown_block(tail))
+        self._markdown_tail = tail
+        cursor.endEditBlock()
+
+    def _render_markdown_block(self, source: str) -> str:
+        self.markdown_block_renders += 1
+        return self._convert_markdown(source)
+
+    @classmethod
+    def _insert_markdown_fragment(cls, cursor: QTextCursor, block_html: str) -> None:
+        cursor.movePosition(QTextCursor.End)
+        if cursor.document().isEmpty():
+            cursor.insertHtml(f"{cls._MARKDOWN_STYLE}{block_html}")
+            return
+        # insertHtml merges the fragment's first block into the current one (taking over its
+        # format when that block is empty); lead with a throwaway paragraph merged into a
+        # non-empty block so both sides keep their formats.
+        start = cursor.position()
+        cursor.insertText(cls._INSERT_SENTINEL)
+        cursor.insertHtml(f"{cls._MARKDOWN_STYLE}<p>{cls._INSERT_SENTINEL}</p>{block_html}")
+        cursor.setPosition(start)
+        cursor.setPosition(start + 2, QTextCursor.KeepAnchor)
+        cursor.removeSelectedText()
+        cursor.movePosition(QTextCursor.End)
+
+    @classmethod
+    def _convert_markdown(cls, source: str) -> str:
+        parser = cls._markdown_parser
+        if parser is None:
+            parser = markdown.Markdown(extensions=list(cls._MARKDOWN_EXTENSIONS))
+            ChatMarkdownBubble._markdown_parser = parser
+        else:
+            parser.reset()
+        return parser.convert(source)
+
     @staticmethod
     def _render_markdown_html(text: str) -> str:
         source = ChatMarkdownBubble._normalize_chat_markdown(text)
-        parser = markdown.Markdown(
-            extensions=[
-                "fenced_code",
-                "tables",
-                "sane_lists",
-                "nl2br",
-            ]
-        )
-        body = parser.convert(source)
-        return (
-            "<style>"
-            "body { color: #e6edf3; font-size: 13px; }"
-            "p { margin: 0.1em 0 0.45em 0; }"
-            "ul, ol { margin: 0.15em 0 0.45em 1.25em; }"
-            "li > p { margin: 0; }"
-            "blockquote { margin: 0.25em 0; padding-left: 8px; border-left: 2px solid #3a4558; color: #c2cfdf; }"
-            "pre { background: #111722; border: 1px solid #2f3f56; border-radius: 6px; padding: 8px; }"
-            "code { font-family: 'Cascadia Code', 'Fira Code', 'Consolas', monospace; }"
-            "pre code { color: #e6edf3; }"
-            "table { border-collapse: collapse; margin: 0.25em 0 0.45em 0; }"
-            "th, td { border: 1px solid #334155; padding: 4px 6px; }"
-            "a { color: #8ab4f8; text-decoration: none; }"
-            "</style>"
-            f"{body}"
-        )
+        body = ChatMarkdownBubble._convert_markdown(source)
+        return f"{ChatMarkdownBubble._MARKDOWN_STYLE}{body}"
+
+    @staticmethod
+    def _split_markdown_blocks(source: str) -> list[str]:
+        """Split normalized markdown at blank lines that start an independent block.
+
+        Fences, indented continuations and consecutive list items stay together so each
+        block renders the same on its own as it does inside the whole message.
+        """
+        text = str(source or "")
+        if re.search(r"^\s{0,3}\[[^\]]+\]:\s", text, re.MULTILINE):
+            # Reference-style link definitions can resolve across blocks.
+            return [text]
+        blocks: list[str] = []
+        current: list[str] = []
+        in_fence = False
+        previous_blank = False
+        previous_content = ""
+        for line in text.split("\n"):
+            stripped = line.strip()
+            if current and previous_blank and stripped and not in_fence and not line[0].isspace():
+                continues_list = ChatMarkdownBubble._is_list_item_line(line) and (
+                    ChatMarkdownBubble._is_list_item_line(previous_content)
+                    or previous_content[:1].isspace()
+                )
+                if not continues_list:
+                    blocks.append("\n".join(current))
+                    current = []
+            current.append(line)
+            if ChatMarkdownBubble._is_fence_line(line):
+                in_fence = not in_fence
+            if stripped:
+                previous_content = line
+            previous_blank = not stripped
+        blocks.append("\n".join(current))
+        return blocks
 
     @staticmethod
     def _normalize_chat_markdown(text: str) -> str:
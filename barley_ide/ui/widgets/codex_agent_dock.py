@@ -41,7 +41,6 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QPushButton,
     QMenu,
-    QScrollArea,
     QSizePolicy,
     QSplitter,
     QToolButton,
@@ -51,11 +50,13 @@ from PySide6.QtWidgets import (
 from barley_ide.ui.codex_session_store import (
     CodexSessionRecord,
     canonical_path_text,
+    codex_sessions_dir,
     find_codex_session,
     list_codex_sessions,
     read_codex_session,
     session_preview_text,
 )
+from barley_ide.ui.codex_session_tail import CodexSessionLogTail
 from barley_ide.ui.dialogs.codex_sessions_dialog import CodexSessionsDialog
 from barley_ide.ui.icons.asset_icons import SETTINGS_ICON_NAME, app_palette_icon
 from barley_ide.ui.theme_runtime import (
@@ -65,6 +66,7 @@ from barley_ide.ui.theme_runtime import (
     current_codex_agent_panel_theme,
 )
 from barley_ide.ui.widgets.chat_markdown_bubble import ChatMarkdownBubble
+from barley_ide.ui.widgets.codex_transcript_view import CodexTranscriptView
 from barley_ide.ui.widgets.spellcheck_inputs import SpellcheckTextEdit
 from barley_ide.ui.dialogs.file_dialog_bridge import get_open_file_names
 
@@ -1543,7 +1545,6 @@ class CodexAgentDockWidget(QWidget):
         self._latest_assistant_bubble_text = ""
         self._forced_bubble_role_boundary: str | None = None
         self._transcript_entries: list[_TranscriptEntry] = []
-        self._transcript_bubbles: list[ChatMarkdownBubble] = []
         self._turn_diff_start_index = 0
         self._turn_changed_files: list[str] = []
         self._turn_changed_file_set: set[str] = set()
@@ -1564,13 +1565,7 @@ class CodexAgentDockWidget(QWidget):
         self._transcript_internal_scroll = False
         self._current_plan: _PlanState | None = None
         self._plan_watch_active = False
-        self._plan_log_path: Path | None = None
-        self._plan_log_position = 0
-        self._plan_start_from_beginning = False
         self._transcript_watch_active = False
-        self._transcript_log_path: Path | None = None
-        self._transcript_log_position = 0
-        self._transcript_start_from_beginning = False
         self._last_rate_limits_text = _RATE_LIMITS_UNAVAILABLE
         self._last_rate_limits_tooltip = "Rate limit data unavailable"
         self._context_mode = "auto"
@@ -1588,13 +1583,13 @@ class CodexAgentDockWidget(QWidget):
             self._on_transcript_scroll_animation_value_changed
         )
 
-        self._plan_poll_timer = QTimer(self)
-        self._plan_poll_timer.setInterval(700)
-        self._plan_poll_timer.timeout.connect(self._poll_plan_updates)
-
-        self._transcript_poll_timer = QTimer(self)
-        self._transcript_poll_timer.setInterval(250)
-        self._transcript_poll_timer.timeout.connect(self._poll_transcript_updates)
+        # One tail reader feeds both the plan panel and the live transcript.
+        self._session_tail = CodexSessionLogTail(
+            resolve_path=self._session_log_path,
+            parse_event=self._parse_session_log_event,
+            parent=self,
+        )
+        self._session_tail.eventsRead.connect(self._on_session_log_events)
 
         self._build_ui()
         self._wire_signals()
@@ -1605,8 +1600,7 @@ class CodexAgentDockWidget(QWidget):
 
     def shutdown(self) -> None:
         self._save_timer.stop()
-        self._plan_poll_timer.stop()
-        self._transcript_poll_timer.stop()
+        self._session_tail.shutdown()
         self._runner.stop()
         self._reset_attachments_for_new_chat()
 
@@ -1661,19 +1655,11 @@ class CodexAgentDockWidget(QWidget):
         transcript_panel_layout.setContentsMargins(0, 0, 0, 0)
         transcript_panel_layout.setSpacing(6)
 
-        self.transcript_scroll = QScrollArea()
+        # Only bubbles near the viewport are materialized; _transcript_entries holds the transcript.
+        self.transcript_scroll = CodexTranscriptView(self._new_transcript_bubble)
         self.transcript_scroll.setObjectName("codexTranscript")
-        self.transcript_scroll.setWidgetResizable(True)
-        self.transcript_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.transcript_scroll.verticalScrollBar().setSingleStep(18)
-
-        self._transcript_container = QWidget()
-        self._transcript_container.setObjectName("codexTranscriptContent")
-        self._transcript_layout = QVBoxLayout(self._transcript_container)
-        self._transcript_layout.setContentsMargins(8, 8, 8, 8)
-        self._transcript_layout.setSpacing(2)
-        self._transcript_layout.addStretch(1)
-        self.transcript_scroll.setWidget(self._transcript_container)
+        self.transcript_scroll.viewport().setObjectName("codexTranscriptContent")
+        self.transcript_scroll.contentHeightChanged.connect(self._on_transcript_bubble_size_hint_changed)
         transcript_panel_layout.addWidget(self.transcript_scroll, 1)
 
         self.plan_panel = _CodexPlanPanel(transcript_panel)
@@ -1860,12 +1846,7 @@ class CodexAgentDockWidget(QWidget):
         self._forced_bubble_role_boundary = None
         self._pending_diff_lines.clear()
         self._turn_diff_start_index = 0
-        while self._transcript_layout.count() > 1:
-            item = self._transcript_layout.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                widget.deleteLater()
-        self._transcript_bubbles.clear()
+        self.transcript_scroll.clear()
         self._refresh_current_diff_summary()
 
     def _set_current_plan(self, plan: _PlanState | None) -> None:
@@ -1967,19 +1948,8 @@ class CodexAgentDockWidget(QWidget):
         return files
 
     def _session_log_path(self, session_id: str) -> Path | None:
-        normalized_id = str(session_id or "").strip()
-        if not normalized_id:
-            return None
-        sessions_dir = Path.home() / ".codex" / "sessions"
-        if not sessions_dir.is_dir():
-            return None
-        candidates = list(sessions_dir.rglob(f"*{normalized_id}.jsonl"))
-        if not candidates:
-            return None
-        try:
-            return max(candidates, key=lambda path: path.stat().st_mtime)
-        except Exception:
-            return candidates[-1]
+        session = find_codex_session(str(session_id or ""))
+        return session.log_path if session is not None else None
 
     @staticmethod
     def _extract_plan_state_from_event(data: dict[str, Any]) -> _PlanState | None:
@@ -2022,127 +1992,64 @@ class CodexAgentDockWidget(QWidget):
         return _PlanState(explanation=explanation, steps=steps)
 
     def _reset_plan_tracking(self, *, clear_panel: bool) -> None:
-        self._plan_poll_timer.stop()
         self._plan_watch_active = False
-        self._plan_log_path = None
-        self._plan_log_position = 0
-        self._plan_start_from_beginning = False
+        if not self._transcript_watch_active:
+            self._session_tail.stop()
         if clear_panel:
             self._clear_current_plan()
 
     def _begin_plan_tracking_for_turn(self) -> None:
         self._clear_current_plan()
         self._plan_watch_active = True
-        self._plan_log_path = None
-        self._plan_log_position = 0
-        self._plan_start_from_beginning = not bool(str(self._session_id or "").strip())
-        session_id = str(self._session_id or "").strip()
-        if session_id:
-            log_path = self._session_log_path(session_id)
-            self._plan_log_path = log_path
-            if log_path is not None:
-                try:
-                    self._plan_log_position = log_path.stat().st_size
-                except Exception:
-                    self._plan_log_position = 0
-        self._plan_poll_timer.start()
-
-    def _ensure_plan_log_ready(self) -> bool:
-        if not self._plan_watch_active:
-            return False
-        session_id = str(self._session_id or "").strip()
-        if not session_id:
-            return False
-        if self._plan_log_path is None:
-            self._plan_log_path = self._session_log_path(session_id)
-            if self._plan_log_path is None:
-                return False
-            if self._plan_start_from_beginning:
-                self._plan_log_position = 0
-            else:
-                try:
-                    self._plan_log_position = self._plan_log_path.stat().st_size
-                except Exception:
-                    self._plan_log_position = 0
-            self._plan_start_from_beginning = False
-        return True
-
-    def _poll_plan_updates(self) -> None:
-        if not self._ensure_plan_log_ready():
-            return
-        log_path = self._plan_log_path
-        if log_path is None:
-            return
-        try:
-            file_size = log_path.stat().st_size
-        except Exception:
-            return
-        if self._plan_log_position > file_size:
-            self._plan_log_position = 0
-        latest_plan: _PlanState | None = None
-        try:
-            with log_path.open("r", encoding="utf-8") as handle:
-                if self._plan_log_position > 0:
-                    handle.seek(self._plan_log_position)
-                for raw_line in handle:
-                    line = str(raw_line or "").strip()
-                    if not line:
-                        continue
-                    try:
-                        data = json.loads(line)
-                    except Exception:
-                        continue
-                    candidate = self._extract_plan_state_from_event(data)
-                    if candidate is not None:
-                        latest_plan = candidate
-                self._plan_log_position = handle.tell()
-        except Exception:
-            return
-        if latest_plan is not None:
-            self._set_current_plan(latest_plan)
+        self._start_session_tail()
 
     def _reset_transcript_tracking(self) -> None:
-        self._transcript_poll_timer.stop()
         self._transcript_watch_active = False
-        self._transcript_log_path = None
-        self._transcript_log_position = 0
-        self._transcript_start_from_beginning = False
+        if not self._plan_watch_active:
+            self._session_tail.stop()
 
     def _begin_transcript_tracking_for_turn(self) -> None:
         self._transcript_watch_active = True
-        self._transcript_log_path = None
-        self._transcript_log_position = 0
-        self._transcript_start_from_beginning = not bool(str(self._session_id or "").strip())
+        self._start_session_tail()
+
+    def _start_session_tail(self) -> None:
+        if self._session_tail.active:
+            return
         session_id = str(self._session_id or "").strip()
-        if session_id:
-            log_path = self._session_log_path(session_id)
-            self._transcript_log_path = log_path
-            if log_path is not None:
-                try:
-                    self._transcript_log_position = log_path.stat().st_size
-                except Exception:
-                    self._transcript_log_position = 0
-        self._transcript_poll_timer.start()
+        # Without a session id the log is created by this turn, so read it from the start once found.
+        self._session_tail.start(session_id, from_beginning=not bool(session_id))
 
     def _ensure_transcript_log_ready(self) -> bool:
         if not self._transcript_watch_active:
             return False
-        session_id = str(self._session_id or "").strip()
-        if not session_id:
-            return False
-        if self._transcript_log_path is None:
-            self._transcript_log_path = self._session_log_path(session_id)
-            if self._transcript_log_path is None:
-                return False
-            if self._transcript_start_from_beginning:
-                self._transcript_log_position = 0
-            else:
-                try:
-                    self._transcript_log_position = self._transcript_log_path.stat().st_size
-                except Exception:
-                    self._transcript_log_position = 0
-            self._transcript_start_from_beginning = False
-        return True
+        return self._session_tail.ensure_path()
+
+    @classmethod
+    def _parse_session_log_event(cls, data: dict[str, Any]) -> list[tuple[str, Any]]:
+        events: list[tuple[str, Any]] = []
+        plan = cls._extract_plan_state_from_event(data)
+        if plan is not None:
+            events.append(("plan", plan))
+        if str(data.get("type") or "").strip() != "response_item":
+            return events
+        payload = data.get("payload")
+        if not isinstance(payload, dict):
+            return events
+        role, text = cls._extract_visible_session_item(payload)
+        if role and text:
+            events.append(("transcript", (role, text, cls._format_iso_timestamp(data.get("timestamp")))))
+        return events
+
+    def _on_session_log_events(self, events: object) -> None:
+        latest_plan: _PlanState | None = None
+        for kind, value in events if isinstance(events, list) else []:
+            if kind == "plan" and self._plan_watch_active:
+                latest_plan = value
+            elif kind == "transcript" and self._transcript_watch_active:
+                role, text, stamp = value
+                self._apply_live_transcript_item(role, text, stamp)
+        if latest_plan is not None:
+            self._set_current_plan(latest_plan)
 
     def _apply_live_transcript_item(self, role: str, text: str, stamp: str | None) -> None:
         normalized_role = str(role or "").strip()
@@ -2156,47 +2063,6 @@ class CodexAgentDockWidget(QWidget):
                 self._capture_changed_files_from_line(raw_line)
         self._add_bubble(normalized_role, text, timestamp=stamp)
 
-    def _poll_transcript_updates(self) -> None:
-        if not self._ensure_transcript_log_ready():
-            return
-        log_path = self._transcript_log_path
-        if log_path is None:
-            return
-        try:
-            file_size = log_path.stat().st_size
-        except Exception:
-            return
-        if self._transcript_log_position > file_size:
-            self._transcript_log_position = 0
-        pending_items: list[tuple[str, str, str | None]] = []
-        try:
-            with log_path.open("r", encoding="utf-8") as handle:
-                if self._transcript_log_position > 0:
-                    handle.seek(self._transcript_log_position)
-                for raw_line in handle:
-                    line = str(raw_line or "").strip()
-                    if not line:
-                        continue
-                    try:
-                        data = json.loads(line)
-                    except Exception:
-                        continue
-                    if str(data.get("type") or "").strip() != "response_item":
-                        continue
-                    payload = data.get("payload")
-                    if not isinstance(payload, dict):
-                        continue
-                    role, text = self._extract_visible_session_item(payload)
-                    if not role or not text:
-                        continue
-                    stamp = self._format_iso_timestamp(data.get("timestamp"))
-                    pending_items.append((role, text, stamp))
-                self._transcript_log_position = handle.tell()
-        except Exception:
-            return
-        for role, text, stamp in pending_items:
-            self._apply_live_transcript_item(role, text, stamp)
-
     def _schedule_transcript_render(
         self,
         *,
@@ -2228,6 +2094,7 @@ class CodexAgentDockWidget(QWidget):
         return bar.value() >= max(0, bar.maximum() - max(0, tolerance))
 
     def _scroll_transcript_to_bottom(self, *, animated: bool = False) -> None:
+        self.transcript_scroll.ensure_laid_out()
         bar = self.transcript_scroll.verticalScrollBar()
         maximum = bar.maximum()
         if not animated or bar.value() >= maximum:
@@ -2340,7 +2207,7 @@ class CodexAgentDockWidget(QWidget):
         bubble.setStyleSheet(self._bubble_stylesheet(str(bubble.role or "")))
 
     def _apply_codex_agent_theme(self) -> None:
-        for bubble in self._transcript_bubbles:
+        for bubble in self.transcript_scroll.bubbles():
             self._apply_bubble_theme(bubble)
         self.plan_panel.apply_theme()
         self.diff_panel.apply_theme()
@@ -2361,7 +2228,6 @@ class CodexAgentDockWidget(QWidget):
             diff_path_display=self._display_changed_path if role == "diff" else None,
         )
         self._apply_bubble_theme(bubble)
-        bubble.sizeHintChanged.connect(self._on_transcript_bubble_size_hint_changed)
         return bubble
 
     def _load_model_choices(self, selected_model: str) -> None:
@@ -3814,12 +3680,9 @@ class CodexAgentDockWidget(QWidget):
     def _remove_transcript_tail_entries(self, count: int) -> None:
         remove_count = max(0, int(count))
         for _ in range(remove_count):
-            if self._transcript_bubbles:
-                bubble = self._transcript_bubbles.pop()
-                self._transcript_layout.removeWidget(bubble)
-                bubble.deleteLater()
             if self._transcript_entries:
                 self._transcript_entries.pop()
+                self.transcript_scroll.remove_last(1)
         self._sync_latest_assistant_bubble_text()
 
     def _prune_replayed_transcript_tail(self) -> None:
@@ -3855,7 +3718,7 @@ class CodexAgentDockWidget(QWidget):
         return str(text or "")
 
     def _prune_repeated_suffix_in_last_entry(self) -> None:
-        if not self._transcript_entries or not self._transcript_bubbles:
+        if not self._transcript_entries:
             return
         entry = self._transcript_entries[-1]
         if not self._is_replay_prune_role(entry.role):
@@ -3864,7 +3727,10 @@ class CodexAgentDockWidget(QWidget):
         if collapsed == str(entry.text or ""):
             return
         entry.text = collapsed
-        self._transcript_bubbles[-1].set_text(collapsed)
+        bubble = self.transcript_scroll.bubble_at(-1)
+        if bubble is not None:
+            bubble.set_text(collapsed)
+        self.transcript_scroll.entry_changed(-1)
         self._sync_latest_assistant_bubble_text()
 
     @staticmethod
@@ -3986,14 +3852,16 @@ class CodexAgentDockWidget(QWidget):
                 last_entry.text = self._append_transcript_line(last_entry.text, line)
             if role == "assistant":
                 self._latest_assistant_bubble_text = str(last_entry.text or "")
-            if self._transcript_bubbles:
-                bubble = self._transcript_bubbles[-1]
+            bubble = self.transcript_scroll.bubble_at(-1)
+            if bubble is not None:
                 if can_group_tools:
                     bubble.set_text(last_entry.text)
                     bubble.set_item_count(last_entry.item_count)
                 else:
                     bubble.append_line(line)
-                    self._prune_repeated_suffix_in_last_entry()
+            self.transcript_scroll.entry_changed(-1)
+            if not can_group_tools:
+                self._prune_repeated_suffix_in_last_entry()
             self._prune_replayed_transcript_tail()
         else:
             entry = _TranscriptEntry(
@@ -4003,10 +3871,7 @@ class CodexAgentDockWidget(QWidget):
                 item_count=1,
             )
             self._transcript_entries.append(entry)
-            bubble = self._new_transcript_bubble(entry)
-            insert_at = max(0, self._transcript_layout.count() - 1)
-            self._transcript_layout.insertWidget(insert_at, bubble)
-            self._transcript_bubbles.append(bubble)
+            self.transcript_scroll.append_entry(entry)
             if role == "assistant":
                 self._latest_assistant_bubble_text = str(entry.text or "")
             self._prune_replayed_transcript_tail()
@@ -4573,20 +4438,14 @@ class CodexAgentDockWidget(QWidget):
                     f"Attached session {session_id[:8]}...",
                     timestamp=_timestamp(),
                 )
-                if self._plan_watch_active:
-                    self._plan_log_path = None
-                    self._plan_log_position = 0
-                    self._plan_start_from_beginning = True
-                    self._poll_plan_updates()
-                if self._transcript_watch_active:
-                    self._transcript_log_path = None
-                    self._transcript_log_position = 0
-                    self._transcript_start_from_beginning = True
-                    self._poll_transcript_updates()
+                if self._plan_watch_active or self._transcript_watch_active:
+                    self._session_tail.switch_session(session_id)
                 self._schedule_persist_settings()
 
         self._capture_rate_limits_from_stream_line(clean_text)
-        self._poll_transcript_updates()
+        if self._transcript_watch_active:
+            # Output usually means the log grew; the watcher covers writes without stdout.
+            self._session_tail.poke()
         self._stream_partial += str(text or "")
         while "\n" in self._stream_partial:
             line, self._stream_partial = self._stream_partial.split("\n", 1)
@@ -4678,33 +4537,19 @@ class CodexAgentDockWidget(QWidget):
         return display
 
     def _recent_session_log_candidates(self, session_id: str | None = None) -> list[Path]:
-        sessions_dir = Path.home() / ".codex" / "sessions"
-        if not sessions_dir.is_dir():
+        if not codex_sessions_dir().is_dir():
             self._append_rate_limits_debug_log("task: sessions_dir not found")
             return []
 
         normalized_id = str(session_id or "").strip()
         if normalized_id:
-            matches = list(sessions_dir.rglob(f"*{normalized_id}.jsonl"))
-            if not matches:
+            session = find_codex_session(normalized_id)
+            if session is None:
                 self._append_rate_limits_debug_log(f"task: no candidates for {normalized_id}")
                 return []
-            try:
-                matches.sort(key=lambda path: path.stat().st_mtime, reverse=True)
-            except Exception:
-                matches = list(reversed(matches))
-            return matches
+            return [session.log_path]
 
-        try:
-            candidates = sorted(
-                sessions_dir.rglob("*.jsonl"),
-                key=lambda path: path.stat().st_mtime,
-                reverse=True,
-            )
-        except Exception:
-            candidates = list(sessions_dir.rglob("*.jsonl"))
-            candidates.reverse()
-        return candidates[:_RATE_LIMITS_RECENT_LOG_SCAN_LIMIT]
+        return [session.log_path for session in list_codex_sessions(limit=_RATE_LIMITS_RECENT_LOG_SCAN_LIMIT)]
 
     def _latest_rate_limit_display(self) -> tuple[str, str]:
         for log_path in self._recent_session_log_candidates():
@@ -4804,10 +4649,9 @@ class CodexAgentDockWidget(QWidget):
         self._stream_partial = ""
         if self._use_stream_transcript_fallback():
             self._flush_pending_diff_bubble()
-        self._poll_transcript_updates()
+        self._session_tail.drain()
         self._reset_transcript_tracking()
-        self._poll_plan_updates()
-        self._plan_poll_timer.stop()
+        self._session_tail.stop()
         self._stream_mode = "assistant"
         self._suppress_post_tokens_echo = False
         self._post_tokens_replay_expected_lines = []
@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtWidgets import QAbstractScrollArea, QFrame, QWidget
+
+from barley_ide.ui.widgets.chat_markdown_bubble import ChatMarkdownBubble
+
+# bubble_factory(entry) -> a new bubble for a transcript entry (role, text, timestamp, item_count).
+BubbleFactory = Callable[[Any], ChatMarkdownBubble]
+
+
+@dataclass(slots=True)
+class _TranscriptRow:
+    entry: Any
+    collapsed: bool | None = None
+    # Rendered height per (content width, collapsed); dropped whenever the entry text changes.
+    heights: dict[tuple[int, bool], int] = field(default_factory=dict)
+    last_height: int = 0
+
+
+class CodexTranscriptView(QAbstractScrollArea):
+    """Virtualized transcript: only rows near the viewport own a bubble widget.
+
+    The transcript itself stays as lightweight entry objects. Bubbles are taken from a
+    per-role pool when a row scrolls into view and returned when it leaves, and measured
+    row heights are cached per width so resizing or scrolling back does not re-render.
+    """
+
+    contentHeightChanged = Signal()
+
+    MARGIN = 8
+    SPACING = 2
+    OVERSCAN_PX = 240
+    POOL_LIMIT_PER_KEY = 6
+    _ESTIMATED_LINE_HEIGHT = 18
+    _ESTIMATED_CHARS_PER_PX = 0.14
+
+    def __init__(self, bubble_factory: BubbleFactory, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self._bubble_factory = bubble_factory
+        self._rows: list[_TranscriptRow] = []
+        # _tops[i] is the y of row i in content coordinates; valid below _tops_valid_from.
+        self._tops: list[int] = [self.MARGIN]
+        self._tops_valid_from = 0
+        self._live: dict[int, ChatMarkdownBubble] = {}
+        self._pool: dict[tuple[str, bool], list[ChatMarkdownBubble]] = {}
+        self._dirty_bubbles: set[int] = set()
+        self._content_height = 0
+        self._in_relayout = False
+        self.bubbles_created = 0
+
+        self.setFrameShape(QFrame.NoFrame)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.verticalScrollBar().setSingleStep(18)
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+
+        self._relayout_timer = QTimer(self)
+        self._relayout_timer.setSingleShot(True)
+        self._relayout_timer.setInterval(0)
+        self._relayout_timer.timeout.connect(self.relayout)
+
+    # -- entries -------------------------------------------------------------------------
+
+    def entry_count(self) -> int:
+        return len(self._rows)
+
+    def append_entry(self, entry: Any) -> None:
+        self._rows.append(_TranscriptRow(entry=entry))
+        self._invalidate_tops(len(self._rows) - 1)
+        self._schedule_relayout()
+
+    def entry_changed(self, index: int = -1) -> None:
+        """The entry at ``index`` changed text or item count; its cached heights are stale."""
+        if not self._rows:
+            return
+        index = index % len(self._rows)
+        self._rows[index].heights.clear()
+        bubble = self._live.get(index)
+        if bubble is not None:
+            self._dirty_bubbles.add(id(bubble))
+        self._invalidate_tops(index)
+        self._schedule_relayout()
+
+    def remove_last(self, count: int = 1) -> None:
+        for _ in range(max(0, int(count))):
+            if not self._rows:
+                break
+            index = len(self._rows) - 1
+            if index in self._live:
+                self._release(index)
+            self._rows.pop()
+        self._invalidate_tops(len(self._rows))
+        self._schedule_relayout()
+
+    def clear(self) -> None:
+        for index in list(self._live):
+            self._release(index)
+        self._rows.clear()
+        self._invalidate_tops(0)
+        self._schedule_relayout()
+
+    def bubble_at(self, index: int = -1) -> ChatMarkdownBubble | None:
+        """The materialized bubble for ``index``, or None while the row is scrolled away."""
+        if not self._rows:
+            return None
+        return self._live.get(index % len(self._rows))
+
+    def bubbles(self) -> Iterator[ChatMarkdownBubble]:
+        """Every bubble widget the view owns, visible or pooled."""
+        yield from self._live.values()
+        for pooled in self._pool.values():
+            yield from pooled
+
+    def live_count(self) -> int:
+        return len(self._live)
+
+    # -- layout --------------------------------------------------------------------------
+
+    def ensure_laid_out(self) -> None:
+        """Apply pending entry changes now, e.g. before reading the scroll range."""
+        if self._relayout_timer.isActive():
+            self.relayout()
+
+    def relayout(self) -> None:
+        if self._in_relayout:
+            return
+        self._relayout_timer.stop()
+        self._in_relayout = True
+        try:
+            bar = self.verticalScrollBar()
+            anchor = self._scroll_anchor()
+            width = self._row_width()
+            for _ in range(4):
+                self._sync_scroll_range()
+                if anchor is not None:
+                    index, offset = anchor
+                    if index < len(self._rows):
+                        bar.setValue(self._top(index) + offset)
+                if not self._materialize_visible(width):
+                    break
+            self._sync_scroll_range()
+            self._position_live(width)
+        finally:
+            self._in_relayout = False
+
+    def resizeEvent(self, event) -> None:  # type: ignore[override]
+        super().resizeEvent(event)
+        if event.oldSize().width() != event.size().width():
+            self._invalidate_tops(0)
+        self.relayout()
+
+    def _schedule_relayout(self) -> None:
+        if not self._relayout_timer.isActive():
+            self._relayout_timer.start()
+
+    def _on_scrolled(self, _value: int) -> None:
+        if not self._in_relayout:
+            self.relayout()
+
+    def _row_width(self) -> int:
+        return max(120, self.viewport().width() - (self.MARGIN * 2))
+
+    def _scroll_anchor(self) -> tuple[int, int] | None:
+        # Keep the first visible row steady while rows above it are measured; when the view
+        # sits at the bottom the owner decides whether to follow new output.
+        bar = self.verticalScrollBar()
+        value = bar.value()
+        if value <= 0 or value >= bar.maximum() or not self._rows:
+            return None
+        self._ensure_tops()
+        index = max(0, min(len(self._rows) - 1, bisect_right(self._tops, value) - 1))
+        return index, value - self._tops[index]
+
+    def _row_height(self, row: _TranscriptRow, width: int) -> int:
+        collapsed = bool(row.collapsed) if row.collapsed is not None else self._default_collapsed(row)
+        cached = row.heights.get((width, collapsed))
+        if cached is not None:
+            return cached
+        if row.last_height > 0:
+            return row.last_height
+        return self._estimate_height(row, width)
+
+    @staticmethod
+    def _default_collapsed(row: _TranscriptRow) -> bool:
+        return str(getattr(row.entry, "role", "") or "") in {"tools", "diff"}
+
+    def _estimate_height(self, row: _TranscriptRow, width: int) -> int:
+        if self._default_collapsed(row) and row.collapsed is not False:
+            return 2 * self._ESTIMATED_LINE_HEIGHT + 11
+        text = str(getattr(row.entry, "text", "") or "")
+        chars_per_line = max(20, int(width * self._ESTIMATED_CHARS_PER_PX))
+        lines = 0
+        for raw in text.split("\n"):
+            lines += 1 + len(raw) // chars_per_line
+        return (lines + 1) * self._ESTIMATED_LINE_HEIGHT + 11
+
+    def _invalidate_tops(self, index: int) -> None:
+        self._tops_valid_from = min(self._tops_valid_from, max(0, index))
+
+    def _ensure_tops(self) -> None:
+        count = len(self._rows)
+        start = min(self._tops_valid_from, count)
+        if start >= count and len(self._tops) == count + 1:
+            return
+        del self._tops[start + 1 :]
+        width = self._row_width()
+        y = self._tops[start]
+        for index in range(start, count):
+            y += self._row_height(self._rows[index], width) + self.SPACING
+            self._tops.append(y)
+        self._tops_valid_from = count
+
+    def _top(self, index: int) -> int:
+        self._ensure_tops()
+        return self._tops[index]
+
+    def _sync_scroll_range(self) -> None:
+        self._ensure_tops()
+        content = self._tops[-1] - (self.SPACING if self._rows else 0) + self.MARGIN
+        viewport_height = self.viewport().height()
+        bar = self.verticalScrollBar()
+        bar.setPageStep(viewport_height)
+        bar.setRange(0, max(0, content - viewport_height))
+        if content != self._content_height:
+            self._content_height = content
+            self.contentHeightChanged.emit()
+
+    def _visible_range(self) -> range:
+        if not self._rows:
+            return range(0)
+        self._ensure_tops()
+        top = self.verticalScrollBar().value() - self.OVERSCAN_PX
+        bottom = self.verticalScrollBar().value() + self.viewport().height() + self.OVERSCAN_PX
+        first = max(0, min(len(self._rows) - 1, bisect_right(self._tops, top) - 1))
+        last = max(first, min(len(self._rows), bisect_right(self._tops, bottom)))
+        return range(first, min(len(self._rows), last))
+
+    def _materialize_visible(self, width: int) -> bool:
+        """Bind bubbles to rows in view and measure them; True when any row height changed."""
+        wanted = self._visible_range()
+        for index in [index for index in self._live if index not in wanted]:
+            self._release(index)
+        changed = False
+        for index in wanted:
+            bubble = self._live.get(index)
+            if bubble is None:
+                bubble = self._acquire(index, width)
+            elif id(bubble) not in self._dirty_bubbles and bubble.width() == width:
+                continue
+            self._dirty_bubbles.discard(id(bubble))
+            if self._measure(index, bubble, width):
+                changed = True
+        return changed
+
+    def _measure(self, index: int, bubble: ChatMarkdownBubble, width: int) -> bool:
+        row = self._rows[index]
+        previous = self._row_height(row, width)
+        if bubble.width() != width:
+            bubble.resize(width, max(1, bubble.height()))
+        layout = bubble.layout()
+        if layout is not None:
+            layout.activate()
+        height = max(1, bubble.sizeHint().height())
+        if bubble.height() != height:
+            bubble.resize(width, height)
+        row.collapsed = bubble.collapsed
+        row.heights[(width, row.collapsed)] = height
+        row.last_height = height
+        if height == previous:
+            return False
+        self._invalidate_tops(index)
+        return True
+
+    def _position_live(self, width: int) -> None:
+        offset = self.verticalScrollBar().value()
+        for index, bubble in self._live.items():
+            bubble.move(self.MARGIN, self._top(index) - offset)
+            if bubble.width() != width:
+                bubble.resize(width, bubble.height())
+
+    # -- pooling -------------------------------------------------------------------------
+
+    @staticmethod
+    def _pool_key(entry: Any) -> tuple[str, bool]:
+        return str(getattr(entry, "role", "") or ""), bool(getattr(entry, "timestamp", None))
+
+    def _acquire(self, index: int, width: int) -> ChatMarkdownBubble:
+        row = self._rows[index]
+        entry = row.entry
+        pooled = self._pool.get(self._pool_key(entry))
+        if pooled:
+            bubble = pooled.pop()
+            bubble.rebind(
+                str(getattr(entry, "text", "") or ""),
+                timestamp=getattr(entry, "timestamp", None),
+                item_count=int(getattr(entry, "item_count", 1) or 1),
+                collapsed=row.collapsed,
+            )
+        else:
+            bubble = self._bubble_factory(entry)
+            self.bubbles_created += 1
+            if row.collapsed is not None:
+                bubble.set_collapsed(row.collapsed)
+            bubble.setParent(self.viewport())
+            bubble.sizeHintChanged.connect(lambda b=bubble: self._on_bubble_size_hint_changed(b))
+        bubble.resize(width, max(1, bubble.height()))
+        bubble.show()
+        self._live[index] = bubble
+        return bubble
+
+    def _release(self, index: int) -> None:
+        bubble = self._live.pop(index)
+        if 0 <= index < len(self._rows):
+            self._rows[index].collapsed = bubble.collapsed
+        self._dirty_bubbles.discard(id(bubble))
+        bubble.hide()
+        key = (bubble.role, bool(bubble.timestamp))
+        pooled = self._pool.setdefault(key, [])
+        if len(pooled) < self.POOL_LIMIT_PER_KEY:
+            pooled.append(bubble)
+        else:
+            bubble.deleteLater()
+
+    def _on_bubble_size_hint_changed(self, bubble: ChatMarkdownBubble) -> None:
+        if not bubble.isVisible():
+            return
+        self._dirty_bubbles.add(id(bubble))
+        self._schedule_relayout()
+
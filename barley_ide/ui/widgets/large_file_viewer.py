@@ -0,0 +1,515 @@
+"""Read-only, virtualized viewer tab for multi-GB text files."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import os
+import uuid
+from pathlib import Path
+
+from PySide6.QtCore import QRect, Qt, QTimer, Signal
+from PySide6.QtGui import (
+    QColor,
+    QFont,
+    QFontMetrics,
+    QGuiApplication,
+    QKeySequence,
+    QPainter,
+    QShortcut,
+)
+from PySide6.QtWidgets import (
+    QAbstractScrollArea,
+    QCheckBox,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
+
+from barley_ide.services.large_file_index import (
+    MAX_RENDERED_LINE_CHARS,
+    LargeFileLineIndex,
+    LargeFileMatch,
+)
+
+_INDEX_POLL_INTERVAL_MS = 120
+_SEARCH_POLL_INTERVAL_MS = 30
+
+
+class _LargeFileViewport(QAbstractScrollArea):
+    """Paints only the lines that fall inside the visible viewport."""
+
+    currentLineChanged = Signal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._index: LargeFileLineIndex | None = None
+        self._current_line = 0
+        self._match: LargeFileMatch | None = None
+        self._background = QColor("#1e1e1e")
+        self._foreground = QColor("#d4d4d4")
+        self._gutter_fg = QColor("#858585")
+        self._current_line_bg = QColor(255, 255, 255, 18)
+        self._match_bg = QColor(255, 200, 60, 110)
+        self.setFocusPolicy(Qt.StrongFocus)
+        font = QFont("Monospace")
+        font.setStyleHint(QFont.TypeWriter)
+        self.set_font(font)
+
+    def set_font(self, font: QFont) -> None:
+        self.viewport().setFont(font)
+        self.setFont(font)
+        self._refresh_scroll_ranges()
+        self.viewport().update()
+
+    def set_colors(self, *, background: QColor, foreground: QColor) -> None:
+        if background.isValid():
+            self._background = QColor(background)
+        if foreground.isValid():
+            self._foreground = QColor(foreground)
+        self.viewport().update()
+
+    def set_index(self, index: LargeFileLineIndex | None) -> None:
+        self._index = index
+        self._current_line = 0
+        self._match = None
+        self._refresh_scroll_ranges()
+        self.verticalScrollBar().setValue(0)
+        self.viewport().update()
+
+    def _line_height(self) -> int:
+        return max(1, QFontMetrics(self.viewport().font()).lineSpacing())
+
+    def _char_width(self) -> int:
+        return max(1, QFontMetrics(self.viewport().font()).horizontalAdvance("M"))
+
+    def visible_line_count(self) -> int:
+        return max(1, self.viewport().height() // self._line_height())
+
+    def _gutter_width(self) -> int:
+        count = self._index.line_count() if self._index is not None else 1
+        return self._char_width() * (len(str(max(1, count))) + 2)
+
+    def _refresh_scroll_ranges(self) -> None:
+        count = self._index.line_count() if self._index is not None else 0
+        page = self.visible_line_count()
+        vbar = self.verticalScrollBar()
+        vbar.setRange(0, max(0, count - page))
+        vbar.setPageStep(page)
+        vbar.setSingleStep(1)
+        self._refresh_horizontal_range()
+
+    def _text_columns(self) -> int:
+        return max(1, (self.viewport().width() - self._gutter_width()) // self._char_width())
+
+    def _longest_visible_line(self) -> int:
+        index = self._index
+        if index is None:
+            return 0
+        first = self.verticalScrollBar().value()
+        last = min(index.line_count(), first + self.visible_line_count() + 1)
+        return max((len(index.line_text(line) or "") for line in range(first, last)), default=0)
+
+    def _refresh_horizontal_range(self) -> None:
+        # Columns, like the vertical bar counts lines; rendered lines stop at the cap.
+        columns = self._text_columns()
+        longest = min(self._longest_visible_line(), MAX_RENDERED_LINE_CHARS)
+        hbar = self.horizontalScrollBar()
+        hbar.setRange(0, max(0, longest - columns))
+        hbar.setPageStep(columns)
+        hbar.setSingleStep(4)
+
+    def refresh_line_count(self) -> None:
+        self._refresh_scroll_ranges()
+        self.viewport().update()
+
+    def current_line(self) -> int:
+        return int(self._current_line)
+
+    def current_match(self) -> LargeFileMatch | None:
+        return self._match
+
+    def set_current_line(self, line: int, *, match: LargeFileMatch | None = None) -> None:
+        count = self._index.line_count() if self._index is not None else 0
+        target = max(0, min(int(line), max(0, count - 1)))
+        self._current_line = target
+        self._match = match
+        first = self.verticalScrollBar().value()
+        page = self.visible_line_count()
+        if target < first or target >= first + page:
+            self.verticalScrollBar().setValue(max(0, target - page // 3))
+        if match is not None:
+            columns = self.horizontalScrollBar().pageStep()
+            hbar = self.horizontalScrollBar()
+            if match.start_column < hbar.value() or match.end_column > hbar.value() + columns:
+                hbar.setValue(max(0, match.start_column - 8))
+        self.viewport().update()
+        self.currentLineChanged.emit(target)
+
+    def copy_current_line(self) -> None:
+        if self._index is None:
+            return
+        text = self._index.line_text(self._current_line)
+        if text is not None:
+            QGuiApplication.clipboard().setText(text)
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self._refresh_scroll_ranges()
+
+    def scrollContentsBy(self, _dx: int, dy: int) -> None:
+        if dy:
+            self._refresh_horizontal_range()
+        self.viewport().update()
+
+    def mousePressEvent(self, event) -> None:
+        if event.button() == Qt.LeftButton:
+            row = int(event.position().y()) // self._line_height()
+            self.set_current_line(self.verticalScrollBar().value() + row)
+        super().mousePressEvent(event)
+
+    def keyPressEvent(self, event) -> None:
+        key = event.key()
+        page = self.visible_line_count()
+        moves = {
+            Qt.Key_Up: -1,
+            Qt.Key_Down: 1,
+            Qt.Key_PageUp: -page,
+            Qt.Key_PageDown: page,
+        }
+        if key in moves:
+            self.set_current_line(self._current_line + moves[key])
+            event.accept()
+            return
+        if key == Qt.Key_Home and event.modifiers() & Qt.ControlModifier:
+            self.set_current_line(0)
+            event.accept()
+            return
+        if key == Qt.Key_End and event.modifiers() & Qt.ControlModifier:
+            count = self._index.line_count() if self._index is not None else 0
+            self.set_current_line(max(0, count - 1))
+            event.accept()
+            return
+        if event.matches(QKeySequence.Copy):
+            self.copy_current_line()
+            event.accept()
+            return
+        super().keyPressEvent(event)
+
+    def paintEvent(self, _event) -> None:
+        painter = QPainter(self.viewport())
+        rect = self.viewport().rect()
+        painter.fillRect(rect, self._background)
+        index = self._index
+        if index is None:
+            return
+        line_height = self._line_height()
+        char_width = self._char_width()
+        ascent = QFontMetrics(self.viewport().font()).ascent()
+        gutter = self._gutter_width()
+        first = self.verticalScrollBar().value()
+        first_col = self.horizontalScrollBar().value()
+        visible_cols = rect.width() // char_width + 2
+        count = index.line_count()
+        for row in range(self.visible_line_count() + 1):
+            line = first + row
+            if line >= count:
+                break
+            y = row * line_height
+            if line == self._current_line:
+                painter.fillRect(QRect(0, y, rect.width(), line_height), self._current_line_bg)
+            painter.setPen(self._gutter_fg)
+            painter.drawText(
+                QRect(0, y, gutter - char_width, line_height),
+                Qt.AlignRight | Qt.AlignVCenter,
+                str(line + 1),
+            )
+            text = index.line_text(line, max_chars=first_col + visible_cols) or ""
+            match = self._match
+            if match is not None and match.line == line:
+                start = max(0, match.start_column - first_col)
+                end = max(start, match.end_column - first_col)
+                painter.fillRect(
+                    QRect(gutter + start * char_width, y, max(1, end - start) * char_width, line_height),
+                    self._match_bg,
+                )
+            painter.setPen(self._foreground)
+            painter.drawText(gutter, y + ascent, text[first_col:].expandtabs(4))
+
+
+class LargeFileViewerWidget(QWidget):
+    """Workspace document tab backed by :class:`LargeFileLineIndex`.
+
+    Only the visible window is decoded and painted; search and goto-line work
+    against the memory map so the file never has to fit in a Python string.
+    """
+
+    def __init__(self, *, file_path: str | None = None, parent=None):
+        super().__init__(parent)
+        self.setObjectName("PyTPOLargeFileViewer")
+        self.editor_id = str(uuid.uuid4())
+        self.file_path: str | None = None
+        self._index: LargeFileLineIndex | None = None
+        self._search_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="pytpo-large-file-search",
+        )
+        self._search_future: concurrent.futures.Future | None = None
+        self._search_generation = 0
+
+        self._viewport = _LargeFileViewport(self)
+        self._viewport.currentLineChanged.connect(lambda _line: self._refresh_status_text())
+
+        self._search_edit = QLineEdit(self)
+        self._search_edit.setPlaceholderText("Search (regex)")
+        self._search_edit.returnPressed.connect(self.find_next)
+        self._regex_check = QCheckBox("Regex", self)
+        self._regex_check.setChecked(True)
+        self._case_check = QCheckBox("Match case", self)
+        self._find_button = QPushButton("Find Next", self)
+        self._find_button.clicked.connect(self.find_next)
+        self._goto_edit = QLineEdit(self)
+        self._goto_edit.setPlaceholderText("Go to line")
+        self._goto_edit.setMaximumWidth(110)
+        self._goto_edit.returnPressed.connect(self._on_goto_requested)
+
+        toolbar = QHBoxLayout()
+        toolbar.setContentsMargins(4, 4, 4, 0)
+        toolbar.setSpacing(6)
+        toolbar.addWidget(self._search_edit, 1)
+        toolbar.addWidget(self._regex_check)
+        toolbar.addWidget(self._case_check)
+        toolbar.addWidget(self._find_button)
+        toolbar.addWidget(self._goto_edit)
+
+        self._status_label = QLabel(self)
+        self._status_label.setObjectName("PyTPOLargeFileViewerStatus")
+        self._status_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        self._status_message = ""
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+        layout.addLayout(toolbar)
+        layout.addWidget(self._viewport, 1)
+        layout.addWidget(self._status_label, 0)
+
+        self._index_poll = QTimer(self)
+        self._index_poll.setInterval(_INDEX_POLL_INTERVAL_MS)
+        self._index_poll.timeout.connect(self._on_index_poll)
+        self._search_poll = QTimer(self)
+        self._search_poll.setInterval(_SEARCH_POLL_INTERVAL_MS)
+        self._search_poll.timeout.connect(self._drain_search)
+
+        QShortcut(QKeySequence.Find, self, activated=self._focus_search)
+        QShortcut(QKeySequence("Ctrl+G"), self, activated=self._focus_goto)
+        QShortcut(QKeySequence.FindNext, self, activated=self.find_next)
+
+        if file_path:
+            self.load_file(file_path)
+
+    # -------- workspace document protocol --------
+
+    def display_name(self) -> str:
+        return os.path.basename(self.file_path) if self.file_path else "Large File"
+
+    def set_file_path(self, path: str | None) -> None:
+        clean = str(path).strip() if isinstance(path, str) and path.strip() else None
+        self.file_path = str(Path(clean).resolve()) if clean else None
+
+    def is_read_only(self) -> bool:
+        return True
+
+    def set_editor_font_preferences(self, *, family: str | None = None, point_size: int | None = None) -> None:
+        font = QFont(self._viewport.font())
+        if family:
+            font.setFamily(str(family))
+        if point_size:
+            font.setPointSize(max(1, int(point_size)))
+        font.setStyleHint(QFont.TypeWriter)
+        self._viewport.set_font(font)
+
+    def set_viewer_background(self, value: str | QColor | None) -> None:
+        color = QColor(value) if isinstance(value, QColor) else QColor(str(value or "").strip())
+        if color.isValid():
+            self._viewport.set_colors(background=color, foreground=QColor())
+
+    def load_file(self, path: str) -> bool:
+        cpath = str(path or "").strip()
+        if not cpath or not os.path.isfile(cpath):
+            return False
+        try:
+            index = LargeFileLineIndex(cpath)
+        except Exception:
+            return False
+        self._close_index()
+        self._index = index
+        self.set_file_path(cpath)
+        self._viewport.set_index(index)
+        index.start()
+        self._index_poll.start()
+        self._refresh_status_text()
+        return True
+
+    # -------- navigation --------
+
+    def current_line(self) -> int:
+        return self._viewport.current_line()
+
+    def goto_line(self, line: int) -> bool:
+        """Move to a 0-based line; returns False while the line is not yet indexed."""
+        if self._index is None:
+            return False
+        target = int(line)
+        if target < 0 or target >= self._index.line_count():
+            return False
+        self._viewport.set_current_line(target)
+        self._viewport.setFocus()
+        return True
+
+    def _on_goto_requested(self) -> None:
+        text = self._goto_edit.text().strip()
+        try:
+            line = int(text) - 1
+        except ValueError:
+            self._set_status_message("Enter a line number.")
+            return
+        if not self.goto_line(line):
+            if self._index is not None and not self._index.is_complete():
+                self._set_status_message(f"Line {text} is not indexed yet.")
+            else:
+                self._set_status_message(f"Line {text} is out of range.")
+
+    def _focus_search(self) -> None:
+        self._search_edit.setFocus()
+        self._search_edit.selectAll()
+
+    def _focus_goto(self) -> None:
+        self._goto_edit.setFocus()
+        self._goto_edit.selectAll()
+
+    # -------- streaming search --------
+
+    def find_next(self) -> None:
+        index = self._index
+        pattern = self._search_edit.text()
+        if index is None or not pattern:
+            return
+        self._search_generation += 1
+        generation = self._search_generation
+        previous = self._viewport.current_match()
+        if previous is not None:
+            # Continue after the last match, which may leave more on the same line.
+            start_offset = previous.byte_end
+        else:
+            start_offset = index.offset_for_line(self._viewport.current_line()) or 0
+        regex = self._regex_check.isChecked()
+        ignore_case = not self._case_check.isChecked()
+
+        def _first_match(origin: int) -> LargeFileMatch | None:
+            matches = index.iter_matches(
+                pattern,
+                start_offset=origin,
+                ignore_case=ignore_case,
+                regex=regex,
+                cancelled=lambda: generation != self._search_generation,
+            )
+            return next(matches, None)
+
+        def _run() -> tuple[int, LargeFileMatch | None, bool, str]:
+            try:
+                match = _first_match(start_offset)
+                if match is not None:
+                    return generation, match, False, ""
+                if start_offset > 0:
+                    # Wrap around, but only to matches before where this search began.
+                    match = _first_match(0)
+                    if match is not None and match.byte_offset < start_offset:
+                        return generation, match, True, ""
+            except Exception as exc:
+                return generation, None, False, str(exc)
+            return generation, None, False, ""
+
+        self._search_future = self._search_executor.submit(_run)
+        self._set_status_message("Searching…")
+        self._search_poll.start()
+
+    def _drain_search(self) -> None:
+        future = self._search_future
+        if future is None:
+            self._search_poll.stop()
+            return
+        if not future.done():
+            return
+        self._search_future = None
+        self._search_poll.stop()
+        try:
+            generation, match, wrapped, error = future.result()
+        except Exception as exc:
+            self._set_status_message(f"Search failed: {exc}")
+            return
+        if generation != self._search_generation:
+            return
+        if error:
+            self._set_status_message(f"Invalid pattern: {error}")
+            return
+        if match is None:
+            self._set_status_message("No matches.")
+            return
+        self._viewport.set_current_line(match.line, match=match)
+        self._set_status_message("Search wrapped to start of file." if wrapped else "")
+
+    # -------- status --------
+
+    def _set_status_message(self, message: str) -> None:
+        self._status_message = str(message or "")
+        self._refresh_status_text()
+
+    def _on_index_poll(self) -> None:
+        index = self._index
+        if index is None:
+            self._index_poll.stop()
+            return
+        self._viewport.refresh_line_count()
+        if index.is_complete():
+            self._index_poll.stop()
+        self._refresh_status_text()
+
+    def _refresh_status_text(self) -> None:
+        index = self._index
+        if index is None:
+            self._status_label.setText("No file loaded")
+            return
+        parts = ["Read-only"]
+        if index.is_complete():
+            parts.append(f"{index.line_count():,} lines")
+        else:
+            parts.append(f"Indexing {int(index.progress() * 100)}% ({index.line_count():,} lines)")
+        parts.append(f"Ln {self._viewport.current_line() + 1:,}")
+        if self._status_message:
+            parts.append(self._status_message)
+        self._status_label.setText("  |  ".join(parts))
+
+    # -------- lifecycle --------
+
+    def _close_index(self) -> None:
+        self._search_generation += 1
+        index = self._index
+        self._index = None
+        if index is not None:
+            index.close()
+
+    def closeEvent(self, event) -> None:
+        self._index_poll.stop()
+        self._search_poll.stop()
+        self._close_index()
+        super().closeEvent(event)
+
+    def deleteLater(self) -> None:
+        self._index_poll.stop()
+        self._search_poll.stop()
+        self._close_index()
+        self._search_executor.shutdown(wait=False, cancel_futures=True)
+        super().deleteLater()
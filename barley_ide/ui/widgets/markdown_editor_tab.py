@@ -8,8 +8,8 @@ from PySide6.QtCore import QTimer, QUrl
 from PySide6.QtGui import QColor
 from PySide6.QtWidgets import QSplitter, QVBoxLayout, QWidget
 
+from barley_ide.startup_profile import note_lazy_feature
 from barley_ide.ui.editor_workspace import EditorWidget
-from TPOPyside.widgets.markdown_viewer_widget import MDHeadFlags, MarkdownViewerWidget
 
 
 class MarkdownEditorTab(QWidget):
@@ -18,7 +18,7 @@ class MarkdownEditorTab(QWidget):
         self._editor = editor
         self.editor_id = str(getattr(editor, "editor_id", "") or id(editor))
         self._last_visible_splitter_sizes: list[int] | None = None
-        self._preview: MarkdownViewerWidget | None = None
+        self._preview = None  # MarkdownViewerWidget, created with the first visible preview
         self._preview_bg_color: QColor | None = None
         self._preview_host = QWidget(self)
         self._preview_host.setObjectName("MarkdownPreviewHost")
@@ -102,6 +102,9 @@ class MarkdownEditorTab(QWidget):
     def save_file(self) -> bool:
         return bool(self._editor.save_file())
 
+    def save_file_async(self, save_manager, *, on_finished=None) -> bool:
+        return bool(self._editor.save_file_async(save_manager, on_finished=on_finished))
+
     def load_file(self, path: str) -> bool:
         ok = bool(self._editor.load_file(path))
         if ok:
@@ -144,10 +147,17 @@ class MarkdownEditorTab(QWidget):
     def is_preview_visible(self) -> bool:
         return bool(self._preview_host.isVisible())
 
-    def _ensure_preview_widget(self) -> MarkdownViewerWidget:
+    def _ensure_preview_widget(self):
         existing = self._preview
-        if isinstance(existing, MarkdownViewerWidget):
+        if existing is not None:
             return existing
+        # QtWebEngine is expensive to import; defer it until a preview is actually shown.
+        note_lazy_feature("markdown preview (QtWebEngine)")
+        from TPOPyside.widgets.markdown_viewer_widget import (
+            MarkdownViewerWidget,
+            MDHeadFlags,
+        )
+
         preview = MarkdownViewerWidget(show_toolbar=False, parent=self._preview_host)
         preview.setHeadFlags(MDHeadFlags.none)
         preview.setMinimumWidth(220)
@@ -269,7 +279,7 @@ class MarkdownEditorTab(QWidget):
                 color = palette_color
 
         self._preview_bg_color = color if isinstance(color, QColor) and color.isValid() else None
-        if not isinstance(self._preview, MarkdownViewerWidget):
+        if self._preview is None:
             return
         setter = getattr(self._preview, "setPreferredPageBackgroundColor", None)
         if callable(setter):
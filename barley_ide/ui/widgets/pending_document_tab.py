@@ -0,0 +1,77 @@
+"""Lightweight stand-in tab used while restoring a saved workspace."""
+
+from __future__ import annotations
+
+import os
+import uuid
+
+from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget
+
+
+class PendingDocumentTab(QWidget):
+    """Holds a restored tab's path and view state until the real editor is built.
+
+    The placeholder asks to be hydrated the first time it becomes visible, which
+    covers both activating the tab and revealing it as the current tab of another
+    split pane. Hydration itself is performed by the owner via ``hydrationRequested``.
+    """
+
+    hydrationRequested = Signal(object)  # PendingDocumentTab
+
+    def __init__(
+        self,
+        *,
+        file_path: str,
+        view_state: dict | None = None,
+        activation_seq: int = 0,
+        duplicate_view: bool = False,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.setObjectName("PyTPOPendingDocumentTab")
+        self.editor_id = str(uuid.uuid4())
+        self.file_path: str | None = str(file_path or "") or None
+        self.view_state: dict = dict(view_state) if isinstance(view_state, dict) else {}
+        self.duplicate_view = bool(duplicate_view)
+        self._workspace_activation_seq = int(activation_seq or 0)
+        self._hydration_requested = False
+        self.hydrating = False
+
+        label = QLabel(f"Loading {self.display_name()}…", self)
+        label.setAlignment(Qt.AlignCenter)
+        label.setEnabled(False)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(label)
+
+    def display_name(self) -> str:
+        return os.path.basename(self.file_path) if self.file_path else "File"
+
+    def set_file_path(self, path: str | None) -> None:
+        self.file_path = str(path) if path else None
+
+    def activation_seq(self) -> int:
+        return int(self._workspace_activation_seq)
+
+    def request_hydration(self) -> None:
+        if self._hydration_requested:
+            return
+        self._hydration_requested = True
+        # Defer so the tab widget finishes its current-index change before we swap pages.
+        QTimer.singleShot(0, self._emit_hydration_requested)
+
+    def _emit_hydration_requested(self) -> None:
+        try:
+            if not self.isVisible():
+                # Only transiently shown (e.g. while tabs were being added); wait for a real activation.
+                self._hydration_requested = False
+                return
+            self.hydrationRequested.emit(self)
+        except RuntimeError:
+            # Placeholder was closed before the deferred request ran.
+            pass
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        self.request_hydration()
@@ -86,6 +86,15 @@ class SvgEditorTab(QWidget):
             self._queue_preview_refresh(immediate=True)
         return ok
 
+    def save_file_async(self, save_manager, *, on_finished=None) -> bool:
+        def _finished(result) -> None:
+            if result.ok:
+                self._queue_preview_refresh(immediate=True)
+            if callable(on_finished):
+                on_finished(result)
+
+        return bool(self._editor.save_file_async(save_manager, on_finished=_finished))
+
     def load_file(self, path: str) -> bool:
         ok = bool(self._editor.load_file(path))
         if ok:
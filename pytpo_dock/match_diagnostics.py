@@ -15,6 +15,7 @@ def write_window_snapshot(
     assigned_windows: dict[str, list[dict[str, Any]]],
     unmatched_windows: list[dict[str, Any]],
     target_items: list[dict[str, Any]],
+    match_counters: dict[str, float] | None = None,
 ) -> tuple[str, str]:
     assigned_by_window_id = _assigned_by_window_id(assigned_windows)
     app_entries = list(known_apps_by_path.items())
@@ -29,6 +30,7 @@ def write_window_snapshot(
             for window in running_windows
         ],
         "target_items": [_target_item_payload(item) for item in target_items],
+        "match_counters": dict(match_counters or {}),
     }
 
     json_path = dock_window_snapshot_json_path()
@@ -148,6 +150,12 @@ def _render_markdown(payload: dict[str, Any]) -> str:
             f"`{window['wm_class'] or '-'}` | `{process}` | `{chosen}` | {top_candidates} |"
         )
 
+    if payload["match_counters"]:
+        lines.extend(["", "## Match Counters", "", "| Counter | Value |", "| --- | --- |"])
+        for name, value in payload["match_counters"].items():
+            shown = f"{value:.2f}" if isinstance(value, float) else str(value)
+            lines.append(f"| `{name}` | `{shown}` |")
+
     lines.append("")
     return "\n".join(lines)
 
@@ -7,7 +7,7 @@ import re
 import subprocess
 import time
 
-from PySide6.QtCore import QEasingCurve, QAbstractAnimation, QEvent, QPoint, QPropertyAnimation, QRect, QSize, Qt, QTimer
+from PySide6.QtCore import QEasingCurve, QAbstractAnimation, QEvent, QPoint, QPropertyAnimation, QRect, QSize, Qt, QTimer, Signal
 from PySide6.QtGui import QAction, QCursor, QDragEnterEvent, QDragMoveEvent, QDropEvent, QGuiApplication, QPixmap
 from PySide6.QtWidgets import QApplication, QGraphicsOpacityEffect, QHBoxLayout, QMenu, QToolButton, QVBoxLayout, QWidget
 from shiboken6 import isValid
@@ -24,14 +24,19 @@ from ..debug import dock_debug_enabled, log_dock_debug
 from ..match_diagnostics import write_window_snapshot
 from ..settings_dialog import DockSettingsDialog, load_dock_settings
 from ..storage_paths import dock_pinned_apps_path, migrate_legacy_dock_storage
-from ..window_matching import finalize_window_records, match_threshold, runtime_group_path, score_window_match
+from ..window_matching import WindowMatchIndex, finalize_window_records, match_threshold, runtime_group_path
 from ..x11_dock_window import X11DockWindowManager
-from ..xlib_window_source import list_windows_via_xlib, pointer_buttons_pressed_via_xlib
+from ..xlib_window_source import XlibWindowTracker, list_windows_via_xlib, pointer_buttons_pressed_via_xlib
 from ..x11_window_preview import X11WindowPreviewCapturer
-from .widgets import DockContainerFrame, DockItem, WindowPreview, apply_widget_opacity, build_settings_icon
+from .widgets import PREVIEW_IMAGE_SIZE, DockContainerFrame, DockItem, WindowPreview, apply_widget_opacity, build_settings_icon
 
 
 class CustomDock(QWidget):
+    # Emitted from the X11 reader thread; Qt queues it onto the GUI thread.
+    x11_windows_changed = Signal()
+    # Emitted from the preview capture thread with the id of a refreshed thumbnail.
+    preview_thumbnail_ready = Signal(str)
+
     def __init__(self):
         super().__init__()
         migrate_legacy_dock_storage()
@@ -56,6 +61,7 @@ class CustomDock(QWidget):
 
         self.is_visible = False
         self.last_dock_state = []
+        self.window_match_index = WindowMatchIndex()
         self.pending_preview_item = None
         self.preview_host = QWidget(self)
         self.preview_host.setFixedSize(0, 0)
@@ -97,7 +103,11 @@ class CustomDock(QWidget):
         self._last_mouse_buttons = Qt.MouseButton.NoButton
         self._last_active_window_id = ""
         self.last_focused_windows = {}
-        self.x11_preview_capturer = X11WindowPreviewCapturer()
+        self.x11_preview_capturer = X11WindowPreviewCapturer(
+            thumbnail_size=(PREVIEW_IMAGE_SIZE.width(), PREVIEW_IMAGE_SIZE.height()),
+            on_update=self.preview_thumbnail_ready.emit,
+        )
+        self.preview_thumbnail_ready.connect(self._apply_preview_thumbnail)
 
         self.main_layout = QVBoxLayout(self)
         self.main_layout.setContentsMargins(0, 0, 0, 0)
@@ -162,13 +172,20 @@ class CustomDock(QWidget):
         self.mouse_timer.timeout.connect(self.check_mouse_proximity)
         self.mouse_timer.start(20)
 
+        self.preview_live_timer = QTimer(self)
+        self.preview_live_timer.setInterval(200)
+        self.preview_live_timer.timeout.connect(self._refresh_live_previews)
+
         self.wm_timer = QTimer(self)
         self.wm_timer.timeout.connect(self.update_dock_items)
-        self.wm_timer.start(1000)
 
         self.active_window_timer = QTimer(self)
         self.active_window_timer.timeout.connect(self.refresh_active_window_highlight)
-        self.active_window_timer.start(250)
+
+        self.window_tracker = None
+        if not self._start_window_tracker(platform_name):
+            self.wm_timer.start(1000)
+            self.active_window_timer.start(250)
 
         self.apply_dock_settings()
         self.update_dock_items()
@@ -176,6 +193,36 @@ class CustomDock(QWidget):
         self.recenter()
         self._log_window_state("dock-init-complete", pinned_apps=list(self.pinned_apps))
 
+    def _start_window_tracker(self, platform_name) -> bool:
+        if platform_name != "xcb":
+            return False
+        tracker = XlibWindowTracker(on_change=self.x11_windows_changed.emit)
+        self.x11_windows_changed.connect(self._apply_tracked_window_changes)
+        try:
+            tracker.start()
+        except Exception as exc:
+            self.x11_windows_changed.disconnect(self._apply_tracked_window_changes)
+            log_dock_debug("dock-window-tracker-unavailable", error=repr(exc))
+            return False
+        self.window_tracker = tracker
+        log_dock_debug("dock-window-tracker-started", windows=len(tracker.windows()))
+        return True
+
+    def _apply_tracked_window_changes(self):
+        tracker = self.window_tracker
+        if tracker is None:
+            return
+        changes = tracker.take_changes()
+        if not tracker.is_running():
+            tracker.stop()
+            self.window_tracker = None
+            self.wm_timer.start(1000)
+            self.active_window_timer.start(250)
+        if "windows" in changes:
+            self.update_dock_items()
+        if "active" in changes:
+            self.refresh_active_window_highlight()
+
     def _log_window_state(self, event_name, /, **fields):
         log_dock_debug(
             event_name,
@@ -304,6 +351,11 @@ class CustomDock(QWidget):
 
     def eventFilter(self, watched, event):
         event_type = event.type()
+        if watched is self.preview_popup and event_type in {QEvent.Show, QEvent.Hide}:
+            if event_type == QEvent.Show:
+                self.preview_live_timer.start()
+            else:
+                self.preview_live_timer.stop()
         if watched in {self, self.preview_popup} and event_type in {
             QEvent.Hide,
             QEvent.Close,
@@ -355,6 +407,9 @@ class CustomDock(QWidget):
             self.last_focused_windows[str(app_path)] = self._normalize_window_id(win_id)
 
     def _active_window_id(self):
+        tracker = getattr(self, "window_tracker", None)
+        if tracker is not None and tracker.is_running():
+            return self._normalize_window_id(tracker.active_window_id())
         try:
             output = subprocess.check_output(
                 ['xprop', '-root', '_NET_ACTIVE_WINDOW'],
@@ -681,6 +736,9 @@ class CustomDock(QWidget):
         )
 
     def closeEvent(self, event):
+        if self.window_tracker is not None:
+            self.window_tracker.stop()
+            self.window_tracker = None
         self.x11_window_manager.sync(reserve_space=False)
         self.preview_popup.hide()
         self.preview_popup.close()
@@ -730,15 +788,28 @@ class CustomDock(QWidget):
         event.acceptProposedAction()
 
     def get_running_windows(self):
-        records = list_windows_via_xlib()
+        tracker = getattr(self, "window_tracker", None)
+        if tracker is not None and tracker.is_running():
+            records = tracker.windows()
+        else:
+            records = list_windows_via_xlib()
         return finalize_window_records(records, is_own_window=self._is_own_window)
 
     def _known_apps_by_path(self):
         known_apps: dict[str, dict[str, str]] = {}
+        parsed_pinned = getattr(self, "_pinned_desktop_cache", {})
+        self._pinned_desktop_cache = {}
         for path in self.pinned_apps:
-            if not os.path.exists(path):
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
                 continue
-            app_data = parse_desktop_file(path)
+            cached = parsed_pinned.get(path)
+            if cached is not None and cached[0] == mtime_ns:
+                app_data = cached[1]
+            else:
+                app_data = parse_desktop_file(path)
+            self._pinned_desktop_cache[path] = (mtime_ns, app_data)
             if app_data:
                 known_apps[path] = app_data
 
@@ -754,16 +825,9 @@ class CustomDock(QWidget):
         unmatched_windows: list[dict] = []
         threshold = match_threshold()
 
-        app_entries = [(path, app_data) for path, app_data in known_apps_by_path.items()]
-        for window in running_windows:
-            best_path = ""
-            best_score = 0
-            for path, app_data in app_entries:
-                score = score_window_match(window, app_data)
-                if score > best_score:
-                    best_score = score
-                    best_path = path
-
+        match_index = self._window_match_index()
+        match_index.sync_apps(known_apps_by_path)
+        for window, (best_path, best_score) in zip(running_windows, match_index.match_windows(running_windows)):
             if best_path and best_score >= threshold:
                 if best_path not in assigned_windows:
                     assigned_windows[best_path] = []
@@ -775,6 +839,12 @@ class CustomDock(QWidget):
 
         return assigned_windows, matched_paths_in_order, unmatched_windows
 
+    def _window_match_index(self) -> WindowMatchIndex:
+        match_index = getattr(self, "window_match_index", None)
+        if match_index is None:
+            match_index = self.window_match_index = WindowMatchIndex()
+        return match_index
+
     def _runtime_window_groups(self, windows):
         groups: dict[str, list[dict]] = {}
         ordered_paths: list[str] = []
@@ -890,6 +960,7 @@ class CustomDock(QWidget):
                 assigned_windows=assigned_windows,
                 unmatched_windows=unmatched_windows,
                 target_items=target_items,
+                match_counters=dict(self._window_match_index().counters),
             )
         except Exception as exc:
             log_dock_debug("dock-window-snapshot-write-failed", error=repr(exc))
@@ -1532,6 +1603,28 @@ class CustomDock(QWidget):
         text = output.lower()
         return 'iconic' in text or '_net_wm_state_hidden' in text
 
+    def _refresh_live_previews(self):
+        win_ids = [preview.get('win_id') for preview in self.current_preview_entries]
+        if win_ids:
+            self.x11_preview_capturer.refresh_damaged(win_ids)
+
+    def _apply_preview_thumbnail(self, win_id):
+        normalized_win_id = self._normalize_window_id(win_id)
+        updated_entries = []
+        changed = False
+        for preview in self.current_preview_entries:
+            if self._normalize_window_id(preview.get('win_id')) == normalized_win_id:
+                pixmap = self.x11_preview_capturer.cached_thumbnail(win_id)
+                if not pixmap.isNull():
+                    preview = dict(preview, pixmap=pixmap)
+                    changed = True
+            updated_entries.append(preview)
+        if not changed:
+            return
+        self.current_preview_entries = updated_entries
+        if self.preview_popup.isVisible():
+            self.preview_popup.update_content(updated_entries, animate_changes=False)
+
     def capture_window_preview(self, win_id):
         pixmap = self.x11_preview_capturer.capture(win_id)
         if not pixmap.isNull():
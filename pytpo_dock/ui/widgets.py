@@ -9,6 +9,8 @@ from PySide6.QtWidgets import QApplication, QFrame, QGraphicsOpacityEffect, QHBo
 from ..debug import log_dock_debug
 from ..settings_dialog import DockVisualSettings
 
+PREVIEW_IMAGE_SIZE = QSize(196, 126)
+
 
 def build_settings_icon():
     """Find a reasonable themed settings icon with a Qt fallback."""
@@ -657,7 +659,7 @@ class PreviewCard(QFrame):
             if widget is not None:
                 widget.deleteLater()
 
-        scaled = self._preview['pixmap'].scaled(196, 126, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        scaled = self._preview['pixmap'].scaled(PREVIEW_IMAGE_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
         self._image_label.setPixmap(scaled)
         self._title_label.setText(self._preview['title'])
 
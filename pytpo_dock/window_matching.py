@@ -4,6 +4,7 @@ import os
 import re
 import shlex
 import subprocess
+import time
 from pathlib import Path
 from typing import Any, Callable
 
@@ -27,6 +28,7 @@ _INTERPRETER_NAMES = {
 }
 _GENERIC_SCRIPT_NAMES = {"__main__", "app", "client", "launcher", "main", "run", "server", "start"}
 _WINDOW_MATCH_THRESHOLD = 120
+_APP_PROFILE_FIELDS = ("path", "desktop_id", "StartupWMClass", "Exec", "Icon", "Name", "GenericName")
 
 
 def parse_wmctrl_windows(
@@ -68,10 +70,149 @@ def finalize_window_records(
 
 def score_window_match(window: dict[str, Any], app_data: dict[str, str]) -> int:
     app_profile = _app_profile(app_data)
-    if not any(group["full"] or group["parts"] for group in app_profile.values()):
+    if not _profile_has_tokens(app_profile):
         return 0
+    return _score_profiles(_window_profile(window), app_profile)
+
+
+class WindowMatchIndex:
+    """Matches windows to apps incrementally across dock refreshes.
+
+    App profiles are rebuilt only when an app's desktop entry fields change and are
+    indexed by every token that can contribute to a score (StartupWMClass, desktop id,
+    executable, icon, name), so a window is only scored against apps sharing a token
+    with it. Results are memoized per window identity, so unchanged windows are not
+    scored again until the set of known apps changes.
+    """
+
+    def __init__(self) -> None:
+        self._profiles: dict[str, tuple[tuple[str, ...], dict[str, dict[str, set[str]]]]] = {}
+        self._apps_key: tuple[tuple[str, tuple[str, ...]], ...] = ()
+        self._app_order: dict[str, int] = {}
+        self._token_index: dict[str, set[str]] = {}
+        self._matches: dict[tuple[Any, ...], tuple[str, int]] = {}
+        self.counters: dict[str, float] = {
+            "passes": 0,
+            "windows": 0,
+            "memo_hits": 0,
+            "windows_scored": 0,
+            "apps_scored": 0,
+            "profiles_built": 0,
+            "index_rebuilds": 0,
+            "last_pass_ms": 0.0,
+            "total_match_ms": 0.0,
+        }
+
+    def sync_apps(self, known_apps_by_path: dict[str, dict[str, str]]) -> None:
+        profiles: dict[str, tuple[tuple[str, ...], dict[str, dict[str, set[str]]]]] = {}
+        for path, app_data in known_apps_by_path.items():
+            signature = tuple(str(app_data.get(field) or "") for field in _APP_PROFILE_FIELDS)
+            cached = self._profiles.get(path)
+            if cached is not None and cached[0] == signature:
+                profiles[path] = cached
+                continue
+            profiles[path] = (signature, _app_profile(app_data))
+            self.counters["profiles_built"] += 1
+        self._profiles = profiles
+
+        apps_key = tuple((path, entry[0]) for path, entry in profiles.items())
+        if apps_key == self._apps_key:
+            return
+        self._apps_key = apps_key
+        self._app_order = {path: order for order, path in enumerate(profiles)}
+        self._token_index = {}
+        for path, (_signature, profile) in profiles.items():
+            if not _profile_has_tokens(profile):
+                continue
+            for token in _app_index_tokens(profile):
+                self._token_index.setdefault(token, set()).add(path)
+        self._matches.clear()
+        self.counters["index_rebuilds"] += 1
+
+    def match_windows(self, windows: list[dict[str, Any]]) -> list[tuple[str, int]]:
+        """Return the best ``(app path, score)`` for each window, in order."""
+        started = time.perf_counter()
+        results: list[tuple[str, int]] = []
+        seen: set[tuple[Any, ...]] = set()
+        for window in windows:
+            key = _window_match_key(window)
+            seen.add(key)
+            cached = self._matches.get(key)
+            if cached is None:
+                cached = self._score_window(window)
+                self._matches[key] = cached
+            else:
+                self.counters["memo_hits"] += 1
+            results.append(cached)
+        for key in [key for key in self._matches if key not in seen]:
+            del self._matches[key]
+
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self.counters["passes"] += 1
+        self.counters["windows"] += len(windows)
+        self.counters["last_pass_ms"] = elapsed_ms
+        self.counters["total_match_ms"] += elapsed_ms
+        return results
+
+    def _score_window(self, window: dict[str, Any]) -> tuple[str, int]:
+        self.counters["windows_scored"] += 1
+        window_profile = _window_profile(window)
+        candidates: set[str] = set()
+        for token in _window_index_tokens(window_profile):
+            candidates.update(self._token_index.get(token, ()))
+
+        best_path = ""
+        best_score = 0
+        # Known-app order breaks ties, exactly as a full scan would.
+        for path in sorted(candidates, key=self._app_order.__getitem__):
+            self.counters["apps_scored"] += 1
+            score = _score_profiles(window_profile, self._profiles[path][1])
+            if score > best_score:
+                best_score = score
+                best_path = path
+        return best_path, best_score
+
+
+def _profile_has_tokens(app_profile: dict[str, dict[str, set[str]]]) -> bool:
+    return any(group["full"] or group["parts"] for group in app_profile.values())
+
+
+def _app_index_tokens(app_profile: dict[str, dict[str, set[str]]]) -> set[str]:
+    return (
+        app_profile["startup"]["full"]
+        | app_profile["startup"]["parts"]
+        | app_profile["desktop"]["full"]
+        | app_profile["exec"]["full"]
+        | app_profile["icon"]["full"]
+        | app_profile["name"]["full"]
+    )
+
+
+def _window_index_tokens(window_profile: dict[str, dict[str, set[str]]]) -> set[str]:
+    tokens: set[str] = set()
+    for group in window_profile.values():
+        tokens |= group["full"] | group["parts"]
+    return tokens
+
+
+def _window_match_key(window: dict[str, Any]) -> tuple[Any, ...]:
+    return (
+        str(window.get("id") or ""),
+        str(window.get("wm_class") or ""),
+        str(window.get("class") or ""),
+        str(window.get("instance") or ""),
+        str(window.get("title") or ""),
+        int(window.get("pid") or 0),
+        str(window.get("process_name") or ""),
+        str(window.get("executable_name") or ""),
+        str(window.get("script_name") or ""),
+    )
+
 
-    window_profile = _window_profile(window)
+def _score_profiles(
+    window_profile: dict[str, dict[str, set[str]]],
+    app_profile: dict[str, dict[str, set[str]]],
+) -> int:
     window_full_tokens = (
         window_profile["wm_class"]["full"]
         | window_profile["class"]["full"]
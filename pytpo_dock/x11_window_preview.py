@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from dataclasses import dataclass
 from typing import ClassVar
 
+from PySide6.QtCore import Qt
 from PySide6.QtGui import QGuiApplication, QImage, QPixmap
 
 from .debug import log_dock_debug
@@ -14,26 +20,72 @@ class _PixmapFormat:
     scanline_pad: int
 
 
+@dataclass(slots=True)
+class _Thumbnail:
+    image: QImage
+    captured_at: float
+    damage_id: int = 0
+    dirty: bool = False
+    pixmap: QPixmap | None = None
+
+
 class X11WindowPreviewCapturer:
+    """Window thumbnails captured through XComposite on a background thread.
+
+    Windows are scaled down on the X server with XRender, so only a thumbnail-sized
+    image crosses the connection. Thumbnails are cached per window and recaptured
+    only after XDamage reports new drawing, or after a short age when the server
+    lacks the Damage extension. All X requests run on one worker thread; the GUI
+    thread only turns finished thumbnails into pixmaps.
+    """
+
     backend_name: ClassVar[str] = "xcffib-xcomposite"
     _LSB_FIRST: ClassVar[int] = 0
     _Z_PIXMAP: ClassVar[int] = 2
     _ALL_PLANES: ClassVar[int] = 0xFFFFFFFF
+    _RENDER_OP_SRC: ClassVar[int] = 1
+    _DAMAGE_REPORT_NON_EMPTY: ClassVar[int] = 3
+    _FIRST_CAPTURE_WAIT_S: ClassVar[float] = 0.05
+    _UNDAMAGED_MAX_AGE_S: ClassVar[float] = 1.0
+    _MAX_THUMBNAILS: ClassVar[int] = 48
 
-    def __init__(self):
+    def __init__(
+        self,
+        *,
+        thumbnail_size: tuple[int, int] = (196, 126),
+        on_update: Callable[[str], None] | None = None,
+    ):
         self._initialized = False
         self._available = False
         self._conn = None
         self._xproto = None
         self._composite = None
+        self._render = None
+        self._damage = None
+        self._damage_notify_type: type | None = None
+        self._root = 0
+        self._argb_format = 0
+        self._pict_format_by_visual: dict[int, int] = {}
         self._image_byte_order = self._LSB_FIRST
         self._format_by_depth: dict[int, _PixmapFormat] = {}
+        self._thumbnail_size = (max(1, int(thumbnail_size[0])), max(1, int(thumbnail_size[1])))
+        self._on_update = on_update
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._thumbnails: dict[int, _Thumbnail] = {}
+        self._queued: dict[int, Future] = {}
 
     def is_available(self) -> bool:
         self._ensure_initialized()
         return self._available
 
     def capture(self, win_id) -> QPixmap:
+        """Return the cached thumbnail for a window and refresh it in the background.
+
+        A window seen for the first time is waited on for at most one short frame; if
+        its capture is still running, a transparent placeholder is returned and the
+        thumbnail arrives through ``on_update``.
+        """
         self._ensure_initialized()
         if not self._available:
             return QPixmap()
@@ -42,36 +94,179 @@ class X11WindowPreviewCapturer:
         if native_id <= 0:
             return QPixmap()
 
+        future = self._schedule([native_id], budget=None)
+        with self._lock:
+            entry = self._thumbnails.get(native_id)
+        if entry is None:
+            try:
+                future.result(timeout=self._FIRST_CAPTURE_WAIT_S)
+            except FutureTimeoutError:
+                return self._placeholder_pixmap()
+            with self._lock:
+                entry = self._thumbnails.get(native_id)
+            if entry is None:
+                return QPixmap()
+        return self._pixmap_for(entry)
+
+    def cached_thumbnail(self, win_id) -> QPixmap:
+        native_id = self._parse_window_id(win_id)
+        with self._lock:
+            entry = self._thumbnails.get(native_id)
+        return self._pixmap_for(entry) if entry is not None else QPixmap()
+
+    def refresh_damaged(self, win_ids, *, budget: float = 0.012) -> None:
+        """Recapture damaged thumbnails for live previews within a per-tick budget."""
+        if not self._available:
+            return
+        native_ids = [native_id for native_id in map(self._parse_window_id, win_ids) if native_id > 0]
+        if native_ids:
+            self._schedule(native_ids, budget=budget)
+
+    def _schedule(self, native_ids: list[int], *, budget: float | None) -> Future:
+        with self._lock:
+            pending = [native_id for native_id in native_ids if native_id not in self._queued]
+            if not pending:
+                return self._queued[native_ids[0]]
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pytpo-dock-preview")
+            future = self._executor.submit(self._refresh, pending, budget)
+            for native_id in pending:
+                self._queued[native_id] = future
+            return future
+
+    def _refresh(self, native_ids: list[int], budget: float | None) -> None:
+        with self._lock:
+            for native_id in native_ids:
+                self._queued.pop(native_id, None)
+        started = time.perf_counter()
+        try:
+            self._drain_damage_events()
+            with self._lock:
+                ordered = sorted(
+                    native_ids,
+                    key=lambda native_id: getattr(self._thumbnails.get(native_id), "captured_at", 0.0),
+                )
+            for native_id in ordered:
+                with self._lock:
+                    entry = self._thumbnails.get(native_id)
+                    if entry is not None and not self._is_stale(entry):
+                        continue
+                    damage_id = entry.damage_id if entry is not None else 0
+                    if entry is not None:
+                        entry.dirty = False
+                image, damage_id = self._capture_thumbnail(native_id, damage_id)
+                if image is not None:
+                    self._store_thumbnail(native_id, image, damage_id)
+                    if self._on_update is not None:
+                        self._on_update(f"0x{native_id:x}")
+                # Windows left over keep their stale flag and go first on the next tick.
+                if budget is not None and time.perf_counter() - started >= budget:
+                    break
+        except Exception as exc:
+            log_dock_debug("dock-preview-refresh-failed", error=repr(exc))
+
+    def _is_stale(self, entry: _Thumbnail) -> bool:
+        if entry.dirty:
+            return True
+        return not entry.damage_id and time.monotonic() - entry.captured_at > self._UNDAMAGED_MAX_AGE_S
+
+    def _store_thumbnail(self, native_id: int, image: QImage, damage_id: int) -> None:
+        evicted: list[int] = []
+        with self._lock:
+            self._thumbnails[native_id] = _Thumbnail(image=image, captured_at=time.monotonic(), damage_id=damage_id)
+            while len(self._thumbnails) > self._MAX_THUMBNAILS:
+                oldest = min(self._thumbnails, key=lambda key: self._thumbnails[key].captured_at)
+                evicted.append(self._thumbnails.pop(oldest).damage_id)
+        for evicted_damage in evicted:
+            if evicted_damage and self._damage is not None:
+                self._damage.Destroy(evicted_damage)
+
+    def _pixmap_for(self, entry: _Thumbnail) -> QPixmap:
+        pixmap = entry.pixmap
+        if pixmap is None:
+            pixmap = QPixmap.fromImage(entry.image)
+            entry.pixmap = pixmap
+        return pixmap
+
+    def _placeholder_pixmap(self) -> QPixmap:
+        pixmap = QPixmap(*self._thumbnail_size)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        return pixmap
+
+    def _drain_damage_events(self) -> None:
+        if self._conn is None or self._damage_notify_type is None:
+            return
+        damaged: set[int] = set()
+        for _index in range(4096):
+            try:
+                event = self._conn.poll_for_event()
+            except Exception:
+                # Errors from requests on windows that have since been destroyed.
+                continue
+            if event is None:
+                break
+            if isinstance(event, self._damage_notify_type):
+                damaged.add(int(event.drawable))
+        if not damaged:
+            return
+        with self._lock:
+            for native_id in damaged:
+                entry = self._thumbnails.get(native_id)
+                if entry is not None:
+                    entry.dirty = True
+
+    def _capture_thumbnail(self, native_id: int, damage_id: int) -> tuple[QImage | None, int]:
         pixmap_id = 0
         try:
             geometry = self._xproto.GetGeometry(native_id).reply()
             width = int(getattr(geometry, "width", 0))
             height = int(getattr(geometry, "height", 0))
             if width <= 0 or height <= 0:
-                return QPixmap()
+                return None, damage_id
+
+            if self._damage is not None:
+                if not damage_id:
+                    damage_id = int(self._conn.generate_id())
+                    self._damage.Create(damage_id, native_id, self._DAMAGE_REPORT_NON_EMPTY)
+                else:
+                    self._damage.Subtract(damage_id, 0, 0)
 
             pixmap_id = int(self._conn.generate_id())
             self._composite.NameWindowPixmapChecked(native_id, pixmap_id).check()
-            image_reply = self._xproto.GetImage(
-                self._Z_PIXMAP,
-                pixmap_id,
-                0,
-                0,
-                width,
-                height,
-                self._ALL_PLANES,
-            ).reply()
-            image = self._qimage_from_reply(image_reply, width=width, height=height)
+            scale = min(1.0, self._thumbnail_size[0] / width, self._thumbnail_size[1] / height)
+            image = None
+            if scale < 1.0 and self._render is not None:
+                image = self._render_scaled_image(native_id, pixmap_id, width=width, height=height, scale=scale)
+            if image is None:
+                image_reply = self._xproto.GetImage(
+                    self._Z_PIXMAP,
+                    pixmap_id,
+                    0,
+                    0,
+                    width,
+                    height,
+                    self._ALL_PLANES,
+                ).reply()
+                image = self._qimage_from_reply(image_reply, width=width, height=height)
             if image is None or image.isNull():
-                return QPixmap()
-            return QPixmap.fromImage(image)
+                return None, damage_id
+            target_width = max(1, round(width * scale))
+            target_height = max(1, round(height * scale))
+            if image.width() != target_width or image.height() != target_height:
+                image = image.scaled(
+                    target_width,
+                    target_height,
+                    Qt.AspectRatioMode.IgnoreAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation,
+                )
+            return image, damage_id
         except Exception as exc:
             log_dock_debug(
                 "dock-preview-xcffib-capture-failed",
-                win_id=win_id,
+                win_id=f"0x{native_id:x}",
                 error=repr(exc),
             )
-            return QPixmap()
+            return None, damage_id
         finally:
             if pixmap_id and self._xproto is not None:
                 try:
@@ -80,6 +275,78 @@ class X11WindowPreviewCapturer:
                 except Exception:
                     pass
 
+    def _render_scaled_image(
+        self,
+        native_id: int,
+        pixmap_id: int,
+        *,
+        width: int,
+        height: int,
+        scale: float,
+    ) -> QImage | None:
+        attributes = self._xproto.GetWindowAttributes(native_id).reply()
+        source_format = self._pict_format_by_visual.get(int(getattr(attributes, "visual", 0)))
+        if not source_format or not self._argb_format:
+            return None
+
+        # The server scales to twice the thumbnail with Render's default (nearest)
+        # filter; the last halving is smoothed on the worker thread.
+        scaled_width = min(width, max(1, round(width * scale * 2)))
+        scaled_height = min(height, max(1, round(height * scale * 2)))
+        target_pixmap = int(self._conn.generate_id())
+        source_picture = int(self._conn.generate_id())
+        target_picture = int(self._conn.generate_id())
+        self._xproto.CreatePixmap(32, target_pixmap, self._root, scaled_width, scaled_height)
+        try:
+            self._render.CreatePicture(source_picture, pixmap_id, source_format, 0, [])
+            self._render.CreatePicture(target_picture, target_pixmap, self._argb_format, 0, [])
+            self._render.SetPictureTransform(
+                source_picture,
+                (
+                    self._to_fixed(width / scaled_width),
+                    0,
+                    0,
+                    0,
+                    self._to_fixed(height / scaled_height),
+                    0,
+                    0,
+                    0,
+                    self._to_fixed(1.0),
+                ),
+            )
+            self._render.Composite(
+                self._RENDER_OP_SRC,
+                source_picture,
+                0,
+                target_picture,
+                0,
+                0,
+                0,
+                0,
+                0,
+                0,
+                scaled_width,
+                scaled_height,
+            )
+            image_reply = self._xproto.GetImage(
+                self._Z_PIXMAP,
+                target_pixmap,
+                0,
+                0,
+                scaled_width,
+                scaled_height,
+                self._ALL_PLANES,
+            ).reply()
+            return self._qimage_from_reply(image_reply, width=scaled_width, height=scaled_height)
+        finally:
+            self._render.FreePicture(source_picture)
+            self._render.FreePicture(target_picture)
+            self._xproto.FreePixmap(target_pixmap)
+
+    @staticmethod
+    def _to_fixed(value: float) -> int:
+        return round(value * 65536)
+
     def _ensure_initialized(self):
         if self._initialized:
             return
@@ -114,16 +381,22 @@ class X11WindowPreviewCapturer:
             xproto_ext = conn.core
             composite_ext = conn(composite.key)
             version = composite_ext.QueryVersion(0, 4).reply()
-            self._register_pixmap_formats(conn.get_setup())
+            setup = conn.get_setup()
+            self._register_pixmap_formats(setup)
+            self._root = int(setup.roots[0].root)
 
             self._conn = conn
             self._xproto = xproto_ext
             self._composite = composite_ext
+            self._init_render(conn, ffi, lib)
+            self._init_damage(conn, ffi, lib)
             self._available = True
             log_dock_debug(
                 "dock-preview-xcffib-ready",
                 version=(int(version.major_version), int(version.minor_version)),
                 platform=platform_name,
+                render=self._render is not None,
+                damage=self._damage is not None,
             )
         except Exception as exc:
             try:
@@ -133,6 +406,56 @@ class X11WindowPreviewCapturer:
             log_dock_debug("dock-preview-xcffib-init-failed", error=repr(exc))
             return
 
+    def _init_render(self, conn, ffi, lib) -> None:
+        try:
+            from xcffib import render
+
+            extension_data = lib.xcb_get_extension_data(conn._conn, render.key.c_key)
+            if extension_data == ffi.NULL or not bool(extension_data.present):
+                return
+            render_ext = conn(render.key)
+            render_ext.QueryVersion(0, 11).reply()
+            formats = render_ext.QueryPictFormats().reply()
+        except Exception as exc:
+            log_dock_debug("dock-preview-xrender-unavailable", error=repr(exc))
+            return
+
+        for item in formats.formats:
+            direct = item.direct
+            if (
+                int(item.depth) == 32
+                and int(direct.alpha_mask) == 0xFF
+                and int(direct.alpha_shift) == 24
+                and int(direct.red_shift) == 16
+                and int(direct.green_shift) == 8
+                and int(direct.blue_shift) == 0
+            ):
+                self._argb_format = int(item.id)
+                break
+        self._pict_format_by_visual = {
+            int(visual.visual): int(visual.format)
+            for screen in formats.screens
+            for depth in screen.depths
+            for visual in depth.visuals
+        }
+        if self._argb_format:
+            self._render = render_ext
+
+    def _init_damage(self, conn, ffi, lib) -> None:
+        try:
+            from xcffib import damage
+
+            extension_data = lib.xcb_get_extension_data(conn._conn, damage.key.c_key)
+            if extension_data == ffi.NULL or not bool(extension_data.present):
+                return
+            damage_ext = conn(damage.key)
+            damage_ext.QueryVersion(1, 1).reply()
+        except Exception as exc:
+            log_dock_debug("dock-preview-xdamage-unavailable", error=repr(exc))
+            return
+        self._damage = damage_ext
+        self._damage_notify_type = damage.NotifyEvent
+
     def _register_pixmap_formats(self, setup) -> None:
         self._image_byte_order = int(getattr(setup, "image_byte_order", self._LSB_FIRST))
         format_by_depth: dict[int, _PixmapFormat] = {}
@@ -247,6 +570,8 @@ class X11WindowPreviewCapturer:
         return 0
 
     def __del__(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
         if self._conn is not None:
             try:
                 self._conn.disconnect()
@@ -1,7 +1,14 @@
 from __future__ import annotations
 
+import os
+import select
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any
 
+from .debug import log_dock_debug
+
 
 def ensure_xlib_available() -> None:
     _load_xlib()
@@ -44,55 +51,17 @@ def list_windows_via_xlib() -> list[dict[str, Any]]:
 
     try:
         root = x_display.screen().root
-        client_list_atom = x_display.intern_atom("_NET_CLIENT_LIST")
-        desktop_atom = x_display.intern_atom("_NET_WM_DESKTOP")
-        net_wm_name_atom = x_display.intern_atom("_NET_WM_NAME")
-        net_wm_pid_atom = x_display.intern_atom("_NET_WM_PID")
-        net_wm_state_atom = x_display.intern_atom("_NET_WM_STATE")
-        skip_taskbar_atom = x_display.intern_atom("_NET_WM_STATE_SKIP_TASKBAR")
-        skip_pager_atom = x_display.intern_atom("_NET_WM_STATE_SKIP_PAGER")
-        window_type_atom = x_display.intern_atom("_NET_WM_WINDOW_TYPE")
-        window_type_dock_atom = x_display.intern_atom("_NET_WM_WINDOW_TYPE_DOCK")
-        window_type_desktop_atom = x_display.intern_atom("_NET_WM_WINDOW_TYPE_DESKTOP")
-        utf8_atom = x_display.intern_atom("UTF8_STRING")
-
-        client_list = root.get_full_property(client_list_atom, X.AnyPropertyType)
+        atoms = _intern_atoms(x_display)
+        client_list = root.get_full_property(atoms.client_list, X.AnyPropertyType)
         if client_list is None:
             raise RuntimeError("_NET_CLIENT_LIST is not available on the X11 root window.")
 
         windows: list[dict[str, Any]] = []
         for window_id in client_list.value:
             window = x_display.create_resource_object("window", int(window_id))
-            if _window_should_be_skipped(
-                window,
-                X=X,
-                net_wm_state_atom=net_wm_state_atom,
-                skip_taskbar_atom=skip_taskbar_atom,
-                skip_pager_atom=skip_pager_atom,
-                window_type_atom=window_type_atom,
-                window_type_dock_atom=window_type_dock_atom,
-                window_type_desktop_atom=window_type_desktop_atom,
-            ):
-                continue
-
-            desktop = _window_desktop(window, X=X, desktop_atom=desktop_atom)
-            title = _window_title(window, X=X, utf8_atom=utf8_atom, net_wm_name_atom=net_wm_name_atom)
-            pid = _window_pid(window, X=X, net_wm_pid_atom=net_wm_pid_atom)
-            instance_name, class_name = _window_class(window)
-            wm_class = ".".join(part for part in (instance_name, class_name) if part)
-
-            windows.append(
-                {
-                    "id": f"0x{int(window_id):x}",
-                    "desktop": desktop,
-                    "pid": pid,
-                    "host": "",
-                    "title": title,
-                    "wm_class": wm_class,
-                    "instance": instance_name,
-                    "class": class_name,
-                }
-            )
+            record = _window_record(window, int(window_id), X=X, atoms=atoms)
+            if record is not None:
+                windows.append(record)
         return windows
     finally:
         try:
@@ -101,6 +70,279 @@ def list_windows_via_xlib() -> list[dict[str, Any]]:
             pass
 
 
+class XlibWindowTracker:
+    """Keeps the dock's window table current from X11 ``PropertyNotify`` events.
+
+    One display connection is held for the tracker's lifetime. The root window reports
+    ``_NET_CLIENT_LIST`` and ``_NET_ACTIVE_WINDOW`` changes and each client window reports
+    its own title, class, desktop and state changes, so only the affected window is
+    re-read. The reader thread sleeps in ``select()`` between events, which keeps an idle
+    desktop free of wakeups.
+
+    ``on_change`` is called from the reader thread once per batch of changes that has not
+    been collected yet; ``take_changes()`` collects them and re-arms the notification.
+    """
+
+    def __init__(self, on_change: Callable[[], None] | None = None) -> None:
+        self._on_change = on_change
+        self._lock = threading.Lock()
+        self._clients: dict[int, dict[str, Any] | None] = {}
+        self._client_order: list[int] = []
+        self._active_window = 0
+        self._changes: set[str] = set()
+        self._notified = False
+        self._failed = False
+        self._X: Any = None
+        self._display: Any = None
+        self._root: Any = None
+        self._atoms: _WindowAtoms | None = None
+        self._record_atoms: set[int] = set()
+        self._thread: threading.Thread | None = None
+        self._wake_fds: tuple[int, int] | None = None
+
+    def start(self) -> None:
+        X, display = _load_xlib()
+        try:
+            x_display = display.Display()
+        except Exception as exc:
+            raise RuntimeError("python-xlib could not open the X11 display for dock window tracking.") from exc
+        self._attach(X, x_display)
+        self._wake_fds = os.pipe()
+        self._thread = threading.Thread(target=self._run, name="pytpo-dock-x11-events", daemon=True)
+        self._thread.start()
+
+    def _attach(self, X: Any, x_display: Any) -> None:
+        self._X = X
+        self._display = x_display
+        self._root = x_display.screen().root
+        self._atoms = _intern_atoms(x_display)
+        self._record_atoms = {
+            int(atom)
+            for atom in (
+                self._atoms.desktop,
+                self._atoms.net_wm_name,
+                self._atoms.net_wm_pid,
+                self._atoms.net_wm_state,
+                self._atoms.window_type,
+                x_display.intern_atom("WM_NAME"),
+                x_display.intern_atom("WM_CLASS"),
+            )
+        }
+        self._root.change_attributes(event_mask=X.PropertyChangeMask)
+        self._sync_client_list()
+        self._sync_active_window()
+        self._changes.clear()
+        x_display.flush()
+
+    def stop(self) -> None:
+        thread = self._thread
+        wake_fds = self._wake_fds
+        self._thread = None
+        self._wake_fds = None
+        if wake_fds is not None:
+            try:
+                os.write(wake_fds[1], b"x")
+            except OSError:
+                pass
+        if thread is not None:
+            thread.join(timeout=1.0)
+        if self._display is not None:
+            try:
+                self._display.close()
+            except Exception:
+                pass
+            self._display = None
+        if wake_fds is not None:
+            for fd in wake_fds:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+    def is_running(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive() and not self._failed
+
+    def windows(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [dict(record) for window_id in self._client_order if (record := self._clients.get(window_id))]
+
+    def active_window_id(self) -> str:
+        with self._lock:
+            return f"0x{self._active_window:x}" if self._active_window else ""
+
+    def take_changes(self) -> set[str]:
+        """Return what changed since the last call: ``"windows"`` and/or ``"active"``."""
+        with self._lock:
+            changes = self._changes
+            self._changes = set()
+            self._notified = False
+        return changes
+
+    def _run(self) -> None:
+        display = self._display
+        wake_fds = self._wake_fds
+        if display is None or wake_fds is None:
+            return
+        try:
+            fileno = display.fileno()
+            while True:
+                # pending_events() also reads whatever the socket has, so events that
+                # arrived while handling the previous batch are not left waiting.
+                while display.pending_events():
+                    self._handle_event(display.next_event())
+                self._notify()
+                readable, _writable, _errors = select.select([fileno, wake_fds[0]], [], [])
+                if wake_fds[0] in readable:
+                    return
+        except Exception as exc:
+            if self._thread is None:
+                return
+            # Lost the X connection: report it so the dock can fall back to polling.
+            log_dock_debug("dock-window-tracker-stopped", error=repr(exc))
+            with self._lock:
+                self._failed = True
+                self._changes.add("windows")
+            if self._on_change is not None:
+                self._on_change()
+
+    def _notify(self) -> None:
+        with self._lock:
+            if not self._changes or self._notified:
+                return
+            self._notified = True
+        if self._on_change is not None:
+            self._on_change()
+
+    def _handle_event(self, event: Any) -> None:
+        if getattr(event, "type", None) != self._X.PropertyNotify:
+            return
+        window_id = int(getattr(getattr(event, "window", None), "id", 0) or 0)
+        atom = int(getattr(event, "atom", 0) or 0)
+        if window_id == int(self._root.id):
+            if atom == int(self._atoms.client_list):
+                self._sync_client_list()
+            elif atom == int(self._atoms.active_window):
+                self._sync_active_window()
+            return
+        if window_id in self._clients and atom in self._record_atoms:
+            self._refresh_client(window_id)
+
+    def _sync_client_list(self) -> None:
+        X = self._X
+        prop = _get_property(self._root, atom=self._atoms.client_list, prop_type=X.AnyPropertyType)
+        window_ids = [int(value) for value in (getattr(prop, "value", None) or [])]
+        added = [window_id for window_id in window_ids if window_id not in self._clients]
+        for window_id in added:
+            window = self._display.create_resource_object("window", window_id)
+            try:
+                window.change_attributes(event_mask=X.PropertyChangeMask, onerror=_error_catcher())
+            except Exception:
+                pass
+            record = _window_record(window, window_id, X=X, atoms=self._atoms)
+            with self._lock:
+                self._clients[window_id] = record
+        listed = set(window_ids)
+        removed = [window_id for window_id in self._clients if window_id not in listed]
+        with self._lock:
+            for window_id in removed:
+                self._clients.pop(window_id, None)
+            order_changed = window_ids != self._client_order
+            self._client_order = window_ids
+            if added or removed or order_changed:
+                self._changes.add("windows")
+
+    def _refresh_client(self, window_id: int) -> None:
+        window = self._display.create_resource_object("window", window_id)
+        record = _window_record(window, window_id, X=self._X, atoms=self._atoms)
+        with self._lock:
+            if window_id not in self._clients or self._clients[window_id] == record:
+                return
+            self._clients[window_id] = record
+            self._changes.add("windows")
+
+    def _sync_active_window(self) -> None:
+        prop = _get_property(self._root, atom=self._atoms.active_window, prop_type=self._X.AnyPropertyType)
+        values = getattr(prop, "value", None) or []
+        active_window = int(values[0]) if len(values) else 0
+        with self._lock:
+            if active_window != self._active_window:
+                self._active_window = active_window
+                self._changes.add("active")
+
+
+@dataclass(frozen=True, slots=True)
+class _WindowAtoms:
+    client_list: Any
+    active_window: Any
+    desktop: Any
+    net_wm_name: Any
+    net_wm_pid: Any
+    net_wm_state: Any
+    skip_taskbar: Any
+    skip_pager: Any
+    window_type: Any
+    window_type_dock: Any
+    window_type_desktop: Any
+    utf8: Any
+
+
+def _intern_atoms(x_display: Any) -> _WindowAtoms:
+    return _WindowAtoms(
+        client_list=x_display.intern_atom("_NET_CLIENT_LIST"),
+        active_window=x_display.intern_atom("_NET_ACTIVE_WINDOW"),
+        desktop=x_display.intern_atom("_NET_WM_DESKTOP"),
+        net_wm_name=x_display.intern_atom("_NET_WM_NAME"),
+        net_wm_pid=x_display.intern_atom("_NET_WM_PID"),
+        net_wm_state=x_display.intern_atom("_NET_WM_STATE"),
+        skip_taskbar=x_display.intern_atom("_NET_WM_STATE_SKIP_TASKBAR"),
+        skip_pager=x_display.intern_atom("_NET_WM_STATE_SKIP_PAGER"),
+        window_type=x_display.intern_atom("_NET_WM_WINDOW_TYPE"),
+        window_type_dock=x_display.intern_atom("_NET_WM_WINDOW_TYPE_DOCK"),
+        window_type_desktop=x_display.intern_atom("_NET_WM_WINDOW_TYPE_DESKTOP"),
+        utf8=x_display.intern_atom("UTF8_STRING"),
+    )
+
+
+def _window_record(window: Any, window_id: int, *, X: Any, atoms: _WindowAtoms) -> dict[str, Any] | None:
+    if _window_should_be_skipped(
+        window,
+        X=X,
+        net_wm_state_atom=atoms.net_wm_state,
+        skip_taskbar_atom=atoms.skip_taskbar,
+        skip_pager_atom=atoms.skip_pager,
+        window_type_atom=atoms.window_type,
+        window_type_dock_atom=atoms.window_type_dock,
+        window_type_desktop_atom=atoms.window_type_desktop,
+    ):
+        return None
+
+    desktop = _window_desktop(window, X=X, desktop_atom=atoms.desktop)
+    title = _window_title(window, X=X, utf8_atom=atoms.utf8, net_wm_name_atom=atoms.net_wm_name)
+    pid = _window_pid(window, X=X, net_wm_pid_atom=atoms.net_wm_pid)
+    instance_name, class_name = _window_class(window)
+    wm_class = ".".join(part for part in (instance_name, class_name) if part)
+    return {
+        "id": f"0x{int(window_id):x}",
+        "desktop": desktop,
+        "pid": pid,
+        "host": "",
+        "title": title,
+        "wm_class": wm_class,
+        "instance": instance_name,
+        "class": class_name,
+    }
+
+
+def _error_catcher() -> Any:
+    # Windows can vanish before their event mask is set; that BadWindow is expected.
+    try:
+        from Xlib import error
+    except Exception:
+        return None
+    return error.CatchError()
+
+
 def _load_xlib():
     try:
         from Xlib import X, display
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Tracing-overhead benchmark for the built-in Python debugger runner.
+
+Runs a call-heavy workload to completion under ``python_debug_runner.py`` with a
+breakpoint that never pauses (its condition is false) in the same file as the hot code,
+which is what "running to a breakpoint" costs. Each trace backend is compared with the
+workload running without a debugger:
+
+- bdb: stock ``bdb`` tracing, which traces every frame of a file containing a breakpoint
+- frame: ``sys.settrace`` with frames whose code has no breakpoint left untraced
+- monitoring: ``sys.monitoring`` LINE events on breakpoint code objects only (3.12+)
+
+The workload times itself, so interpreter and debugger startup are excluded.
+
+Usage:
+    python scripts/debug_trace_benchmark.py
+    python scripts/debug_trace_benchmark.py --python python3.12 --calls 500000 --json results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+RUNNER_PATH = REPO_ROOT / "barley_ide" / "ui" / "debugger" / "python_debug_runner.py"
+BACKENDS = ("bdb", "frame", "monitoring")
+
+_WORKLOAD = '''import sys
+import time
+
+
+def scale(value):
+    return value * 3 + 1
+
+
+def accumulate(values):
+    total = 0
+    for value in values:
+        total += scale(value) % 7
+    return total
+
+
+def checkpoint(total):
+    marker = total  # breakpoint line
+    return marker
+
+
+started = time.perf_counter()
+result = 0
+for chunk in range({chunks}):
+    result += accumulate(range(chunk, chunk + 100))
+checkpoint(result)
+print(f"elapsed={{time.perf_counter() - started:.6f}}")
+'''
+_BREAKPOINT_LINE = 17
+
+
+def _elapsed(stdout: str) -> float:
+    for line in stdout.splitlines():
+        if line.startswith("elapsed="):
+            return float(line.split("=", 1)[1])
+    raise RuntimeError(f"workload did not report its time:\n{stdout}")
+
+
+def run_plain(python: str, workload: Path) -> float:
+    done = subprocess.run([python, str(workload)], capture_output=True, text=True, check=True, timeout=600)
+    return _elapsed(done.stdout)
+
+
+def run_debugger(python: str, workload: Path, backend: str) -> tuple[float, str]:
+    env = {
+        **os.environ,
+        "PYTPO_DEBUG_TRACE_BACKEND": backend,
+        "PYTPO_DEBUG_PROJECT_ROOTS": json.dumps([str(workload.parent)]),
+    }
+    breakpoints = {
+        os.path.normcase(str(workload)): [
+            {"line": _BREAKPOINT_LINE, "condition": "False", "hit_count": 0, "log_message": ""}
+        ]
+    }
+    commands = "".join(
+        json.dumps(command) + "\n"
+        for command in (
+            {"action": "set_breakpoints", "breakpoints": breakpoints},
+            {"action": "continue"},
+        )
+    )
+    done = subprocess.run(
+        [python, str(RUNNER_PATH), "script", str(workload)],
+        input=commands,
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=str(workload.parent),
+        check=True,
+        timeout=600,
+    )
+    used = backend
+    for line in done.stderr.splitlines():
+        if not line.startswith("__DBG__:"):
+            continue
+        event = json.loads(line[len("__DBG__:") :])
+        if event.get("event") == "started":
+            used = str((event.get("data") or {}).get("trace_backend") or backend)
+        if event.get("event") in {"stop", "fatal"}:
+            raise RuntimeError(f"unexpected debugger event under {backend}: {event}")
+    return _elapsed(done.stdout), used
+
+
+def run(python: str, calls: int, repeats: int, backends: list[str]) -> dict:
+    with tempfile.TemporaryDirectory(prefix="pytpo-trace-bench-") as tmpdir:
+        workload = Path(tmpdir) / "workload.py"
+        workload.write_text(_WORKLOAD.format(chunks=max(1, calls // 100)), encoding="utf-8")
+        version = subprocess.run(
+            [python, "-c", "import sys; print('%d.%d.%d' % sys.version_info[:3])"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+
+        plain = statistics.median(run_plain(python, workload) for _ in range(repeats))
+        results: dict[str, dict] = {}
+        for backend in backends:
+            samples: list[float] = []
+            used = backend
+            for _ in range(repeats):
+                elapsed, used = run_debugger(python, workload, backend)
+                samples.append(elapsed)
+            if used != backend:
+                # e.g. monitoring requested on an interpreter without sys.monitoring
+                results[backend] = {"skipped": f"interpreter used {used}"}
+                continue
+            median = statistics.median(samples)
+            results[backend] = {"seconds": median, "slowdown": median / plain if plain > 0 else 0.0}
+
+    return {"python": version, "calls": calls, "repeats": repeats, "plain_seconds": plain, "backends": results}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--python", default=sys.executable, help="interpreter running the workload")
+    parser.add_argument("--calls", type=int, default=200_000, help="approximate number of hot function calls")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--json", type=Path, default=None, help="write results to this file")
+    args = parser.parse_args()
+
+    result = run(args.python, max(100, args.calls), max(1, args.repeats), args.backends)
+    print(f"python {result['python']}, {result['calls']} calls, median of {result['repeats']}")
+    print(f"{'no debugger':>12}: {result['plain_seconds'] * 1000.0:8.1f} ms")
+    for backend, values in result["backends"].items():
+        if "skipped" in values:
+            print(f"{backend:>12}: skipped ({values['skipped']})")
+            continue
+        print(f"{backend:>12}: {values['seconds'] * 1000.0:8.1f} ms  ({values['slowdown']:.1f}x)")
+    if args.json is not None:
+        args.json.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Live-preview benchmark for the markdown viewer's render pipeline.
+
+Generates a long markdown document (headings, paragraphs, lists, highlighted code
+fences) and simulates typing into one paragraph. For each edit it compares:
+
+- full: a fresh ``markdown.Markdown`` converting the whole document, as the viewer
+  did before block caching
+- blocks: ``MarkdownBlockRenderer`` re-rendering with its block cache, plus the
+  size of the block patch that would be sent to the page
+
+No QWebEngine is needed; page-side work is approximated by the bytes sent.
+
+Usage:
+    python scripts/markdown_preview_benchmark.py
+    python scripts/markdown_preview_benchmark.py --lines 5000 --edits 20 --json results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from TPOPyside.widgets.markdown_render_cache import (
+    MarkdownBlockRenderer,
+    create_preview_parser,
+    diff_blocks,
+)
+
+_CODE_SAMPLE = '''```python
+def handler_{index}(request, *, retries: int = 3) -> dict:
+    """Process request {index}."""
+    for attempt in range(retries):
+        result = request.send(timeout=attempt * 0.5)
+        if result.ok:
+            return {{"index": {index}, "attempt": attempt, "body": result.json()}}
+    raise RuntimeError("request {index} failed")
+```'''
+
+
+def build_document(target_lines: int) -> list[str]:
+    lines: list[str] = ["# Benchmark document", ""]
+    section = 0
+    while len(lines) < target_lines:
+        section += 1
+        lines += [f"## Section {section}", ""]
+        lines += [
+            f"Paragraph {section} explains the *behaviour* of `handler_{section}` with a "
+            f"[link](https://example.com/{section}) and some **bold** text.",
+            "It wraps onto a second source line for realism.",
+            "",
+        ]
+        lines += [f"- item {section}.{n} with `code`" for n in range(4)] + [""]
+        lines += _CODE_SAMPLE.format(index=section).splitlines() + [""]
+    return lines[:target_lines]
+
+
+def run(lines: int, edits: int) -> dict:
+    document = build_document(lines)
+    text = "\n".join(document)
+    edit_line = next(i for i, line in enumerate(document) if line.startswith("Paragraph") and i > len(document) // 2)
+
+    renderer = MarkdownBlockRenderer(create_preview_parser)
+    started = time.perf_counter()
+    page = renderer.render(text)
+    cold_ms = (time.perf_counter() - started) * 1000.0
+    page_keys = [block.key for block in page.blocks]
+
+    full_ms: list[float] = []
+    block_ms: list[float] = []
+    patch_bytes: list[int] = []
+    converted: list[int] = []
+    full_bytes = 0
+    for step in range(edits):
+        document[edit_line] += f" typed{step}"
+        text = "\n".join(document)
+
+        started = time.perf_counter()
+        full_html = create_preview_parser().convert(text)
+        full_ms.append((time.perf_counter() - started) * 1000.0)
+        full_bytes = len(full_html.encode("utf-8"))
+
+        started = time.perf_counter()
+        rendered = renderer.render(text)
+        patch = diff_blocks(page_keys, rendered.blocks)
+        block_ms.append((time.perf_counter() - started) * 1000.0)
+        page_keys = [block.key for block in rendered.blocks]
+        converted.append(rendered.converted)
+        patch_bytes.append(sum(len(block.html.encode("utf-8")) for block in patch.insert))
+
+    return {
+        "lines": len(document),
+        "blocks": len(page_keys),
+        "edits": edits,
+        "cold_block_render_ms": cold_ms,
+        "full_render_ms_median": statistics.median(full_ms),
+        "block_render_ms_median": statistics.median(block_ms),
+        "blocks_converted_per_edit": statistics.median(converted),
+        "full_html_bytes": full_bytes,
+        "patch_bytes_median": statistics.median(patch_bytes),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=5000)
+    parser.add_argument("--edits", type=int, default=10)
+    parser.add_argument("--json", type=Path, default=None, help="write results to this file")
+    args = parser.parse_args()
+
+    result = run(max(100, args.lines), max(1, args.edits))
+    print(f"document: {result['lines']} lines, {result['blocks']} blocks")
+    print(f"cold block render: {result['cold_block_render_ms']:.1f} ms")
+    print(
+        f"per edit: full {result['full_render_ms_median']:.1f} ms -> blocks "
+        f"{result['block_render_ms_median']:.1f} ms ({result['blocks_converted_per_edit']:.0f} converted)"
+    )
+    print(f"sent to page: full {result['full_html_bytes']} bytes -> patch {result['patch_bytes_median']:.0f} bytes")
+    if args.json is not None:
+        args.json.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
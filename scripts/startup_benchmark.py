@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Reproducible cold/warm startup benchmark for Barley.
+
+Each run launches ``python -m barley_ide --profile-startup-exit`` in a fresh
+process, which writes a startup profile and quits after the first event-loop
+turn of the main window.
+
+- cold runs use an empty ``PYTHONPYCACHEPREFIX`` per run, so every module is
+  compiled from source (bytecode cache miss)
+- warm runs share one bytecode cache that is primed by an unmeasured launch
+
+OS page cache is not dropped; run on an otherwise idle machine.
+
+Usage:
+    python scripts/startup_benchmark.py --runs 5
+    python scripts/startup_benchmark.py --runs 3 --offscreen --json results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _launch(*, pycache_prefix: str, report_path: Path, offscreen: bool, project: str | None) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPYCACHEPREFIX"] = pycache_prefix
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH", "")]))
+    if offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    command = [
+        sys.executable,
+        "-m",
+        "barley_ide",
+        f"--profile-startup={report_path}",
+        "--profile-startup-exit",
+    ]
+    command.append(project if project else "--no-project")
+    started = time.perf_counter()
+    subprocess.run(command, cwd=str(REPO_ROOT), env=env, check=True, stdout=subprocess.DEVNULL)
+    wall_ms = (time.perf_counter() - started) * 1000.0
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    phases = {item["name"]: item["duration_ms"] for item in report.get("phases", [])}
+    return {
+        "wall_ms": wall_ms,
+        "first_turn_ms": float(report.get("marks", {}).get("first event loop turn", report.get("total_ms", 0.0))),
+        "import_count": len(report.get("imports", [])),
+        "phases": phases,
+    }
+
+
+def _summarize(label: str, runs: list[dict]) -> dict:
+    def _stats(values: list[float]) -> dict:
+        return {
+            "median": statistics.median(values),
+            "min": min(values),
+            "max": max(values),
+        }
+
+    phase_names = sorted({name for run in runs for name in run["phases"]})
+    summary = {
+        "label": label,
+        "runs": len(runs),
+        "wall_ms": _stats([run["wall_ms"] for run in runs]),
+        "first_turn_ms": _stats([run["first_turn_ms"] for run in runs]),
+        "phases_ms": {
+            name: _stats([run["phases"][name] for run in runs if name in run["phases"]]) for name in phase_names
+        },
+    }
+    print(f"{label}: {len(runs)} runs")
+    print(f"  wall clock      median {summary['wall_ms']['median']:8.1f} ms  min {summary['wall_ms']['min']:8.1f} ms")
+    print(
+        f"  first turn      median {summary['first_turn_ms']['median']:8.1f} ms  "
+        f"min {summary['first_turn_ms']['min']:8.1f} ms"
+    )
+    for name, stats in summary["phases_ms"].items():
+        print(f"  {name:<34} median {stats['median']:8.1f} ms")
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="measured launches per mode (default: 5)")
+    parser.add_argument("--offscreen", action="store_true", help="use the Qt offscreen platform plugin")
+    parser.add_argument("--project", default=None, help="project directory to open (default: --no-project)")
+    parser.add_argument("--json", dest="json_path", default=None, help="write the summary as JSON to this path")
+    args = parser.parse_args(argv)
+    runs = max(1, int(args.runs))
+
+    with tempfile.TemporaryDirectory(prefix="barley-startup-bench-") as tmp:
+        tmp_path = Path(tmp)
+        cold: list[dict] = []
+        for index in range(runs):
+            cache = tmp_path / f"cold-cache-{index}"
+            cache.mkdir()
+            cold.append(
+                _launch(
+                    pycache_prefix=str(cache),
+                    report_path=tmp_path / f"cold-{index}.json",
+                    offscreen=args.offscreen,
+                    project=args.project,
+                )
+            )
+
+        warm_cache = tmp_path / "warm-cache"
+        warm_cache.mkdir()
+        _launch(
+            pycache_prefix=str(warm_cache),
+            report_path=tmp_path / "warm-prime.json",
+            offscreen=args.offscreen,
+            project=args.project,
+        )
+        warm = [
+            _launch(
+                pycache_prefix=str(warm_cache),
+                report_path=tmp_path / f"warm-{index}.json",
+                offscreen=args.offscreen,
+                project=args.project,
+            )
+            for index in range(runs)
+        ]
+
+    results = {"cold": _summarize("cold", cold), "warm": _summarize("warm", warm)}
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,9 +2,50 @@ from __future__ import annotations
 
 import unittest
 
+from PySide6.QtGui import QTextDocument
+from PySide6.QtWidgets import QApplication
+
 from barley_ide.ui.widgets.chat_markdown_bubble import ChatMarkdownBubble
 
 
+def _app() -> QApplication:
+    app = QApplication.instance()
+    return app if app is not None else QApplication([])
+
+
+def _document_shape(document: QTextDocument) -> list[tuple[str, int, bool, str]]:
+    shape: list[tuple[str, int, bool, str]] = []
+    block = document.begin()
+    while block.isValid():
+        fmt = block.blockFormat()
+        shape.append((block.text(), fmt.headingLevel(), block.textList() is not None, fmt.background().color().name()))
+        block = block.next()
+    return shape
+
+
+_STREAMED_MESSAGE = """# Plan
+Here is the plan:
+- one
+- two
+
+- three
+Done.
+
+```python
+def f():
+
+    return 1
+```
+
+> quoted
+
+| a | b |
+|---|---|
+| 1 | 2 |
+
+Final **bold** words"""
+
+
 class ChatMarkdownBubbleMarkdownTests(unittest.TestCase):
     def test_inserts_gap_before_unordered_list(self) -> None:
         html = ChatMarkdownBubble._render_markdown_html("Here are items:\n- one\n- two")
@@ -37,6 +78,42 @@ class ChatMarkdownBubbleMarkdownTests(unittest.TestCase):
         self.assertIn("1. literal", html)
 
 
+class ChatMarkdownBubbleStreamingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        _app()
+
+    @staticmethod
+    def _full_render_shape(text: str) -> list[tuple[str, int, bool, str]]:
+        document = QTextDocument()
+        document.setHtml(ChatMarkdownBubble._render_markdown_html(text))
+        return _document_shape(document)
+
+    def test_streamed_lines_match_full_render(self) -> None:
+        bubble = ChatMarkdownBubble("assistant", "")
+        for line in _STREAMED_MESSAGE.split("\n"):
+            bubble.append_line(line)
+        self.assertEqual(_document_shape(bubble.body.document()), self._full_render_shape(_STREAMED_MESSAGE))
+
+    def test_completed_blocks_render_once(self) -> None:
+        bubble = ChatMarkdownBubble("assistant", "")
+        lines = _STREAMED_MESSAGE.split("\n")
+        for line in lines:
+            bubble.append_line(line)
+        committed = list(bubble._markdown_blocks)
+        self.assertGreaterEqual(len(committed), 5)
+        # One render per streamed line for the open block, plus one per block as it completes.
+        self.assertLessEqual(bubble.markdown_block_renders, len(lines) + len(committed) + 1)
+        bubble.append_line("more text")
+        self.assertEqual(bubble._markdown_blocks, committed)
+        self.assertTrue(all(a is b for a, b in zip(bubble._markdown_blocks, committed)))
+
+    def test_set_text_with_edited_prefix_rebuilds(self) -> None:
+        bubble = ChatMarkdownBubble("assistant", _STREAMED_MESSAGE)
+        edited = _STREAMED_MESSAGE.replace("# Plan", "## Revised plan")
+        bubble.set_text(edited)
+        self.assertEqual(_document_shape(bubble.body.document()), self._full_render_shape(edited))
+
+
 class ChatMarkdownBubbleDiffTests(unittest.TestCase):
     @staticmethod
     def _relative_display(path_text: str) -> str:
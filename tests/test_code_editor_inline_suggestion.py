@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import unittest
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QTextCursor
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication
+
+from TPOPyside.widgets.code_editor.editor import CodeEditor
+
+
+def _app() -> QApplication:
+    app = QApplication.instance()
+    return app if app is not None else QApplication([])
+
+
+def _editor_with_suggestion(text: str, suggestion: str) -> CodeEditor:
+    editor = CodeEditor()
+    editor.file_path = "example.py"
+    editor.setPlainText(text)
+    editor.moveCursor(QTextCursor.End)
+    editor.show()
+    _app().processEvents()
+    editor.set_inline_suggestion(suggestion)
+    return editor
+
+
+class InlineSuggestionTypeThroughTests(unittest.TestCase):
+    def setUp(self) -> None:
+        _app()
+
+    def test_typing_matching_characters_trims_suggestion(self) -> None:
+        editor = _editor_with_suggestion("total = ", "sum_of(values)")
+        QTest.keyClicks(editor, "sum_")
+        self.assertEqual(editor.toPlainText(), "total = sum_")
+        self.assertEqual(editor._inline_suggestion_text, "of(values)")
+        self.assertEqual(editor._inline_suggestion_anchor_pos, editor.textCursor().position())
+
+    def test_diverging_character_clears_suggestion(self) -> None:
+        editor = _editor_with_suggestion("total = ", "sum_of(values)")
+        QTest.keyClicks(editor, "m")
+        self.assertFalse(editor.has_inline_suggestion())
+
+    def test_navigation_still_clears_suggestion(self) -> None:
+        editor = _editor_with_suggestion("total = ", "sum_of(values)")
+        QTest.keyClick(editor, Qt.Key_Left)
+        self.assertFalse(editor.has_inline_suggestion())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from barley_ide.ui.codex_session_store import CodexSessionIndex
+
+
+def _write_session(root: Path, session_id: str, *, cwd: str, prompt: str, stamp_s: int) -> Path:
+    path = root / "2025" / "01" / "02" / f"rollout-2025-01-02T10-00-00-{session_id}.jsonl"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = [
+        {"type": "session_meta", "payload": {"id": session_id, "cwd": cwd}},
+        {"type": "turn_context", "payload": {"model": "gpt-test", "cwd": cwd}},
+        {"type": "response_item", "payload": {"type": "message", "role": "user", "content": [{"text": prompt}]}},
+    ]
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8")
+    os.utime(path, (stamp_s, stamp_s))
+    return path
+
+
+class CodexSessionIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        base = Path(self._tmp.name).resolve()
+        self.sessions = base / "sessions"
+        self.cache_path = base / "cache" / "codex-session-index.json"
+        self.project = str(base / "project")
+        for idx in range(5):
+            cwd = self.project if idx % 2 == 0 else str(base / "other")
+            _write_session(self.sessions, f"sess-{idx}", cwd=cwd, prompt=f"task number {idx}", stamp_s=1_700_000_000 + idx)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _index(self) -> CodexSessionIndex:
+        return CodexSessionIndex(self.sessions, cache_path=self.cache_path, min_refresh_interval_s=0.0)
+
+    def test_lists_newest_first_with_pagination_and_filters(self) -> None:
+        index = self._index()
+        self.assertEqual([s.session_id for s in index.list_sessions(limit=2)], ["sess-4", "sess-3"])
+        self.assertEqual([s.session_id for s in index.list_sessions(limit=2, offset=2)], ["sess-2", "sess-1"])
+        scoped = index.list_sessions(project_dir=Path(self.project))
+        self.assertEqual([s.session_id for s in scoped], ["sess-4", "sess-2", "sess-0"])
+        self.assertEqual(index.count_sessions(query="number 3"), 1)
+        self.assertEqual(index.list_sessions(limit=1)[0].first_user_message, "task number 4")
+
+    def test_refresh_only_parses_changed_files(self) -> None:
+        index = self._index()
+        index.refresh()
+        self.assertEqual(index.parses, 5)
+
+        path = _write_session(self.sessions, "sess-9", cwd=self.project, prompt="new", stamp_s=1_700_000_100)
+        self.assertTrue(index.refresh())
+        self.assertEqual(index.parses, 6)
+        self.assertEqual(index.find("sess-9").log_path, path)
+
+        # Appending turns to a session whose metadata is known does not re-read it.
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps({"type": "event_msg", "payload": {"type": "agent_message"}}) + "\n")
+        os.utime(path, (1_700_000_200, 1_700_000_200))
+        self.assertTrue(index.refresh())
+        self.assertEqual(index.parses, 6)
+
+        path.unlink()
+        self.assertTrue(index.refresh())
+        self.assertIsNone(index.find("sess-9"))
+
+    def test_persisted_index_skips_parsing(self) -> None:
+        self._index().refresh()
+        self.assertTrue(self.cache_path.is_file())
+
+        reloaded = self._index()
+        self.assertEqual(reloaded.count_sessions(), 5)
+        self.assertEqual(reloaded.parses, 0)
+        self.assertEqual(reloaded.find("sess-2").cwd, self.project)
+
+    def test_find_picks_up_new_log_without_explicit_refresh(self) -> None:
+        index = CodexSessionIndex(self.sessions, cache_path=self.cache_path, min_refresh_interval_s=3600.0)
+        index.refresh()
+        _write_session(self.sessions, "sess-late", cwd=self.project, prompt="late", stamp_s=1_700_000_300)
+        self.assertEqual(index.count_sessions(), 5)
+        self.assertIsNotNone(index.find("sess-late"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from PySide6.QtCore import QCoreApplication, QEvent, QObject
+from PySide6.QtWidgets import QApplication
+
+from barley_ide.ui.codex_session_tail import CodexSessionLogTail, read_session_log_events
+
+
+def _app() -> QApplication:
+    app = QApplication.instance()
+    return app if app is not None else QApplication([])
+
+
+def _parse(data: dict) -> list[tuple[str, object]]:
+    events: list[tuple[str, object]] = [("transcript", data.get("text"))]
+    if data.get("plan"):
+        events.append(("plan", data["plan"]))
+    return events
+
+
+def _append(path: Path, *items: dict, newline: bool = True) -> None:
+    text = "\n".join(json.dumps(item) for item in items)
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write(text + ("\n" if newline else ""))
+
+
+class CodexSessionLogTailTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = _app()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.log = Path(self._tmp.name) / "rollout-abc.jsonl"
+        self.log.write_text(json.dumps({"text": "old"}) + "\n", encoding="utf-8")
+        self.resolvable = True
+        self.batches: list[list] = []
+        self.owner = QObject()
+        self.tail = CodexSessionLogTail(
+            resolve_path=lambda _sid: self.log if self.resolvable else None,
+            parse_event=_parse,
+            parent=self.owner,
+        )
+        self.tail.eventsRead.connect(self.batches.append)
+
+    def tearDown(self) -> None:
+        # Unwatch and destroy the tail (and its watcher/timers) before its log disappears;
+        # left to the garbage collector they break later tests' event loops.
+        self.tail.shutdown()
+        self.assertEqual(self.tail._watcher.files(), [])
+        self.owner.deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        self._tmp.cleanup()
+
+    def _wait_for(self, predicate, timeout: float = 5.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            self.app.processEvents()
+            if predicate():
+                return True
+            time.sleep(0.01)
+        return predicate()
+
+    def test_watcher_delivers_plan_and_transcript_from_one_pass(self) -> None:
+        self.tail.start("abc", from_beginning=False)
+        self.assertEqual(self.tail.log_path, self.log)
+        _append(self.log, {"text": "hello", "plan": "step 1"}, {"text": "world"})
+        self.assertTrue(self._wait_for(lambda: self.batches))
+        self.assertEqual(self.batches[0], [("transcript", "hello"), ("plan", "step 1"), ("transcript", "world")])
+        self.assertEqual(self.tail.reads, 1)
+
+    def test_partial_line_waits_for_newline(self) -> None:
+        self.tail.start("abc", from_beginning=False)
+        _append(self.log, {"text": "half"}, newline=False)
+        self.tail.drain()
+        self.assertEqual(self.batches, [])
+        with self.log.open("a", encoding="utf-8") as handle:
+            handle.write("\n")
+        self.tail.drain()
+        self.assertEqual(self.batches, [[("transcript", "half")]])
+
+    def test_from_beginning_and_poll_until_log_appears(self) -> None:
+        self.resolvable = False
+        self.tail.start("abc", from_beginning=True)
+        self.assertIsNone(self.tail.log_path)
+        self.resolvable = True
+        self.assertTrue(self._wait_for(lambda: self.batches))
+        self.assertEqual(self.batches[0], [("transcript", "old")])
+
+    def test_stop_discards_in_flight_reads(self) -> None:
+        self.tail.start("abc", from_beginning=True)
+        self.tail.poke()
+        self.tail.stop()
+        self._wait_for(lambda: False, timeout=0.2)
+        self.assertEqual(self.batches, [])
+
+    def test_read_restarts_after_truncation(self) -> None:
+        read = read_session_log_events(self.log, 10_000, _parse)
+        self.assertEqual((read.start, read.events), (0, [("transcript", "old")]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import unittest
+from dataclasses import dataclass
+
+from PySide6.QtWidgets import QApplication
+
+from barley_ide.ui.widgets.chat_markdown_bubble import ChatMarkdownBubble
+from barley_ide.ui.widgets.codex_transcript_view import CodexTranscriptView
+
+
+def _app() -> QApplication:
+    app = QApplication.instance()
+    return app if app is not None else QApplication([])
+
+
+@dataclass(slots=True)
+class _Entry:
+    role: str
+    text: str
+    timestamp: str | None = None
+    item_count: int = 1
+
+
+def _bubble(entry: _Entry) -> ChatMarkdownBubble:
+    return ChatMarkdownBubble(entry.role, entry.text, timestamp=entry.timestamp, item_count=entry.item_count)
+
+
+class CodexTranscriptViewTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = _app()
+        self.view = CodexTranscriptView(_bubble)
+        self.view.resize(420, 300)
+        self.view.show()
+        self.app.processEvents()
+
+    def tearDown(self) -> None:
+        self.view.close()
+        self.view.deleteLater()
+
+    def _fill(self, count: int) -> list[_Entry]:
+        entries = [
+            _Entry("assistant" if idx % 2 else "user", f"message {idx}\n\nsecond paragraph {idx}")
+            for idx in range(count)
+        ]
+        for entry in entries:
+            self.view.append_entry(entry)
+        self.view.relayout()
+        return entries
+
+    def test_only_rows_near_viewport_own_widgets(self) -> None:
+        self._fill(120)
+        self.assertLess(self.view.live_count(), 20)
+        self.assertIsNone(self.view.bubble_at(-1))
+
+        bar = self.view.verticalScrollBar()
+        bar.setValue(bar.maximum())
+        self.view.relayout()
+        last = self.view.bubble_at(-1)
+        self.assertIsNotNone(last)
+        self.assertIn("message 119", last._text)
+        self.assertLess(self.view.bubbles_created, 40)
+
+        live = sorted(self.view._live.items())
+        for (_a, upper), (_b, lower) in zip(live, live[1:]):
+            self.assertLessEqual(upper.y() + upper.height(), lower.y())
+
+    def test_heights_are_cached_per_width(self) -> None:
+        self._fill(3)
+        row = self.view._rows[0]
+        narrow = self.view._row_width()
+        self.assertIn((narrow, False), row.heights)
+
+        self.view.resize(700, 300)
+        self.app.processEvents()
+        wide = self.view._row_width()
+        self.assertIn((wide, False), row.heights)
+        self.assertIn((narrow, False), row.heights)
+
+        self.view.entry_changed(0)
+        self.assertEqual(row.heights.get((narrow, False)), None)
+
+    def test_collapsed_state_survives_recycling(self) -> None:
+        self.view.append_entry(_Entry("tools", "ran: ls\nfile_a\nfile_b"))
+        self._fill(60)
+        tools = self.view.bubble_at(0)
+        self.assertTrue(tools.collapsed)
+        tools.set_collapsed(False)
+
+        bar = self.view.verticalScrollBar()
+        bar.setValue(bar.maximum())
+        self.view.relayout()
+        self.assertIsNone(self.view.bubble_at(0))
+        bar.setValue(0)
+        self.view.relayout()
+        self.assertFalse(self.view.bubble_at(0).collapsed)
+
+    def test_remove_last_and_clear(self) -> None:
+        self._fill(4)
+        self.view.remove_last(2)
+        self.view.relayout()
+        self.assertEqual(self.view.entry_count(), 2)
+        self.assertEqual(set(self.view._live), {0, 1})
+        self.view.clear()
+        self.view.relayout()
+        self.assertEqual((self.view.entry_count(), self.view.live_count()), (0, 0))
+        self.assertEqual(self.view.verticalScrollBar().maximum(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import json
 import os
-import selectors
+import queue
 import socket
 import subprocess
 import sys
 import tempfile
 import textwrap
+import threading
 import time
 import unittest
 from unittest import mock
@@ -347,33 +348,197 @@ class PythonDebuggerHarnessTests(unittest.TestCase):
                 if proc.stderr is not None:
                     proc.stderr.close()
 
+    def test_harness_trace_backends_stop_and_step_alike(self) -> None:
+        backends = ["bdb", "frame"] + (["monitoring"] if hasattr(sys, "monitoring") else [])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            main_path = root / "main.py"
+            harness_path = root / "debugger_harness.py"
+            main_source = textwrap.dedent(
+                """
+                def inner(x):
+                    y = x * 2
+                    return y
+
+                total = 0
+                for i in range(3):
+                    total += inner(i)
+                print(total)
+                """
+            ).lstrip()
+            main_path.write_text(main_source, encoding="utf-8")
+            harness_path.write_text(DEBUGGER_HARNESS_CODE, encoding="utf-8")
+            breakpoints = {
+                os.path.normcase(os.path.abspath(str(main_path))): [
+                    {"line": 2, "condition": "x == 1", "hit_count": 0, "log_message": ""}
+                ]
+            }
+
+            for backend in backends:
+                with self.subTest(backend=backend):
+                    proc = subprocess.Popen(
+                        [sys.executable, str(harness_path), "script", str(main_path)],
+                        cwd=str(root),
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        text=True,
+                        env={
+                            **os.environ,
+                            "PYTPO_DEBUG_PROJECT_ROOTS": json.dumps([str(root)]),
+                            "PYTPO_DEBUG_TRACE_BACKEND": backend,
+                        },
+                    )
+                    try:
+                        started = self._read_event(proc, expected="started")
+                        self.assertEqual(started["data"]["trace_backend"], backend)
+                        self._send_command(proc, {"action": "set_breakpoints", "breakpoints": breakpoints})
+                        self._send_command(proc, {"action": "continue"})
+
+                        stops = []
+                        for action in ("next", "next", "step", "continue"):
+                            event = self._read_event(proc, expected="stop")
+                            stops.append((event["data"]["function"], int(event["data"]["line"])))
+                            self._send_command(proc, {"action": action})
+                        self._read_event(proc, expected="finished")
+                        self.assertEqual(proc.wait(timeout=5), 0)
+                        self.assertEqual(stops, [("inner", 2), ("inner", 3), ("<module>", 6), ("<module>", 7)])
+                    finally:
+                        if proc.poll() is None:
+                            proc.kill()
+                        for stream in (proc.stdin, proc.stdout, proc.stderr):
+                            if stream is not None:
+                                stream.close()
+
+    def test_harness_sends_frame_summaries_and_pages_variables_on_demand(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            main_path = root / "main.py"
+            harness_path = root / "debugger_harness.py"
+            main_source = textwrap.dedent(
+                """
+                import time
+
+                class Slow:
+                    def __repr__(self):
+                        time.sleep(5)
+                        return "slow"
+
+                def work():
+                    items = list(range(250))
+                    text = "x" * 100000
+                    slow = Slow()
+                    return items, text, slow
+
+                work()
+                """
+            ).lstrip()
+            main_path.write_text(main_source, encoding="utf-8")
+            harness_path.write_text(DEBUGGER_HARNESS_CODE, encoding="utf-8")
+
+            proc = subprocess.Popen(
+                [sys.executable, str(harness_path), "script", str(main_path)],
+                cwd=str(root),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                env={**os.environ, "PYTPO_DEBUG_PROJECT_ROOTS": json.dumps([str(root)])},
+            )
+            try:
+                self._read_event(proc, expected="started")
+                self._send_command(
+                    proc,
+                    {
+                        "action": "set_breakpoints",
+                        "breakpoints": {
+                            os.path.normcase(os.path.abspath(str(main_path))): [
+                                {"line": 12, "condition": "", "hit_count": 0, "log_message": ""}
+                            ]
+                        },
+                    },
+                )
+                self._send_command(proc, {"action": "continue"})
+
+                stop = self._read_event(proc, expected="stop")
+                top = stop["data"]["stack"][-1]
+                self.assertEqual(top["function"], "work")
+                self.assertNotIn("locals", top)
+                scopes = {scope["name"]: scope["variables_reference"] for scope in top["scopes"]}
+
+                self._send_command(proc, {"action": "variables", "reference": scopes["Locals"]})
+                started = time.monotonic()
+                local_page = self._read_event(proc, expected="variables")["data"]
+                self.assertLess(time.monotonic() - started, 3.0)
+                by_name = {item["name"]: item for item in local_page["variables"]}
+                self.assertEqual(set(by_name), {"items", "text", "slow"})
+                self.assertLessEqual(len(by_name["text"]["value"]), 512)
+                self.assertIn("timed out", by_name["slow"]["value"])
+
+                items_ref = by_name["items"]["variables_reference"]
+                self._send_command(proc, {"action": "variables", "reference": items_ref, "start": 200, "count": 100})
+                page = self._read_event(proc, expected="variables")["data"]
+                self.assertEqual((page["start"], page["total"], len(page["variables"])), (200, 250, 50))
+                self.assertEqual(page["variables"][0], {"name": "200", "value": "200", "type": "int", "variables_reference": 0})
+
+                self._send_command(proc, {"action": "variables", "reference": scopes["Locals"]})
+                self.assertEqual(self._read_event(proc, expected="variables")["data"], local_page)
+
+                self._send_command(proc, {"action": "continue"})
+                self._read_event(proc, expected="finished")
+                self._send_command(proc, {"action": "variables", "reference": items_ref})
+                self.assertEqual(proc.wait(timeout=5), 0)
+            finally:
+                if proc.poll() is None:
+                    proc.kill()
+                for stream in (proc.stdin, proc.stdout, proc.stderr):
+                    if stream is not None:
+                        stream.close()
+
     def _send_command(self, proc: subprocess.Popen[str], payload: dict) -> None:
         assert proc.stdin is not None
         proc.stdin.write(json.dumps(payload) + "\n")
         proc.stdin.flush()
 
     def _read_event(self, proc: subprocess.Popen[str], *, expected: str, timeout: float = 5.0) -> dict:
-        assert proc.stderr is not None
-        selector = selectors.DefaultSelector()
-        selector.register(proc.stderr, selectors.EVENT_READ)
-        try:
-            end_time = time.monotonic() + timeout
-            while time.monotonic() < end_time:
-                ready = selector.select(timeout=0.1)
-                if not ready:
-                    continue
-                line = proc.stderr.readline()
-                if not line:
-                    continue
-                if not line.startswith("__DBG__:"):
-                    continue
-                event = json.loads(line[len("__DBG__:") :])
-                if event.get("event") == expected:
-                    return event
-        finally:
-            selector.close()
+        # Lines are read on a thread: select() on the pipe misses lines already buffered by readline().
+        lines = self._stderr_lines(proc)
+        end_time = time.monotonic() + timeout
+        while True:
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                line = lines.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if line is None:
+                break
+            if not line.startswith("__DBG__:"):
+                continue
+            event = json.loads(line[len("__DBG__:") :])
+            if event.get("event") == expected:
+                return event
         raise AssertionError(f"Timed out waiting for debugger event: {expected}")
 
+    def _stderr_lines(self, proc: subprocess.Popen[str]) -> queue.Queue:
+        readers = self.__dict__.setdefault("_stderr_readers", {})
+        lines = readers.get(id(proc))
+        if lines is None:
+            assert proc.stderr is not None
+            lines = readers[id(proc)] = queue.Queue()
+
+            def pump(stream=proc.stderr, sink=lines) -> None:
+                try:
+                    for line in stream:
+                        sink.put(line)
+                except (OSError, ValueError):
+                    pass
+                sink.put(None)
+
+            threading.Thread(target=pump, daemon=True).start()
+        return lines
+
 
 class PythonDebuggerBackendUnitTests(unittest.TestCase):
     def test_stop_plan_escalates_from_polite_to_kill(self) -> None:
@@ -866,6 +1031,104 @@ class DebugpyBackendIntegrationTests(unittest.TestCase):
             finally:
                 backend.stop_debugging(clean_only=True)
 
+    def test_debugpy_backend_steps_deep_stack_without_loading_every_frame(self) -> None:
+        _qt_app()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            script_path = Path(tmpdir) / "deep.py"
+            script_path.write_text(
+                "def down(depth, items):\n"
+                "    if depth == 0:\n"
+                "        marker = len(items)\n"
+                "        return marker\n"
+                "    return down(depth - 1, items)\n"
+                "\n"
+                "\n"
+                "values = list(range(250))\n"
+                "print(down(40, values))\n",
+                encoding="utf-8",
+            )
+
+            backend = DebugpyPythonDebuggerBackend()
+            commands: list[str] = []
+            send_request = backend._send_request
+
+            def record_request(command, arguments, callback):
+                commands.append(command)
+                return send_request(command, arguments, callback)
+
+            backend._send_request = record_request
+            received: list[dict] = []
+            backend.variablesReceived.connect(lambda data: received.append(dict(data)))
+
+            def fetch(reference: int, start: int, count: int) -> dict:
+                backend.send_command("variables", {"reference": reference, "start": start, "count": count})
+                for data in received:
+                    if (data.get("reference"), data.get("start")) == (reference, start):
+                        return data
+                (data,) = _wait_for_signal(
+                    backend.variablesReceived,
+                    predicate=lambda data: (data.get("reference"), data.get("start")) == (reference, start),
+                    timeout_ms=4000,
+                )
+                return data
+
+            try:
+                backend.start_debugging(
+                    DebugLaunchRequest(
+                        file_path=str(script_path),
+                        source_text="",
+                        launch_kind=DebugLaunchKind.SCRIPT,
+                        interpreter=sys.executable,
+                        working_directory=tmpdir,
+                    ),
+                    {
+                        os.path.normcase(os.path.abspath(str(script_path))): [
+                            {"line": 3, "condition": "", "hit_count": 0, "log_message": ""}
+                        ]
+                    },
+                )
+                _wait_for_signal(backend.paused, predicate=lambda data: int(data.get("line") or 0) == 3, timeout_ms=8000)
+
+                commands.clear()
+                started = time.perf_counter()
+                backend.send_command("next")
+                (paused_data,) = _wait_for_signal(
+                    backend.paused,
+                    predicate=lambda data: int(data.get("line") or 0) == 4,
+                    timeout_ms=4000,
+                )
+                step_seconds = time.perf_counter() - started
+
+                # 42 frames, yet the stop needs one stack request and one scopes request.
+                stack = paused_data.get("stack") or []
+                self.assertEqual(len(stack), 42)
+                self.assertEqual(stack[-1].get("function"), "down")
+                self.assertEqual(commands, ["next", "stackTrace", "scopes"])
+                self.assertNotIn("locals", paused_data)
+                self.assertLess(step_seconds, 3.0)
+
+                top_locals = fetch(int(stack[-1]["scopes"][0]["variables_reference"]), 0, 100)
+                values = {item["name"]: item for item in top_locals["variables"]}
+                self.assertEqual(values["marker"]["value"], "250")
+
+                items_reference = int(values["items"]["variables_reference"])
+                first_page = fetch(items_reference, 0, 50)
+                self.assertEqual(len(first_page["variables"]), 50)
+                self.assertGreater(first_page["total"], 50)
+                requests_before = commands.count("variables")
+                second_page = fetch(items_reference, 50, 50)
+                self.assertEqual(len(second_page["variables"]), min(50, first_page["total"] - 50))
+                self.assertEqual(commands.count("variables"), requests_before)
+
+                module_globals = fetch(int(stack[0]["scopes"][1]["variables_reference"]), 0, 100)
+                self.assertIn("values", [item["name"] for item in module_globals["variables"]])
+                self.assertEqual(commands.count("scopes"), 2)
+
+                backend.send_command("continue")
+                _wait_for_signal(backend.finished, timeout_ms=8000)
+            finally:
+                backend.stop_debugging(clean_only=True)
+
     def test_debugpy_backend_stop_request_finishes_long_running_script(self) -> None:
         _qt_app()
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -0,0 +1,635 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication
+
+from DL_Manager import main as dl_main
+from DL_Manager.main import (
+    DownloadScheduler,
+    DownloadSignals,
+    DownloadWorker,
+    ProgressMeter,
+    TokenBucket,
+    journal_path,
+    write_json_atomic,
+)
+
+
+def _app() -> QApplication:
+    app = QApplication.instance()
+    return app if app is not None else QApplication([])
+
+
+class _RangeServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, payload: bytes, *, ranges: bool = True, honour_ranges: bool = True) -> None:
+        super().__init__(("127.0.0.1", 0), _RangeHandler)
+        self.payload = payload
+        self.ranges = ranges
+        self.honour_ranges = honour_ranges
+        self.slow_starts: set[int] = set()
+        self.slow_all = False
+        self.etag = ""
+        self.requests: list[tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/payload.bin"
+
+    def record(self, method: str, range_header: str) -> None:
+        with self._lock:
+            self.requests.append((method, range_header))
+
+    def range_starts(self) -> list[int]:
+        with self._lock:
+            headers = [header for method, header in self.requests if method == "GET" and header]
+        return [int(header.split("=", 1)[1].split("-", 1)[0]) for header in headers]
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    server: _RangeServer
+
+    def log_message(self, *_args) -> None:
+        return None
+
+    def do_HEAD(self) -> None:
+        self.server.record("HEAD", "")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.server.payload)))
+        if self.server.ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        if self.server.etag:
+            self.send_header("ETag", self.server.etag)
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        payload = self.server.payload
+        range_header = self.headers.get("Range", "")
+        self.server.record("GET", range_header)
+        start, end = 0, len(payload) - 1
+        if_range = self.headers.get("If-Range")
+        if if_range is not None and if_range != self.server.etag:
+            range_header = ""
+        if range_header and self.server.ranges and self.server.honour_ranges:
+            first, _, last = range_header.split("=", 1)[1].partition("-")
+            start = int(first)
+            end = int(last) if last else len(payload) - 1
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(payload)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(end - start + 1))
+        if self.server.etag:
+            self.send_header("ETag", self.server.etag)
+        self.end_headers()
+
+        slow = self.server.slow_all or start in self.server.slow_starts
+        position = start
+        try:
+            while position <= end:
+                piece = payload[position : min(end + 1, position + 64 * 1024)]
+                self.wfile.write(piece)
+                position += len(piece)
+                if slow:
+                    time.sleep(0.05)
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+
+class DownloadWorkerSegmentTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._qt_app = _app()
+
+    def setUp(self) -> None:
+        self.payload = random.Random(47).randbytes(3 * 1024 * 1024)
+        tmpdir = tempfile.TemporaryDirectory(prefix="pytpo-dl-")
+        self.addCleanup(tmpdir.cleanup)
+        self.filepath = os.path.join(tmpdir.name, "payload.bin")
+
+    def _serve(self, **kwargs) -> _RangeServer:
+        server = _RangeServer(self.payload, **kwargs)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def _data(self, server: _RangeServer, **data) -> dict:
+        return {
+            "id": "download-1",
+            "url": server.url,
+            "filepath": self.filepath,
+            "status": "active",
+            "downloaded_bytes": 0,
+            "total_bytes": 0,
+            **data,
+        }
+
+    def _download(self, server: _RangeServer, *, configure=None, **data) -> dict:
+        data = self._data(server, **data)
+        worker = DownloadWorker(data)
+        worker.min_segment_size = 256 * 1024
+        if configure is not None:
+            configure(worker)
+        worker.start()
+        if not worker.wait(30000):
+            worker.cancel()
+            self.fail("download did not finish")
+        self.assertEqual(data["status"], "completed")
+        with open(self.filepath, "rb") as f:
+            self.assertEqual(f.read(), self.payload)
+        return data
+
+    def test_ranged_server_is_fetched_in_parallel_segments(self) -> None:
+        server = self._serve()
+
+        data = self._download(server)
+
+        # Four planned segments; connections that finish early may split the rest further.
+        self.assertLessEqual({0, 786432, 1572864, 2359296}, set(server.range_starts()))
+        self.assertEqual(data["downloaded_bytes"], len(self.payload))
+        self.assertEqual(sum(seg["end"] - seg["start"] for seg in data["segments"]), len(self.payload))
+
+    def test_stale_writes_to_the_shared_dict_do_not_lose_segment_bytes(self) -> None:
+        server = self._serve()
+        reports: list[int] = []
+
+        def configure(worker: DownloadWorker) -> None:
+            worker.chunk_size = 8 * 1024
+            worker._meter.interval = 0.0
+
+            def on_progress(_uid, current, *_rest) -> None:
+                reports.append(current)
+                # Stand in for another thread writing back an older snapshot.
+                worker.data["downloaded_bytes"] = 0
+
+            worker.signals.progress.connect(on_progress, Qt.DirectConnection)
+
+        self._download(server, configure=configure)
+
+        self.assertEqual(reports[-1], len(self.payload))
+        self.assertEqual(max(reports), len(self.payload))
+
+    def test_slow_segment_is_split_between_connections(self) -> None:
+        server = self._serve()
+        server.slow_starts.add(0)
+
+        data = self._download(server)
+
+        stolen = [start for start in server.range_starts() if 0 < start < 786432]
+        self.assertTrue(stolen, server.requests)
+        self.assertGreater(len(data["segments"]), 4)
+        self.assertTrue(all(seg["done"] == seg["end"] - seg["start"] for seg in data["segments"]))
+
+    def test_resume_requests_only_the_missing_bytes_of_each_segment(self) -> None:
+        server = self._serve()
+        quarter = len(self.payload) // 4
+        segments = [
+            {"start": index * quarter, "end": (index + 1) * quarter, "done": done}
+            for index, done in enumerate((quarter, 1000, 0, quarter - 10))
+        ]
+        with open(self.filepath, "wb") as f:
+            f.truncate(len(self.payload))
+            for seg in segments:
+                f.seek(seg["start"])
+                f.write(self.payload[seg["start"] : seg["start"] + seg["done"]])
+        completed = [(seg["start"], seg["start"] + seg["done"]) for seg in segments if seg["done"]]
+
+        self._download(server, segments=segments, total_bytes=len(self.payload), downloaded_bytes=2 * quarter)
+
+        starts = server.range_starts()
+        self.assertLessEqual({quarter + 1000, 2 * quarter, 4 * quarter - 10}, set(starts))
+        for start in starts:
+            self.assertFalse(
+                any(low <= start < high for low, high in completed),
+                f"re-fetched completed bytes at {start}",
+            )
+
+    def test_server_without_ranges_uses_a_single_stream(self) -> None:
+        server = self._serve(ranges=False)
+
+        data = self._download(server)
+
+        self.assertEqual([method for method, _header in server.requests], ["HEAD", "GET"])
+        self.assertNotIn("segments", data)
+
+    def test_server_ignoring_range_requests_falls_back_to_a_single_stream(self) -> None:
+        server = self._serve(honour_ranges=False)
+
+        data = self._download(server)
+
+        self.assertIn(("GET", ""), server.requests)
+        self.assertNotIn("segments", data)
+
+    def test_progress_is_throttled_and_ends_with_the_full_size(self) -> None:
+        server = self._serve()
+        server.slow_starts.add(0)
+        reports: list[tuple] = []
+
+        def configure(worker: DownloadWorker) -> None:
+            worker.chunk_size = 8 * 1024
+            worker.signals.progress.connect(lambda *args: reports.append(args), Qt.DirectConnection)
+
+        self._download(server, configure=configure)
+
+        # ~390 chunks over well under two seconds; roughly ten reports a second get through.
+        self.assertLess(len(reports), 40)
+        self.assertEqual(reports[-1][1:3], (len(self.payload), len(self.payload)))
+        self.assertEqual(reports[-1][4], 0.0)
+
+
+    def test_interrupted_download_resumes_from_its_journal(self) -> None:
+        server = self._serve()
+        server.etag = '"v1"'
+        server.slow_all = True
+        data = self._data(server)
+        worker = DownloadWorker(data)
+        worker.min_segment_size = 256 * 1024
+        worker.checkpoint_interval = 0.05
+        worker.start()
+        deadline = time.monotonic() + 10
+        journal: dict = {}
+        while time.monotonic() < deadline:
+            try:
+                with open(journal_path(self.filepath)) as f:
+                    journal = json.load(f)
+            except (OSError, ValueError):
+                journal = {}
+            if sum(seg["done"] for seg in journal.get("segments", [])) > 0:
+                break
+            time.sleep(0.02)
+        worker.cancel()
+        self.assertTrue(journal.get("segments"), "no checkpoint was written while downloading")
+
+        with open(journal_path(self.filepath)) as f:
+            journal = json.load(f)
+        self.assertEqual(journal["etag"], '"v1"')
+        with open(self.filepath, "rb") as f:
+            on_disk = f.read()
+        for seg in journal["segments"]:
+            verified = slice(seg["start"], seg["start"] + seg["done"])
+            self.assertEqual(on_disk[verified], self.payload[verified])
+        completed = [(seg["start"], seg["start"] + seg["done"]) for seg in journal["segments"] if seg["done"]]
+
+        server.slow_all = False
+        server.requests.clear()
+        self._download(server)
+
+        for start in server.range_starts():
+            self.assertFalse(any(low <= start < high for low, high in completed), f"re-fetched bytes at {start}")
+        self.assertFalse(os.path.exists(journal_path(self.filepath)))
+
+    def test_single_stream_paused_before_a_checkpoint_still_journals(self) -> None:
+        server = self._serve()
+        server.etag = '"v1"'
+        server.slow_all = True
+        data = self._data(server)
+        worker = DownloadWorker(data)
+        worker.min_segment_size = len(self.payload)  # too small to split: single stream
+        worker._maybe_checkpoint = lambda _fd: None  # interrupted before any periodic checkpoint
+        worker.start()
+        deadline = time.monotonic() + 10
+        while data["downloaded_bytes"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        worker.cancel()
+
+        with open(journal_path(self.filepath)) as f:
+            journal = json.load(f)
+        self.assertEqual(journal["etag"], '"v1"')
+        self.assertGreater(journal["downloaded_bytes"], 0)
+        self.assertEqual(os.path.getsize(self.filepath), journal["downloaded_bytes"])
+
+        server.slow_all = False
+        server.requests.clear()
+        self._download(server, configure=lambda w: setattr(w, "min_segment_size", len(self.payload)))
+
+        self.assertEqual(server.range_starts(), [journal["downloaded_bytes"]])
+
+    def test_changed_remote_file_is_downloaded_again(self) -> None:
+        old_payload = bytes(len(self.payload))
+        quarter = len(self.payload) // 4
+        with open(self.filepath, "wb") as f:
+            f.write(old_payload)
+        segments = [
+            {"start": index * quarter, "end": (index + 1) * quarter, "done": quarter // 2} for index in range(4)
+        ]
+        server = self._serve()
+        server.etag = '"v2"'
+        write_json_atomic(
+            journal_path(self.filepath),
+            {"url": server.url, "total_bytes": len(self.payload), "etag": '"v1"', "segments": segments},
+        )
+
+        self._download(server)
+
+        self.assertIn(0, server.range_starts())
+
+
+    def test_rate_limit_caps_throughput(self) -> None:
+        server = self._serve()
+        started = time.monotonic()
+
+        self._download(server, rate_limit=4 * 1024 * 1024)
+
+        # 3 MiB at 4 MiB/s, starting with an empty bucket.
+        self.assertGreaterEqual(time.monotonic() - started, 0.7)
+
+    def test_paused_worker_blocks_until_resumed(self) -> None:
+        server = self._serve()
+        server.slow_all = True
+        data = self._data(server)
+        worker = DownloadWorker(data)
+        worker.min_segment_size = 256 * 1024
+        self.addCleanup(worker.cancel)
+        worker.start()
+        deadline = time.monotonic() + 10
+        while data["downloaded_bytes"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        worker.pause()
+        time.sleep(0.5)
+        paused_at = data["downloaded_bytes"]
+        time.sleep(0.3)
+        self.assertEqual(data["downloaded_bytes"], paused_at)
+        self.assertTrue(worker.isRunning())
+
+        server.slow_all = False
+        worker.resume()
+        self.assertTrue(worker.wait(30000))
+        self.assertEqual(data["status"], "completed")
+        with open(self.filepath, "rb") as f:
+            self.assertEqual(f.read(), self.payload)
+
+
+class _FakeWorker:
+    def __init__(self, uid: str, priority: int = 0) -> None:
+        self.id = uid
+        self.data = {"id": uid, "priority": priority}
+        self.signals = DownloadSignals()
+        self.global_bucket = None
+        self.calls: list[str] = []
+
+    def resume(self) -> None:
+        self.calls.append("resume")
+
+    def pause(self) -> None:
+        self.calls.append("pause")
+
+
+class DownloadSchedulerTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._qt_app = _app()
+
+    def _scheduler(self, *workers: _FakeWorker, max_active: int = 2) -> DownloadScheduler:
+        scheduler = DownloadScheduler(max_active=max_active)
+        for worker in workers:
+            scheduler.add(worker)
+        return scheduler
+
+    def test_only_max_active_downloads_start_in_priority_order(self) -> None:
+        low, normal, high, urgent = (_FakeWorker("low", -1), _FakeWorker("normal"), _FakeWorker("high", 5),
+                                     _FakeWorker("urgent", 9))
+        scheduler = self._scheduler(low, normal, high, urgent, max_active=1)
+        statuses: list[tuple[str, str]] = []
+        for worker in (low, normal, high, urgent):
+            worker.signals.status.connect(lambda uid, text: statuses.append((uid, text)))
+
+        for uid in ("low", "normal", "high", "urgent"):
+            scheduler.enqueue(uid)
+
+        self.assertEqual(scheduler.active, {"low"})
+        self.assertEqual(scheduler.queued_ids(), ["urgent", "high", "normal"])
+        self.assertIn(("normal", "Queued"), statuses)
+        self.assertIs(low.global_bucket, scheduler.global_bucket)
+
+        scheduler.set_max_active(2)
+        self.assertEqual(scheduler.active, {"low", "urgent"})
+
+        scheduler.set_priority("normal", 7)
+        scheduler._on_finished("low")
+        self.assertEqual(scheduler.active, {"urgent", "normal"})
+        self.assertEqual(scheduler.queued_ids(), ["high"])
+
+    def test_pause_and_remove_free_their_slot(self) -> None:
+        first, second, third = _FakeWorker("a"), _FakeWorker("b"), _FakeWorker("c")
+        scheduler = self._scheduler(first, second, third, max_active=1)
+        for uid in ("a", "b", "c"):
+            scheduler.enqueue(uid)
+
+        scheduler.pause("a")
+        self.assertEqual(first.calls, ["resume", "pause"])
+        self.assertEqual(scheduler.active, {"b"})
+
+        scheduler.pause("c")
+        scheduler.remove("b")
+        self.assertEqual(scheduler.active, set())
+        self.assertEqual(third.calls, ["pause"])
+
+        scheduler.enqueue("a")
+        self.assertEqual(scheduler.active, {"a"})
+
+    def test_worker_completion_is_delivered_to_the_scheduler(self) -> None:
+        worker = _FakeWorker("a")
+        scheduler = self._scheduler(worker, _FakeWorker("b"), max_active=1)
+        scheduler.enqueue("a")
+        scheduler.enqueue("b")
+
+        worker.signals.finished.emit("a")
+
+        self.assertEqual(scheduler.active, {"b"})
+
+
+class TokenBucketTests(unittest.TestCase):
+    def test_consumers_wait_off_their_debt(self) -> None:
+        clock = [10.0]
+        waits: list[float] = []
+        with patch.object(dl_main.time, "monotonic", side_effect=lambda: clock[0]):
+            bucket = TokenBucket(rate=1000, burst=0.5)
+            bucket.consume(250, waits.append)
+            self.assertEqual(waits, [0.25])
+
+            # Idle time refills the bucket, but only up to the burst allowance.
+            clock[0] += 10.0
+            bucket.consume(500, waits.append)
+            self.assertEqual(waits, [0.25])
+            bucket.consume(100, waits.append)
+            self.assertAlmostEqual(waits[-1], 0.1)
+
+            bucket.set_rate(0)
+            bucket.consume(10**9, waits.append)
+            self.assertEqual(len(waits), 2)
+
+
+class AtomicStateTests(unittest.TestCase):
+    def test_failed_write_keeps_the_previous_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "downloads.json")
+            write_json_atomic(path, [{"id": "a"}])
+
+            with self.assertRaises(TypeError):
+                write_json_atomic(path, [{"id": {"not", "json"}}])
+
+            with open(path) as f:
+                self.assertEqual(json.load(f), [{"id": "a"}])
+            self.assertEqual(os.listdir(tmpdir), ["downloads.json"])
+
+
+class ProgressMeterTests(unittest.TestCase):
+    def test_reports_are_rate_limited_and_speed_is_smoothed(self) -> None:
+        clock = [100.0]
+        with patch.object(dl_main.time, "monotonic", side_effect=lambda: clock[0]):
+            meter = ProgressMeter(interval=0.25, smoothing=0.5)
+            clock[0] += 0.125
+            self.assertIsNone(meter.update(500, 10_000))
+
+            clock[0] += 0.125
+            speed, eta = meter.update(1_000, 10_000)
+            self.assertAlmostEqual(speed, 4_000.0)
+            self.assertAlmostEqual(eta, 2.25)
+
+            clock[0] += 0.25
+            speed, _eta = meter.update(3_000, 10_000)
+            self.assertAlmostEqual(speed, 6_000.0)
+
+            self.assertIsNotNone(meter.update(3_000, 10_000, force=True))
+            self.assertEqual(meter.update(3_000, 0, force=True)[1], -1.0)
+
+
+class MainWindowProgressTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._qt_app = _app()
+
+    def setUp(self) -> None:
+        tmpdir = tempfile.TemporaryDirectory(prefix="pytpo-dl-state-")
+        self.addCleanup(tmpdir.cleanup)
+        self.state_file = os.path.join(tmpdir.name, "downloads.json")
+        state_patch = patch.object(dl_main, "STATE_FILE", self.state_file)
+        state_patch.start()
+        self.addCleanup(state_patch.stop)
+        self.window = dl_main.MainWindow()
+        self.addCleanup(self.window.deleteLater)
+
+    def _add(self, uid: str) -> dict:
+        data = {
+            "id": uid,
+            "url": "http://127.0.0.1:9/file.bin",
+            "filepath": f"/tmp/{uid}.bin",
+            "status": "paused",
+            "downloaded_bytes": 0,
+            "total_bytes": 0,
+            "priority": 0,
+            "rate_limit": 0,
+        }
+        self.window.downloads[uid] = data
+        self.window.create_download_row(data)
+        return data
+
+    def test_progress_signals_are_applied_once_per_flush(self) -> None:
+        first = self._add("a")
+        second = self._add("b")
+        widget = self.window.widgets["a"]
+
+        with patch.object(widget, "update_progress", wraps=widget.update_progress) as update:
+            for current in range(0, 1000, 10):
+                self.window.on_progress("a", current, 1000, 50.0, 2.0)
+            self.window.on_progress("b", 5, 10, 1.0, 5.0)
+            update.assert_not_called()
+            self.assertTrue(self.window._progress_timer.isActive())
+
+            self.window.flush_progress()
+
+        update.assert_called_once_with(990, 1000, 50.0, 2.0)
+        self.assertEqual(widget.progress_bar.value(), 99)
+        self.assertEqual(self.window.widgets["b"].progress_bar.value(), 50)
+        # Progress reports are display-only; the worker owns the persisted byte counts.
+        self.assertEqual((first["downloaded_bytes"], first["total_bytes"]), (0, 0))
+        self.assertEqual((second["downloaded_bytes"], second["total_bytes"]), (0, 0))
+        self.assertEqual(widget.lbl_speed.text(), "50.00 B/s - 2s left")
+
+    def test_row_controls_change_priority_and_rate_limit(self) -> None:
+        self.window.scheduler.set_max_active(1)
+        downloads = {uid: self._add(uid) for uid in ("a", "b", "c")}
+        for uid, data in downloads.items():
+            data["status"] = "active"
+            patch.object(self.window.workers[uid], "resume").start()
+            self.window.scheduler.enqueue(uid)
+        self.addCleanup(patch.stopall)
+        self.assertEqual(self.window.scheduler.queued_ids(), ["b", "c"])
+
+        self.window.widgets["c"].priority_input.setValue(5)
+        self.window.widgets["b"].rate_input.setValue(64)
+
+        self.assertEqual(self.window.scheduler.queued_ids(), ["c", "b"])
+        self.assertEqual(downloads["c"]["priority"], 5)
+        self.assertEqual(downloads["b"]["rate_limit"], 64 * 1024)
+        self.assertEqual(self.window.workers["b"].rate_bucket.rate, 64 * 1024)
+        self.assertTrue(self.window._save_timer.isActive())
+
+    def test_removed_download_drops_its_pending_progress(self) -> None:
+        self._add("a")
+        self.window.on_progress("a", 10, 100, 1.0, 90.0)
+        self.window.remove_download("a")
+
+        self.window.flush_progress()
+
+        self.assertEqual(self.window.downloads, {})
+
+    def test_progress_schedules_a_checkpoint_of_queue_fields_only(self) -> None:
+        data = self._add("a")
+        data["segments"] = [{"start": 0, "end": 100, "done": 40}]
+        data["etag"] = '"v1"'
+        # As the worker publishes them alongside its progress report.
+        data["downloaded_bytes"], data["total_bytes"] = 40, 100
+        self.window.on_progress("a", 40, 100, 10.0, 6.0)
+        self.window.flush_progress()
+        self.assertTrue(self.window._save_timer.isActive())
+        self.assertFalse(os.path.exists(self.state_file))
+
+        self.window._save_timer.timeout.emit()
+
+        self.assertFalse(self.window._save_timer.isActive())
+        with open(self.state_file) as f:
+            saved = json.load(f)
+        self.assertEqual(saved, [{key: data[key] for key in dl_main.QUEUE_FIELDS}])
+        self.assertEqual(saved[0]["downloaded_bytes"], 40)
+
+    def test_close_waits_for_every_worker_before_saving(self) -> None:
+        self._add("a")
+        self._add("b")
+        calls: list[tuple] = []
+        for uid, worker in self.window.workers.items():
+            patch.object(worker, "cancel", lambda wait=True, uid=uid: calls.append(("cancel", uid, wait))).start()
+            patch.object(worker, "wait", lambda timeout, uid=uid: calls.append(("wait", uid, timeout)) or True).start()
+        self.addCleanup(patch.stopall)
+        self.window.on_progress("a", 10, 100, 1.0, 90.0)
+
+        self.window.close()
+
+        self.assertEqual(calls, [
+            ("cancel", "a", False),
+            ("cancel", "b", False),
+            ("wait", "a", dl_main.SHUTDOWN_TIMEOUT_MS),
+            ("wait", "b", dl_main.SHUTDOWN_TIMEOUT_MS),
+        ])
+        self.assertEqual(self.window._pending_progress, {})
+        with open(self.state_file) as f:
+            self.assertEqual([entry["id"] for entry in json.load(f)], ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
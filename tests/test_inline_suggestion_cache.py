@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from PySide6.QtWidgets import QApplication
+
+from barley_ide.ai.context_assembler import ContextAssembler
+from barley_ide.ai.inline_controller import InlineSuggestionController
+from barley_ide.ai.provider_base import InlineCompletionResult
+from barley_ide.ai.suggestion_cache import (
+    InlineSuggestionCache,
+    make_cache_key,
+    split_at_cursor,
+)
+
+
+def _app() -> QApplication:
+    app = QApplication.instance()
+    return app if app is not None else QApplication([])
+
+
+def _key(source: str, line: int, column: int, model: str = "m"):
+    prefix, suffix = split_at_cursor(source, line, column)
+    return make_cache_key(file_path="/p/a.py", prefix=prefix, suffix=suffix, model=model), prefix
+
+
+class InlineSuggestionCacheTests(unittest.TestCase):
+    def test_split_at_cursor(self) -> None:
+        self.assertEqual(split_at_cursor("ab\ncd\n", 2, 1), ("ab\nc", "d\n"))
+        self.assertEqual(split_at_cursor("ab", 1, 99), ("ab", ""))
+
+    def test_exact_hit_depends_on_model_and_suffix(self) -> None:
+        cache = InlineSuggestionCache()
+        key, prefix = _key("total = \nprint(total)\n", 1, 8)
+        cache.store(key, prefix, "sum(items)")
+        self.assertEqual(cache.lookup(key, prefix).text, "sum(items)")
+
+        other_model, _ = _key("total = \nprint(total)\n", 1, 8, model="other")
+        self.assertIsNone(cache.lookup(other_model, prefix))
+        other_suffix, _ = _key("total = \nprint(x)\n", 1, 8)
+        self.assertIsNone(cache.lookup(other_suffix, prefix))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 2)
+
+    def test_typing_through_suggestion_returns_remaining_tail(self) -> None:
+        cache = InlineSuggestionCache()
+        key, prefix = _key("total = \nprint(total)\n", 1, 8)
+        cache.store(key, prefix, "sum(items)")
+
+        typed_key, typed_prefix = _key("total = sum(\nprint(total)\n", 1, 12)
+        hit = cache.lookup(typed_key, typed_prefix)
+        self.assertEqual((hit.text, hit.kind), ("items)", "typed_through"))
+        self.assertEqual(cache.lookup(typed_key, typed_prefix).kind, "exact")
+
+        diverged_key, diverged_prefix = _key("total = max(\nprint(total)\n", 1, 12)
+        self.assertIsNone(cache.lookup(diverged_key, diverged_prefix))
+        self.assertEqual(cache.stats()["typed_through_hits"], 1)
+
+    def test_lru_respects_entry_and_byte_bounds(self) -> None:
+        cache = InlineSuggestionCache(max_entries=2)
+        keys = [_key(f"x{i} = \n", 1, 5) for i in range(3)]
+        for key, prefix in keys:
+            cache.store(key, prefix, "value")
+        self.assertIsNone(cache.lookup(*keys[0]))
+        self.assertIsNotNone(cache.lookup(*keys[2]))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+        small = InlineSuggestionCache(max_bytes=2048)
+        for i in range(10):
+            small.store(*_key(f"y{i} = \n", 1, 5), "v" * 300)
+        self.assertLessEqual(small.stats()["bytes"], 2048)
+
+
+class _CountingProvider:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def complete_inline(self, request, *, on_delta=None, cancel=None):
+        self.calls += 1
+        return InlineCompletionResult(ok=True, status_text="ok", text="sum(items)")
+
+
+class InlineControllerCacheTests(unittest.TestCase):
+    def test_repeat_and_typed_through_requests_skip_provider(self) -> None:
+        app = _app()
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            source = root / "main.py"
+            source.write_text("total = \n", encoding="utf-8")
+            provider = _CountingProvider()
+            assembler = ContextAssembler(str(root), canonicalize=lambda p: str(Path(p).resolve()))
+            controller = InlineSuggestionController(provider_client=provider, context_assembler=assembler)
+            self.addCleanup(assembler.shutdown)
+            self.addCleanup(controller.shutdown)
+            controller.update_settings({"enabled": True, "model": "stub", "base_url": "http://127.0.0.1:9"})
+            payloads: list[dict] = []
+            controller.suggestionReady.connect(payloads.append)
+
+            def request(text: str, column: int) -> None:
+                controller.request_manual(
+                    editor_id="ed-1",
+                    file_path=str(source),
+                    source_text=text,
+                    line=1,
+                    column=column,
+                    prefix="",
+                    previous_char=" ",
+                )
+
+            request("total = \n", 8)
+            deadline = time.monotonic() + 5.0
+            while not payloads and time.monotonic() < deadline:
+                app.processEvents()
+                time.sleep(0.01)
+            self.assertEqual(payloads[-1]["text"], "sum(items)")
+
+            request("total = \n", 8)
+            request("total = sum(\n", 12)
+            self.assertEqual([p["text"] for p in payloads[1:]], ["sum(items)", "items)"])
+            self.assertEqual([p["metadata"]["cache"] for p in payloads[1:]], ["exact", "typed_through"])
+            self.assertEqual(provider.calls, 1)
+            stats = controller.cache_stats()
+            self.assertEqual((stats["hits"], stats["typed_through_hits"], stats["misses"]), (1, 1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
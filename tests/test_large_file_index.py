@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from barley_ide.services import large_file_index
+from barley_ide.services.large_file_index import LargeFileLineIndex
+
+
+class LargeFileLineIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def _write(self, data: bytes) -> str:
+        path = os.path.join(self._tmp.name, "big.log")
+        with open(path, "wb") as handle:
+            handle.write(data)
+        return path
+
+    def _index(self, data: bytes) -> LargeFileLineIndex:
+        index = LargeFileLineIndex(self._write(data))
+        self.addCleanup(index.close)
+        index.start()
+        self.assertTrue(index.wait(5.0))
+        return index
+
+    def test_indexes_line_offsets_and_reads_lines(self) -> None:
+        index = self._index(b"alpha\r\nbeta\ngamma")
+        self.assertEqual(index.line_count(), 3)
+        self.assertEqual(index.line_text(0), "alpha")
+        self.assertEqual(index.line_text(1), "beta")
+        self.assertEqual(index.line_text(2), "gamma")
+        self.assertIsNone(index.line_text(3))
+        self.assertEqual(index.line_for_offset(8), 1)
+
+    def test_empty_file_is_complete_without_thread(self) -> None:
+        index = LargeFileLineIndex(self._write(b""))
+        self.addCleanup(index.close)
+        self.assertTrue(index.is_complete())
+        self.assertEqual(index.line_count(), 1)
+        self.assertEqual(index.line_text(0), "")
+
+    def test_indexing_spans_chunk_boundaries(self) -> None:
+        lines = [f"line {i:05d}".encode() for i in range(2000)]
+        original = large_file_index._INDEX_CHUNK_BYTES
+        large_file_index._INDEX_CHUNK_BYTES = 97
+        self.addCleanup(setattr, large_file_index, "_INDEX_CHUNK_BYTES", original)
+        index = self._index(b"\n".join(lines) + b"\n")
+        self.assertEqual(index.line_count(), 2000)
+        self.assertEqual(index.line_text(1234), "line 01234")
+
+    def test_rendered_lines_are_truncated(self) -> None:
+        index = self._index(b"x" * 10000 + b"\nshort\n")
+        self.assertEqual(len(index.line_text(0, max_chars=50) or ""), 50)
+
+    def test_streaming_regex_search_reports_line_and_columns(self) -> None:
+        original = large_file_index._SEARCH_CHUNK_BYTES
+        large_file_index._SEARCH_CHUNK_BYTES = 16
+        self.addCleanup(setattr, large_file_index, "_SEARCH_CHUNK_BYTES", original)
+        index = self._index(b"ok\nok\nERROR: disk full\nok\nerror: again\n")
+        matches = list(index.iter_matches(r"error: \w+", ignore_case=True))
+        self.assertEqual([(m.line, m.start_column, m.end_column) for m in matches], [(2, 0, 11), (4, 0, 12)])
+        after = list(index.iter_matches("error", start_offset=index.offset_for_line(3) or 0, ignore_case=True))
+        self.assertEqual([m.line for m in after], [4])
+
+    def test_literal_search_escapes_pattern(self) -> None:
+        index = self._index(b"a.b\naxb\n")
+        matches = list(index.iter_matches("a.b", regex=False))
+        self.assertEqual([m.line for m in matches], [0])
+
+    def test_search_can_be_cancelled(self) -> None:
+        index = self._index(b"hit\n" * 100)
+        self.assertEqual(list(index.iter_matches("hit", cancelled=lambda: True)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+import unittest
+
+from PySide6.QtWidgets import QApplication
+
+from barley_ide.services.large_file_index import MAX_RENDERED_LINE_CHARS
+from barley_ide.ui.widgets.large_file_viewer import LargeFileViewerWidget
+
+
+class LargeFileViewerTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._app = QApplication.instance() or QApplication([])
+
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def _viewer(self, data: bytes) -> LargeFileViewerWidget:
+        path = os.path.join(self._tmp.name, "big.log")
+        with open(path, "wb") as handle:
+            handle.write(data)
+        viewer = LargeFileViewerWidget(file_path=path)
+        self.addCleanup(viewer.close)
+        viewer.resize(480, 320)
+        viewer.show()
+        self.assertTrue(viewer._index.wait(5.0))
+        viewer._on_index_poll()
+        return viewer
+
+    def _find(self, viewer: LargeFileViewerWidget, pattern: str) -> tuple[int, int]:
+        viewer._search_edit.setText(pattern)
+        viewer.find_next()
+        deadline = time.monotonic() + 5.0
+        while viewer._search_future is not None and time.monotonic() < deadline:
+            self._app.processEvents()
+            time.sleep(0.005)
+        match = viewer._viewport.current_match()
+        self.assertIsNotNone(match)
+        return match.line, match.start_column
+
+    def test_horizontal_range_reaches_the_end_of_the_longest_visible_line(self) -> None:
+        viewer = self._viewer(b"short\n" + b"x" * 3000 + b"\n" + b"y" * 9000 + b"\n")
+        viewport = viewer._viewport
+        hbar = viewport.horizontalScrollBar()
+
+        self.assertEqual(hbar.maximum() + hbar.pageStep(), MAX_RENDERED_LINE_CHARS)
+
+        viewport.verticalScrollBar().setValue(viewport.verticalScrollBar().maximum())
+        viewport.set_index(None)
+        self.assertEqual(hbar.maximum(), 0)
+
+    def test_find_next_starts_on_the_current_line_and_continues_along_it(self) -> None:
+        viewer = self._viewer(b"foo bar foo\nbaz\nfoo\n")
+
+        self.assertEqual(self._find(viewer, "foo"), (0, 0))
+        self.assertEqual(self._find(viewer, "foo"), (0, 8))
+        self.assertEqual(self._find(viewer, "foo"), (2, 0))
+        self.assertEqual(self._find(viewer, "foo"), (0, 0))
+        self.assertEqual(viewer._status_message, "Search wrapped to start of file.")
+
+
+if __name__ == "__main__":
+    unittest.main()
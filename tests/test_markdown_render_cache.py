@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import re
+import unittest
+
+from TPOPyside.widgets.markdown_render_cache import (
+    MarkdownBlockRenderer,
+    create_preview_parser,
+    diff_blocks,
+    split_markdown_blocks,
+)
+
+_DOCUMENT = """# Usage
+
+Intro paragraph
+over two lines.
+
+## Usage
+
+- first
+- second
+
+- third
+
+!!! note "Heads up"
+    admonition body
+
+    second body paragraph
+
+```python
+def f():
+
+    return 1
+```
+
+> quoted
+lazily continued
+
+> second quote
+
+# Usage
+
+Closing text with `code` and $x^2$.
+"""
+
+
+def _squash(html: str) -> str:
+    return re.sub(r">\s+<", "><", re.sub(r"\s+", " ", html)).strip()
+
+
+class MarkdownRenderCacheTests(unittest.TestCase):
+    def test_block_render_matches_whole_document(self) -> None:
+        rendered = MarkdownBlockRenderer().render(_DOCUMENT)
+        whole = create_preview_parser()
+        self.assertEqual(_squash(rendered.html), _squash(whole.convert(_DOCUMENT)))
+        self.assertGreater(len(rendered.blocks), 6)
+        self.assertEqual([token["id"] for token in rendered.toc_tokens], ["usage", "usage_1", "usage_2"])
+
+    def test_split_keeps_fences_lists_and_quotes_whole(self) -> None:
+        blocks = split_markdown_blocks(_DOCUMENT)
+        self.assertTrue(any(block.startswith("```python") and block.rstrip().endswith("```") for block in blocks))
+        self.assertTrue(any("- first" in block and "- third" in block for block in blocks))
+        self.assertTrue(any("quoted" in block and "second quote" in block for block in blocks))
+        self.assertEqual(split_markdown_blocks("[a]: https://example.com\n\nsee [x][a]"), ["[a]: https://example.com\n\nsee [x][a]"])
+
+    def test_edit_converts_and_patches_only_changed_block(self) -> None:
+        renderer = MarkdownBlockRenderer()
+        before = renderer.render(_DOCUMENT)
+        edited = renderer.render(_DOCUMENT.replace("Intro paragraph", "Intro paragraph, edited"))
+        self.assertEqual(edited.converted, 1)
+
+        patch = diff_blocks([block.key for block in before.blocks], edited.blocks)
+        self.assertEqual((patch.keep_prefix, patch.remove_count, len(patch.insert)), (1, 1, 1))
+        self.assertIn("edited", patch.insert[0].html)
+        self.assertTrue(diff_blocks([block.key for block in edited.blocks], edited.blocks).empty)
+
+    def test_duplicate_heading_ids_follow_new_earlier_heading(self) -> None:
+        renderer = MarkdownBlockRenderer()
+        renderer.render("## Setup\n\ntext")
+        rendered = renderer.render("## Setup\n\nmore\n\n## Setup\n\ntext")
+        self.assertIn('id="setup_1"', rendered.blocks[2].html)
+        self.assertEqual(rendered.converted, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
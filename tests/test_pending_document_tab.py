@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import unittest
+
+from PySide6.QtWidgets import QApplication, QTabWidget
+
+from barley_ide.ui.widgets.pending_document_tab import PendingDocumentTab
+
+
+def _app() -> QApplication:
+    app = QApplication.instance()
+    return app if app is not None else QApplication([])
+
+
+class PendingDocumentTabTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = _app()
+
+    def test_keeps_restore_state_without_loading(self) -> None:
+        tab = PendingDocumentTab(
+            file_path="/repo/src/main.py",
+            view_state={"cursor_pos": 42},
+            activation_seq=7,
+        )
+        self.assertEqual(tab.display_name(), "main.py")
+        self.assertEqual(tab.view_state, {"cursor_pos": 42})
+        self.assertEqual(tab.activation_seq(), 7)
+
+    def test_requests_hydration_only_when_left_visible(self) -> None:
+        tabs = QTabWidget()
+        first = PendingDocumentTab(file_path="/repo/a.py")
+        second = PendingDocumentTab(file_path="/repo/b.py")
+        requested: list[object] = []
+        first.hydrationRequested.connect(requested.append)
+        second.hydrationRequested.connect(requested.append)
+        tabs.addTab(first, first.display_name())
+        tabs.addTab(second, second.display_name())
+        tabs.show()
+        tabs.setCurrentWidget(second)
+        tabs.setCurrentWidget(first)
+        self.app.processEvents()
+        self.assertEqual(requested, [first])
+
+        tabs.setCurrentWidget(second)
+        self.app.processEvents()
+        self.assertEqual(requested, [first, second])
+        tabs.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import os
 import unittest
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -209,6 +210,7 @@ class WindowMatchingTests(unittest.TestCase):
             _assign_windows_to_apps = main_window.CustomDock._assign_windows_to_apps
             _write_window_snapshot = main_window.CustomDock._write_window_snapshot
             _runtime_window_groups = main_window.CustomDock._runtime_window_groups
+            _window_match_index = main_window.CustomDock._window_match_index
             update_dock_items = main_window.CustomDock.update_dock_items
 
             def __init__(self):
@@ -244,6 +246,110 @@ class WindowMatchingTests(unittest.TestCase):
         self.assertEqual(runtime_item["data"]["Icon"], "gimp")
         self.assertEqual(len(runtime_item["windows"]), 2)
 
+    def _index_fixture(self):
+        apps = {
+            "/apps/firefox.desktop": {
+                "path": "/apps/firefox.desktop",
+                "desktop_id": "firefox.desktop",
+                "Name": "Firefox",
+                "Exec": "firefox %u",
+                "Icon": "firefox",
+                "StartupWMClass": "firefox",
+            },
+            "/apps/firefox-esr.desktop": {
+                "path": "/apps/firefox-esr.desktop",
+                "desktop_id": "firefox-esr.desktop",
+                "Name": "Firefox ESR",
+                "Exec": "firefox-esr",
+                "Icon": "firefox",
+                "StartupWMClass": "",
+            },
+            "/apps/my-tool.desktop": {
+                "path": "/apps/my-tool.desktop",
+                "desktop_id": "my-tool.desktop",
+                "Name": "My Tool",
+                "Exec": "python3 /opt/my_tool.py",
+                "Icon": "my-tool",
+                "StartupWMClass": "",
+            },
+            "/apps/empty.desktop": {"path": "", "desktop_id": ""},
+        }
+        windows = [
+            {"id": "0x1", "wm_class": "navigator.firefox", "instance": "navigator", "class": "firefox",
+             "title": "Mozilla Firefox", "pid": 10, "process_name": "firefox", "executable_name": "firefox"},
+            {"id": "0x2", "wm_class": "python3.python3", "instance": "python3", "class": "python3",
+             "title": "My Tool", "pid": 11, "process_name": "python3", "executable_name": "python3",
+             "script_name": "my_tool"},
+            {"id": "0x3", "wm_class": "gimp.gimp", "instance": "gimp", "class": "gimp",
+             "title": "image.xcf - GIMP", "pid": 12, "process_name": "gimp", "executable_name": "gimp"},
+        ]
+        return apps, windows
+
+    def test_window_match_index_agrees_with_full_scan(self):
+        apps, windows = self._index_fixture()
+        index = window_matching.WindowMatchIndex()
+        index.sync_apps(apps)
+
+        expected = []
+        for window in windows:
+            best = ("", 0)
+            for path, app_data in apps.items():
+                score = window_matching.score_window_match(window, app_data)
+                if score > best[1]:
+                    best = (path, score)
+            expected.append(best)
+
+        self.assertEqual(index.match_windows(windows), expected)
+        self.assertEqual(expected[0][0], "/apps/firefox.desktop")
+        self.assertEqual(expected[2], ("", 0))
+        self.assertLess(index.counters["apps_scored"], len(apps) * len(windows))
+
+    def test_window_match_index_rescores_only_changed_windows_and_apps(self):
+        apps, windows = self._index_fixture()
+        index = window_matching.WindowMatchIndex()
+        index.sync_apps(apps)
+        index.match_windows(windows)
+        self.assertEqual(index.counters["profiles_built"], len(apps))
+        self.assertEqual(index.counters["windows_scored"], 3)
+
+        index.sync_apps(dict(apps))
+        index.match_windows(windows)
+        self.assertEqual(index.counters["profiles_built"], len(apps))
+        self.assertEqual(index.counters["windows_scored"], 3)
+        self.assertEqual(index.counters["memo_hits"], 3)
+
+        retitled = dict(windows[0], title="Docs - Mozilla Firefox")
+        index.match_windows([retitled, windows[1], windows[2]])
+        self.assertEqual(index.counters["windows_scored"], 4)
+
+        changed_apps = dict(apps)
+        changed_apps["/apps/my-tool.desktop"] = dict(apps["/apps/my-tool.desktop"], StartupWMClass="gimp")
+        index.sync_apps(changed_apps)
+        results = index.match_windows(windows)
+        self.assertEqual(index.counters["profiles_built"], len(apps) + 1)
+        self.assertEqual(index.counters["windows_scored"], 7)
+        self.assertEqual(results[2][0], "/apps/my-tool.desktop")
+
+    def test_known_apps_by_path_reparses_pinned_desktop_files_only_when_modified(self):
+        class _DummyDock:
+            _known_apps_by_path = main_window.CustomDock._known_apps_by_path
+
+        with TemporaryDirectory() as tmp_dir:
+            desktop_path = Path(tmp_dir) / "tool.desktop"
+            desktop_path.write_text("[Desktop Entry]\nName=Tool\n", encoding="utf-8")
+            dock = _DummyDock()
+            dock.pinned_apps = [str(desktop_path), str(Path(tmp_dir) / "missing.desktop")]
+            dock.registry = {}
+            with mock.patch.object(main_window, "parse_desktop_file", return_value={"Name": "Tool"}) as parse:
+                first = dock._known_apps_by_path()
+                dock._known_apps_by_path()
+                stat = desktop_path.stat()
+                os.utime(desktop_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+                dock._known_apps_by_path()
+
+        self.assertEqual(list(first), [str(desktop_path)])
+        self.assertEqual(parse.call_count, 2)
+
     def test_write_window_snapshot_outputs_json_and_markdown(self):
         running_windows = [
             {
@@ -295,6 +401,7 @@ class WindowMatchingTests(unittest.TestCase):
                     assigned_windows=assigned_windows,
                     unmatched_windows=[],
                     target_items=target_items,
+                    match_counters={"passes": 3, "last_pass_ms": 0.25},
                 )
             json_text = json_path.read_text(encoding="utf-8")
             md_text = md_path.read_text(encoding="utf-8")
@@ -303,6 +410,8 @@ class WindowMatchingTests(unittest.TestCase):
         self.assertEqual(written_md, str(md_path))
         self.assertIn("Firefox", json_text)
         self.assertIn("Dock Window Snapshot", md_text)
+        self.assertIn('"passes": 3', json_text)
+        self.assertIn("Match Counters", md_text)
 
     def test_get_running_windows_uses_xlib_backend_records(self):
         class _DummyDock:
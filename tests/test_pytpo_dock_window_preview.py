@@ -2,6 +2,7 @@ import unittest
 from unittest import mock
 
 from PySide6.QtCore import QAbstractAnimation, QEvent, QPoint, QRect, QSize, Qt
+from PySide6.QtWidgets import QApplication
 
 from pytpo_dock.settings_dialog import DockVisualSettings
 from pytpo_dock.ui import main_window
@@ -272,6 +273,97 @@ class _FakeOffsetGeometry:
         return (self._x, self._y, self._width, self._height)
 
 
+class _FakeCookie:
+    def __init__(self, reply=None):
+        self._reply = reply
+
+    def reply(self):
+        return self._reply
+
+    def check(self):
+        return None
+
+
+class _FakeGeometry:
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+
+
+class _FakeXProto:
+    def __init__(self, *, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.image_requests = []
+        self.freed = []
+
+    def GetGeometry(self, _native_id):
+        return _FakeCookie(_FakeGeometry(self.width, self.height))
+
+    def GetWindowAttributes(self, _native_id):
+        return _FakeCookie(type("Attributes", (), {"visual": 0x21})())
+
+    def CreatePixmap(self, depth, pixmap_id, _drawable, width, height):
+        self.created = (depth, pixmap_id, width, height)
+
+    def GetImage(self, _format, drawable, _x, _y, width, height, _planes):
+        self.image_requests.append((drawable, width, height))
+        return _FakeCookie(_FakeImageReply(depth=32, raw=bytes([0x10, 0x20, 0x30, 0xFF]) * (width * height)))
+
+    def FreePixmap(self, pixmap_id):
+        self.freed.append(pixmap_id)
+
+
+class _FakeComposite:
+    def NameWindowPixmapChecked(self, _native_id, _pixmap_id):
+        return _FakeCookie()
+
+
+class _FakeRender:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append((name, args))
+
+
+class _FakeDamageNotify:
+    def __init__(self, drawable: int):
+        self.drawable = drawable
+
+
+class _FakeXConnection:
+    def __init__(self):
+        self.next_id = 0x100
+        self.events = []
+
+    def generate_id(self):
+        self.next_id += 1
+        return self.next_id
+
+    def flush(self):
+        return None
+
+    def poll_for_event(self):
+        return self.events.pop(0) if self.events else None
+
+
+def _fake_capturer(*, width: int = 1600, height: int = 1000, on_update=None):
+    capturer = X11WindowPreviewCapturer(on_update=on_update)
+    capturer._initialized = True
+    capturer._available = True
+    capturer._conn = _FakeXConnection()
+    capturer._xproto = _FakeXProto(width=width, height=height)
+    capturer._composite = _FakeComposite()
+    capturer._format_by_depth = {32: _PixmapFormat(bits_per_pixel=32, scanline_pad=32)}
+    return capturer
+
+
+def _wait_for_capture_thread(capturer) -> None:
+    if capturer._executor is not None:
+        capturer._executor.submit(lambda: None).result(timeout=5)
+
+
 class DockWindowPreviewTests(unittest.TestCase):
     def test_capture_window_preview_prefers_xcffib_backend(self):
         backend_pixmap = _FakePixmap(is_null=False, width=400, height=240)
@@ -1471,5 +1563,111 @@ class DockWindowPreviewTests(unittest.TestCase):
         self.assertEqual((color.red(), color.green(), color.blue()), (0x30, 0x20, 0x10))
 
 
+    def test_apply_preview_thumbnail_updates_only_the_matching_card(self):
+        thumbnail = _FakePixmap(is_null=False, width=196, height=122)
+
+        class _Capturer:
+            def cached_thumbnail(self, win_id):
+                self.requested = win_id
+                return thumbnail
+
+        class _DummyDock:
+            _apply_preview_thumbnail = main_window.CustomDock._apply_preview_thumbnail
+            _normalize_window_id = main_window.CustomDock._normalize_window_id
+
+            def __init__(self):
+                self.x11_preview_capturer = _Capturer()
+                self.preview_popup = _FakePreviewPopup(visible=True)
+                self.current_preview_entries = [
+                    {"win_id": "0x2a", "title": "One", "pixmap": None},
+                    {"win_id": "0x2b", "title": "Two", "pixmap": None},
+                ]
+
+        dock = _DummyDock()
+        updates = []
+        dock.preview_popup.update_content = lambda previews, animate_changes: updates.append((previews, animate_changes))
+        dock._apply_preview_thumbnail("0x2B")
+
+        self.assertIsNone(dock.current_preview_entries[0]["pixmap"])
+        self.assertIs(dock.current_preview_entries[1]["pixmap"], thumbnail)
+        self.assertEqual(len(updates), 1)
+        self.assertFalse(updates[0][1])
+
+
+class X11WindowPreviewCaptureTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._qt_app = QApplication.instance() or QApplication([])
+
+    def test_capture_thumbnail_downscales_full_window_image_when_render_is_missing(self):
+        capturer = _fake_capturer(width=800, height=500)
+
+        image, _damage_id = capturer._capture_thumbnail(0x2A, 0)
+
+        self.assertEqual((image.width(), image.height()), (196, 122))
+        self.assertEqual(capturer._xproto.image_requests[0][1:], (800, 500))
+
+    def test_capture_thumbnail_reads_only_a_server_scaled_image_through_render(self):
+        capturer = _fake_capturer(width=3840, height=2160)
+        capturer._render = _FakeRender()
+        capturer._argb_format = 0x40
+        capturer._pict_format_by_visual = {0x21: 0x41}
+
+        image, _damage_id = capturer._capture_thumbnail(0x2A, 0)
+
+        self.assertEqual((image.width(), image.height()), (196, 110))
+        self.assertEqual([request[1:] for request in capturer._xproto.image_requests], [(392, 220)])
+        call_names = [name for name, _args in capturer._render.calls]
+        self.assertEqual(call_names, ["CreatePicture", "CreatePicture", "SetPictureTransform", "Composite", "FreePicture", "FreePicture"])
+        transform = capturer._render.calls[2][1][1]
+        self.assertEqual((transform[0], transform[4], transform[8]), (round(3840 / 392 * 65536), round(2160 / 220 * 65536), 65536))
+
+    def test_capture_caches_thumbnails_until_damage_is_reported(self):
+        updates = []
+        capturer = _fake_capturer(on_update=updates.append)
+        capturer._damage = _FakeRender()
+        capturer._damage_notify_type = _FakeDamageNotify
+
+        first = capturer.capture("0x2a")
+        _wait_for_capture_thread(capturer)
+        capturer.capture("0x2a")
+        _wait_for_capture_thread(capturer)
+
+        self.assertFalse(first.isNull())
+        self.assertEqual((first.width(), first.height()), (196, 122))
+        self.assertEqual(len(capturer._xproto.image_requests), 1)
+        self.assertEqual(updates, ["0x2a"])
+        self.assertEqual([name for name, _args in capturer._damage.calls], ["Create"])
+
+        capturer._conn.events.append(_FakeDamageNotify(0x2A))
+        capturer.refresh_damaged(["0x2a"])
+        _wait_for_capture_thread(capturer)
+
+        self.assertEqual(len(capturer._xproto.image_requests), 2)
+        self.assertEqual(updates, ["0x2a", "0x2a"])
+        self.assertEqual([name for name, _args in capturer._damage.calls], ["Create", "Subtract"])
+
+    def test_refresh_damaged_spreads_recaptures_across_ticks_within_budget(self):
+        capturer = _fake_capturer()
+        capturer._damage = _FakeRender()
+        capturer._damage_notify_type = _FakeDamageNotify
+        for win_id in ("0x2a", "0x2b"):
+            capturer.capture(win_id)
+        _wait_for_capture_thread(capturer)
+        capturer._xproto.image_requests.clear()
+
+        capturer._conn.events.extend([_FakeDamageNotify(0x2A), _FakeDamageNotify(0x2B)])
+        capturer.refresh_damaged(["0x2a", "0x2b"], budget=0.0)
+        _wait_for_capture_thread(capturer)
+        self.assertEqual(len(capturer._xproto.image_requests), 1)
+
+        capturer.refresh_damaged(["0x2a", "0x2b"], budget=0.0)
+        _wait_for_capture_thread(capturer)
+        self.assertEqual(len(capturer._xproto.image_requests), 2)
+
+        capturer.refresh_damaged(["0x2a", "0x2b"], budget=0.0)
+        _wait_for_capture_thread(capturer)
+        self.assertEqual(len(capturer._xproto.image_requests), 2)
+
 if __name__ == "__main__":
     unittest.main()
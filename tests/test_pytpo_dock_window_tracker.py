@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import threading
+import unittest
+from unittest import mock
+
+from pytpo_dock.xlib_window_source import XlibWindowTracker
+
+
+class _FakeX:
+    AnyPropertyType = 0
+    PropertyChangeMask = 1 << 22
+    PropertyNotify = 28
+
+
+class _FakeProperty:
+    def __init__(self, value):
+        self.value = value
+
+
+class _FakeWindow:
+    def __init__(self, window_id: int, display: "_FakeDisplay"):
+        self.id = window_id
+        self._display = display
+
+    def get_full_property(self, atom, _prop_type):
+        value = self._display.properties.get((self.id, int(atom)))
+        return None if value is None else _FakeProperty(value)
+
+    def get_wm_class(self):
+        return self._display.wm_classes.get(self.id)
+
+    def get_wm_name(self):
+        return ""
+
+    def change_attributes(self, **kwargs):
+        self._display.selected.append((self.id, kwargs.get("event_mask")))
+
+
+class _FakeScreen:
+    def __init__(self, root):
+        self.root = root
+
+
+class _FakeDisplay:
+    ROOT = 1
+
+    def __init__(self):
+        self.atoms: dict[str, int] = {}
+        self.properties: dict[tuple[int, int], object] = {}
+        self.wm_classes: dict[int, tuple[str, str]] = {}
+        self.selected: list[tuple[int, int]] = []
+        self.reads = 0
+
+    def intern_atom(self, name: str) -> int:
+        return self.atoms.setdefault(name, 100 + len(self.atoms))
+
+    def screen(self):
+        return _FakeScreen(_FakeWindow(self.ROOT, self))
+
+    def create_resource_object(self, _kind, window_id):
+        self.reads += 1
+        return _FakeWindow(int(window_id), self)
+
+    def flush(self):
+        return None
+
+    def set(self, window_id: int, name: str, value) -> int:
+        atom = self.intern_atom(name)
+        self.properties[(window_id, atom)] = value
+        return atom
+
+    def add_client(self, window_id: int, *, title: str, wm_class: tuple[str, str]) -> None:
+        self.set(window_id, "_NET_WM_NAME", title.encode("utf-8"))
+        self.wm_classes[window_id] = wm_class
+
+
+class _FakeEvent:
+    def __init__(self, window_id: int, atom: int):
+        self.type = _FakeX.PropertyNotify
+        self.window = _FakeWindow(window_id, None)
+        self.atom = atom
+
+
+class XlibWindowTrackerTests(unittest.TestCase):
+    def _tracker(self, display: _FakeDisplay):
+        notifications: list[int] = []
+        tracker = XlibWindowTracker(on_change=lambda: notifications.append(1))
+        tracker._attach(_FakeX, display)
+        return tracker, notifications
+
+    def test_attach_reads_client_list_and_selects_property_events(self) -> None:
+        display = _FakeDisplay()
+        display.add_client(0x20, title="Editor", wm_class=("code", "Code"))
+        display.add_client(0x30, title="Panel", wm_class=("panel", "Panel"))
+        display.set(0x30, "_NET_WM_WINDOW_TYPE", [display.intern_atom("_NET_WM_WINDOW_TYPE_DOCK")])
+        display.set(display.ROOT, "_NET_CLIENT_LIST", [0x20, 0x30])
+        display.set(display.ROOT, "_NET_ACTIVE_WINDOW", [0x20])
+
+        tracker, notifications = self._tracker(display)
+
+        windows = tracker.windows()
+        self.assertEqual([window["id"] for window in windows], ["0x20"])
+        self.assertEqual((windows[0]["title"], windows[0]["class"]), ("Editor", "code"))
+        self.assertEqual(tracker.active_window_id(), "0x20")
+        self.assertEqual(tracker.take_changes(), set())
+        self.assertEqual({window_id for window_id, _mask in display.selected}, {display.ROOT, 0x20, 0x30})
+        self.assertEqual(notifications, [])
+
+    def test_events_update_only_the_changed_window_and_coalesce_notifications(self) -> None:
+        display = _FakeDisplay()
+        display.add_client(0x20, title="Editor", wm_class=("code", "Code"))
+        client_list = display.set(display.ROOT, "_NET_CLIENT_LIST", [0x20])
+        tracker, notifications = self._tracker(display)
+        reads_after_attach = display.reads
+
+        name_atom = display.set(0x20, "_NET_WM_NAME", b"Editor - main.py")
+        tracker._handle_event(_FakeEvent(0x20, name_atom))
+        tracker._handle_event(_FakeEvent(0x20, display.intern_atom("_NET_WM_USER_TIME")))
+        tracker._notify()
+        tracker._notify()
+
+        self.assertEqual(notifications, [1])
+        self.assertEqual(display.reads - reads_after_attach, 1)
+        self.assertEqual(tracker.windows()[0]["title"], "Editor - main.py")
+        self.assertEqual(tracker.take_changes(), {"windows"})
+
+        display.add_client(0x40, title="Terminal", wm_class=("term", "Term"))
+        display.set(display.ROOT, "_NET_CLIENT_LIST", [0x40])
+        tracker._handle_event(_FakeEvent(display.ROOT, client_list))
+        active_atom = display.set(display.ROOT, "_NET_ACTIVE_WINDOW", [0x40])
+        tracker._handle_event(_FakeEvent(display.ROOT, active_atom))
+        tracker._notify()
+
+        self.assertEqual(notifications, [1, 1])
+        self.assertEqual([window["id"] for window in tracker.windows()], ["0x40"])
+        self.assertEqual(tracker.active_window_id(), "0x40")
+        self.assertEqual(tracker.take_changes(), {"windows", "active"})
+
+    def test_unchanged_property_event_reports_nothing(self) -> None:
+        display = _FakeDisplay()
+        display.add_client(0x20, title="Editor", wm_class=("code", "Code"))
+        display.set(display.ROOT, "_NET_CLIENT_LIST", [0x20])
+        tracker, notifications = self._tracker(display)
+
+        tracker._handle_event(_FakeEvent(0x20, display.intern_atom("_NET_WM_NAME")))
+        tracker._notify()
+
+        self.assertEqual(notifications, [])
+        self.assertEqual(tracker.take_changes(), set())
+
+
+def _start_xvfb():
+    read_fd, write_fd = os.pipe()
+    try:
+        process = subprocess.Popen(
+            ["Xvfb", "-displayfd", str(write_fd), "-nolisten", "tcp", "-screen", "0", "640x480x24"],
+            pass_fds=(write_fd,),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    finally:
+        os.close(write_fd)
+    with os.fdopen(read_fd) as reader:
+        number = reader.readline().strip()
+    if not number:
+        process.kill()
+        process.wait()
+        raise unittest.SkipTest("Xvfb did not report a display")
+    return process, f":{number}"
+
+
+def _xlib_available() -> bool:
+    try:
+        import Xlib.display  # noqa: F401
+    except Exception:
+        return False
+    return True
+
+
+@unittest.skipUnless(shutil.which("Xvfb") and _xlib_available(), "Xvfb and python-xlib are required")
+class XlibWindowTrackerXvfbTests(unittest.TestCase):
+    def test_tracker_follows_client_list_title_and_focus_changes(self) -> None:
+        from Xlib import X, Xatom, display
+
+        process, display_name = _start_xvfb()
+        self.addCleanup(process.wait)
+        self.addCleanup(process.terminate)
+        wm = display.Display(display_name)
+        self.addCleanup(wm.close)
+        root = wm.screen().root
+        client_list = wm.intern_atom("_NET_CLIENT_LIST")
+        active_window = wm.intern_atom("_NET_ACTIVE_WINDOW")
+        net_wm_name = wm.intern_atom("_NET_WM_NAME")
+        utf8 = wm.intern_atom("UTF8_STRING")
+        root.change_property(client_list, Xatom.WINDOW, 32, [])
+        wm.sync()
+
+        changed = threading.Event()
+        tracker = XlibWindowTracker(on_change=changed.set)
+        with mock.patch.dict(os.environ, {"DISPLAY": display_name}):
+            tracker.start()
+        self.addCleanup(tracker.stop)
+        self.assertEqual(tracker.windows(), [])
+
+        def wait_for(predicate) -> None:
+            for _attempt in range(50):
+                self.assertTrue(changed.wait(5.0))
+                changed.clear()
+                tracker.take_changes()
+                if predicate():
+                    return
+            self.fail("tracker never reported the expected state")
+
+        window = root.create_window(0, 0, 50, 50, 0, wm.screen().root_depth, X.InputOutput, X.CopyFromParent)
+        window.set_wm_class("demo", "Demo")
+        window.change_property(net_wm_name, utf8, 8, b"Demo window")
+        root.change_property(client_list, Xatom.WINDOW, 32, [window.id])
+        wm.sync()
+        wait_for(lambda: [item["title"] for item in tracker.windows()] == ["Demo window"])
+        self.assertEqual(tracker.windows()[0]["class"], "demo")
+
+        window.change_property(net_wm_name, utf8, 8, b"Renamed")
+        wm.sync()
+        wait_for(lambda: tracker.windows()[0]["title"] == "Renamed")
+
+        root.change_property(active_window, Xatom.WINDOW, 32, [window.id])
+        wm.sync()
+        wait_for(lambda: tracker.active_window_id() == f"0x{window.id:x}")
+
+        root.change_property(client_list, Xatom.WINDOW, 32, [])
+        wm.sync()
+        wait_for(lambda: tracker.windows() == [])
+        self.assertTrue(tracker.is_running())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from barley_ide.ai.context_assembler import ContextAssembler
+from barley_ide.ai.retrieval_index import ProjectRetrievalIndex, tokenize
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+
+
+class ProjectRetrievalIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name).resolve()
+        _write(
+            self.root / "pkg" / "loader.py",
+            "def load_config(path):\n    return parse_yaml(path)\n\n\ndef unrelated():\n    return 1\n",
+        )
+        _write(self.root / "pkg" / "render.py", "class PageRenderer:\n    def draw(self):\n        pass\n")
+        _write(self.root / ".venv" / "lib" / "site.py", "def load_config():\n    pass\n")
+        self.cache_path = self.root / ".cache" / "completion" / "retrieval-index.json"
+        self.cache_path.parent.mkdir(parents=True)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _built_index(self) -> ProjectRetrievalIndex:
+        index = ProjectRetrievalIndex(str(self.root), cache_path=str(self.cache_path))
+        index.schedule_refresh()
+        self.assertTrue(index.wait_idle(10.0))
+        self.addCleanup(index.shutdown)
+        return index
+
+    def test_tokenize_splits_identifiers(self) -> None:
+        self.assertEqual(tokenize("PageRenderer load_config"), ["pagerenderer", "page", "renderer", "load_config", "load", "config"])
+
+    def test_query_ranks_matching_chunk_and_skips_excluded_dirs(self) -> None:
+        index = self._built_index()
+        hits = index.query(["load_config"], limit=5)
+        self.assertEqual([Path(hit.path).name for hit in hits], ["loader.py"])
+        self.assertIn("parse_yaml", hits[0].text)
+        self.assertEqual(index.query(["renderer"], limit=5)[0].path, str(self.root / "pkg" / "render.py"))
+
+        stats = index.stats()
+        self.assertEqual((stats["files"], stats["queries"], stats["hits"]), (2, 2, 2))
+        self.assertLess(stats["latency_ms_max"], 10.0)
+
+    def test_incremental_update_and_removal(self) -> None:
+        index = self._built_index()
+        _write(self.root / "pkg" / "render.py", "def load_config_cached():\n    pass\n")
+        index.schedule_refresh([str(self.root / "pkg" / "render.py")])
+        index.wait_idle(10.0)
+        self.assertEqual(len(index.query(["config"], limit=5)), 2)
+
+        (self.root / "pkg" / "loader.py").unlink()
+        index.schedule_refresh([str(self.root / "pkg")])
+        index.wait_idle(10.0)
+        self.assertEqual([Path(hit.path).name for hit in index.query(["config"], limit=5)], ["render.py"])
+
+    def test_persisted_index_is_served_before_refresh(self) -> None:
+        self._built_index().save()
+        self.assertTrue(self.cache_path.is_file())
+        reloaded = ProjectRetrievalIndex(str(self.root), cache_path=str(self.cache_path))
+        self.addCleanup(reloaded.shutdown)
+        self.assertTrue(reloaded.load())
+        self.assertTrue(reloaded.is_ready())
+        self.assertEqual(len(reloaded.query(["parse_yaml"], limit=3)), 1)
+
+
+class ContextAssemblerRetrievalTests(unittest.TestCase):
+    def test_assemble_inline_uses_index_snippets(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            (root / ".cache" / "completion").mkdir(parents=True)
+            _write(root / "helpers.py", "def compute_total(items):\n    return sum(items)\n")
+            current = root / "main.py"
+            _write(current, "total = compute_total(values)\n")
+
+            assembler = ContextAssembler(str(root), canonicalize=lambda p: str(Path(p).resolve()))
+            self.addCleanup(assembler.shutdown)
+            kwargs = dict(
+                file_path=str(current),
+                source_text=current.read_text(encoding="utf-8"),
+                line=1,
+                column=5,
+                max_context_tokens=4000,
+                retrieval_snippets=3,
+            )
+            first = assembler.assemble_inline(**kwargs)
+            self.assertEqual(first.metadata["retrieval"]["reason"], "index_building")
+            assembler.retrieval_index().wait_idle(10.0)
+
+            second = assembler.assemble_inline(**kwargs)
+            retrieval = second.metadata["retrieval"]
+            self.assertEqual(retrieval["reason"], "ok")
+            self.assertEqual([item["path"] for item in retrieval["items"]], ["helpers.py"])
+            self.assertIn("compute_total", second.user_prompt)
+            self.assertEqual(assembler.retrieval_stats()["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
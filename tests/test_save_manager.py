@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import os
+import stat
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from PySide6.QtWidgets import QApplication
+
+from barley_ide.services.file_io import atomic_write_text
+from barley_ide.ui.save_manager import DocumentSaveManager, SaveResult
+
+
+def _app() -> QApplication:
+    app = QApplication.instance()
+    return app if app is not None else QApplication([])
+
+
+class AtomicWriteTextTests(unittest.TestCase):
+    def test_replaces_content_and_preserves_mode(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / "script.sh"
+            target.write_text("old", encoding="utf-8")
+            os.chmod(target, 0o750)
+            atomic_write_text(str(target), "new\n")
+            self.assertEqual(target.read_text(encoding="utf-8"), "new\n")
+            self.assertEqual(stat.S_IMODE(target.stat().st_mode), 0o750)
+            self.assertEqual(sorted(p.name for p in Path(tmp).iterdir()), ["script.sh"])
+
+
+class DocumentSaveManagerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        _app()
+
+    def test_writes_in_background_and_reports_result(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            target = os.path.join(tmp, "a.txt")
+            manager = DocumentSaveManager()
+            results: list[SaveResult] = []
+            manager.submit(target, "hello", on_finished=results.append)
+            self.assertTrue(manager.is_saving(target))
+            self.assertTrue(manager.flush(5.0))
+            self.assertFalse(manager.is_saving(target))
+            self.assertEqual(Path(target).read_text(encoding="utf-8"), "hello")
+            self.assertEqual(len(results), 1)
+            self.assertTrue(results[0].ok)
+
+    def test_coalesces_repeated_saves_of_same_path(self) -> None:
+        gate = threading.Event()
+        writes: list[str] = []
+
+        def _writer(path: str, text: str, *, encoding: str = "utf-8") -> None:
+            gate.wait(5.0)
+            writes.append(text)
+
+        manager = DocumentSaveManager(writer=_writer)
+        results: list[SaveResult] = []
+        manager.submit("/tmp/coalesce.txt", "v1", on_finished=results.append)
+        manager.submit("/tmp/coalesce.txt", "v2", on_finished=results.append)
+        manager.submit("/tmp/coalesce.txt", "v3", on_finished=results.append)
+        gate.set()
+        self.assertTrue(manager.flush(5.0))
+        self.assertEqual(writes, ["v1", "v3"])
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[-1].coalesced, 2)
+
+    def test_failed_write_is_reported(self) -> None:
+        def _writer(path: str, text: str, *, encoding: str = "utf-8") -> None:
+            raise OSError("disk full")
+
+        manager = DocumentSaveManager(writer=_writer)
+        results: list[SaveResult] = []
+        manager.submit("/tmp/fail.txt", "x", on_finished=results.append)
+        self.assertTrue(manager.flush(5.0))
+        self.assertFalse(results[0].ok)
+        self.assertIn("disk full", results[0].error)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+
+from barley_ide.startup_profile import StartupProfiler, split_profile_args
+
+
+class SplitProfileArgsTests(unittest.TestCase):
+    def test_strips_profile_flags(self) -> None:
+        remaining, enabled, report_path, exit_after = split_profile_args(
+            ["--profile-startup=/tmp/out.json", "/repo", "--profile-startup-exit"]
+        )
+        self.assertEqual(remaining, ["/repo"])
+        self.assertTrue(enabled)
+        self.assertEqual(report_path, "/tmp/out.json")
+        self.assertTrue(exit_after)
+
+    def test_disabled_without_flags(self) -> None:
+        self.assertEqual(split_profile_args(["/repo"]), (["/repo"], False, None, False))
+
+
+class StartupProfilerTests(unittest.TestCase):
+    def test_records_nested_import_self_time_and_writes_report(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "_profile_outer.py").write_text("import _profile_inner\nVALUE = 1\n", encoding="utf-8")
+            (root / "_profile_inner.py").write_text(
+                textwrap.dedent(
+                    """
+                    import time
+                    time.sleep(0.02)
+                    """
+                ),
+                encoding="utf-8",
+            )
+            sys.path.insert(0, tmp)
+            profiler = StartupProfiler(report_path=str(root / "profile.json"))
+            profiler.install_import_hook()
+            try:
+                with profiler.phase("imports"):
+                    import _profile_outer  # noqa: F401
+                profiler.mark("done")
+            finally:
+                profiler.remove_import_hook()
+                sys.path.remove(tmp)
+                sys.modules.pop("_profile_outer", None)
+                sys.modules.pop("_profile_inner", None)
+
+            timings = {item.module: item for item in profiler.report().imports}
+            self.assertIn("_profile_outer", timings)
+            self.assertIn("_profile_inner", timings)
+            outer = timings["_profile_outer"]
+            inner = timings["_profile_inner"]
+            self.assertEqual(inner.depth, 1)
+            self.assertGreaterEqual(inner.inclusive_ms, 15.0)
+            self.assertGreaterEqual(outer.inclusive_ms, inner.inclusive_ms)
+            self.assertLess(outer.self_ms, inner.inclusive_ms)
+
+            written = profiler.write_report()
+            self.assertIsNotNone(written)
+            payload = json.loads(Path(written).read_text(encoding="utf-8"))
+            self.assertEqual([phase["name"] for phase in payload["phases"]], ["imports"])
+            self.assertIn("done", payload["marks"])
+            self.assertIn("_profile_inner", Path(written).with_suffix(".txt").read_text(encoding="utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from barley_ide.services.tdoc_index_service import TDocProjectIndexCache
+from TPOPyside.widgets.tdoc_core import TDocProjectIndex
+
+MARKER = """Concepts:
+Widget = widgets | Widgetry
+Gadget
+"""
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    # Make sure a rewrite within the same mtime tick is still seen as a change.
+    stamp = time.time_ns() + len(text)
+    os.utime(path, ns=(stamp, stamp))
+
+
+class TDocProjectIndexCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name).resolve()
+        _write(self.root / ".tdocproject", MARKER)
+        _write(self.root / "a.tdoc", "See [widgets] and [Gadget].\n")
+        _write(self.root / "sub" / "b.tdoc", "A [Widget] and a [Missing] one.\n")
+        self.cache_path = self.root / ".cache" / "tdoc-index.json"
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _index(self) -> TDocProjectIndexCache:
+        return TDocProjectIndexCache(str(self.root), cache_path=str(self.cache_path))
+
+    def test_matches_stateless_references_and_validation(self) -> None:
+        index = self._index()
+        stats = index.refresh()
+        self.assertTrue(stats.full)
+        self.assertEqual(stats.reparsed, 2)
+
+        aliases = TDocProjectIndex.load_aliases(self.root)
+        expected = TDocProjectIndex.collect_symbol_references(self.root, aliases[0], aliases[3], aliases[4])
+        self.assertEqual(index.references(), expected)
+        self.assertEqual(index.validate(), TDocProjectIndex.validate_project(self.root))
+
+    def test_backlinks_cover_every_alias(self) -> None:
+        index = self._index()
+        index.refresh()
+        rel_paths = [ref[0] for ref in index.backlinks("widget")]
+        self.assertEqual(rel_paths, ["a.tdoc", "sub/b.tdoc"])
+        self.assertIn("missing", index.unresolved_labels())
+
+    def test_incremental_refresh_only_reparses_changed_documents(self) -> None:
+        index = self._index()
+        index.refresh()
+        _write(self.root / "a.tdoc", "Only [Gadget] now.\n")
+        stats = index.refresh([str(self.root / "a.tdoc")])
+        self.assertFalse(stats.full)
+        self.assertEqual((stats.scanned, stats.reparsed), (1, 1))
+        self.assertEqual([ref[0] for ref in index.backlinks("Widget")], ["sub/b.tdoc"])
+
+        (self.root / "sub" / "b.tdoc").unlink()
+        stats = index.refresh([str(self.root / "sub" / "b.tdoc")])
+        self.assertEqual(stats.removed, 1)
+        self.assertEqual(index.backlinks("Widget"), [])
+
+    def test_persisted_cache_skips_reparsing(self) -> None:
+        first = self._index()
+        first.refresh()
+        self.assertTrue(first.save())
+
+        second = self._index()
+        self.assertTrue(second.load())
+        stats = second.refresh()
+        self.assertEqual((stats.reparsed, stats.unchanged), (0, 2))
+        self.assertEqual(second.references(), first.references())
+
+    def test_focused_query_sees_unrefreshed_save(self) -> None:
+        index = self._index()
+        index.refresh()
+        _write(self.root / "sub" / "b.tdoc", "Now [Gadget] only.\n")
+        symbol_refs, _unresolved, _meta, _issues = index.references(rel_paths=["sub/b.tdoc"])
+        self.assertEqual(set(symbol_refs), {"Gadget"})
+
+
+if __name__ == "__main__":
+    unittest.main()
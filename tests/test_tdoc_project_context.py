@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from PySide6.QtWidgets import QApplication
+
+from TPOPyside.widgets.tdoc_support import TDocProjectContextCache
+
+
+def _app() -> QApplication:
+    app = QApplication.instance()
+    return app if app is not None else QApplication([])
+
+
+def _write(path: Path, text: str, *, bump_ns: int = 0) -> None:
+    path.write_text(text, encoding="utf-8")
+    if bump_ns:
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump_ns))
+
+
+class TDocProjectContextCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = _app()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name).resolve()
+        self.marker = self.root / ".tdocproject"
+        _write(self.marker, "frontmatter_schema: schema.json\nConcepts:\nWidget = widgets\n")
+        _write(self.root / "schema.json", '{"keys": ["title"]}')
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_loads_once_and_checks_once_per_turn(self) -> None:
+        cache = TDocProjectContextCache()
+        first = cache.get(str(self.root))
+        self.assertEqual(first.alias_to_symbol.get("widgets"), "Widget")
+        self.assertEqual(first.frontmatter_schema.get("keys"), ["title"])
+
+        _write(self.marker, "Concepts:\nGadget = gadgets\n", bump_ns=5_000_000)
+        self.assertIs(cache.get(str(self.root)), first)
+        self.assertEqual(cache.loads, 1)
+
+        self.app.processEvents()
+        second = cache.get(str(self.root))
+        self.assertIsNot(second, first)
+        self.assertEqual(second.alias_to_symbol.get("gadgets"), "Gadget")
+        self.assertEqual(cache.loads, 2)
+
+        self.app.processEvents()
+        self.assertIs(cache.get(str(self.root)), second)
+        self.assertEqual(cache.loads, 2)
+
+    def test_schema_change_reloads_context(self) -> None:
+        cache = TDocProjectContextCache()
+        cache.get(str(self.root))
+        _write(self.root / "schema.json", '{"keys": ["title", "status"]}', bump_ns=5_000_000)
+        self.app.processEvents()
+        self.assertEqual(cache.get(str(self.root)).frontmatter_schema.get("keys"), ["title", "status"])
+
+    def test_invalidate_forces_reload(self) -> None:
+        cache = TDocProjectContextCache()
+        cache.get(str(self.root))
+        cache.invalidate(str(self.root))
+        cache.get(str(self.root))
+        self.assertEqual(cache.loads, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
 import unittest
+from pathlib import Path
 from unittest.mock import patch
 
-from PySide6.QtDBus import QDBusMessage
-from PySide6.QtGui import QIcon
+from PySide6.QtCore import QEventLoop, Qt
+from PySide6.QtDBus import QDBusConnection, QDBusMessage
+from PySide6.QtGui import QColor, QIcon, QImage
 from PySide6.QtWidgets import QApplication
 
-from TPOPyside.components.tray_discovery import ResolvedTrayIcon, TrayDiscovery, item_is_alive
+from TPOPyside.components.tray_discovery import ResolvedTrayIcon, TrayDiscovery, TrayIconResolver, item_is_alive
 
 
 def _app() -> QApplication:
@@ -71,6 +79,94 @@ class _FakeInterface:
         return self._reply
 
 
+_FAKE_ITEM_SCRIPT = """
+import json
+import os
+import sys
+
+from PySide6.QtCore import ClassInfo, Property, QCoreApplication, QObject, QSocketNotifier, Signal
+from PySide6.QtDBus import QDBusConnection
+
+reads = {}
+
+
+def _read(name, value):
+    reads[name] = reads.get(name, 0) + 1
+    return value
+
+
+@ClassInfo({"D-Bus Interface": "org.kde.StatusNotifierItem"})
+class Item(QObject):
+    NewTitle = Signal()
+    NewIcon = Signal()
+    NewStatus = Signal(str)
+
+    def __init__(self, icon_path):
+        super().__init__()
+        self.title = "Fake Item"
+        self.status = "Active"
+        self.icon_name = icon_path
+
+    Id = Property(str, lambda self: _read("Id", "fake-item"))
+    Title = Property(str, lambda self: _read("Title", self.title))
+    Status = Property(str, lambda self: _read("Status", self.status))
+    IconName = Property(str, lambda self: _read("IconName", self.icon_name))
+    Menu = Property(str, lambda self: _read("Menu", "/MenuBar"))
+    ItemIsMenu = Property(bool, lambda self: _read("ItemIsMenu", False))
+
+
+@ClassInfo({"D-Bus Interface": "org.kde.StatusNotifierWatcher"})
+class Watcher(QObject):
+    StatusNotifierItemRegistered = Signal(str)
+    StatusNotifierItemUnregistered = Signal(str)
+
+    def __init__(self, items):
+        super().__init__()
+        self.items = items
+
+    RegisteredStatusNotifierItems = Property("QStringList", lambda self: self.items)
+
+
+app = QCoreApplication(sys.argv)
+bus = QDBusConnection.sessionBus()
+options = (
+    QDBusConnection.ExportAllProperties | QDBusConnection.ExportAllSlots | QDBusConnection.ExportAllSignals
+)
+item = Item(sys.argv[1])
+watcher = Watcher(["org.example.FakeItem/StatusNotifierItem"])
+bus.registerObject("/StatusNotifierItem", item, options)
+bus.registerService("org.example.FakeItem")
+bus.registerObject("/StatusNotifierWatcher", watcher, options)
+bus.registerService("org.kde.StatusNotifierWatcher")
+
+
+def on_command():
+    line = sys.stdin.readline()
+    if not line:
+        app.quit()
+        return
+    command, _, argument = line.strip().partition(" ")
+    if command == "title":
+        item.title = argument
+        item.NewTitle.emit()
+    elif command == "status":
+        item.status = argument
+        item.NewStatus.emit(argument)
+    elif command == "drop":
+        watcher.items = []
+        watcher.StatusNotifierItemUnregistered.emit("org.example.FakeItem/StatusNotifierItem")
+    elif command == "reads":
+        print(json.dumps(reads), flush=True)
+        reads.clear()
+
+
+notifier = QSocketNotifier(sys.stdin.fileno(), QSocketNotifier.Read)
+notifier.activated.connect(on_command)
+print("ready", os.environ["DBUS_SESSION_BUS_ADDRESS"], flush=True)
+app.exec()
+"""
+
+
 class TrayDiscoveryTests(unittest.TestCase):
     @classmethod
     def setUpClass(cls) -> None:
@@ -137,6 +233,119 @@ class TrayDiscoveryTests(unittest.TestCase):
         self.assertEqual([item.item_id for item in items], ["org.example.Live/StatusNotifierItem"])
         self.assertEqual(items[0].title, "Live app")
 
+    def test_resolve_from_only_looks_up_pixmaps_when_names_fail(self) -> None:
+        resolver = TrayIconResolver(_FakeBus())
+        requested: list[str] = []
+        opaque_red = [(1, 1, bytes([255, 255, 0, 0]))]
+
+        def pixmap_lookup(name: str):
+            requested.append(name)
+            return opaque_red if name == "IconPixmap" else None
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            icon_path = str(Path(tmpdir) / "icon.png")
+            image = QImage(4, 4, QImage.Format_ARGB32)
+            image.fill(QColor(Qt.blue))
+            self.assertTrue(image.save(icon_path))
+
+            resolved = resolver.resolve_from({"IconName": icon_path}.get, pixmap_lookup)
+            self.assertEqual(resolved.source, "IconName:absolute-path")
+            self.assertEqual(requested, [])
+
+        resolved = resolver.resolve_from({"IconName": ""}.get, pixmap_lookup)
+        self.assertEqual(resolved.source, "IconPixmap")
+        self.assertEqual(requested, ["IconPixmap"])
+
+
+@unittest.skipUnless(shutil.which("dbus-run-session"), "dbus-run-session is required")
+class TrayDiscoverySessionBusTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._qt_app = _app()
+
+    def setUp(self) -> None:
+        tmpdir = tempfile.TemporaryDirectory(prefix="pytpo-tray-")
+        self.addCleanup(tmpdir.cleanup)
+        script = Path(tmpdir.name) / "fake_item.py"
+        script.write_text(_FAKE_ITEM_SCRIPT, encoding="utf-8")
+        icon_path = Path(tmpdir.name) / "icon.png"
+        image = QImage(4, 4, QImage.Format_ARGB32)
+        image.fill(QColor(Qt.green))
+        image.save(str(icon_path))
+        self.icon_path = str(icon_path)
+
+        self.process = subprocess.Popen(
+            ["dbus-run-session", "--", sys.executable, str(script), self.icon_path],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        self.addCleanup(self._stop_process)
+        ready = self.process.stdout.readline().split()
+        if len(ready) != 2 or ready[0] != "ready":
+            self.skipTest("fake tray item did not start")
+
+        self.bus_name = f"pytpo-tray-test-{id(self)}"
+        self.bus = QDBusConnection.connectToBus(ready[1], self.bus_name)
+        self.addCleanup(QDBusConnection.disconnectFromBus, self.bus_name)
+        self.assertTrue(self.bus.isConnected())
+
+    def _stop_process(self) -> None:
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self.process.stdout.close()
+
+    def _send(self, command: str) -> None:
+        self.process.stdin.write(command + "\n")
+        self.process.stdin.flush()
+
+    def _reads(self) -> dict[str, int]:
+        self._send("reads")
+        return json.loads(self.process.stdout.readline())
+
+    def _wait_for(self, predicate, timeout: float = 10.0) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            QApplication.processEvents(QEventLoop.AllEvents, 50)
+            if predicate():
+                return
+            time.sleep(0.01)
+        self.fail("tray discovery never reached the expected state")
+
+    def test_items_are_fetched_once_and_updated_from_signals(self) -> None:
+        discovery = TrayDiscovery(self.bus)
+        self.addCleanup(discovery.stop)
+        changes: list[int] = []
+        discovery.itemsChanged.connect(lambda: changes.append(1))
+
+        self.assertTrue(discovery.start())
+        self._wait_for(lambda: bool(discovery.items()))
+        item = discovery.items()[0]
+        self.assertEqual(item.item_id, "org.example.FakeItem/StatusNotifierItem")
+        self.assertEqual((item.title, item.status, item.menu_path), ("Fake Item", "Active", "/MenuBar"))
+        self.assertFalse(item.item_is_menu)
+        self.assertEqual(item.icon_name, self.icon_path)
+        self.assertEqual(self._reads(), {name: 1 for name in ("Id", "Title", "Status", "IconName", "Menu", "ItemIsMenu")})
+
+        self._send("title Renamed")
+        self._wait_for(lambda: discovery.items()[0].title == "Renamed")
+        self.assertEqual(self._reads(), {"Title": 1})
+
+        self._send("status Passive")
+        self._wait_for(lambda: discovery.items(visible_only=True) == [])
+        self.assertEqual(discovery.items()[0].status, "Passive")
+        self.assertEqual(self._reads(), {})
+
+        self._send("drop")
+        self._wait_for(lambda: discovery.items() == [])
+        self.assertGreaterEqual(len(changes), 4)
+
 
 if __name__ == "__main__":
     unittest.main()
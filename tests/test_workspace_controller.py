@@ -7,6 +7,7 @@ from pathlib import Path
 from PySide6.QtCore import QObject
 
 from barley_ide.ui.controllers.workspace_controller import WorkspaceController
+from barley_ide.ui.save_manager import DocumentSaveManager
 
 
 class _StatusBar:
@@ -59,6 +60,15 @@ class _FakeSvgTab:
         return object()
 
 
+class _FakeAsyncDocument:
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+
+    def save_file_async(self, save_manager, *, on_finished=None) -> bool:
+        save_manager.submit(self.file_path, "text", on_finished=on_finished)
+        return True
+
+
 class _FakeIde(QObject):
     def __init__(self, widget: object, path: str) -> None:
         super().__init__()
@@ -176,6 +186,63 @@ class WorkspaceControllerTests(unittest.TestCase):
 
             self.assertEqual(wrapper.refresh_calls, 1)
 
+    def test_save_widget_async_reports_failed_writes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "main.py"
+            document = _FakeAsyncDocument(str(path))
+            controller = WorkspaceController(_FakeIde(document, str(path)))
+
+            def _failing_writer(_path: str, _text: str, *, encoding: str) -> None:
+                raise OSError("disk full")
+
+            controller._save_manager = DocumentSaveManager(controller, writer=_failing_writer)
+            saved: list[str] = []
+            results = []
+
+            submitted = controller.save_widget_async(
+                document,
+                source="save for run",
+                on_saved=lambda _widget, cpath: saved.append(cpath),
+                on_result=results.append,
+            )
+
+            self.assertTrue(submitted)
+            self.assertTrue(controller.save_manager.flush(5.0))
+            self.assertEqual(saved, [])
+            self.assertEqual([(result.ok, result.error) for result in results], [(False, "disk full")])
+
+    def test_save_widget_async_reports_synchronous_saves(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "notes.txt"
+
+            class _SyncDocument:
+                file_path = str(path)
+
+                def save_file(self) -> bool:
+                    return False
+
+            document = _SyncDocument()
+            controller = WorkspaceController(_FakeIde(document, str(path)))
+            results = []
+
+            self.assertFalse(controller.save_widget_async(document, source="save for run", on_result=results.append))
+            self.assertEqual([(result.path, result.ok) for result in results], [(str(path.resolve()), False)])
+
+    def test_stop_writes_pending_saves_and_shuts_the_save_manager_down(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "main.py"
+            document = _FakeAsyncDocument(str(path))
+            controller = WorkspaceController(_FakeIde(document, str(path)))
+            results = []
+            controller.save_widget_async(document, source="autosave", on_result=results.append)
+
+            controller.stop()
+
+            self.assertEqual([result.ok for result in results], [True])
+            self.assertEqual(path.read_text(encoding="utf-8"), "text")
+            with self.assertRaises(RuntimeError):
+                controller.save_manager._executor.submit(print)
+
 
 if __name__ == "__main__":
     unittest.main()